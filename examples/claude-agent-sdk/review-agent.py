@@ -8,17 +8,29 @@ Demonstrates the full Twining lifecycle:
   4. Record decisions with rationale
   5. Create a handoff for follow-up work
 
+Fan-out mode reviews many scopes at once. Context is assembled once per
+shared parent scope. Reviews run concurrently, and all findings and
+decisions are submitted in bulk. A single handoff covers the whole run.
+
 Usage:
     python review-agent.py <scope>
+    python review-agent.py <scope> <scope> ... [--concurrency N]
+    python review-agent.py --split <directory> [--concurrency N]
 
 Examples:
     python review-agent.py src/storage/
     python review-agent.py src/engine/context-assembler.ts
     python review-agent.py project
+    python review-agent.py src/storage/ src/engine/ src/tools/
+    python review-agent.py --split src/ --concurrency 8
 """
 
+import argparse
 import asyncio
+import json
+import re
 import sys
+import time
 from pathlib import Path
 
 from claude_code_sdk import ClaudeCodeOptions, query
@@ -372,24 +384,362 @@ async def run_review(scope: str, cwd: str) -> None:
     print("Twining dashboard to see the results.")
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python review-agent.py <scope>")
-        print()
-        print("Examples:")
-        print("  python review-agent.py src/storage/")
-        print("  python review-agent.py src/engine/context-assembler.ts")
-        print("  python review-agent.py project")
-        sys.exit(1)
+# ---------------------------------------------------------------------------
+# Fan-out mode
+# ---------------------------------------------------------------------------
+# The tools accept at most this many items per batch call.
+BATCH_LIMIT = 100
+
+ENTRY_TYPES = {"finding", "warning", "need"}
+
+# Directories never worth a review worker of their own.
+SKIP_DIRS = {"node_modules", "dist", "build", "coverage", "__pycache__", "venv", ".venv"}
+
+
+class StageTimer:
+    """Wall-clock time per pipeline stage, plus the time workers spent in each."""
+
+    def __init__(self):
+        self.wall = {}
+        self.busy = {}
+
+    def stage(self, name: str):
+        timer = self
+
+        class _Stage:
+            def __enter__(self):
+                self.started = time.perf_counter()
+
+            def __exit__(self, *exc):
+                timer.wall[name] = timer.wall.get(name, 0.0) + time.perf_counter() - self.started
+
+        return _Stage()
+
+    def add_busy(self, name: str, seconds: float) -> None:
+        self.busy[name] = self.busy.get(name, 0.0) + seconds
+
+    def report(self) -> None:
+        print(f"\n{'stage':12} {'wall s':>8} {'worker s':>9}")
+        for name in [*self.busy, *(n for n in self.wall if n not in self.busy)]:
+            wall = f"{self.wall[name]:8.1f}" if name in self.wall else f"{'-':>8}"
+            busy = f"{self.busy[name]:9.1f}" if name in self.busy else f"{'-':>9}"
+            print(f"{name:12} {wall} {busy}")
+
+
+class ContextCache:
+    """
+    One context assembly per parent scope, shared by every worker under it.
+
+    Caching the task rather than its result means workers that start
+    together wait on a single in-flight assembly instead of each
+    starting their own.
+    """
+
+    def __init__(self, cwd: str, timer: StageTimer):
+        self.cwd = cwd
+        self.timer = timer
+        self._tasks = {}
+
+    @property
+    def assemblies(self) -> int:
+        return len(self._tasks)
+
+    def get(self, parent: str) -> "asyncio.Task[str]":
+        if parent not in self._tasks:
+            self._tasks[parent] = asyncio.create_task(self._assemble(parent))
+        return self._tasks[parent]
+
+    async def _assemble(self, parent: str) -> str:
+        started = time.perf_counter()
+        try:
+            return await assemble_context(parent, self.cwd)
+        finally:
+            self.timer.add_busy("assemble", time.perf_counter() - started)
+
+
+def parent_scope(scope: str) -> str:
+    """The directory that contains a scope, as a Twining scope prefix."""
+    parent = str(Path(scope.rstrip("/")).parent)
+    return "project" if parent in (".", "") else parent + "/"
+
+
+def split_directory(directory: str, cwd: str) -> list:
+    """One scope per visible subdirectory and file directly under a directory."""
+    root = Path(cwd)
+    base = (root / directory).resolve()
+    if not base.is_dir():
+        sys.exit(f"Not a directory: {directory}")
+    scopes = []
+    for child in sorted(base.iterdir()):
+        if child.name.startswith(".") or child.name in SKIP_DIRS:
+            continue
+        relative = child.relative_to(root).as_posix()
+        scopes.append(relative + "/" if child.is_dir() else relative)
+    return scopes
+
+
+def _parse_records(scope: str, text: str) -> tuple:
+    """
+    Pull the entries and decisions out of the last ```json block of a
+    review, filling in the fields every record shares.
+    """
+    blocks = re.findall(r"```json\s*(.*?)```", text, re.DOTALL)
+    if not blocks:
+        return [], []
+    try:
+        records = json.loads(blocks[-1])
+    except ValueError:
+        print(f"  [{scope}] review records were not valid JSON; skipping them")
+        return [], []
+
+    entries = []
+    for entry in records.get("entries", []):
+        if entry.get("entry_type") not in ENTRY_TYPES or not entry.get("summary"):
+            continue
+        entries.append({
+            "entry_type": entry["entry_type"],
+            "summary": entry["summary"][:200],
+            "detail": entry.get("detail", ""),
+            "tags": ["code-review", AGENT_ID, *entry.get("tags", [])],
+            "scope": entry.get("scope") or scope,
+            "agent_id": AGENT_ID,
+        })
+
+    decisions = []
+    for decision in records.get("decisions", []):
+        if not all(decision.get(k) for k in ("domain", "summary", "context", "rationale")):
+            continue
+        decisions.append({**decision, "scope": decision.get("scope") or scope, "agent_id": AGENT_ID})
+    return entries, decisions
+
+
+async def review_scope(scope: str, context_summary: str, cwd: str) -> tuple:
+    """
+    Review one scope and return its report plus the entries and decisions
+    to record, without writing anything to Twining.
+
+    Folding the post and decide steps into the review prompt keeps each
+    worker to a single query; the records are submitted in bulk later.
+    """
+    prompt = f"""You are a code review agent (agent_id: {AGENT_ID}).
+
+Context assembled for the parent of "{scope}":
+
+<context>
+{context_summary}
+</context>
+
+Perform a code review of the files in scope "{scope}":
 
-    scope = sys.argv[1]
+1. Read the relevant source files in the scope.
+2. Analyze them for code quality, architecture, consistency with the
+   decisions in the context, and potential bugs.
+3. Write a short structured review report.
+4. End your answer with one ```json block of the records to save:
+
+```json
+{{
+  "entries": [
+    {{"entry_type": "finding" | "warning" | "need", "summary": "max 200 chars",
+      "detail": "full explanation", "tags": ["domain-tag"]}}
+  ],
+  "decisions": [
+    {{"domain": "architecture", "summary": "...", "context": "...", "rationale": "...",
+      "alternatives": [{{"option": "...", "reason_rejected": "..."}}],
+      "confidence": "high" | "medium" | "low", "affected_files": ["..."]}}
+  ]
+}}
+```
+
+Group minor issues into one finding. Only include decisions for genuinely
+important recommendations; an empty list is fine. Do NOT modify any files."""
+
+    messages = []
+    async for message in query(
+        prompt=prompt,
+        options=ClaudeCodeOptions(allowed_tools=["Read", "Glob", "Grep"], cwd=cwd),
+    ):
+        messages.append(message)
+
+    report = _extract_result(messages)
+    entries, decisions = _parse_records(scope, report)
+    return report, entries, decisions
+
+
+async def submit_records(entries: list, decisions: list, cwd: str) -> str:
+    """Record every worker's entries and decisions with the batch tools."""
+    calls = []
+    for i in range(0, len(entries), BATCH_LIMIT):
+        calls.append(("twining_post_batch", {"entries": entries[i:i + BATCH_LIMIT]}))
+    for i in range(0, len(decisions), BATCH_LIMIT):
+        calls.append(("twining_decide_batch", {"decisions": decisions[i:i + BATCH_LIMIT]}))
+    if not calls:
+        return "(nothing to record)"
+
+    listing = "\n\n".join(
+        f"Call {n}: {tool} with arguments:\n{json.dumps(arguments)}"
+        for n, (tool, arguments) in enumerate(calls, start=1)
+    )
+    prompt = f"""You are a code review agent (agent_id: {AGENT_ID}).
+
+Make exactly these {len(calls)} tool calls, with the arguments exactly as
+given, then report how many items each call recorded or failed.
+
+{listing}"""
+
+    messages = []
+    async for message in query(
+        prompt=prompt,
+        options=ClaudeCodeOptions(
+            allowed_tools=[
+                "mcp__twining__twining_post_batch",
+                "mcp__twining__twining_decide_batch",
+            ],
+            cwd=cwd,
+        ),
+    ):
+        messages.append(message)
+    return _extract_result(messages)
+
+
+async def create_aggregated_handoff(root_scope: str, outcomes: dict, cwd: str) -> str:
+    """One handoff summarizing every scope the fan-out reviewed."""
+    results = []
+    for scope, outcome in outcomes.items():
+        if outcome["error"]:
+            results.append({
+                "description": f"Review of {scope}",
+                "status": "failed",
+                "notes": outcome["error"],
+            })
+        else:
+            results.append({
+                "description": f"Review of {scope}",
+                "status": "completed",
+                "notes": f"{outcome['entries']} entries, {outcome['decisions']} decisions recorded",
+            })
+    failed = sum(1 for outcome in outcomes.values() if outcome["error"])
+    arguments = {
+        "source_agent": AGENT_ID,
+        "scope": root_scope,
+        "summary": f"Code review of {len(outcomes)} scopes under {root_scope} ({failed} failed)",
+        "results": results,
+    }
+    prompt = f"""You are a code review agent (agent_id: {AGENT_ID}).
+
+Call twining_handoff once with exactly these arguments, then report the
+handoff ID:
+
+{json.dumps(arguments)}"""
+
+    messages = []
+    async for message in query(
+        prompt=prompt,
+        options=ClaudeCodeOptions(allowed_tools=["mcp__twining__twining_handoff"], cwd=cwd),
+    ):
+        messages.append(message)
+    return _extract_result(messages)
+
+
+async def run_fan_out(scopes: list, cwd: str, concurrency: int) -> None:
+    """
+    Review many scopes concurrently.
+
+    Workers share one context assembly per parent scope and at most
+    `concurrency` reviews run at a time. Nothing is written to Twining
+    until every review is done; the records then go in through the batch
+    tools and a single handoff closes the run.
+    """
+    print(f"Starting fan-out review of {len(scopes)} scopes (concurrency {concurrency})")
+    print(f"Working directory: {cwd}")
+    print("=" * 60)
+
+    timer = StageTimer()
+    cache = ContextCache(cwd, timer)
+    semaphore = asyncio.Semaphore(concurrency)
+    outcomes = {}
+    all_entries = []
+    all_decisions = []
+
+    async def worker(scope: str) -> None:
+        async with semaphore:
+            try:
+                context_summary = await cache.get(parent_scope(scope))
+                started = time.perf_counter()
+                try:
+                    _, entries, decisions = await review_scope(scope, context_summary, cwd)
+                finally:
+                    timer.add_busy("review", time.perf_counter() - started)
+            except Exception as err:
+                outcomes[scope] = {"error": str(err), "entries": 0, "decisions": 0}
+                print(f"  [{scope}] failed: {err}")
+                return
+            all_entries.extend(entries)
+            all_decisions.extend(decisions)
+            outcomes[scope] = {"error": None, "entries": len(entries), "decisions": len(decisions)}
+            print(f"  [{scope}] {len(entries)} entries, {len(decisions)} decisions")
+
+    print(f"\n[1/3] Assembling context and reviewing {len(scopes)} scopes...")
+    # Assemblies overlap the reviews, so they have worker time but no wall time
+    with timer.stage("review"):
+        await asyncio.gather(*(worker(scope) for scope in scopes))
+
+    print(f"\n[2/3] Recording {len(all_entries)} entries and {len(all_decisions)} decisions...")
+    with timer.stage("submit"):
+        submitted = await submit_records(all_entries, all_decisions, cwd)
+    print(submitted[:2000])
+
+    print("\n[3/3] Creating aggregated handoff...")
+    root_scope = _common_scope(scopes)
+    with timer.stage("handoff"):
+        handoff = await create_aggregated_handoff(root_scope, dict(sorted(outcomes.items())), cwd)
+    print(handoff[:2000])
+
+    timer.report()
+    print("\n" + "=" * 60)
+    print(f"Reviewed {len(scopes)} scopes with {cache.assemblies} context assemblies.")
+
+
+def _common_scope(scopes: list) -> str:
+    """The deepest directory containing every scope."""
+    parents = [parent_scope(scope) for scope in scopes]
+    if any(parent == "project" for parent in parents):
+        return "project"
+    parts = [parent.rstrip("/").split("/") for parent in parents]
+    common = []
+    for segments in zip(*parts):
+        if len(set(segments)) != 1:
+            break
+        common.append(segments[0])
+    return "/".join(common) + "/" if common else "project"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Code review agent using Claude Code SDK + Twining MCP.",
+        epilog="One scope runs the five-step pipeline; several scopes or --split run the fan-out mode.",
+    )
+    parser.add_argument("scopes", nargs="*", help="scope(s) to review, e.g. src/storage/ or project")
+    parser.add_argument("--split", metavar="DIR", help="review each entry directly under DIR in parallel")
+    parser.add_argument("--concurrency", type=int, default=4, help="parallel reviews in fan-out mode (default: 4)")
+    args = parser.parse_args()
 
     # Resolve the working directory. The agent needs to run in a project
     # root that has Twining initialized (a .twining/ directory).
     # Default to the current working directory.
     cwd = str(Path.cwd())
 
-    asyncio.run(run_review(scope, cwd))
+    scopes = list(args.scopes)
+    if args.split:
+        scopes += split_directory(args.split, cwd)
+    if not scopes:
+        parser.print_help()
+        sys.exit(1)
+
+    if len(scopes) == 1 and not args.split:
+        asyncio.run(run_review(scopes[0], cwd))
+    else:
+        asyncio.run(run_fan_out(scopes, cwd, max(1, args.concurrency)))
 
 
 if __name__ == "__main__":
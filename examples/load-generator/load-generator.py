@@ -0,0 +1,663 @@
+#!/usr/bin/env python3
+"""
+Twining MCP Load Generator
+
+Simulates many agents hammering one Twining project, with no LLM in the
+loop, and reports how the server holds up:
+
+  - throughput and p50/p95/p99 latency per tool
+  - lock acquisitions, retries and wait time per tool (from traces.jsonl)
+  - resident memory of every server process
+  - decision conflicts detected and tool errors
+
+Each simulated agent replays a workload profile: a weighted mix of
+operations with a think time between them. Agents either spawn their own
+stdio `twining-mcp` (like separate Claude Code sessions do) or share one
+server process. The project is a synthetic .twining/ seeded to the chosen
+size before the measured run starts.
+
+Results are written as JSON with a stable schema, so runs can be diffed
+with --compare.
+
+Usage:
+    python load-generator.py [options]
+
+Examples:
+    # 8 agents, each with its own server, 60s of post-heavy load
+    python load-generator.py --agents 8 --profile post-heavy --duration 60
+
+    # A mixed workload against one shared server and a 10k-entry project
+    python load-generator.py --shared --entries 10000 --decisions 1000 \\
+        --mix post-heavy=4,assemble-heavy=4,decide-with-conflicts=2,dashboard-polling=1
+
+    # Same workload through the state daemon, compared with the last run
+    python load-generator.py --daemon --mix post-heavy=8 \\
+        --output daemon.json --compare standalone.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import shlex
+import sys
+import tempfile
+import time
+import urllib.request
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+try:
+    import psutil
+except ImportError:  # RSS sampling is skipped without it
+    psutil = None
+
+
+RESULTS_VERSION = 1
+
+# Dashboard API calls are recorded under this prefix instead of a tool name.
+HTTP_PREFIX = "GET "
+
+
+# ---------------------------------------------------------------------------
+# Workload profiles
+# ---------------------------------------------------------------------------
+# Each profile is a weighted mix of operations plus a think time between
+# them. Operation names map to the builders in OPERATIONS below. Pass
+# --profiles-file to add profiles or override these.
+PROFILES = {
+    "post-heavy": {
+        "think_ms": 20,
+        "ops": {"post": 70, "post_batch": 5, "read": 10, "recent": 15},
+    },
+    "assemble-heavy": {
+        "think_ms": 50,
+        "ops": {"assemble": 70, "query": 15, "why": 15},
+    },
+    "decide-with-conflicts": {
+        "think_ms": 50,
+        "ops": {"decide": 60, "decide_batch": 5, "search_decisions": 15, "assemble": 20},
+    },
+    "dashboard-polling": {
+        "think_ms": 500,
+        "ops": {
+            "dash_status": 30,
+            "dash_blackboard": 30,
+            "dash_decisions": 20,
+            "dash_graph": 10,
+            "dash_search": 10,
+        },
+    },
+}
+
+
+# ---------------------------------------------------------------------------
+# Synthetic project content
+# ---------------------------------------------------------------------------
+MODULES = [
+    "auth", "storage", "engine", "api", "billing", "search", "graph",
+    "dashboard", "jobs", "config", "cache", "events", "users", "admin",
+    "reports", "notifications", "payments", "sessions", "audit", "metrics",
+]
+
+WORDS = [
+    "retry", "timeout", "cache", "token", "schema", "migration", "index",
+    "lock", "queue", "batch", "stream", "session", "quota", "backoff",
+    "snapshot", "replica", "shard", "checksum", "latency", "throughput",
+    "validation", "pagination", "webhook", "rollback", "deadline", "cursor",
+]
+
+POST_TYPES = ["finding", "warning", "need", "status", "question", "artifact"]
+
+ENTITY_TYPES = ["module", "class", "function", "file", "concept"]
+
+RELATION_TYPES = ["depends_on", "calls", "imports", "related_to"]
+
+# Decide-with-conflicts agents draw from few scopes and many summaries, so
+# concurrent agents keep making different decisions about the same code.
+CONFLICT_SCOPES = ["src/auth/", "src/auth/tokens.ts", "src/storage/", "src/storage/locks.ts"]
+
+
+def random_scope(rng: random.Random) -> str:
+    module = rng.choice(MODULES)
+    if rng.random() < 0.3:
+        return f"src/{module}/"
+    return f"src/{module}/{rng.choice(WORDS)}.ts"
+
+
+def random_phrase(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def post_args(rng: random.Random, agent_id: str) -> dict:
+    return {
+        "entry_type": rng.choice(POST_TYPES),
+        "summary": f"{random_phrase(rng, 4)} in {rng.choice(MODULES)}"[:200],
+        "detail": random_phrase(rng, 30),
+        "tags": rng.sample(WORDS, 2),
+        "scope": random_scope(rng),
+        "agent_id": agent_id,
+    }
+
+
+def decision_args(rng: random.Random, agent_id: str, scope: str | None = None) -> dict:
+    scope = scope or random_scope(rng)
+    return {
+        "domain": rng.choice(["architecture", "implementation", "testing"]),
+        "scope": scope,
+        "summary": f"Use {random_phrase(rng, 2)} for {random_phrase(rng, 2)}",
+        "context": random_phrase(rng, 20),
+        "rationale": random_phrase(rng, 20),
+        "alternatives": [
+            {"option": random_phrase(rng, 3), "reason_rejected": random_phrase(rng, 6)}
+        ],
+        "confidence": rng.choice(["high", "medium", "low"]),
+        "affected_files": [scope] if scope.endswith(".ts") else [],
+        "agent_id": agent_id,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Operations
+# ---------------------------------------------------------------------------
+# An MCP operation returns (tool_name, arguments); a dashboard operation
+# returns the API path to GET.
+OPERATIONS = {
+    "post": lambda rng, agent: ("twining_post", post_args(rng, agent)),
+    "post_batch": lambda rng, agent: (
+        "twining_post_batch",
+        {"entries": [post_args(rng, agent) for _ in range(20)]},
+    ),
+    "read": lambda rng, agent: (
+        "twining_read",
+        {"scope": random_scope(rng), "limit": 50},
+    ),
+    "recent": lambda rng, agent: ("twining_recent", {"n": 20}),
+    "assemble": lambda rng, agent: (
+        "twining_assemble",
+        {"task": f"Work on {random_phrase(rng, 3)}", "scope": random_scope(rng), "agent_id": agent},
+    ),
+    "query": lambda rng, agent: ("twining_query", {"query": random_phrase(rng, 3), "limit": 10}),
+    "why": lambda rng, agent: ("twining_why", {"scope": random_scope(rng)}),
+    "decide": lambda rng, agent: (
+        "twining_decide",
+        decision_args(rng, agent, rng.choice(CONFLICT_SCOPES)),
+    ),
+    "decide_batch": lambda rng, agent: (
+        "twining_decide_batch",
+        {"decisions": [decision_args(rng, agent, rng.choice(CONFLICT_SCOPES)) for _ in range(5)]},
+    ),
+    "search_decisions": lambda rng, agent: (
+        "twining_search_decisions",
+        {"query": random_phrase(rng, 2), "limit": 10},
+    ),
+    "dash_status": lambda rng, agent: "/api/status",
+    "dash_blackboard": lambda rng, agent: "/api/blackboard?limit=50",
+    "dash_decisions": lambda rng, agent: "/api/decisions?limit=50",
+    "dash_graph": lambda rng, agent: "/api/graph?limit=100",
+    "dash_search": lambda rng, agent: f"/api/search?q={rng.choice(WORDS)}",
+}
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+@dataclass
+class Recorder:
+    """Latencies and outcomes of every measured call, keyed by tool."""
+
+    measuring: bool = False
+    latencies: dict = field(default_factory=dict)
+    errors: dict = field(default_factory=dict)
+    conflicts: int = 0
+
+    def add(self, tool: str, seconds: float, ok: bool, conflicts: int = 0) -> None:
+        if not self.measuring:
+            return
+        self.latencies.setdefault(tool, []).append(seconds * 1000)
+        if not ok:
+            self.errors[tool] = self.errors.get(tool, 0) + 1
+        self.conflicts += conflicts
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    tools = {}
+    for tool, values in sorted(recorder.latencies.items()):
+        values = sorted(values)
+        tools[tool] = {
+            "calls": len(values),
+            "errors": recorder.errors.get(tool, 0),
+            "throughput_per_s": round(len(values) / elapsed, 2),
+            "mean_ms": round(sum(values) / len(values), 2),
+            "p50_ms": round(percentile(values, 50), 2),
+            "p95_ms": round(percentile(values, 95), 2),
+            "p99_ms": round(percentile(values, 99), 2),
+            "max_ms": round(values[-1], 2),
+        }
+    total = sum(t["calls"] for t in tools.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "calls": total,
+        "errors": sum(t["errors"] for t in tools.values()),
+        "throughput_per_s": round(total / elapsed, 2) if elapsed > 0 else 0.0,
+        "decision_conflicts": recorder.conflicts,
+        "tools": tools,
+    }
+
+
+def lock_stats(twining_dir: Path, since: str) -> dict:
+    """
+    Lock acquisitions, retries and wait time per tool, from the "lock"
+    spans of traces written since the measured run started.
+    """
+    stats = {}
+    traces = twining_dir / "traces.jsonl"
+    if not traces.exists():
+        return stats
+    with traces.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                trace = json.loads(line)
+            except ValueError:
+                continue
+            if trace.get("timestamp", "") < since:
+                continue
+            for span in trace.get("spans", []):
+                if span.get("name") != "lock":
+                    continue
+                attrs = span.get("attributes", {})
+                tool = stats.setdefault(
+                    trace["name"], {"acquisitions": 0, "retries": 0, "wait_ms": 0.0}
+                )
+                tool["acquisitions"] += 1
+                tool["retries"] += int(attrs.get("retries", 0))
+                tool["wait_ms"] += float(attrs.get("wait_ms", 0))
+    for tool in stats.values():
+        tool["wait_ms"] = round(tool["wait_ms"], 2)
+    return stats
+
+
+class RssSampler:
+    """Samples the resident memory of every process this harness started."""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.peak_total = 0
+        self.peak_by_pid = {}
+        self.last_total = 0
+        self._task = None
+
+    def start(self) -> None:
+        if psutil is not None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> dict | None:
+        if psutil is None:
+            return None
+        if self._task:
+            self._task.cancel()
+        mib = 1024 * 1024
+        return {
+            "processes": len(self.peak_by_pid),
+            "peak_total_mib": round(self.peak_total / mib, 1),
+            "final_total_mib": round(self.last_total / mib, 1),
+            "peak_per_process_mib": round(max(self.peak_by_pid.values(), default=0) / mib, 1),
+        }
+
+    async def _run(self) -> None:
+        me = psutil.Process()
+        while True:
+            total = 0
+            for child in me.children(recursive=True):
+                try:
+                    rss = child.memory_info().rss
+                except psutil.Error:
+                    continue
+                total += rss
+                self.peak_by_pid[child.pid] = max(self.peak_by_pid.get(child.pid, 0), rss)
+            self.last_total = total
+            self.peak_total = max(self.peak_total, total)
+            await asyncio.sleep(self.interval)
+
+
+# ---------------------------------------------------------------------------
+# Servers and agents
+# ---------------------------------------------------------------------------
+def server_params(args, project: Path, dashboard: bool) -> StdioServerParameters:
+    command, *command_args = shlex.split(args.server_command)
+    env = {**os.environ, "TWINING_DASHBOARD_NO_OPEN": "1"}
+    if dashboard:
+        env["TWINING_DASHBOARD_PORT"] = str(args.dashboard_port)
+    else:
+        env["TWINING_DASHBOARD"] = "0"
+    return StdioServerParameters(
+        command=command,
+        args=[*command_args, "--project", str(project)],
+        env=env,
+    )
+
+
+async def open_session(stack: AsyncExitStack, params: StdioServerParameters) -> ClientSession:
+    read, write = await stack.enter_async_context(stdio_client(params))
+    session = await stack.enter_async_context(ClientSession(read, write))
+    await session.initialize()
+    return session
+
+
+async def call_tool(session: ClientSession, recorder: Recorder, tool: str, arguments: dict):
+    """Call a tool, recording its latency and whether it failed."""
+    started = time.perf_counter()
+    ok = True
+    conflicts = 0
+    payload = None
+    try:
+        result = await session.call_tool(tool, arguments)
+        ok = not result.isError
+        text = result.content[0].text if result.content else ""
+        try:
+            payload = json.loads(text)
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict):
+            if payload.get("error") is True:
+                ok = False
+            conflicts = len(payload.get("conflicts", []))
+            for item in payload.get("results", []):
+                if isinstance(item, dict):
+                    conflicts += len(item.get("conflicts", []))
+    except Exception:
+        ok = False
+    recorder.add(tool, time.perf_counter() - started, ok, conflicts)
+    return payload
+
+
+async def fetch(recorder: Recorder, base_url: str, api_path: str) -> None:
+    """GET a dashboard API path, recording it like a tool call."""
+    started = time.perf_counter()
+    ok = True
+
+    def get() -> None:
+        with urllib.request.urlopen(base_url + api_path, timeout=30) as response:
+            response.read()
+
+    try:
+        await asyncio.to_thread(get)
+    except Exception:
+        ok = False
+    name = HTTP_PREFIX + api_path.split("?")[0]
+    recorder.add(name, time.perf_counter() - started, ok)
+
+
+async def run_agent(
+    agent_id: str,
+    profile: dict,
+    session: ClientSession | None,
+    recorder: Recorder,
+    base_url: str,
+    deadline: float,
+    seed: int,
+) -> None:
+    """Replay one profile until the deadline."""
+    rng = random.Random(seed)
+    names = list(profile["ops"])
+    weights = [profile["ops"][name] for name in names]
+    think = profile.get("think_ms", 0) / 1000
+    while time.monotonic() < deadline:
+        op = OPERATIONS[rng.choices(names, weights)[0]](rng, agent_id)
+        if isinstance(op, str):
+            await fetch(recorder, base_url, op)
+        elif session is not None:
+            await call_tool(session, recorder, *op)
+        if think:
+            # Jitter keeps agents from moving in lockstep
+            await asyncio.sleep(think * rng.uniform(0.5, 1.5))
+
+
+async def seed_project(session: ClientSession, args) -> None:
+    """Fill the project to the requested size through the batch tools."""
+    rng = random.Random(args.seed)
+    scratch = Recorder()
+    plan = [
+        ("entries", args.entries, "twining_post_batch", "entries", lambda: post_args(rng, "seeder")),
+        ("decisions", args.decisions, "twining_decide_batch", "decisions", lambda: decision_args(rng, "seeder")),
+    ]
+    for label, total, tool, key, make in plan:
+        done = 0
+        while done < total:
+            count = min(100, total - done)
+            await call_tool(session, scratch, tool, {key: [make() for _ in range(count)]})
+            done += count
+            print(f"  seeded {done}/{total} {label}", end="\r", file=sys.stderr)
+        if total:
+            print(file=sys.stderr)
+
+    names = [f"{rng.choice(MODULES)}.{rng.choice(WORDS)}{i}" for i in range(args.entities)]
+    for i, name in enumerate(names):
+        await call_tool(session, scratch, "twining_add_entity", {"name": name, "type": rng.choice(ENTITY_TYPES)})
+        if i > 0:
+            await call_tool(
+                session,
+                scratch,
+                "twining_add_relation",
+                {"source": name, "target": rng.choice(names[:i]), "type": rng.choice(RELATION_TYPES)},
+            )
+        if (i + 1) % 100 == 0 or i + 1 == len(names):
+            print(f"  seeded {i + 1}/{len(names)} entities", end="\r", file=sys.stderr)
+    if names:
+        print(file=sys.stderr)
+
+
+def configure_project(twining_dir: Path, args) -> None:
+    """Keep every lock span in traces.jsonl, and switch the daemon on or off."""
+    config_path = twining_dir / "config.yml"
+    config = config_path.read_text(encoding="utf-8")
+    if not args.no_trace:
+        config = re.sub(r"(\n\s+sample_rate:) [\d.]+", r"\1 1", config)
+        config = re.sub(r"(\n\s+min_duration_ms:) \d+", r"\1 0", config)
+    enabled = "true" if args.daemon else "false"
+    config = re.sub(r"(\ndaemon:\n\s+enabled:) \w+", rf"\1 {enabled}", config)
+    config_path.write_text(config, encoding="utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Orchestration
+# ---------------------------------------------------------------------------
+def parse_mix(args) -> list:
+    """Expand --mix / --agents + --profile into one profile name per agent."""
+    if args.mix:
+        agents = []
+        for part in args.mix.split(","):
+            name, _, count = part.partition("=")
+            agents += [name.strip()] * int(count or 1)
+    else:
+        agents = [args.profile] * args.agents
+    unknown = sorted({name for name in agents if name not in PROFILES})
+    if unknown:
+        sys.exit(f"Unknown profile(s): {', '.join(unknown)}. Known: {', '.join(PROFILES)}")
+    return agents
+
+
+async def run(args) -> dict:
+    project = Path(args.project or tempfile.mkdtemp(prefix="twining-load-")).resolve()
+    project.mkdir(parents=True, exist_ok=True)
+    twining_dir = project / ".twining"
+    agents = parse_mix(args)
+    base_url = f"http://127.0.0.1:{args.dashboard_port}"
+    print(f"Project: {project}", file=sys.stderr)
+
+    # Seed once with a private server, then set tracing and daemon mode
+    # before the measured servers start.
+    async with AsyncExitStack() as stack:
+        session = await open_session(stack, server_params(args, project, dashboard=False))
+        if args.entries or args.decisions or args.entities:
+            print("Seeding synthetic project...", file=sys.stderr)
+            await seed_project(session, args)
+    configure_project(twining_dir, args)
+
+    recorder = Recorder()
+    sampler = RssSampler()
+    sampler.start()
+    async with AsyncExitStack() as stack:
+        started = time.perf_counter()
+        mcp_agents = [i for i, name in enumerate(agents) if not name.startswith("dashboard")]
+        sessions = {}
+        if args.shared:
+            shared = await open_session(stack, server_params(args, project, dashboard=True))
+            sessions = {i: shared for i in mcp_agents}
+        else:
+            # The first server hosts the dashboard; pure dashboard workloads
+            # get a server of their own to poll.
+            host_ids = mcp_agents or [None]
+            opened = await asyncio.gather(
+                *(
+                    open_session(stack, server_params(args, project, dashboard=(n == 0)))
+                    for n, _ in enumerate(host_ids)
+                )
+            )
+            sessions = {i: s for i, s in zip(host_ids, opened) if i is not None}
+        connect_s = time.perf_counter() - started
+        print(f"Connected {len(agents)} agents in {connect_s:.2f}s", file=sys.stderr)
+
+        if args.warmup > 0:
+            print(f"Warming up for {args.warmup}s...", file=sys.stderr)
+            await asyncio.gather(
+                *(
+                    run_agent(f"load-{i}", PROFILES[name], sessions.get(i), recorder, base_url,
+                              time.monotonic() + args.warmup, args.seed + i)
+                    for i, name in enumerate(agents)
+                )
+            )
+
+        print(f"Running {len(agents)} agents for {args.duration}s...", file=sys.stderr)
+        since = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        recorder.measuring = True
+        measured_from = time.perf_counter()
+        deadline = time.monotonic() + args.duration
+        await asyncio.gather(
+            *(
+                run_agent(f"load-{i}", PROFILES[name], sessions.get(i), recorder, base_url,
+                          deadline, args.seed + 1000 + i)
+                for i, name in enumerate(agents)
+            )
+        )
+        elapsed = time.perf_counter() - measured_from
+        recorder.measuring = False
+        rss = await sampler.stop()
+
+    mix = {}
+    for name in agents:
+        mix[name] = mix.get(name, 0) + 1
+    return {
+        "version": RESULTS_VERSION,
+        "started_at": since,
+        "config": {
+            "agents": len(agents),
+            "mix": mix,
+            "mode": "daemon" if args.daemon else ("shared" if args.shared else "per-agent"),
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "entries": args.entries,
+            "decisions": args.decisions,
+            "entities": args.entities,
+            "seed": args.seed,
+            "server_command": args.server_command,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "connect_s": round(connect_s, 3),
+        "summary": summarize(recorder, elapsed),
+        "locks": lock_stats(twining_dir, since),
+        "rss": rss,
+    }
+
+
+def print_report(results: dict, baseline: dict | None) -> None:
+    summary = results["summary"]
+    print(
+        f"\n{summary['calls']} calls in {summary['elapsed_s']}s "
+        f"({summary['throughput_per_s']}/s), {summary['errors']} errors, "
+        f"{summary['decision_conflicts']} decision conflicts"
+    )
+    base_tools = (baseline or {}).get("summary", {}).get("tools", {})
+    header = f"{'tool':34} {'calls':>7} {'err':>5} {'ops/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(header + ("  p95 vs baseline" if baseline else ""))
+    for tool, t in summary["tools"].items():
+        line = (
+            f"{tool:34} {t['calls']:>7} {t['errors']:>5} {t['throughput_per_s']:>8} "
+            f"{t['p50_ms']:>8} {t['p95_ms']:>8} {t['p99_ms']:>8}"
+        )
+        before = base_tools.get(tool)
+        if before and before["p95_ms"] > 0:
+            line += f"  {(t['p95_ms'] / before['p95_ms'] - 1) * 100:+.1f}%"
+        print(line)
+
+    if results["locks"]:
+        print(f"\n{'locks':34} {'acquired':>9} {'retries':>8} {'wait ms':>10}")
+        for tool, s in sorted(results["locks"].items()):
+            print(f"{tool:34} {s['acquisitions']:>9} {s['retries']:>8} {s['wait_ms']:>10}")
+    rss = results["rss"]
+    if rss:
+        print(
+            f"\nRSS: peak {rss['peak_total_mib']} MiB across {rss['processes']} processes "
+            f"(largest {rss['peak_per_process_mib']} MiB)"
+        )
+    else:
+        print("\nRSS: install psutil to sample server memory")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Concurrent multi-agent load generator for twining-mcp (no LLM required).",
+    )
+    parser.add_argument("--agents", type=int, default=4, help="agents running --profile (default: 4)")
+    parser.add_argument("--profile", default="post-heavy", help="workload profile for --agents")
+    parser.add_argument("--mix", help="per-profile agent counts, e.g. post-heavy=4,dashboard-polling=1")
+    parser.add_argument("--profiles-file", help="JSON file of extra or overriding profiles")
+    parser.add_argument("--shared", action="store_true", help="all agents share one server process")
+    parser.add_argument("--daemon", action="store_true", help="enable the state daemon in the project config")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds (default: 30)")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds first (default: 5)")
+    parser.add_argument("--project", help="project directory (default: a fresh temp dir)")
+    parser.add_argument("--entries", type=int, default=1000, help="blackboard entries to seed")
+    parser.add_argument("--decisions", type=int, default=200, help="decisions to seed")
+    parser.add_argument("--entities", type=int, default=200, help="graph entities to seed")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+    parser.add_argument("--server-command", default="twining-mcp", help='server command (e.g. "node dist/index.js")')
+    parser.add_argument("--dashboard-port", type=int, default=24399, help="dashboard port to poll")
+    parser.add_argument("--no-trace", action="store_true", help="leave tracing config alone (no lock stats)")
+    parser.add_argument("--output", help="write JSON results here")
+    parser.add_argument("--compare", help="earlier JSON results to compare p95 against")
+    args = parser.parse_args()
+
+    if args.profiles_file:
+        PROFILES.update(json.loads(Path(args.profiles_file).read_text(encoding="utf-8")))
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8")) if args.compare else None
+
+    results = asyncio.run(run(args))
+    print_report(results, baseline)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env node
+/**
+ * Writes .br and .gz siblings, at maximum quality, for the dashboard's
+ * static assets in dist/dashboard/public, so the dashboard server never
+ * compresses them at runtime.
+ *
+ * Run automatically via the "postbuild" npm script, after tsc and the copy
+ * of src/dashboard/public. index.html is skipped: the server rewrites it
+ * with vendor hashes, so a precompressed copy would never match.
+ */
+import { readdirSync, readFileSync, statSync, writeFileSync } from "node:fs";
+import { resolve, dirname, extname, join, basename } from "node:path";
+import { fileURLToPath } from "node:url";
+
+const __dirname = dirname(fileURLToPath(import.meta.url));
+const publicDir = resolve(__dirname, "../dist/dashboard/public");
+
+const {
+  compress,
+  COMPRESSIBLE_EXTENSIONS,
+  MIN_COMPRESS_BYTES,
+  PRECOMPRESSED_SUFFIX,
+} = await import("../dist/dashboard/compression.js");
+
+function* walk(dir) {
+  for (const entry of readdirSync(dir, { withFileTypes: true })) {
+    const full = join(dir, entry.name);
+    if (entry.isDirectory()) yield* walk(full);
+    else yield full;
+  }
+}
+
+let files = 0;
+let before = 0;
+let after = 0;
+for (const file of walk(publicDir)) {
+  if (basename(file) === "index.html") continue;
+  if (!COMPRESSIBLE_EXTENSIONS.has(extname(file))) continue;
+  if (statSync(file).size < MIN_COMPRESS_BYTES) continue;
+
+  const body = readFileSync(file);
+  for (const encoding of ["br", "gzip"]) {
+    const encoded = await compress(body, encoding, "max");
+    writeFileSync(file + PRECOMPRESSED_SUFFIX[encoding], encoded);
+    if (encoding === "br") after += encoded.length;
+  }
+  files++;
+  before += body.length;
+}
+
+console.log(
+  `[precompress-dashboard] ${files} assets, ${Math.round(before / 1024)} KiB -> ${Math.round(after / 1024)} KiB (br).`,
+);
@@ -34,9 +34,11 @@ export class AnalyticsEngine {
     // Blind decisions prevented
     const totalDecisions = decisionIndex.length;
     let assembledBefore = 0;
-    for (const dec of decisionIndex) {
-      const full = await this.decisionStore.get(dec.id);
-      if (full?.assembled_before) {
+    const fullDecisions = await this.decisionStore.getMany(
+      decisionIndex.map((dec) => dec.id),
+    );
+    for (const full of fullDecisions) {
+      if (full.assembled_before) {
         assembledBefore++;
       }
     }
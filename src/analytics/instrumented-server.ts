@@ -1,9 +1,10 @@
 /**
  * Instrumented MCP server — patches registerTool to wrap callbacks with timing.
  * Zero changes to any tool file — instrumentation is invisible to them.
+ * Sampled calls also run inside a trace that spans below them nest into.
  */
 import type { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
-import type { MetricsCollector } from "./metrics-collector.js";
+import type { MetricsCollector, ToolCallAnnotations } from "./metrics-collector.js";
 
 /**
  * Patch the server's registerTool method to wrap all tool callbacks with
@@ -25,9 +26,14 @@ export function createInstrumentedServer(
       const start = Date.now();
       let success = true;
       let errorCode: string | undefined;
+      const call: ToolCallAnnotations = {};
+      const trace = collector.startTrace(name);
+      const run = () => callback(...cbArgs);
 
       try {
-        const result = await callback(...cbArgs);
+        const result = await collector.runInCall(call, () =>
+          trace ? trace.run(run) : run(),
+        );
 
         // Detect soft errors by inspecting toolError() response format
         if (result && typeof result === "object" && "content" in (result as Record<string, unknown>)) {
@@ -50,6 +56,9 @@ export function createInstrumentedServer(
 
         const durationMs = Date.now() - start;
         const agentId = extractAgentId(cbArgs);
+        const traceId = trace
+          ? collector.keepTrace(trace.finish(success ? undefined : errorCode))
+          : undefined;
 
         // Fire-and-forget metric recording
         collector.record({
@@ -59,20 +68,28 @@ export function createInstrumentedServer(
           success,
           error_code: errorCode,
           agent_id: agentId,
+          stages: call.stages,
+          trace_id: traceId,
         }).catch(() => {/* never fail a tool call */});
 
         return result;
       } catch (err) {
         const durationMs = Date.now() - start;
         const agentId = extractAgentId(cbArgs);
+        const errorName = err instanceof Error ? err.constructor.name : "UNKNOWN";
+        const traceId = trace
+          ? collector.keepTrace(trace.finish(errorName))
+          : undefined;
 
         collector.record({
           tool_name: name,
           timestamp: new Date().toISOString(),
           duration_ms: durationMs,
           success: false,
-          error_code: err instanceof Error ? err.constructor.name : "UNKNOWN",
+          error_code: errorName,
           agent_id: agentId,
+          stages: call.stages,
+          trace_id: traceId,
         }).catch(() => {/* never fail a tool call */});
 
         throw err;
@@ -0,0 +1,88 @@
+/**
+ * Mergeable latency histogram for tool call durations.
+ * HDR-style log-linear buckets: values below 256ms are counted exactly,
+ * larger ones in buckets 1/128 of their magnitude wide (under 0.8% error).
+ * Sketches merge by adding counts, so per-minute sketches combine into
+ * quantiles for any time range without keeping raw durations.
+ */
+
+/** Values below this are their own bucket. */
+const EXACT_LIMIT = 256;
+
+/** Buckets per power of two above EXACT_LIMIT. */
+const SUB_BUCKETS = 128;
+
+export class LatencySketch {
+  private readonly counts = new Map<number, number>();
+  private total = 0;
+
+  /** Rebuild a sketch from its toJSON() form. */
+  static fromJSON(json: Record<string, number>): LatencySketch {
+    const sketch = new LatencySketch();
+    for (const [key, count] of Object.entries(json)) {
+      sketch.addBucket(Number(key), count);
+    }
+    return sketch;
+  }
+
+  /** Number of recorded values. */
+  get count(): number {
+    return this.total;
+  }
+
+  /** Record one duration in milliseconds. */
+  add(valueMs: number): void {
+    this.addBucket(bucketOf(valueMs), 1);
+  }
+
+  /** Add another sketch's counts into this one. */
+  merge(other: LatencySketch): void {
+    for (const [bucket, count] of other.counts) this.addBucket(bucket, count);
+  }
+
+  /**
+   * Value at quantile q (0–1), using the same nearest-rank definition as
+   * sorting every duration: the ceil(q·n)-th smallest value.
+   */
+  quantile(q: number): number {
+    if (this.total === 0) return 0;
+    const rank = Math.min(Math.max(Math.ceil(this.total * q), 1), this.total);
+    const buckets = [...this.counts.keys()].sort((a, b) => a - b);
+    let seen = 0;
+    for (const bucket of buckets) {
+      seen += this.counts.get(bucket)!;
+      if (seen >= rank) return valueOf(bucket);
+    }
+    return valueOf(buckets[buckets.length - 1]!);
+  }
+
+  /** Sparse bucket → count form for persistence. */
+  toJSON(): Record<string, number> {
+    return Object.fromEntries(this.counts);
+  }
+
+  private addBucket(bucket: number, count: number): void {
+    this.counts.set(bucket, (this.counts.get(bucket) ?? 0) + count);
+    this.total += count;
+  }
+}
+
+/** Bucket index of a duration. */
+function bucketOf(valueMs: number): number {
+  const v = Math.max(0, Math.round(valueMs));
+  if (v < EXACT_LIMIT) return v;
+  // Shift so the leading bits land in [SUB_BUCKETS, 2·SUB_BUCKETS)
+  const shift = Math.floor(Math.log2(v)) - 7;
+  const mantissa = Math.floor(v / 2 ** shift);
+  return EXACT_LIMIT + (shift - 1) * SUB_BUCKETS + (mantissa - SUB_BUCKETS);
+}
+
+/** Representative value of a bucket: exact below EXACT_LIMIT, else its midpoint. */
+function valueOf(bucket: number): number {
+  if (bucket < EXACT_LIMIT) return bucket;
+  const offset = bucket - EXACT_LIMIT;
+  const shift = Math.floor(offset / SUB_BUCKETS) + 1;
+  const mantissa = SUB_BUCKETS + (offset % SUB_BUCKETS);
+  const width = 2 ** shift;
+  return Math.round(mantissa * width + (width - 1) / 2);
+}
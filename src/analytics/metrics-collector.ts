@@ -1,17 +1,93 @@
 /**
  * Metrics collector — appends tool call metrics to .twining/metrics.jsonl.
  * Fire-and-forget: never fails a tool call, silently logs on error.
+ * Also keeps in-process counters (e.g. assemble cache hits/misses) that the
+ * dashboard reads from the same process, and attaches per-stage timings
+ * reported during a tool call to that call's metric. Every so many records
+ * it checkpoints the metrics rollups and rotates the raw log in the
+ * background.
+ *
+ * A sampled share of tool calls is traced; traces of calls at least
+ * min_duration_ms long are kept in traces.jsonl and linked from the
+ * call's metric by trace_id.
+ *
+ * Startup stages are marked in milliseconds since process start. Once the
+ * first tool call has responded and background warm-up has settled, they
+ * are written as one STARTUP_METRIC entry whose duration is the time to
+ * that first response. Rollups skip it, so it never counts as a tool call.
  */
+import { AsyncLocalStorage } from "node:async_hooks";
 import path from "node:path";
-import type { MetricEntry } from "../utils/types.js";
+import { performance } from "node:perf_hooks";
+import { STARTUP_METRIC, type MetricEntry } from "../utils/types.js";
 import { appendJSONL } from "../storage/file-store.js";
+import { Trace, type TraceRecord } from "../utils/tracing.js";
+import { MetricsRollup, type RotationOptions } from "./metrics-rollup.js";
+import { TraceLog } from "./trace-log.js";
 
-export class MetricsCollector {
+/** Records between rollup checkpoint / rotation checks. */
+const MAINTAIN_EVERY = 200;
+
+/** Which tool calls to trace and which traces to keep. */
+export interface TracingOptions {
+  /** Share of tool calls traced, 0–1 (0 disables tracing) */
+  sample_rate: number;
+  /** Keep only traces of calls at least this long */
+  min_duration_ms: number;
+}
+
+const DEFAULT_TRACING: TracingOptions = { sample_rate: 0, min_duration_ms: 0 };
+
+/** Annotations gathered while a tool call runs. */
+export interface ToolCallAnnotations {
+  stages?: Record<string, number>;
+}
+
+export class MetricsCollector implements MetricsSink {
   private readonly metricsPath: string;
   private telemetryClient: TelemetryClientLike | null = null;
+  private readonly counters = new Map<string, number>();
+  private readonly currentCall = new AsyncLocalStorage<ToolCallAnnotations>();
+  private readonly rollup: MetricsRollup;
+  private readonly traceLog: TraceLog;
+  private tracing: TracingOptions = { ...DEFAULT_TRACING };
+  private recordsSinceMaintain = 0;
+  private maintaining: Promise<void> | null = null;
+  private readonly startupMarks: Record<string, number> = {};
+  private startupSettled = false;
+  private startupReported = false;
 
-  constructor(twiningDir: string) {
+  constructor(twiningDir: string, rotation?: RotationOptions) {
     this.metricsPath = path.join(twiningDir, "metrics.jsonl");
+    this.rollup = new MetricsRollup(twiningDir, rotation);
+    this.traceLog = new TraceLog(twiningDir);
+  }
+
+  /** Set the trace sampling rate and slow-call threshold. */
+  setTracing(options?: Partial<TracingOptions>): void {
+    this.tracing = {
+      sample_rate: options?.sample_rate ?? DEFAULT_TRACING.sample_rate,
+      min_duration_ms: options?.min_duration_ms ?? DEFAULT_TRACING.min_duration_ms,
+    };
+  }
+
+  /** Start a trace for a tool call if it is sampled; null otherwise. */
+  startTrace(toolName: string): Trace | null {
+    const rate = this.tracing.sample_rate;
+    if (rate <= 0 || (rate < 1 && Math.random() >= rate)) return null;
+    return new Trace(toolName);
+  }
+
+  /**
+   * Keep a finished trace if the call was slow enough. Returns its
+   * trace_id when kept. Fire-and-forget like record().
+   */
+  keepTrace(trace: TraceRecord): string | undefined {
+    if (trace.duration_ms < this.tracing.min_duration_ms) return undefined;
+    this.traceLog.append(trace).catch((err) => {
+      console.error("[twining] Trace write failed (non-fatal):", (err as Error).message);
+    });
+    return trace.trace_id;
   }
 
   /** Set an optional telemetry client to forward sanitized events */
@@ -19,10 +95,59 @@ export class MetricsCollector {
     this.telemetryClient = client;
   }
 
+  /** Add to a named in-process counter. */
+  increment(name: string, by = 1): void {
+    this.counters.set(name, (this.counters.get(name) ?? 0) + by);
+  }
+
+  /** Snapshot of all counters since process start. */
+  getCounters(): Record<string, number> {
+    return Object.fromEntries(this.counters);
+  }
+
+  /** Run a tool call so stage timings reported inside it land in `call`. */
+  runInCall<T>(call: ToolCallAnnotations, fn: () => T): T {
+    return this.currentCall.run(call, fn);
+  }
+
+  /** Attach stage timings to the tool call in progress; no-op outside one. */
+  recordStages(stages: Record<string, number>): void {
+    const call = this.currentCall.getStore();
+    if (call) call.stages = { ...call.stages, ...stages };
+  }
+
+  /**
+   * Note that a startup stage finished, now or at an earlier
+   * performance.now() reading. The first mark of a stage wins.
+   */
+  markStartup(stage: string, at = performance.now()): void {
+    if (stage in this.startupMarks) return;
+    this.startupMarks[stage] = Math.round(at);
+  }
+
+  /** Startup stages marked so far, in ms since process start. */
+  getStartupMarks(): Record<string, number> {
+    return { ...this.startupMarks };
+  }
+
+  /** Background warm-up is over; report startup once a tool has responded. */
+  settleStartup(): void {
+    this.startupSettled = true;
+    this.reportStartup();
+  }
+
   /** Record a tool call metric. Fire-and-forget — never throws. */
   async record(entry: MetricEntry): Promise<void> {
+    if (!("first_tool_response" in this.startupMarks)) {
+      this.markStartup("first_tool_response");
+      this.reportStartup();
+    }
     try {
       await appendJSONL(this.metricsPath, entry);
+      if (++this.recordsSinceMaintain >= MAINTAIN_EVERY) {
+        this.recordsSinceMaintain = 0;
+        void this.maintain();
+      }
     } catch (err) {
       console.error("[twining] Metrics write failed (non-fatal):", (err as Error).message);
     }
@@ -36,6 +161,47 @@ export class MetricsCollector {
       }
     }
   }
+
+  /** Write the startup entry once both the first response and warm-up are in. */
+  private reportStartup(): void {
+    const firstResponse = this.startupMarks.first_tool_response;
+    if (this.startupReported || !this.startupSettled || firstResponse === undefined) return;
+    this.startupReported = true;
+    appendJSONL(this.metricsPath, {
+      tool_name: STARTUP_METRIC,
+      timestamp: new Date().toISOString(),
+      duration_ms: firstResponse,
+      success: true,
+      agent_id: "twining",
+      stages: { ...this.startupMarks },
+    } satisfies MetricEntry).catch((err) => {
+      console.error("[twining] Startup metric write failed (non-fatal):", (err as Error).message);
+    });
+  }
+
+  /**
+   * Checkpoint rollups, rotate metrics.jsonl if it is past its size or
+   * age limit and trim traces.jsonl. Runs one at a time; never throws.
+   */
+  async maintain(): Promise<void> {
+    if (!this.maintaining) {
+      this.maintaining = Promise.all([this.rollup.maintain(), this.traceLog.trim()])
+        .then(() => undefined)
+        .catch((err) => {
+          console.error("[twining] Metrics rollup maintenance failed (non-fatal):", (err as Error).message);
+        })
+        .finally(() => {
+          this.maintaining = null;
+        });
+    }
+    return this.maintaining;
+  }
+}
+
+/** Minimal metrics interface so engines can report without depending on the collector */
+export interface MetricsSink {
+  increment(name: string, by?: number): void;
+  recordStages(stages: Record<string, number>): void;
 }
 
 /** Minimal interface for telemetry client to avoid circular imports */
@@ -0,0 +1,454 @@
+/**
+ * Incremental rollups of metrics.jsonl.
+ * Keeps per-tool totals, per-period per-tool counts, error counts and
+ * latency sketches, so analytics queries never reparse the raw log.
+ * Periods are minutes for the last day; each checkpoint folds older
+ * minutes into hours, hours older than 30 days into days, and drops days
+ * older than a year, so the rollup stays a bounded size.
+ *
+ * Rollups are persisted to metrics.rollup.json with the log position they
+ * cover; a reader loads that and applies only the complete lines appended
+ * since. The raw log rotates once it passes a size or age limit: under
+ * the metrics lock the rollup catches up, the log moves to
+ * archive/metrics/ and the rollup restarts at offset 0 of a fresh log.
+ * Rotated logs are gzip-compressed in the background.
+ */
+import fs from "node:fs";
+import path from "node:path";
+import zlib from "node:zlib";
+import { promisify } from "node:util";
+import { acquireLock, readTail, statOrNull } from "../storage/file-store.js";
+import { STARTUP_METRIC, type MetricEntry } from "../utils/types.js";
+import { LatencySketch } from "./latency-sketch.js";
+
+const gzip = promisify(zlib.gzip);
+
+/** Rotate the raw log once it reaches this size by default (5 MiB). */
+const DEFAULT_ROTATE_BYTES = 5 * 1024 * 1024;
+
+/** Rotate the raw log once its first entry is this old by default (7 days). */
+const DEFAULT_ROTATE_AGE_MS = 7 * 24 * 60 * 60 * 1000;
+
+/** Persist the rollup once this much of the log isn't covered by it. */
+const CHECKPOINT_BYTES = 64 * 1024;
+
+const MINUTE_MS = 60 * 1000;
+const HOUR_MS = 60 * MINUTE_MS;
+const DAY_MS = 24 * HOUR_MS;
+
+/** Keep minute periods this long before folding them into hours. */
+const MINUTE_RETENTION_MS = DAY_MS;
+
+/** Keep hour periods this long before folding them into days. */
+const HOUR_RETENTION_MS = 30 * DAY_MS;
+
+/** Drop day periods older than this; they still count in the totals. */
+const DAY_RETENTION_MS = 365 * DAY_MS;
+
+export interface RotationOptions {
+  rotate_bytes?: number;
+  rotate_age_ms?: number;
+}
+
+/** Counts, latency and last call for one tool over some period. */
+export interface ToolRollup {
+  count: number;
+  errors: number;
+  sum_ms: number;
+  last_called: string;
+  sketch: LatencySketch;
+}
+
+/** All tools' calls within one minute, hour or day. */
+export interface PeriodRollup {
+  count: number;
+  errors: number;
+  sum_ms: number;
+  tools: Map<string, ToolRollup>;
+}
+
+export interface RollupState {
+  /** Totals per tool since metrics began. */
+  tools: Map<string, ToolRollup>;
+  /** Per-minute rollups keyed by minute start (epoch ms). */
+  minutes: Map<number, PeriodRollup>;
+  /** Per-hour rollups for minutes past their retention. */
+  hours: Map<number, PeriodRollup>;
+  /** Per-day rollups for hours past their retention. */
+  days: Map<number, PeriodRollup>;
+  /** Error counts keyed by tool name and error code. */
+  errors: Map<string, { tool_name: string; error_code: string; count: number }>;
+  /** Inode and bytes of metrics.jsonl folded in so far. */
+  logIno: number;
+  logBytes: number;
+  /** Timestamp of the first entry in the current log, for age rotation. */
+  logStartedAt: string | null;
+  /** Rollup file mtime:size:ino this state was loaded from or saved as. */
+  persistedVersion: string;
+  /** Log bytes covered by the persisted file. */
+  persistedBytes: number;
+}
+
+interface ToolRollupJSON {
+  count: number;
+  errors: number;
+  sum_ms: number;
+  last_called: string;
+  sketch: Record<string, number>;
+}
+
+interface PeriodRollupJSON {
+  count: number;
+  errors: number;
+  sum_ms: number;
+  tools: Record<string, ToolRollupJSON>;
+}
+
+interface RollupJSON {
+  version: 1;
+  log: { ino: number; bytes: number; started_at: string | null };
+  tools: Record<string, ToolRollupJSON>;
+  minutes: Record<string, PeriodRollupJSON>;
+  /** Absent in rollups written before periods were downsampled */
+  hours?: Record<string, PeriodRollupJSON>;
+  days?: Record<string, PeriodRollupJSON>;
+  errors: { tool_name: string; error_code: string; count: number }[];
+}
+
+/** A period rollup with its start and length, for range queries. */
+export interface Period {
+  start: number;
+  length_ms: number;
+  rollup: PeriodRollup;
+}
+
+export class MetricsRollup {
+  private readonly logPath: string;
+  private readonly rollupPath: string;
+  private readonly archiveDir: string;
+  private readonly rotateBytes: number;
+  private readonly rotateAgeMs: number;
+  private state: RollupState | null = null;
+
+  constructor(twiningDir: string, options?: RotationOptions) {
+    this.logPath = path.join(twiningDir, "metrics.jsonl");
+    this.rollupPath = path.join(twiningDir, "metrics.rollup.json");
+    this.archiveDir = path.join(twiningDir, "archive", "metrics");
+    this.rotateBytes = options?.rotate_bytes ?? DEFAULT_ROTATE_BYTES;
+    this.rotateAgeMs = options?.rotate_age_ms ?? DEFAULT_ROTATE_AGE_MS;
+  }
+
+  /**
+   * Current rollups: the persisted file (reloaded only when it changes)
+   * plus any complete lines appended to the log since.
+   */
+  refresh(): RollupState {
+    const version = fileVersion(this.rollupPath);
+    let state = this.state;
+    if (!state || version !== state.persistedVersion) {
+      state = this.load(version);
+      this.state = state;
+    }
+
+    const log = statOrNull(this.logPath);
+    if (!log) return state;
+
+    if (log.ino !== state.logIno) {
+      // A fresh log after rotation (or the first one): start at offset 0
+      state.logIno = log.ino;
+      state.logBytes = 0;
+      state.persistedBytes = 0;
+      state.logStartedAt = null;
+    } else if (log.size < state.logBytes) {
+      // Truncated in place: totals can't be un-counted, so start over
+      state = emptyState(version);
+      state.logIno = log.ino;
+      this.state = state;
+    }
+
+    const tail = readTail(this.logPath, state.logBytes, log.size);
+    state.logBytes += tail.bytes;
+    for (const line of tail.lines) {
+      if (line.trim().length === 0) continue;
+      try {
+        applyEntry(state, JSON.parse(line) as MetricEntry);
+      } catch {
+        console.error("[twining] Skipping corrupt JSONL line in metrics.jsonl");
+      }
+    }
+    return state;
+  }
+
+  /**
+   * Rotate the log if it is past its size or age limit, otherwise persist
+   * the rollup if enough of the log isn't covered by the saved copy.
+   * Runs under the metrics.jsonl lock so appends and other processes wait.
+   */
+  async maintain(now: number = Date.now()): Promise<void> {
+    if (!fs.existsSync(this.logPath)) return;
+    const release = await acquireLock(this.logPath);
+    let rotated: string | null = null;
+    try {
+      const state = this.refresh();
+      const tooBig = state.logBytes >= this.rotateBytes;
+      const tooOld =
+        state.logStartedAt !== null &&
+        now - new Date(state.logStartedAt).getTime() >= this.rotateAgeMs;
+
+      if (state.logBytes > 0 && (tooBig || tooOld)) {
+        rotated = this.rotate(state, now);
+      } else if (state.logBytes - state.persistedBytes >= CHECKPOINT_BYTES) {
+        this.persist(state, now);
+      }
+    } finally {
+      await release();
+    }
+
+    if (rotated) await this.compress(rotated);
+  }
+
+  /** Move the log to the archive and restart the rollup on a fresh log. */
+  private rotate(state: RollupState, now: number): string {
+    fs.mkdirSync(this.archiveDir, { recursive: true });
+    const stamp = new Date().toISOString().replace(/[:.]/g, "-");
+    const archived = path.join(this.archiveDir, `metrics-${stamp}.jsonl`);
+    fs.renameSync(this.logPath, archived);
+    fs.writeFileSync(this.logPath, "");
+
+    state.logIno = fs.statSync(this.logPath).ino;
+    state.logBytes = 0;
+    state.logStartedAt = null;
+    this.persist(state, now);
+    return archived;
+  }
+
+  /** Gzip a rotated log and remove the uncompressed copy (best-effort). */
+  private async compress(file: string): Promise<void> {
+    try {
+      const data = await fs.promises.readFile(file);
+      await fs.promises.writeFile(`${file}.gz`, await gzip(data));
+      await fs.promises.unlink(file);
+    } catch (error) {
+      console.error("[twining] Metrics log compression failed (non-fatal):", error);
+    }
+  }
+
+  /** Downsample old periods, then save the rollup with its log position. */
+  private persist(state: RollupState, now: number): void {
+    downsample(state, now);
+    const tmp = `${this.rollupPath}.${process.pid}.tmp`;
+    fs.writeFileSync(tmp, JSON.stringify(toJSON(state)));
+    fs.renameSync(tmp, this.rollupPath);
+    state.persistedVersion = fileVersion(this.rollupPath);
+    state.persistedBytes = state.logBytes;
+  }
+
+  private load(version: string): RollupState {
+    const state = emptyState(version);
+    if (!version) return state;
+    try {
+      const json = JSON.parse(fs.readFileSync(this.rollupPath, "utf-8")) as RollupJSON;
+      state.logIno = json.log.ino;
+      state.logBytes = json.log.bytes;
+      state.persistedBytes = json.log.bytes;
+      state.logStartedAt = json.log.started_at;
+      for (const [name, tool] of Object.entries(json.tools)) {
+        state.tools.set(name, toolFromJSON(tool));
+      }
+      periodsFromJSON(state.minutes, json.minutes);
+      periodsFromJSON(state.hours, json.hours ?? {});
+      periodsFromJSON(state.days, json.days ?? {});
+      for (const e of json.errors) {
+        state.errors.set(`${e.tool_name}\0${e.error_code}`, { ...e });
+      }
+    } catch (error) {
+      console.error("[twining] Metrics rollup unreadable, rebuilding from log (non-fatal):", error);
+      return emptyState(version);
+    }
+    return state;
+  }
+}
+
+/** Fold one metric entry into the rollups. Startup entries aren't tool calls. */
+function applyEntry(state: RollupState, raw: MetricEntry): void {
+  const ts = new Date(raw.timestamp).getTime();
+  if (!raw.tool_name || raw.tool_name === STARTUP_METRIC || Number.isNaN(ts)) return;
+  const entry = { ...raw, duration_ms: Number(raw.duration_ms) || 0 };
+  state.logStartedAt ??= entry.timestamp;
+
+  addToTool(state.tools, entry);
+
+  const minute = periodAt(state.minutes, Math.floor(ts / MINUTE_MS) * MINUTE_MS);
+  minute.count++;
+  minute.sum_ms += entry.duration_ms;
+  if (!entry.success) minute.errors++;
+  addToTool(minute.tools, entry);
+
+  if (!entry.success) {
+    const code = entry.error_code || "unknown";
+    const key = `${entry.tool_name}\0${code}`;
+    const existing = state.errors.get(key);
+    if (existing) existing.count++;
+    else state.errors.set(key, { tool_name: entry.tool_name, error_code: code, count: 1 });
+  }
+}
+
+function addToTool(tools: Map<string, ToolRollup>, entry: MetricEntry): void {
+  let tool = tools.get(entry.tool_name);
+  if (!tool) {
+    tool = { count: 0, errors: 0, sum_ms: 0, last_called: entry.timestamp, sketch: new LatencySketch() };
+    tools.set(entry.tool_name, tool);
+  }
+  tool.count++;
+  tool.sum_ms += entry.duration_ms;
+  if (!entry.success) tool.errors++;
+  if (entry.timestamp >= tool.last_called) tool.last_called = entry.timestamp;
+  tool.sketch.add(entry.duration_ms);
+}
+
+function periodAt(periods: Map<number, PeriodRollup>, start: number): PeriodRollup {
+  let period = periods.get(start);
+  if (!period) {
+    period = { count: 0, errors: 0, sum_ms: 0, tools: new Map() };
+    periods.set(start, period);
+  }
+  return period;
+}
+
+/**
+ * Fold minutes older than their retention into hours and hours into
+ * days, and drop days past theirs. Totals and errors are untouched.
+ */
+export function downsample(state: RollupState, now: number): void {
+  fold(state.minutes, state.hours, HOUR_MS, now - MINUTE_RETENTION_MS);
+  fold(state.hours, state.days, DAY_MS, now - HOUR_RETENTION_MS);
+  for (const start of state.days.keys()) {
+    if (start + DAY_MS <= now - DAY_RETENTION_MS) state.days.delete(start);
+  }
+}
+
+/** Move periods that ended before `cutoff` into coarser ones. */
+function fold(
+  from: Map<number, PeriodRollup>,
+  into: Map<number, PeriodRollup>,
+  lengthMs: number,
+  cutoff: number,
+): void {
+  for (const [start, period] of from) {
+    if (start >= cutoff) continue;
+    const coarse = periodAt(into, Math.floor(start / lengthMs) * lengthMs);
+    coarse.count += period.count;
+    coarse.errors += period.errors;
+    coarse.sum_ms += period.sum_ms;
+    for (const [name, tool] of period.tools) {
+      const existing = coarse.tools.get(name);
+      if (existing) mergeToolRollup(existing, tool);
+      else coarse.tools.set(name, tool);
+    }
+    from.delete(start);
+  }
+}
+
+/** Every period rollup, minutes, hours and days alike. */
+export function* periods(state: RollupState): Generator<Period> {
+  for (const [start, rollup] of state.days) yield { start, length_ms: DAY_MS, rollup };
+  for (const [start, rollup] of state.hours) yield { start, length_ms: HOUR_MS, rollup };
+  for (const [start, rollup] of state.minutes) yield { start, length_ms: MINUTE_MS, rollup };
+}
+
+/** Add one tool rollup into another (for range queries). */
+export function mergeToolRollup(into: ToolRollup, from: ToolRollup): void {
+  into.count += from.count;
+  into.errors += from.errors;
+  into.sum_ms += from.sum_ms;
+  if (from.last_called > into.last_called) into.last_called = from.last_called;
+  into.sketch.merge(from.sketch);
+}
+
+function emptyState(persistedVersion: string): RollupState {
+  return {
+    tools: new Map(),
+    minutes: new Map(),
+    hours: new Map(),
+    days: new Map(),
+    errors: new Map(),
+    logIno: 0,
+    logBytes: 0,
+    logStartedAt: null,
+    persistedVersion,
+    persistedBytes: 0,
+  };
+}
+
+function toolToJSON(tool: ToolRollup): ToolRollupJSON {
+  return {
+    count: tool.count,
+    errors: tool.errors,
+    sum_ms: tool.sum_ms,
+    last_called: tool.last_called,
+    sketch: tool.sketch.toJSON(),
+  };
+}
+
+function toolFromJSON(json: ToolRollupJSON): ToolRollup {
+  return {
+    count: json.count,
+    errors: json.errors,
+    sum_ms: json.sum_ms,
+    last_called: json.last_called,
+    sketch: LatencySketch.fromJSON(json.sketch),
+  };
+}
+
+function periodsToJSON(periods: Map<number, PeriodRollup>): Record<string, PeriodRollupJSON> {
+  const json: Record<string, PeriodRollupJSON> = {};
+  for (const [start, period] of periods) {
+    const tools: Record<string, ToolRollupJSON> = {};
+    for (const [name, tool] of period.tools) tools[name] = toolToJSON(tool);
+    json[String(start)] = {
+      count: period.count,
+      errors: period.errors,
+      sum_ms: period.sum_ms,
+      tools,
+    };
+  }
+  return json;
+}
+
+function periodsFromJSON(
+  periods: Map<number, PeriodRollup>,
+  json: Record<string, PeriodRollupJSON>,
+): void {
+  for (const [start, period] of Object.entries(json)) {
+    const tools = new Map<string, ToolRollup>();
+    for (const [name, tool] of Object.entries(period.tools)) {
+      tools.set(name, toolFromJSON(tool));
+    }
+    periods.set(Number(start), {
+      count: period.count,
+      errors: period.errors,
+      sum_ms: period.sum_ms,
+      tools,
+    });
+  }
+}
+
+function toJSON(state: RollupState): RollupJSON {
+  const tools: RollupJSON["tools"] = {};
+  for (const [name, tool] of state.tools) tools[name] = toolToJSON(tool);
+  return {
+    version: 1,
+    log: { ino: state.logIno, bytes: state.logBytes, started_at: state.logStartedAt },
+    tools,
+    minutes: periodsToJSON(state.minutes),
+    hours: periodsToJSON(state.hours),
+    days: periodsToJSON(state.days),
+    errors: [...state.errors.values()],
+  };
+}
+
+/** mtime:size:ino of a file, or "" if it doesn't exist. */
+function fileVersion(file: string): string {
+  const stat = statOrNull(file);
+  return stat ? `${stat.mtimeMs}:${stat.size}:${stat.ino}` : "";
+}
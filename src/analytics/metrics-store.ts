@@ -1,105 +1,118 @@
 /**
- * Metrics store — reads metrics.jsonl with mtime caching.
- * Same pattern as BlackboardStore for efficient repeated reads.
+ * Metrics store — answers analytics queries from incremental rollups of
+ * metrics.jsonl (see MetricsRollup) instead of reparsing the raw log.
+ * Queries cost time proportional to tools and retained periods (a day of
+ * minutes, a month of hours, a year of days), not calls.
  */
-import fs from "node:fs";
-import path from "node:path";
-import type { MetricEntry, ToolUsageSummary, UsageBucket } from "../utils/types.js";
-import { readJSONL } from "../storage/file-store.js";
+import type { ToolUsageSummary, UsageBucket } from "../utils/types.js";
+import { LatencySketch } from "./latency-sketch.js";
+import {
+  MetricsRollup,
+  mergeToolRollup,
+  periods,
+  type RollupState,
+  type ToolRollup,
+} from "./metrics-rollup.js";
+
+const MINUTE_MS = 60 * 1000;
 
 export class MetricsStore {
-  private readonly metricsPath: string;
-  private cachedEntries: MetricEntry[] | null = null;
-  private cachedMtime: number = 0;
+  private readonly rollup: MetricsRollup;
 
   constructor(twiningDir: string) {
-    this.metricsPath = path.join(twiningDir, "metrics.jsonl");
+    this.rollup = new MetricsRollup(twiningDir);
   }
 
-  /** Read all metrics, using mtime cache when possible */
-  private async readAll(): Promise<MetricEntry[]> {
+  /** Current rollups; an unreadable log reads as empty */
+  private readState(): RollupState | null {
     try {
-      if (!fs.existsSync(this.metricsPath)) return [];
-      const stat = fs.statSync(this.metricsPath);
-      if (this.cachedEntries !== null && stat.mtimeMs === this.cachedMtime) {
-        return this.cachedEntries;
-      }
-      const entries = await readJSONL<MetricEntry>(this.metricsPath);
-      this.cachedEntries = entries;
-      this.cachedMtime = stat.mtimeMs;
-      return entries;
+      return this.rollup.refresh();
     } catch {
-      return [];
+      return null;
     }
   }
 
-  /** Get tool usage summary, optionally filtered by time */
+  /**
+   * Get tool usage summary, optionally filtered by time. `since` is
+   * applied at the resolution the period containing it is kept at:
+   * minute for the last day, then hour, then day. Calls in that period
+   * count.
+   */
   async getToolUsageSummary(since?: string): Promise<ToolUsageSummary[]> {
-    const entries = await this.readAll();
-    const filtered = since
-      ? entries.filter((e) => e.timestamp >= since)
-      : entries;
-
-    const byTool = new Map<string, MetricEntry[]>();
-    for (const entry of filtered) {
-      const existing = byTool.get(entry.tool_name) || [];
-      existing.push(entry);
-      byTool.set(entry.tool_name, existing);
+    const state = this.readState();
+    if (!state) return [];
+
+    let tools: Map<string, ToolRollup> = state.tools;
+    if (since) {
+      const sinceMs = new Date(since).getTime();
+      tools = new Map();
+      for (const { start, length_ms, rollup } of periods(state)) {
+        if (!(start + length_ms > sinceMs)) continue;
+        for (const [name, tool] of rollup.tools) {
+          let merged = tools.get(name);
+          if (!merged) {
+            merged = { count: 0, errors: 0, sum_ms: 0, last_called: "", sketch: new LatencySketch() };
+            tools.set(name, merged);
+          }
+          mergeToolRollup(merged, tool);
+        }
+      }
     }
 
     const summaries: ToolUsageSummary[] = [];
-    for (const [tool_name, toolEntries] of byTool) {
-      const durations = toolEntries.map((e) => e.duration_ms).sort((a, b) => a - b);
-      const errorCount = toolEntries.filter((e) => !e.success).length;
-      const avgDuration = durations.reduce((a, b) => a + b, 0) / durations.length;
-      const p95Index = Math.min(
-        Math.ceil(durations.length * 0.95) - 1,
-        durations.length - 1,
-      );
-
+    for (const [tool_name, tool] of tools) {
       summaries.push({
         tool_name,
-        call_count: toolEntries.length,
-        error_count: errorCount,
-        avg_duration_ms: Math.round(avgDuration),
-        p95_duration_ms: durations[p95Index]!,
-        last_called: toolEntries[toolEntries.length - 1]!.timestamp,
+        call_count: tool.count,
+        error_count: tool.errors,
+        avg_duration_ms: Math.round(tool.sum_ms / tool.count),
+        p95_duration_ms: tool.sketch.quantile(0.95),
+        last_called: tool.last_called,
       });
     }
 
     return summaries.sort((a, b) => b.call_count - a.call_count);
   }
 
-  /** Get usage over time in buckets */
+  /**
+   * Get usage over time in buckets (one minute or coarser). Periods kept
+   * at a coarser resolution than the bucket land in the bucket holding
+   * their start.
+   */
   async getUsageOverTime(bucketMinutes: number = 60): Promise<UsageBucket[]> {
-    const entries = await this.readAll();
-    if (entries.length === 0) return [];
-
-    const bucketMs = bucketMinutes * 60 * 1000;
-    const buckets = new Map<number, MetricEntry[]>();
-
-    for (const entry of entries) {
-      const ts = new Date(entry.timestamp).getTime();
-      const bucketStart = Math.floor(ts / bucketMs) * bucketMs;
-      const existing = buckets.get(bucketStart) || [];
-      existing.push(entry);
-      buckets.set(bucketStart, existing);
+    const state = this.readState();
+    if (!state) return [];
+
+    const bucketMs = bucketMinutes * MINUTE_MS;
+    const buckets = new Map<number, { count: number; errors: number; sum_ms: number }>();
+
+    for (const { start, rollup } of periods(state)) {
+      const bucketStart = Math.floor(start / bucketMs) * bucketMs;
+      const bucket = buckets.get(bucketStart);
+      if (bucket) {
+        bucket.count += rollup.count;
+        bucket.errors += rollup.errors;
+        bucket.sum_ms += rollup.sum_ms;
+      } else {
+        buckets.set(bucketStart, {
+          count: rollup.count,
+          errors: rollup.errors,
+          sum_ms: rollup.sum_ms,
+        });
+      }
     }
 
     const result: UsageBucket[] = [];
     const sortedKeys = [...buckets.keys()].sort((a, b) => a - b);
 
     for (const key of sortedKeys) {
-      const bucketEntries = buckets.get(key)!;
-      const durations = bucketEntries.map((e) => e.duration_ms);
-      const avgDuration = durations.reduce((a, b) => a + b, 0) / durations.length;
-
+      const bucket = buckets.get(key)!;
       result.push({
         bucket_start: new Date(key).toISOString(),
         bucket_end: new Date(key + bucketMs).toISOString(),
-        call_count: bucketEntries.length,
-        error_count: bucketEntries.filter((e) => !e.success).length,
-        avg_duration_ms: Math.round(avgDuration),
+        call_count: bucket.count,
+        error_count: bucket.errors,
+        avg_duration_ms: Math.round(bucket.sum_ms / bucket.count),
       });
     }
 
@@ -110,20 +123,10 @@ export class MetricsStore {
   async getErrorBreakdown(): Promise<
     Array<{ tool_name: string; error_code: string; count: number }>
   > {
-    const entries = await this.readAll();
-    const errors = entries.filter((e) => !e.success);
-
-    const byKey = new Map<string, number>();
-    for (const entry of errors) {
-      const key = `${entry.tool_name}::${entry.error_code || "unknown"}`;
-      byKey.set(key, (byKey.get(key) || 0) + 1);
-    }
-
-    return [...byKey.entries()]
-      .map(([key, count]) => {
-        const [tool_name, error_code] = key.split("::");
-        return { tool_name: tool_name!, error_code: error_code!, count };
-      })
+    const state = this.readState();
+    if (!state) return [];
+    return [...state.errors.values()]
+      .map((e) => ({ ...e }))
       .sort((a, b) => b.count - a.count);
   }
 }
@@ -0,0 +1,187 @@
+/**
+ * Sampled tool call traces — .twining/traces.jsonl — and their export.
+ * One line per kept trace. Once the file passes its size cap it is
+ * trimmed to the newest half, so it never needs rotation.
+ * Traces export as Chrome trace-event JSON (chrome://tracing, Perfetto)
+ * or in the OTLP JSON file format written by the OpenTelemetry
+ * collector's file exporter.
+ */
+import fs from "node:fs";
+import path from "node:path";
+import { acquireLock, appendJSONL, readJSONL } from "../storage/file-store.js";
+import type { SpanAttributes, TraceRecord } from "../utils/tracing.js";
+
+/** Trim traces.jsonl once it grows past this size by default (2 MiB). */
+export const DEFAULT_TRACE_LOG_MAX_BYTES = 2 * 1024 * 1024;
+
+/** One trace in a listing, without its spans. */
+export interface TraceSummary {
+  trace_id: string;
+  name: string;
+  timestamp: string;
+  duration_ms: number;
+  span_count: number;
+  error?: string;
+}
+
+export class TraceLog {
+  private readonly tracesPath: string;
+  private readonly maxBytes: number;
+
+  constructor(twiningDir: string, maxBytes = DEFAULT_TRACE_LOG_MAX_BYTES) {
+    this.tracesPath = path.join(twiningDir, "traces.jsonl");
+    this.maxBytes = maxBytes;
+  }
+
+  async append(trace: TraceRecord): Promise<void> {
+    await appendJSONL(this.tracesPath, trace);
+  }
+
+  /** Newest traces first, optionally only those at least min_duration_ms long. */
+  async recent(
+    limit: number,
+    options?: { min_duration_ms?: number },
+  ): Promise<TraceRecord[]> {
+    const minDuration = options?.min_duration_ms ?? 0;
+    const traces = await readJSONL<TraceRecord>(this.tracesPath);
+    const result: TraceRecord[] = [];
+    for (let i = traces.length - 1; i >= 0 && result.length < limit; i--) {
+      const trace = traces[i]!;
+      if (trace.duration_ms >= minDuration) result.push(trace);
+    }
+    return result;
+  }
+
+  /** Summaries of the newest traces, for listing. */
+  async list(
+    limit: number,
+    options?: { min_duration_ms?: number },
+  ): Promise<TraceSummary[]> {
+    const traces = await this.recent(limit, options);
+    return traces.map((trace) => {
+      const summary: TraceSummary = {
+        trace_id: trace.trace_id,
+        name: trace.name,
+        timestamp: trace.timestamp,
+        duration_ms: trace.duration_ms,
+        span_count: trace.spans.length,
+      };
+      const error = trace.spans[0]?.error;
+      if (error) summary.error = error;
+      return summary;
+    });
+  }
+
+  async get(traceId: string): Promise<TraceRecord | null> {
+    const traces = await readJSONL<TraceRecord>(this.tracesPath);
+    return traces.find((t) => t.trace_id === traceId) ?? null;
+  }
+
+  /** Drop the oldest half of the file if it is past its size cap. */
+  async trim(): Promise<void> {
+    if (!fs.existsSync(this.tracesPath)) return;
+    if (fs.statSync(this.tracesPath).size < this.maxBytes) return;
+
+    const release = await acquireLock(this.tracesPath);
+    try {
+      const content = fs.readFileSync(this.tracesPath, "utf-8");
+      if (Buffer.byteLength(content) < this.maxBytes) return;
+      const lines = content.split("\n").filter((line) => line.length > 0);
+      const kept = lines.slice(Math.floor(lines.length / 2));
+      const tmp = `${this.tracesPath}.${process.pid}.tmp`;
+      fs.writeFileSync(tmp, kept.length > 0 ? kept.join("\n") + "\n" : "");
+      fs.renameSync(tmp, this.tracesPath);
+    } finally {
+      await release();
+    }
+  }
+}
+
+/**
+ * Chrome trace-event format: one complete ("X") event per span, each
+ * trace on its own thread row, timestamps in microseconds.
+ */
+export function toChromeTrace(traces: TraceRecord[]): {
+  traceEvents: Record<string, unknown>[];
+  displayTimeUnit: "ms";
+} {
+  const traceEvents: Record<string, unknown>[] = [];
+  traces.forEach((trace, i) => {
+    const tid = i + 1;
+    const origin = Date.parse(trace.timestamp) * 1000;
+    traceEvents.push({
+      name: "thread_name",
+      ph: "M",
+      pid: 1,
+      tid,
+      args: { name: `${trace.name} ${trace.trace_id.slice(0, 8)}` },
+    });
+    for (const span of trace.spans) {
+      traceEvents.push({
+        name: span.name,
+        cat: span.parent_id === null ? "tool" : "span",
+        ph: "X",
+        ts: Math.round(origin + span.start_ms * 1000),
+        dur: Math.round(span.duration_ms * 1000),
+        pid: 1,
+        tid,
+        args: {
+          ...span.attributes,
+          ...(span.error ? { error: span.error } : {}),
+        },
+      });
+    }
+  });
+  return { traceEvents, displayTimeUnit: "ms" };
+}
+
+/**
+ * OTLP/JSON ExportTraceServiceRequest for the traces — one line of an
+ * OTLP file. Span IDs are the trace ID prefix plus the span's number.
+ */
+export function toOtlp(traces: TraceRecord[]): Record<string, unknown> {
+  const spans: Record<string, unknown>[] = [];
+  for (const trace of traces) {
+    const originNs = BigInt(Date.parse(trace.timestamp)) * 1_000_000n;
+    const spanId = (id: number) =>
+      trace.trace_id.slice(0, 8) + id.toString(16).padStart(8, "0");
+    for (const span of trace.spans) {
+      const startNs = originNs + BigInt(Math.round(span.start_ms * 1e6));
+      const endNs = startNs + BigInt(Math.round(span.duration_ms * 1e6));
+      const otlpSpan: Record<string, unknown> = {
+        traceId: trace.trace_id,
+        spanId: spanId(span.id),
+        name: span.name,
+        kind: span.parent_id === null ? 2 : 1, // SERVER for the tool call, INTERNAL below
+        startTimeUnixNano: startNs.toString(),
+        endTimeUnixNano: endNs.toString(),
+        attributes: otlpAttributes(span.attributes ?? {}),
+        status: span.error ? { code: 2, message: span.error } : { code: 0 },
+      };
+      if (span.parent_id !== null) otlpSpan.parentSpanId = spanId(span.parent_id);
+      spans.push(otlpSpan);
+    }
+  }
+  return {
+    resourceSpans: [
+      {
+        resource: {
+          attributes: otlpAttributes({ "service.name": "twining-mcp" }),
+        },
+        scopeSpans: [{ scope: { name: "twining" }, spans }],
+      },
+    ],
+  };
+}
+
+function otlpAttributes(attributes: SpanAttributes): Record<string, unknown>[] {
+  return Object.entries(attributes).map(([key, value]) => {
+    if (typeof value === "boolean") return { key, value: { boolValue: value } };
+    if (typeof value === "number") {
+      return Number.isInteger(value)
+        ? { key, value: { intValue: String(value) } }
+        : { key, value: { doubleValue: value } };
+    }
+    return { key, value: { stringValue: value } };
+  });
+}
@@ -24,6 +24,11 @@ export const DEFAULT_CONFIG: TwiningConfig = {
       warning_boost: 0.1,
       graph_reachability: 0.35,
     },
+    cache: {
+      max_entries: 64,
+      ttl_ms: 30000,
+    },
+    stage_timeout_ms: 2000,
   },
   conflict_resolution: "human",
   agents: {
@@ -42,6 +47,12 @@ export const DEFAULT_CONFIG: TwiningConfig = {
   analytics: {
     metrics: {
       enabled: true,         // Local metrics on by default
+      rotate_bytes: 5242880, // Rotate + gzip metrics.jsonl past 5 MiB...
+      rotate_age_days: 7,    // ...or once its oldest entry is a week old
+    },
+    tracing: {
+      sample_rate: 1,        // Share of tool calls traced (0 = off)
+      min_duration_ms: 250,  // Keep traces only for slow calls
     },
     telemetry: {
       enabled: false,        // Opt-in only
@@ -55,6 +66,33 @@ export const DEFAULT_CONFIG: TwiningConfig = {
   tools: {
     mode: "full",            // "full" or "lite" — lite registers only core tools
   },
+  embeddings: {
+    batch_size: 32,
+    batch_delay_ms: 5,       // Coalescing window for background embedding
+    workers: 0,              // 0 = run inference in-process
+    query_cache_size: 256,
+  },
+  search: {
+    ann: {
+      enabled: true,
+      min_vectors: 2000,     // Exact scan below this many vectors
+      nlist: 0,              // 0 = sqrt(vectors)
+      nprobe: 8,             // Raise for recall, lower for latency
+    },
+  },
+  storage: {
+    append_window_ms: 0,     // Group-commit window for JSONL appends; 0 = same tick
+    fsync: "none",           // "none" or "batch" (fsync each group write)
+  },
+  daemon: {
+    enabled: false,          // Opt-in: share one state daemon across MCP processes
+    idle_timeout_ms: 600000, // Daemon exits after 10 minutes without clients
+    spawn_timeout_ms: 5000,  // Wait this long for a spawned daemon before going standalone
+  },
+  startup: {
+    warm_embedder: true,     // Load the embedding model in the background after the handshake
+    snapshot: false,         // Opt-in: preload parsed stores from .twining/state.snapshot
+  },
 };
 
 /** Deep merge source into target, returning a new object */
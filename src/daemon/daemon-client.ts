@@ -0,0 +1,257 @@
+/**
+ * Thin-client side of the state daemon.
+ * In daemon mode the stdio process an agent spawns holds no state: it
+ * connects to the project's daemon (spawning one if none is running) and
+ * relays newline-delimited JSON-RPC between stdin/stdout and the socket.
+ * If the daemon goes away mid-session the relay fails over to a local,
+ * direct-file server: it replays the session's initialize handshake,
+ * fails the calls that were in flight (they may or may not have been
+ * applied, so they are not retried) and carries on.
+ *
+ * CRITICAL: Never use console.log or process.stdout in this module
+ * except through the relay's output stream.
+ */
+import { spawn } from "node:child_process";
+import fs from "node:fs";
+import type net from "node:net";
+import path from "node:path";
+import type { Readable, Writable } from "node:stream";
+import type { Transport } from "@modelcontextprotocol/sdk/shared/transport.js";
+import type { JSONRPCMessage } from "@modelcontextprotocol/sdk/types.js";
+import { connectSocket, daemonSocketPath } from "./daemon-socket.js";
+
+/** Request ID used when replaying initialize to the fallback server. */
+const REPLAY_INIT_ID = "twining-relay-initialize";
+
+/** JSON-RPC internal error, for calls lost with the daemon. */
+const DAEMON_LOST_CODE = -32603;
+
+type RpcId = string | number;
+
+interface RpcMessage {
+  jsonrpc?: string;
+  id?: RpcId;
+  method?: string;
+  [key: string]: unknown;
+}
+
+/**
+ * Connect to the project's daemon, spawning it when nothing answers.
+ * Resolves null if no daemon is reachable within spawn_timeout_ms.
+ */
+export async function connectOrSpawnDaemon(
+  projectRoot: string,
+  twiningDir: string,
+  options: { spawn_timeout_ms: number; entry?: string },
+): Promise<net.Socket | null> {
+  const socketPath = daemonSocketPath(twiningDir);
+  try {
+    return await connectSocket(socketPath);
+  } catch {
+    // No daemon yet
+  }
+
+  try {
+    spawnDaemon(projectRoot, twiningDir, options.entry ?? process.argv[1]!);
+  } catch (err) {
+    console.error("[twining] Could not spawn state daemon (non-fatal):", err);
+    return null;
+  }
+
+  // Racing clients may each spawn one; all but the first exit on their own
+  const deadline = Date.now() + options.spawn_timeout_ms;
+  let delay = 25;
+  while (Date.now() < deadline) {
+    await new Promise((resolve) => setTimeout(resolve, delay));
+    delay = Math.min(delay * 2, 250);
+    try {
+      return await connectSocket(socketPath);
+    } catch {
+      // Still starting up
+    }
+  }
+  return null;
+}
+
+/** Start a detached daemon for the project, logging to .twining/daemon.log. */
+function spawnDaemon(projectRoot: string, twiningDir: string, entry: string): void {
+  const log = fs.openSync(path.join(twiningDir, "daemon.log"), "a");
+  try {
+    const child = spawn(
+      process.execPath,
+      [...process.execArgv, entry, "--daemon", "--project", projectRoot],
+      { detached: true, stdio: ["ignore", "ignore", log], windowsHide: true },
+    );
+    child.unref();
+  } finally {
+    fs.closeSync(log);
+  }
+}
+
+/**
+ * Relays one MCP session between a stdio pair and the daemon socket,
+ * falling back to a local server if the daemon disconnects.
+ */
+export class DaemonRelay {
+  private readonly input: Readable;
+  private readonly output: Writable;
+  private readonly socket: net.Socket;
+  private readonly fallback: () => Promise<Transport>;
+  private mode: "daemon" | "switching" | "local" = "daemon";
+  private local: Transport | null = null;
+  /** Client requests the daemon has not answered yet */
+  private readonly inFlight = new Map<RpcId, RpcMessage>();
+  /** Client messages that arrived while switching to the local server */
+  private readonly queued: RpcMessage[] = [];
+  private initialize: RpcMessage | null = null;
+  private initialized: RpcMessage | null = null;
+  private ended = false;
+  private resolveDone!: () => void;
+  private rejectDone!: (err: unknown) => void;
+
+  /** Settles when the client closes stdin, or rejects if failover fails. */
+  readonly done: Promise<void>;
+
+  constructor(
+    input: Readable,
+    output: Writable,
+    socket: net.Socket,
+    fallback: () => Promise<Transport>,
+  ) {
+    this.input = input;
+    this.output = output;
+    this.socket = socket;
+    this.fallback = fallback;
+    this.done = new Promise((resolve, reject) => {
+      this.resolveDone = resolve;
+      this.rejectDone = reject;
+    });
+  }
+
+  start(): void {
+    onLines(this.input, (line) => this.fromClient(line));
+    this.input.on("end", () => {
+      this.ended = true;
+      this.socket.end();
+      void this.local?.close();
+      this.resolveDone();
+    });
+
+    onLines(this.socket, (line) => this.fromDaemon(line));
+    this.socket.on("error", () => {
+      // "close" follows and triggers the failover
+    });
+    this.socket.on("close", () => {
+      if (!this.ended) void this.failover();
+    });
+  }
+
+  /** Which side is currently serving the session. */
+  get target(): "daemon" | "switching" | "local" {
+    return this.mode;
+  }
+
+  private fromClient(line: string): void {
+    let message: RpcMessage;
+    try {
+      message = JSON.parse(line) as RpcMessage;
+    } catch {
+      console.error("[twining] Dropping malformed message from client (non-fatal)");
+      return;
+    }
+    if (message.method === "initialize") this.initialize = message;
+    if (message.method === "notifications/initialized") this.initialized = message;
+
+    if (this.mode === "daemon") {
+      if (message.method !== undefined && message.id !== undefined) {
+        this.inFlight.set(message.id, message);
+      }
+      this.socket.write(line + "\n");
+    } else if (this.mode === "switching") {
+      this.queued.push(message);
+    } else {
+      void this.sendLocal(message);
+    }
+  }
+
+  private fromDaemon(line: string): void {
+    try {
+      const message = JSON.parse(line) as RpcMessage;
+      if (message.method === undefined && message.id !== undefined) {
+        this.inFlight.delete(message.id);
+      }
+    } catch {
+      // Pass it through; the client reports the parse error
+    }
+    this.output.write(line + "\n");
+  }
+
+  private async failover(): Promise<void> {
+    this.mode = "switching";
+    console.error("[twining] State daemon disconnected; continuing with direct file access");
+
+    // Calls the daemon may have applied are failed rather than repeated.
+    // An unanswered initialize is safe to hand to the local server instead.
+    const pendingInit =
+      this.initialize?.id !== undefined && this.inFlight.has(this.initialize.id)
+        ? this.initialize
+        : null;
+    for (const [id, message] of this.inFlight) {
+      if (message === pendingInit) continue;
+      this.writeToClient({
+        jsonrpc: "2.0",
+        id,
+        error: {
+          code: DAEMON_LOST_CODE,
+          message: "Twining state daemon exited during this call; it may not have been applied",
+        },
+      });
+    }
+    this.inFlight.clear();
+
+    try {
+      const local = await this.fallback();
+      local.onmessage = (message) => {
+        if ((message as RpcMessage).id === REPLAY_INIT_ID) return;
+        this.writeToClient(message as RpcMessage);
+      };
+      await local.start();
+      this.local = local;
+
+      if (pendingInit) {
+        await this.sendLocal(pendingInit);
+      } else if (this.initialize) {
+        await this.sendLocal({ ...this.initialize, id: REPLAY_INIT_ID });
+      }
+      if (this.initialized) await this.sendLocal(this.initialized);
+
+      this.mode = "local";
+      for (const message of this.queued.splice(0)) await this.sendLocal(message);
+    } catch (err) {
+      this.rejectDone(err);
+    }
+  }
+
+  private async sendLocal(message: RpcMessage): Promise<void> {
+    await this.local!.send(message as JSONRPCMessage);
+  }
+
+  private writeToClient(message: RpcMessage): void {
+    this.output.write(JSON.stringify(message) + "\n");
+  }
+}
+
+/** Call handler for each newline-terminated line read from a stream. */
+function onLines(stream: Readable, handler: (line: string) => void): void {
+  let buffered = "";
+  stream.setEncoding("utf-8");
+  stream.on("data", (chunk: string) => {
+    buffered += chunk;
+    let newline: number;
+    while ((newline = buffered.indexOf("\n")) !== -1) {
+      const line = buffered.slice(0, newline).replace(/\r$/, "");
+      buffered = buffered.slice(newline + 1);
+      if (line.length > 0) handler(line);
+    }
+  });
+}
@@ -0,0 +1,101 @@
+/**
+ * Single-owner state daemon.
+ * One long-lived process per project holds the stores and their caches,
+ * the embedding indexes and the embedder, and serves the MCP protocol to
+ * every agent session over a local socket. The stdio processes agents
+ * spawn become thin relays (see daemon-client.ts), so concurrent sessions
+ * share one model in memory and one set of warm caches, and their writes
+ * are serialized in one process instead of contending on file locks.
+ * Each connection gets its own MCP server over the shared services.
+ *
+ * CRITICAL: Never use console.log or process.stdout in this module.
+ */
+import net from "node:net";
+import { StdioServerTransport } from "@modelcontextprotocol/sdk/server/stdio.js";
+import { createMcpServer, createServices, saveSnapshot, warmUp } from "../server.js";
+import type { TwiningServices } from "../server.js";
+import { ensureInitialized } from "../storage/init.js";
+import { flushAppends } from "../storage/file-store.js";
+import { daemonSocketPath, listenExclusive } from "./daemon-socket.js";
+
+export interface DaemonHandle {
+  socketPath: string;
+  services: TwiningServices;
+  /** Currently connected clients */
+  connections(): number;
+  /** Stop accepting clients, drop current ones and flush pending writes. */
+  close(): Promise<void>;
+}
+
+/**
+ * Start the daemon for a project. Resolves null when another daemon
+ * already owns the project's socket. `onIdle` runs once the daemon has
+ * had no clients for idle_timeout_ms (0 disables).
+ */
+export async function startDaemon(
+  projectRoot: string,
+  options?: { idle_timeout_ms?: number; onIdle?: () => void },
+): Promise<DaemonHandle | null> {
+  const twiningDir = ensureInitialized(projectRoot);
+  const socketPath = daemonSocketPath(twiningDir);
+  const idleTimeoutMs = options?.idle_timeout_ms ?? 0;
+
+  const sockets = new Set<net.Socket>();
+  let idleTimer: NodeJS.Timeout | null = null;
+  const armIdle = () => {
+    if (idleTimeoutMs <= 0 || !options?.onIdle || sockets.size > 0 || idleTimer) return;
+    idleTimer = setTimeout(options.onIdle, idleTimeoutMs);
+  };
+  const disarmIdle = () => {
+    if (idleTimer) clearTimeout(idleTimer);
+    idleTimer = null;
+  };
+
+  let services: TwiningServices | null = null;
+  const server = net.createServer((socket) => {
+    if (!services) {
+      socket.destroy();
+      return;
+    }
+    sockets.add(socket);
+    disarmIdle();
+
+    const mcp = createMcpServer(services);
+    socket.on("error", () => {
+      // The client went away mid-write; "close" follows
+    });
+    socket.on("close", () => {
+      sockets.delete(socket);
+      mcp.close().catch(() => {});
+      armIdle();
+    });
+    mcp.connect(new StdioServerTransport(socket, socket)).catch((err) => {
+      console.error("[twining] Daemon client connection failed (non-fatal):", err);
+      socket.destroy();
+    });
+  });
+
+  if (!(await listenExclusive(server, socketPath))) return null;
+  // Build state only once this process owns the socket
+  services = createServices(projectRoot);
+  console.error(`[twining] State daemon listening on ${socketPath}`);
+  armIdle();
+  void warmUp(services);
+
+  return {
+    socketPath,
+    services,
+    connections: () => sockets.size,
+    async close() {
+      disarmIdle();
+      const closed = new Promise<void>((resolve) => server.close(() => resolve()));
+      for (const socket of sockets) socket.destroy();
+      await closed;
+      if (services && services.embeddingQueue.pendingCount() > 0) {
+        await services.embeddingQueue.flush();
+      }
+      if (services) saveSnapshot(services);
+      await flushAppends();
+    },
+  };
+}
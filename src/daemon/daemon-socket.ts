@@ -0,0 +1,95 @@
+/**
+ * Socket addressing and ownership for the state daemon.
+ * The daemon listens on .twining/daemon.sock (a named pipe on Windows).
+ * Whoever binds the socket owns the project's state; a socket file left
+ * behind by a crashed daemon is recognised by a refused connect and
+ * replaced.
+ *
+ * CRITICAL: Never use console.log or process.stdout in this module.
+ */
+import crypto from "node:crypto";
+import fs from "node:fs";
+import net from "node:net";
+import os from "node:os";
+import path from "node:path";
+
+/** Unix socket paths must fit sun_path (104 bytes on macOS, 108 on Linux). */
+const MAX_SOCKET_PATH_BYTES = 100;
+
+/**
+ * Where the daemon for a .twining/ directory listens. Projects nested too
+ * deep for a socket inside .twining/ get one in the temp dir, named by a
+ * hash of the directory so every client still agrees on it.
+ */
+export function daemonSocketPath(twiningDir: string): string {
+  const resolved = path.resolve(twiningDir);
+  const hash = crypto.createHash("sha256").update(resolved).digest("hex").slice(0, 16);
+  if (process.platform === "win32") return `\\\\.\\pipe\\twining-${hash}`;
+  const local = path.join(resolved, "daemon.sock");
+  if (Buffer.byteLength(local) <= MAX_SOCKET_PATH_BYTES) return local;
+  return path.join(os.tmpdir(), `twining-${hash}.sock`);
+}
+
+/** Connect to a socket, rejecting on error or after timeoutMs. */
+export function connectSocket(socketPath: string, timeoutMs = 1000): Promise<net.Socket> {
+  return new Promise((resolve, reject) => {
+    const socket = net.createConnection(socketPath);
+    const timer = setTimeout(() => {
+      socket.destroy();
+      reject(new Error(`Timed out connecting to ${socketPath}`));
+    }, timeoutMs);
+    const onError = (err: Error) => {
+      clearTimeout(timer);
+      reject(err);
+    };
+    socket.once("error", onError);
+    socket.once("connect", () => {
+      clearTimeout(timer);
+      socket.removeListener("error", onError);
+      resolve(socket);
+    });
+  });
+}
+
+/**
+ * Listen on the daemon socket, taking over a stale socket file.
+ * Resolves false, without listening, when a live daemon already owns it.
+ */
+export async function listenExclusive(server: net.Server, socketPath: string): Promise<boolean> {
+  try {
+    await listen(server, socketPath);
+    return true;
+  } catch (err) {
+    if ((err as NodeJS.ErrnoException).code !== "EADDRINUSE") throw err;
+  }
+
+  try {
+    const probe = await connectSocket(socketPath);
+    probe.destroy();
+    return false;
+  } catch {
+    // Nobody is answering: a crashed daemon left its socket file behind
+  }
+  if (process.platform !== "win32") fs.rmSync(socketPath, { force: true });
+  try {
+    await listen(server, socketPath);
+    return true;
+  } catch (err) {
+    // Another daemon starting at the same moment got there first
+    if ((err as NodeJS.ErrnoException).code === "EADDRINUSE") return false;
+    throw err;
+  }
+}
+
+function listen(server: net.Server, socketPath: string): Promise<void> {
+  return new Promise((resolve, reject) => {
+    const onError = (err: Error) => reject(err);
+    server.once("error", onError);
+    server.listen(socketPath, () => {
+      server.removeListener("error", onError);
+      // Only this user's agents may talk to the daemon
+      if (process.platform !== "win32") fs.chmodSync(socketPath, 0o600);
+      resolve();
+    });
+  });
+}
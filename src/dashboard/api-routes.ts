@@ -10,6 +10,7 @@
 import http from "node:http";
 import fs from "node:fs";
 import path from "node:path";
+import { createHash, randomBytes } from "node:crypto";
 import { BlackboardStore } from "../storage/blackboard-store.js";
 import { DecisionStore } from "../storage/decision-store.js";
 import { GraphStore } from "../storage/graph-store.js";
@@ -21,6 +22,7 @@ import { GraphEngine } from "../engine/graph.js";
 import { Embedder } from "../embeddings/embedder.js";
 import { IndexManager } from "../embeddings/index-manager.js";
 import { SearchEngine } from "../embeddings/search.js";
+import { loadConfig } from "../config.js";
 import {
   scoreAgent,
   parseDelegationMetadata,
@@ -32,19 +34,132 @@ import {
 } from "../utils/liveness.js";
 import { AnalyticsEngine } from "../analytics/analytics-engine.js";
 import { MetricsStore } from "../analytics/metrics-store.js";
+import { TraceLog, toChromeTrace, toOtlp } from "../analytics/trace-log.js";
+import type { MetricsCollector } from "../analytics/metrics-collector.js";
+import { TwiningError } from "../utils/errors.js";
+import { ChangeFeed, type Change } from "./change-feed.js";
+import { sendBody } from "./compression.js";
+import {
+  applyListQuery,
+  parseListQuery,
+  projectFields,
+  type ListQuery,
+  type ListSpec,
+} from "./list-query.js";
+
+/** In-process sources the dashboard can report when run inside the MCP server. */
+export interface ApiHandlerOptions {
+  metricsCollector?: MetricsCollector;
+  /** How often the change feed checks store generations (default: 1000) */
+  feedPollMs?: number;
+}
+
+/** Keep-alive comment interval for event streams, below common proxy idle timeouts. */
+const EVENTS_HEARTBEAT_MS = 25_000;
+
+/** List parameters accepted by /api/blackboard. */
+const BLACKBOARD_LIST: ListSpec = {
+  sortable: ["id", "timestamp", "entry_type", "scope", "agent_id"],
+  filterable: ["entry_type", "agent_id", "tags"],
+  timeField: "timestamp",
+  defaultOrder: "desc",
+};
 
-/** Send a JSON response with standard headers. */
+/** List parameters accepted by /api/decisions. */
+const DECISIONS_LIST: ListSpec = {
+  sortable: ["id", "timestamp", "domain", "status", "confidence", "scope"],
+  filterable: ["status", "domain", "confidence"],
+  timeField: "timestamp",
+  defaultOrder: "desc",
+};
+
+/** List parameters accepted by /api/handoffs. */
+const HANDOFFS_LIST: ListSpec = {
+  sortable: ["id", "created_at", "source_agent", "result_status"],
+  filterable: ["source_agent", "target_agent", "result_status"],
+  timeField: "created_at",
+  defaultOrder: "desc",
+};
+
+/** List parameters accepted by /api/graph; they page the entities. */
+const ENTITIES_LIST: ListSpec = {
+  sortable: ["id", "name", "type", "updated_at"],
+  filterable: ["type"],
+  timeField: "updated_at",
+  defaultOrder: "asc",
+};
+
+/** Send a JSON response with standard headers, compressed when accepted. */
 function sendJSON(
   res: http.ServerResponse,
   data: unknown,
   statusCode: number = 200,
 ): void {
-  const body = JSON.stringify(data);
-  res.writeHead(statusCode, {
-    "Content-Type": "application/json; charset=utf-8",
-    "Cache-Control": "no-cache",
-  });
-  res.end(body);
+  void sendBody(
+    res,
+    statusCode,
+    {
+      "Content-Type": "application/json; charset=utf-8",
+      "Cache-Control": "no-cache",
+    },
+    JSON.stringify(data),
+  );
+}
+
+/**
+ * Send JSON with an ETag, or 304 Not Modified when the client already has
+ * this version. `build` only runs when the body is actually needed.
+ */
+async function sendCachedJSON(
+  req: http.IncomingMessage,
+  res: http.ServerResponse,
+  etag: string,
+  build: () => Promise<unknown>,
+): Promise<void> {
+  if (req.headers["if-none-match"] === etag) {
+    res.writeHead(304, { ETag: etag, "Cache-Control": "no-cache" });
+    res.end();
+    return;
+  }
+  await sendBody(
+    res,
+    200,
+    {
+      "Content-Type": "application/json; charset=utf-8",
+      "Cache-Control": "no-cache",
+      ETag: etag,
+    },
+    JSON.stringify(await build()),
+  );
+}
+
+/**
+ * Parse a list route's parameters. Answers 400 and returns null when they
+ * are invalid. `version` distinguishes the ETags of different queries.
+ */
+function parseListRequest(
+  res: http.ServerResponse,
+  url: string,
+  spec: ListSpec,
+): { query: ListQuery; version: string } | null {
+  const { search, searchParams } = new URL(url, "http://localhost");
+  try {
+    return {
+      query: parseListQuery(searchParams, spec),
+      version: search
+        ? "-" + createHash("sha1").update(search).digest("base64url").slice(0, 12)
+        : "",
+    };
+  } catch (err: unknown) {
+    if (!(err instanceof TwiningError)) throw err;
+    sendJSON(res, { error: err.message }, 400);
+    return null;
+  }
+}
+
+/** Write one batch of changes as a server-sent event. */
+function writeChanges(res: http.ServerResponse, seq: number, changes: Change[]): void {
+  res.write(`id: ${seq}\nevent: changes\ndata: ${JSON.stringify(changes)}\n\n`);
 }
 
 /**
@@ -58,6 +173,7 @@ function sendJSON(
  */
 export function createApiHandler(
   projectRoot: string,
+  options?: ApiHandlerOptions,
 ): (req: http.IncomingMessage, res: http.ServerResponse) => Promise<boolean> {
   const twiningDir = path.join(projectRoot, ".twining");
   const blackboardStore = new BlackboardStore(twiningDir);
@@ -72,6 +188,13 @@ export function createApiHandler(
     handoffStore,
   );
   const metricsStore = new MetricsStore(twiningDir);
+  const traceLog = new TraceLog(twiningDir);
+  const graphEngine = new GraphEngine(graphStore);
+  // Store generations restart at 0 with the process; the epoch keeps an
+  // ETag from a previous run from matching
+  const etagEpoch = randomBytes(4).toString("hex");
+  const etag = (version: string) => `W/"${etagEpoch}-${version}"`;
+  let eventSeq = 0;
 
   // Engine layer for search — lazily initialized to avoid creating
   // .twining/embeddings/ directory on uninitialized projects
@@ -79,13 +202,20 @@ export function createApiHandler(
     blackboardEngine: BlackboardEngine;
     decisionEngine: DecisionEngine;
     graphEngine: GraphEngine;
+    /** Keyword catch-up for entries written without the index, run once */
+    indexed: Promise<void>;
   } | null = null;
 
   function getSearchEngines() {
     if (!searchEngines) {
-      const embedder = Embedder.getInstance(twiningDir);
+      const config = loadConfig(twiningDir);
+      const embedder = Embedder.getInstance(twiningDir, config.embeddings);
       const indexManager = new IndexManager(twiningDir);
-      const searchEngine = new SearchEngine(embedder, indexManager);
+      const searchEngine = new SearchEngine(
+        embedder,
+        indexManager,
+        config.search?.ann,
+      );
       const bbEngine = new BlackboardEngine(
         blackboardStore,
         embedder,
@@ -105,11 +235,185 @@ export function createApiHandler(
         blackboardEngine: bbEngine,
         decisionEngine: decEngine,
         graphEngine: grEngine,
+        indexed: searchEngine.indexMissing(blackboardStore, decisionStore),
       };
     }
     return searchEngines;
   }
 
+  /** Dashboard status summary: counts and last activity across stores. */
+  async function buildStatus() {
+    const { total_count: blackboard_entries } =
+      await blackboardStore.read();
+
+    const index = await decisionStore.getIndex();
+    const active_decisions = index.filter(
+      (e) => e.status === "active",
+    ).length;
+    const provisional_decisions = index.filter(
+      (e) => e.status === "provisional",
+    ).length;
+
+    const entities = await graphStore.getEntities();
+    const relations = await graphStore.getRelations();
+    const graph_entities = entities.length;
+    const graph_relations = relations.length;
+
+    // Compute last_activity from most recent blackboard entry and decision
+    const recentEntries = await blackboardStore.recent(1);
+    const lastBBActivity =
+      recentEntries.length > 0
+        ? recentEntries[recentEntries.length - 1]!.timestamp
+        : null;
+    const lastDecisionActivity =
+      index.length > 0
+        ? index.reduce(
+            (latest, e) =>
+              e.timestamp > latest ? e.timestamp : latest,
+            index[0]!.timestamp,
+          )
+        : null;
+
+    let last_activity = "none";
+    if (lastBBActivity && lastDecisionActivity) {
+      last_activity =
+        lastBBActivity > lastDecisionActivity
+          ? lastBBActivity
+          : lastDecisionActivity;
+    } else if (lastBBActivity) {
+      last_activity = lastBBActivity;
+    } else if (lastDecisionActivity) {
+      last_activity = lastDecisionActivity;
+    }
+
+    // Coordination counts
+    const agents = await agentStore.getAll();
+    const registered_agents = agents.length;
+    const now = new Date();
+    const active_agents = agents.filter(
+      (a) =>
+        computeLiveness(a.last_active, now, DEFAULT_LIVENESS_THRESHOLDS) ===
+        "active",
+    ).length;
+
+    const { entries: needEntries } = await blackboardStore.read({
+      entry_types: ["need"],
+    });
+    const pending_delegations = needEntries.filter((entry) => {
+      const meta = parseDelegationMetadata(entry);
+      return meta !== null && !isDelegationExpired(meta, now);
+    }).length;
+
+    const handoffs = await handoffStore.list({});
+    const total_handoffs = handoffs.length;
+
+    return {
+      initialized: true,
+      project_name: path.basename(path.resolve(projectRoot)),
+      blackboard_entries,
+      active_decisions,
+      provisional_decisions,
+      graph_entities,
+      graph_relations,
+      last_activity,
+      registered_agents,
+      active_agents,
+      pending_delegations,
+      total_handoffs,
+    };
+  }
+
+  /** Registered agents with their current liveness. */
+  async function agentsWithLiveness() {
+    const agents = await agentStore.getAll();
+    const now = new Date();
+    return agents.map((agent) => ({
+      ...agent,
+      liveness: computeLiveness(
+        agent.last_active,
+        now,
+        DEFAULT_LIVENESS_THRESHOLDS,
+      ),
+    }));
+  }
+
+  /**
+   * Generations of every store plus the current minute, for responses
+   * that also depend on elapsed time (liveness, delegation expiry).
+   */
+  async function storeVersion(): Promise<string> {
+    return [
+      await blackboardStore.generation(),
+      await decisionStore.generation(),
+      await graphStore.generation(),
+      await handoffStore.generation(),
+      await agentStore.generation(),
+      Math.floor(Date.now() / 60_000),
+    ].join(".");
+  }
+
+  const changeFeed = new ChangeFeed(
+    [
+      {
+        kind: "entry",
+        appendOnly: true,
+        generation: () => blackboardStore.generation(),
+        load: async () =>
+          (await blackboardStore.read()).entries.map((entry) => ({
+            id: entry.id,
+            value: entry,
+          })),
+      },
+      {
+        kind: "decision",
+        generation: () => decisionStore.generation(),
+        load: async () =>
+          (await decisionStore.getIndex()).map((entry) => ({
+            id: entry.id,
+            value: entry,
+          })),
+      },
+      {
+        kind: "entity",
+        generation: () => graphStore.generation(),
+        load: async () =>
+          (await graphStore.getEntities()).map((entity) => ({
+            id: entity.id,
+            value: entity,
+          })),
+      },
+      {
+        kind: "relation",
+        generation: () => graphStore.generation(),
+        load: async () =>
+          (await graphStore.getRelations()).map((relation) => ({
+            id: relation.id,
+            value: relation,
+          })),
+      },
+      {
+        kind: "handoff",
+        generation: () => handoffStore.generation(),
+        load: async () =>
+          (await handoffStore.list({})).map((entry) => ({
+            id: entry.id,
+            value: entry,
+          })),
+      },
+      {
+        kind: "agent",
+        generation: () => agentStore.generation(),
+        load: async () =>
+          (await agentsWithLiveness()).map((agent) => ({
+            id: agent.agent_id,
+            value: agent,
+          })),
+      },
+    ],
+    buildStatus,
+    options?.feedPollMs,
+  );
+
   return async (
     req: http.IncomingMessage,
     res: http.ServerResponse,
@@ -177,12 +481,16 @@ export function createApiHandler(
         }
 
         const engines = getSearchEngines();
+        await engines.indexed;
         const allResults: UnifiedResult[] = [];
         let fallbackMode = true;
 
         // Search blackboard
         if (requestedTypes.includes("blackboard")) {
-          const bbResult = await engines.blackboardEngine.query(q, { limit });
+          const bbResult = await engines.blackboardEngine.query(q, {
+            scope: scope || undefined,
+            limit,
+          });
           if (!bbResult.fallback_mode) {
             fallbackMode = false;
           }
@@ -216,6 +524,7 @@ export function createApiHandler(
               domain: domain || undefined,
               status: (status as "active" | "provisional" | "superseded" | "overridden") || undefined,
               confidence: (confidence as "high" | "medium" | "low") || undefined,
+              scope: scope || undefined,
             },
             limit,
           );
@@ -276,6 +585,27 @@ export function createApiHandler(
       return true;
     }
 
+    // GET /api/events — server-sent change feed
+    if (url === "/api/events") {
+      res.writeHead(200, {
+        "Content-Type": "text/event-stream; charset=utf-8",
+        "Cache-Control": "no-cache",
+        Connection: "keep-alive",
+      });
+      // Reconnect quickly; the client resyncs with ETag'd fetches on open
+      res.write("retry: 3000\n\n");
+      const unsubscribe = changeFeed.subscribe((changes) => {
+        writeChanges(res, ++eventSeq, changes);
+      });
+      const heartbeat = setInterval(() => res.write(": ping\n\n"), EVENTS_HEARTBEAT_MS);
+      heartbeat.unref?.();
+      req.on("close", () => {
+        clearInterval(heartbeat);
+        unsubscribe();
+      });
+      return true;
+    }
+
     // GET /api/status
     if (url === "/api/status") {
       try {
@@ -297,84 +627,12 @@ export function createApiHandler(
           return true;
         }
 
-        const { total_count: blackboard_entries } =
-          await blackboardStore.read();
-
-        const index = await decisionStore.getIndex();
-        const active_decisions = index.filter(
-          (e) => e.status === "active",
-        ).length;
-        const provisional_decisions = index.filter(
-          (e) => e.status === "provisional",
-        ).length;
-
-        const entities = await graphStore.getEntities();
-        const relations = await graphStore.getRelations();
-        const graph_entities = entities.length;
-        const graph_relations = relations.length;
-
-        // Compute last_activity from most recent blackboard entry and decision
-        const recentEntries = await blackboardStore.recent(1);
-        const lastBBActivity =
-          recentEntries.length > 0
-            ? recentEntries[recentEntries.length - 1]!.timestamp
-            : null;
-        const lastDecisionActivity =
-          index.length > 0
-            ? index.reduce(
-                (latest, e) =>
-                  e.timestamp > latest ? e.timestamp : latest,
-                index[0]!.timestamp,
-              )
-            : null;
-
-        let last_activity = "none";
-        if (lastBBActivity && lastDecisionActivity) {
-          last_activity =
-            lastBBActivity > lastDecisionActivity
-              ? lastBBActivity
-              : lastDecisionActivity;
-        } else if (lastBBActivity) {
-          last_activity = lastBBActivity;
-        } else if (lastDecisionActivity) {
-          last_activity = lastDecisionActivity;
-        }
-
-        // Coordination counts
-        const agents = await agentStore.getAll();
-        const registered_agents = agents.length;
-        const now = new Date();
-        const active_agents = agents.filter(
-          (a) =>
-            computeLiveness(a.last_active, now, DEFAULT_LIVENESS_THRESHOLDS) ===
-            "active",
-        ).length;
-
-        const { entries: needEntries } = await blackboardStore.read({
-          entry_types: ["need"],
-        });
-        const pending_delegations = needEntries.filter((entry) => {
-          const meta = parseDelegationMetadata(entry);
-          return meta !== null && !isDelegationExpired(meta, now);
-        }).length;
-
-        const handoffs = await handoffStore.list({});
-        const total_handoffs = handoffs.length;
-
-        sendJSON(res, {
-          initialized: true,
-          project_name: path.basename(path.resolve(projectRoot)),
-          blackboard_entries,
-          active_decisions,
-          provisional_decisions,
-          graph_entities,
-          graph_relations,
-          last_activity,
-          registered_agents,
-          active_agents,
-          pending_delegations,
-          total_handoffs,
-        });
+        await sendCachedJSON(
+          req,
+          res,
+          etag(`status-${await storeVersion()}`),
+          buildStatus,
+        );
       } catch (err: unknown) {
         console.error("[twining] API /api/status error:", err);
         sendJSON(res, { error: "Internal server error" }, 500);
@@ -382,8 +640,8 @@ export function createApiHandler(
       return true;
     }
 
-    // GET /api/blackboard
-    if (url === "/api/blackboard") {
+    // GET /api/blackboard?limit=&cursor=&sort=&order=&fields=&entry_type=...
+    if (url === "/api/blackboard" || url.startsWith("/api/blackboard?")) {
       try {
         if (!fs.existsSync(twiningDir)) {
           sendJSON(res, {
@@ -394,8 +652,26 @@ export function createApiHandler(
           return true;
         }
 
-        const { entries, total_count } = await blackboardStore.read();
-        sendJSON(res, { initialized: true, entries, total_count });
+        const list = parseListRequest(res, url, BLACKBOARD_LIST);
+        if (!list) return true;
+        await sendCachedJSON(
+          req,
+          res,
+          etag(`bb-${await blackboardStore.generation()}${list.version}`),
+          async () => {
+            const { entries, total_count } = await blackboardStore.read();
+            if (!list.query.active) {
+              return { initialized: true, entries, total_count };
+            }
+            const page = applyListQuery(entries, list.query, BLACKBOARD_LIST);
+            return {
+              initialized: true,
+              entries: projectFields(page.items, list.query.fields),
+              total_count: page.total,
+              next_cursor: page.next_cursor,
+            };
+          },
+        );
       } catch (err: unknown) {
         console.error("[twining] API /api/blackboard error:", err);
         sendJSON(res, { error: "Internal server error" }, 500);
@@ -431,8 +707,8 @@ export function createApiHandler(
       return true;
     }
 
-    // GET /api/decisions
-    if (url === "/api/decisions") {
+    // GET /api/decisions?limit=&cursor=&sort=&order=&fields=&status=...
+    if (url === "/api/decisions" || url.startsWith("/api/decisions?")) {
       try {
         if (!fs.existsSync(twiningDir)) {
           sendJSON(res, {
@@ -443,12 +719,30 @@ export function createApiHandler(
           return true;
         }
 
-        const decisions = await decisionStore.getIndex();
-        sendJSON(res, {
-          initialized: true,
-          decisions,
-          total_count: decisions.length,
-        });
+        const list = parseListRequest(res, url, DECISIONS_LIST);
+        if (!list) return true;
+        await sendCachedJSON(
+          req,
+          res,
+          etag(`decisions-${await decisionStore.generation()}${list.version}`),
+          async () => {
+            const decisions = await decisionStore.getIndex();
+            if (!list.query.active) {
+              return {
+                initialized: true,
+                decisions,
+                total_count: decisions.length,
+              };
+            }
+            const page = applyListQuery(decisions, list.query, DECISIONS_LIST);
+            return {
+              initialized: true,
+              decisions: projectFields(page.items, list.query.fields),
+              total_count: page.total,
+              next_cursor: page.next_cursor,
+            };
+          },
+        );
       } catch (err: unknown) {
         console.error("[twining] API /api/decisions error:", err);
         sendJSON(res, { error: "Internal server error" }, 500);
@@ -464,17 +758,11 @@ export function createApiHandler(
           return true;
         }
 
-        const agents = await agentStore.getAll();
-        const now = new Date();
-        const mapped = agents.map((agent) => ({
-          ...agent,
-          liveness: computeLiveness(
-            agent.last_active,
-            now,
-            DEFAULT_LIVENESS_THRESHOLDS,
-          ),
-        }));
-        sendJSON(res, { initialized: true, agents: mapped, total: mapped.length });
+        const version = `${await agentStore.generation()}.${Math.floor(Date.now() / 60_000)}`;
+        await sendCachedJSON(req, res, etag(`agents-${version}`), async () => {
+          const mapped = await agentsWithLiveness();
+          return { initialized: true, agents: mapped, total: mapped.length };
+        });
       } catch (err: unknown) {
         console.error("[twining] API /api/agents error:", err);
         sendJSON(res, { error: "Internal server error" }, 500);
@@ -490,76 +778,83 @@ export function createApiHandler(
           return true;
         }
 
-        const { entries: needEntries } = await blackboardStore.read({
-          entry_types: ["need"],
-        });
-        const agents = await agentStore.getAll();
-        const now = new Date();
-
-        const delegations: Array<{
-          entry_id: string;
-          timestamp: string;
-          summary: string;
-          scope: string;
-          agent_id: string;
-          required_capabilities: string[];
-          urgency: string;
-          expires_at: string;
-          expired: boolean;
-          suggested_agents: Array<{
-            agent_id: string;
-            capabilities: string[];
-            role?: string;
-            liveness: string;
-            total_score: number;
-          }>;
-        }> = [];
-
-        for (const entry of needEntries) {
-          const meta = parseDelegationMetadata(entry);
-          if (!meta) continue;
-
-          const expired = isDelegationExpired(meta, now);
-
-          // Score agents, filter out gone, sort by total_score, take top 5
-          const scored = agents
-            .map((agent) =>
-              scoreAgent(
-                agent,
-                meta.required_capabilities,
-                DEFAULT_LIVENESS_THRESHOLDS,
-                now,
-              ),
-            )
-            .filter((s) => s.liveness !== "gone")
-            .sort((a, b) => b.total_score - a.total_score)
-            .slice(0, 5)
-            .map((s) => ({
-              agent_id: s.agent_id,
-              capabilities: s.capabilities,
-              role: s.role,
-              liveness: s.liveness,
-              total_score: s.total_score,
-            }));
-
-          delegations.push({
-            entry_id: entry.id,
-            timestamp: entry.timestamp,
-            summary: entry.summary,
-            scope: entry.scope,
-            agent_id: entry.agent_id,
-            required_capabilities: meta.required_capabilities,
-            urgency: meta.urgency,
-            expires_at: meta.expires_at,
-            expired,
-            suggested_agents: scored,
+        const version = [
+          await blackboardStore.generation(),
+          await agentStore.generation(),
+          Math.floor(Date.now() / 60_000),
+        ].join(".");
+        await sendCachedJSON(req, res, etag(`delegations-${version}`), async () => {
+          const { entries: needEntries } = await blackboardStore.read({
+            entry_types: ["need"],
           });
-        }
+          const agents = await agentStore.getAll();
+          const now = new Date();
 
-        sendJSON(res, {
-          initialized: true,
-          delegations,
-          total: delegations.length,
+          const delegations: Array<{
+            entry_id: string;
+            timestamp: string;
+            summary: string;
+            scope: string;
+            agent_id: string;
+            required_capabilities: string[];
+            urgency: string;
+            expires_at: string;
+            expired: boolean;
+            suggested_agents: Array<{
+              agent_id: string;
+              capabilities: string[];
+              role?: string;
+              liveness: string;
+              total_score: number;
+            }>;
+          }> = [];
+
+          for (const entry of needEntries) {
+            const meta = parseDelegationMetadata(entry);
+            if (!meta) continue;
+
+            const expired = isDelegationExpired(meta, now);
+
+            // Score agents, filter out gone, sort by total_score, take top 5
+            const scored = agents
+              .map((agent) =>
+                scoreAgent(
+                  agent,
+                  meta.required_capabilities,
+                  DEFAULT_LIVENESS_THRESHOLDS,
+                  now,
+                ),
+              )
+              .filter((s) => s.liveness !== "gone")
+              .sort((a, b) => b.total_score - a.total_score)
+              .slice(0, 5)
+              .map((s) => ({
+                agent_id: s.agent_id,
+                capabilities: s.capabilities,
+                role: s.role,
+                liveness: s.liveness,
+                total_score: s.total_score,
+              }));
+
+            delegations.push({
+              entry_id: entry.id,
+              timestamp: entry.timestamp,
+              summary: entry.summary,
+              scope: entry.scope,
+              agent_id: entry.agent_id,
+              required_capabilities: meta.required_capabilities,
+              urgency: meta.urgency,
+              expires_at: meta.expires_at,
+              expired,
+              suggested_agents: scored,
+            });
+          }
+
+          return {
+            initialized: true,
+            delegations,
+            total: delegations.length,
+          };
         });
       } catch (err: unknown) {
         console.error("[twining] API /api/delegations error:", err);
@@ -596,20 +891,38 @@ export function createApiHandler(
       return true;
     }
 
-    // GET /api/handoffs
-    if (url === "/api/handoffs") {
+    // GET /api/handoffs?limit=&cursor=&sort=&order=&fields=&source_agent=...
+    if (url === "/api/handoffs" || url.startsWith("/api/handoffs?")) {
       try {
         if (!fs.existsSync(twiningDir)) {
           sendJSON(res, { initialized: false, handoffs: [], total: 0 });
           return true;
         }
 
-        const entries = await handoffStore.list({});
-        sendJSON(res, {
-          initialized: true,
-          handoffs: entries,
-          total: entries.length,
-        });
+        const list = parseListRequest(res, url, HANDOFFS_LIST);
+        if (!list) return true;
+        await sendCachedJSON(
+          req,
+          res,
+          etag(`handoffs-${await handoffStore.generation()}${list.version}`),
+          async () => {
+            const entries = await handoffStore.list({});
+            if (!list.query.active) {
+              return {
+                initialized: true,
+                handoffs: entries,
+                total: entries.length,
+              };
+            }
+            const page = applyListQuery(entries, list.query, HANDOFFS_LIST);
+            return {
+              initialized: true,
+              handoffs: projectFields(page.items, list.query.fields),
+              total: page.total,
+              next_cursor: page.next_cursor,
+            };
+          },
+        );
       } catch (err: unknown) {
         console.error("[twining] API /api/handoffs error:", err);
         sendJSON(res, { error: "Internal server error" }, 500);
@@ -617,8 +930,53 @@ export function createApiHandler(
       return true;
     }
 
-    // GET /api/graph
-    if (url === "/api/graph") {
+    // GET /api/graph/neighbors/:id?depth=N — one entity's neighborhood,
+    // for loading the graph view incrementally
+    if (url.startsWith("/api/graph/neighbors/")) {
+      try {
+        const parsed = new URL(url, "http://localhost");
+        const id = decodeURIComponent(
+          parsed.pathname.slice("/api/graph/neighbors/".length),
+        );
+        if (!id) {
+          sendJSON(res, { error: "Entity ID required" }, 400);
+          return true;
+        }
+        if (!fs.existsSync(twiningDir)) {
+          sendJSON(res, { error: "Entity not found" }, 404);
+          return true;
+        }
+        const entity = await graphStore.getEntityById(id);
+        if (!entity) {
+          sendJSON(res, { error: "Entity not found" }, 404);
+          return true;
+        }
+
+        const depthParam = parsed.searchParams.get("depth");
+        const depth = depthParam ? parseInt(depthParam, 10) : 1;
+        await sendCachedJSON(
+          req,
+          res,
+          etag(`neighbors-${await graphStore.generation()}-${encodeURIComponent(id)}-${depth}`),
+          async () => {
+            const { center, neighbors } = await graphEngine.neighbors(id, depth);
+            return {
+              center,
+              entities: neighbors.map((n) => n.entity),
+              relations: neighbors.map((n) => n.relation),
+            };
+          },
+        );
+      } catch (err: unknown) {
+        console.error("[twining] API /api/graph/neighbors/:id error:", err);
+        sendJSON(res, { error: "Internal server error" }, 500);
+      }
+      return true;
+    }
+
+    // GET /api/graph?limit=&cursor=&sort=&order=&fields=&type=...
+    // Paging applies to entities; relations are those touching the page
+    if (url === "/api/graph" || url.startsWith("/api/graph?")) {
       try {
         if (!fs.existsSync(twiningDir)) {
           sendJSON(res, {
@@ -631,15 +989,38 @@ export function createApiHandler(
           return true;
         }
 
-        const entities = await graphStore.getEntities();
-        const relations = await graphStore.getRelations();
-        sendJSON(res, {
-          initialized: true,
-          entities,
-          relations,
-          entity_count: entities.length,
-          relation_count: relations.length,
-        });
+        const list = parseListRequest(res, url, ENTITIES_LIST);
+        if (!list) return true;
+        await sendCachedJSON(
+          req,
+          res,
+          etag(`graph-${await graphStore.generation()}${list.version}`),
+          async () => {
+            const entities = await graphStore.getEntities();
+            const relations = await graphStore.getRelations();
+            if (!list.query.active) {
+              return {
+                initialized: true,
+                entities,
+                relations,
+                entity_count: entities.length,
+                relation_count: relations.length,
+              };
+            }
+            const page = applyListQuery(entities, list.query, ENTITIES_LIST);
+            const pageIds = new Set(page.items.map((entity) => entity.id));
+            return {
+              initialized: true,
+              entities: projectFields(page.items, list.query.fields),
+              relations: relations.filter(
+                (r) => pageIds.has(r.source) || pageIds.has(r.target),
+              ),
+              entity_count: page.total,
+              relation_count: relations.length,
+              next_cursor: page.next_cursor,
+            };
+          },
+        );
       } catch (err: unknown) {
         console.error("[twining] API /api/graph error:", err);
         sendJSON(res, { error: "Internal server error" }, 500);
@@ -713,6 +1094,79 @@ export function createApiHandler(
       return true;
     }
 
+    // GET /api/analytics/counters — in-process counters (cache hits/misses)
+    if (url === "/api/analytics/counters") {
+      sendJSON(res, { counters: options?.metricsCollector?.getCounters() ?? {} });
+      return true;
+    }
+
+    // GET /api/traces/export?format=chrome|otlp&limit=N — download traces
+    if (url.startsWith("/api/traces/export")) {
+      try {
+        const parsed = new URL(url, "http://localhost");
+        const format = parsed.searchParams.get("format") ?? "chrome";
+        if (format !== "chrome" && format !== "otlp") {
+          sendJSON(res, { error: "format must be chrome or otlp" }, 400);
+          return true;
+        }
+        const limitParam = parsed.searchParams.get("limit");
+        const limit = limitParam ? parseInt(limitParam, 10) : 500;
+        const traces = (await traceLog.recent(limit)).reverse();
+        if (format === "chrome") {
+          sendJSON(res, toChromeTrace(traces));
+        } else {
+          // OTLP file format: one ExportTraceServiceRequest per line
+          await sendBody(
+            res,
+            200,
+            {
+              "Content-Type": "application/x-ndjson; charset=utf-8",
+              "Cache-Control": "no-cache",
+            },
+            JSON.stringify(toOtlp(traces)) + "\n",
+          );
+        }
+      } catch (err: unknown) {
+        console.error("[twining] API /api/traces/export error:", err);
+        sendJSON(res, { error: "Internal server error" }, 500);
+      }
+      return true;
+    }
+
+    // GET /api/traces/:id — one trace with its spans
+    if (url.startsWith("/api/traces/")) {
+      try {
+        const traceId = decodeURIComponent(url.slice("/api/traces/".length));
+        const trace = await traceLog.get(traceId);
+        if (!trace) {
+          sendJSON(res, { error: "Trace not found" }, 404);
+          return true;
+        }
+        sendJSON(res, { trace });
+      } catch (err: unknown) {
+        console.error("[twining] API /api/traces/:id error:", err);
+        sendJSON(res, { error: "Internal server error" }, 500);
+      }
+      return true;
+    }
+
+    // GET /api/traces?limit=N&min_ms=M — newest kept traces, slowest calls only
+    if (url === "/api/traces" || url.startsWith("/api/traces?")) {
+      try {
+        const parsed = new URL(url, "http://localhost");
+        const limitParam = parsed.searchParams.get("limit");
+        const minParam = parsed.searchParams.get("min_ms");
+        const traces = await traceLog.list(limitParam ? parseInt(limitParam, 10) : 50, {
+          min_duration_ms: minParam ? parseFloat(minParam) : 0,
+        });
+        sendJSON(res, { traces, total: traces.length });
+      } catch (err: unknown) {
+        console.error("[twining] API /api/traces error:", err);
+        sendJSON(res, { error: "Internal server error" }, 500);
+      }
+      return true;
+    }
+
     // Not an API route we handle
     return false;
   };
@@ -0,0 +1,133 @@
+/**
+ * Change feed for the dashboard's server-sent events stream.
+ *
+ * While at least one client is subscribed, polls each collection's store
+ * generation counter — a cheap stat/tail check — and only when it moves
+ * reloads that collection and diffs it against the last snapshot. The
+ * diff goes out as typed deltas ("entry.added", "decision.updated",
+ * "relation.removed", ...) followed by a fresh "status" summary.
+ * Generation polling catches writes from other processes, which
+ * in-process hooks would miss, without any fs.watch platform quirks.
+ *
+ * CRITICAL: Never use console.log or process.stdout in this module.
+ */
+
+/** Poll store generations this often while clients are connected. */
+export const DEFAULT_FEED_POLL_MS = 1000;
+
+/** One typed delta. `data` is the new value for added/updated items. */
+export interface Change {
+  type: string;
+  id?: string;
+  data?: unknown;
+}
+
+/** A store-backed collection the feed diffs. */
+export interface FeedCollection {
+  /** Event prefix: "entry" → entry.added / entry.updated / entry.removed */
+  kind: string;
+  generation: () => Promise<number>;
+  load: () => Promise<Array<{ id: string; value: unknown }>>;
+  /** Items never change once written; diff by id only. */
+  appendOnly?: boolean;
+}
+
+interface Snapshot {
+  gen: number;
+  /** id → serialized value ("" for append-only collections) */
+  items: Map<string, string>;
+}
+
+export type ChangeListener = (changes: Change[]) => void;
+
+export class ChangeFeed {
+  private readonly collections: FeedCollection[];
+  private readonly status: () => Promise<unknown>;
+  private readonly pollMs: number;
+  private readonly listeners = new Set<ChangeListener>();
+  private readonly snapshots = new Map<string, Snapshot>();
+  private timer: NodeJS.Timeout | null = null;
+  private polling: Promise<Change[]> | null = null;
+
+  constructor(
+    collections: FeedCollection[],
+    status: () => Promise<unknown>,
+    pollMs = DEFAULT_FEED_POLL_MS,
+  ) {
+    this.collections = collections;
+    this.status = status;
+    this.pollMs = pollMs;
+  }
+
+  /** Receive batches of changes; polling runs while anyone is subscribed. */
+  subscribe(listener: ChangeListener): () => void {
+    this.listeners.add(listener);
+    if (!this.timer) {
+      // Take the baseline now so the first tick only reports real changes
+      void this.poll();
+      this.timer = setInterval(() => void this.poll(), this.pollMs);
+      this.timer.unref?.();
+    }
+    return () => {
+      this.listeners.delete(listener);
+      if (this.listeners.size === 0 && this.timer) {
+        clearInterval(this.timer);
+        this.timer = null;
+        // A stale baseline would replay everything on the next subscribe
+        this.snapshots.clear();
+      }
+    };
+  }
+
+  /**
+   * Check every collection once and notify listeners of any changes.
+   * Concurrent calls share one check. Never throws.
+   */
+  poll(): Promise<Change[]> {
+    if (!this.polling) {
+      this.polling = this.check()
+        .catch((err: unknown) => {
+          console.error("[twining] Dashboard change feed poll failed (non-fatal):", err);
+          return [];
+        })
+        .finally(() => {
+          this.polling = null;
+        });
+    }
+    return this.polling;
+  }
+
+  private async check(): Promise<Change[]> {
+    const changes: Change[] = [];
+    for (const collection of this.collections) {
+      const gen = await collection.generation();
+      const previous = this.snapshots.get(collection.kind);
+      if (previous && previous.gen === gen) continue;
+
+      const items = new Map<string, string>();
+      for (const { id, value } of await collection.load()) {
+        const serialized = collection.appendOnly ? "" : JSON.stringify(value);
+        items.set(id, serialized);
+        if (!previous) continue;
+        const before = previous.items.get(id);
+        if (before === undefined) {
+          changes.push({ type: `${collection.kind}.added`, id, data: value });
+        } else if (before !== serialized) {
+          changes.push({ type: `${collection.kind}.updated`, id, data: value });
+        }
+      }
+      if (previous) {
+        for (const id of previous.items.keys()) {
+          if (!items.has(id)) changes.push({ type: `${collection.kind}.removed`, id });
+        }
+      }
+      this.snapshots.set(collection.kind, { gen, items });
+    }
+
+    // A generation can move without a visible change (e.g. compaction)
+    if (changes.length === 0) return changes;
+    changes.push({ type: "status", data: await this.status() });
+    for (const listener of this.listeners) listener(changes);
+    return changes;
+  }
+}
@@ -0,0 +1,117 @@
+/**
+ * Content-Encoding negotiation for dashboard responses.
+ * Clients that accept brotli get brotli, otherwise gzip; bodies too small
+ * to benefit go out as-is.
+ *
+ * Compression runs on the libuv thread pool, never on the event loop that
+ * also serves MCP stdio. Static assets are precompressed at build time
+ * (scripts/precompress-dashboard.mjs) and served from their .br/.gz
+ * siblings.
+ *
+ * CRITICAL: Never use console.log or process.stdout in this module.
+ */
+import http from "node:http";
+import zlib from "node:zlib";
+import { promisify } from "node:util";
+
+const brotliCompress = promisify(zlib.brotliCompress);
+const gzip = promisify(zlib.gzip);
+
+/** Bodies below this size are sent uncompressed. */
+export const MIN_COMPRESS_BYTES = 1024;
+
+/** Static asset types worth compressing; images are already compressed. */
+export const COMPRESSIBLE_EXTENSIONS = new Set([".html", ".css", ".js", ".json", ".svg"]);
+
+export type Encoding = "br" | "gzip";
+
+/** File suffix of a precompressed sibling, per encoding. */
+export const PRECOMPRESSED_SUFFIX: Record<Encoding, string> = { br: ".br", gzip: ".gz" };
+
+/**
+ * Choose an encoding from an Accept-Encoding header. Prefers brotli at
+ * equal weight; codings with q=0 are refused.
+ */
+export function negotiateEncoding(
+  header: string | string[] | undefined,
+): Encoding | null {
+  if (!header) return null;
+  const weights = new Map<string, number>();
+  for (const part of (Array.isArray(header) ? header.join(",") : header).split(",")) {
+    const [name, ...params] = part.trim().toLowerCase().split(";");
+    if (!name) continue;
+    let q = 1;
+    for (const param of params) {
+      const [key, value] = param.trim().split("=");
+      if (key === "q" && value !== undefined) q = parseFloat(value) || 0;
+    }
+    weights.set(name, q);
+  }
+  const weightOf = (name: Encoding) => weights.get(name) ?? weights.get("*") ?? 0;
+  const br = weightOf("br");
+  const gzip = weightOf("gzip");
+  if (br > 0 && br >= gzip) return "br";
+  if (gzip > 0) return "gzip";
+  return null;
+}
+
+/**
+ * Compress a body off the event loop. `level` "max" is for content
+ * compressed once and reused (the build-time precompression); "fast" is
+ * for per-request JSON, where encode time matters more than ratio.
+ */
+export function compress(
+  body: Buffer,
+  encoding: Encoding,
+  level: "fast" | "max" = "fast",
+): Promise<Buffer> {
+  if (encoding === "br") {
+    return brotliCompress(body, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_QUALITY]:
+          level === "max" ? zlib.constants.BROTLI_MAX_QUALITY : 1,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: body.length,
+      },
+    });
+  }
+  return gzip(body, {
+    level: level === "max" ? zlib.constants.Z_BEST_COMPRESSION : zlib.constants.Z_BEST_SPEED,
+  });
+}
+
+/**
+ * Send a response body, compressed when the request accepts it and the
+ * body is large enough to be worth it. Never rejects: if compression
+ * fails the body goes out uncompressed.
+ */
+export async function sendBody(
+  res: http.ServerResponse,
+  statusCode: number,
+  headers: http.OutgoingHttpHeaders,
+  body: string | Buffer,
+): Promise<void> {
+  const raw = typeof body === "string" ? Buffer.from(body) : body;
+  const encoding =
+    raw.length >= MIN_COMPRESS_BYTES
+      ? negotiateEncoding(res.req?.headers["accept-encoding"])
+      : null;
+  let encoded: Buffer | null = null;
+  if (encoding) {
+    try {
+      encoded = await compress(raw, encoding);
+    } catch {
+      // Send it as-is
+    }
+  }
+  if (!encoding || !encoded) {
+    res.writeHead(statusCode, { ...headers, Vary: "Accept-Encoding" });
+    res.end(raw);
+    return;
+  }
+  res.writeHead(statusCode, {
+    ...headers,
+    "Content-Encoding": encoding,
+    Vary: "Accept-Encoding",
+  });
+  res.end(encoded);
+}
@@ -9,8 +9,17 @@ import http from "node:http";
 import fs from "node:fs/promises";
 import path from "node:path";
 import { fileURLToPath } from "node:url";
+import { createHash } from "node:crypto";
 import { getDashboardConfig } from "./dashboard-config.js";
-import { createApiHandler } from "./api-routes.js";
+import { createApiHandler, type ApiHandlerOptions } from "./api-routes.js";
+import {
+  compress,
+  COMPRESSIBLE_EXTENSIONS,
+  MIN_COMPRESS_BYTES,
+  negotiateEncoding,
+  PRECOMPRESSED_SUFFIX,
+  type Encoding,
+} from "./compression.js";
 
 /**
  * Check if a Twining dashboard for the SAME project is already running on the given port.
@@ -61,18 +70,121 @@ const MIME_TYPES: Record<string, string> = {
   ".ico": "image/x-icon",
 };
 
+/** Cache-Control for vendor assets requested with their content hash. */
+const IMMUTABLE_CACHE = "public, max-age=31536000, immutable";
+
+/** Vendor script and stylesheet references in index.html. */
+const VENDOR_REF = /((?:src|href)=")(vendor\/[^"?]+)"/g;
+
+/** A static file held in memory, with its compressed encodings. */
+interface StaticAsset {
+  mtimeMs: number;
+  size: number;
+  body: Buffer;
+  /** First 16 hex chars of the body's SHA-256 */
+  hash: string;
+  /** Precompressed siblings, or compressions started on first request */
+  encoded: Partial<Record<Encoding, Promise<Buffer>>>;
+}
+
 /**
  * Create a static file serving handler for the given directory.
  * Includes path traversal prevention (403) and 404 for missing files.
+ *
+ * Files are cached in memory until their mtime or size changes. Encoded
+ * bodies come from the .br/.gz siblings written at build time; without a
+ * current sibling (a source checkout, or index.html, which is rewritten
+ * here) a file is compressed once per encoding, off the event loop.
+ * index.html links vendor assets with a `?v=<hash>` query; requests that
+ * carry the current hash are cached as immutable, everything else is
+ * revalidated by ETag.
  */
 function serveStatic(
   publicDir: string,
 ): (req: http.IncomingMessage, res: http.ServerResponse) => Promise<void> {
+  const cache = new Map<string, StaticAsset>();
+
+  async function load(filePath: string): Promise<StaticAsset> {
+    const stat = await fs.stat(filePath);
+    const cached = cache.get(filePath);
+    if (cached && cached.mtimeMs === stat.mtimeMs && cached.size === stat.size) {
+      return cached;
+    }
+    let body = await fs.readFile(filePath);
+    const rewritten = path.basename(filePath) === "index.html";
+    if (rewritten) {
+      body = Buffer.from(await versionVendorRefs(body.toString("utf-8")));
+    }
+    const asset: StaticAsset = {
+      mtimeMs: stat.mtimeMs,
+      size: stat.size,
+      body,
+      hash: createHash("sha256").update(body).digest("hex").slice(0, 16),
+      encoded: {},
+    };
+    if (!rewritten && COMPRESSIBLE_EXTENSIONS.has(path.extname(filePath))) {
+      for (const encoding of ["br", "gzip"] as const) {
+        const encoded = await readPrecompressed(
+          filePath + PRECOMPRESSED_SUFFIX[encoding],
+          stat.mtimeMs,
+        );
+        if (encoded) asset.encoded[encoding] = Promise.resolve(encoded);
+      }
+    }
+    cache.set(filePath, asset);
+    return asset;
+  }
+
+  /** A precompressed sibling, unless it is missing or older than its source. */
+  async function readPrecompressed(
+    siblingPath: string,
+    sourceMtimeMs: number,
+  ): Promise<Buffer | null> {
+    try {
+      const stat = await fs.stat(siblingPath);
+      if (stat.mtimeMs < sourceMtimeMs) return null;
+      return await fs.readFile(siblingPath);
+    } catch {
+      return null;
+    }
+  }
+
+  /** The asset's body in `encoding`, compressing it on first use. */
+  async function encodedBody(asset: StaticAsset, encoding: Encoding): Promise<Buffer | null> {
+    const pending = (asset.encoded[encoding] ??= compress(asset.body, encoding, "max"));
+    try {
+      return await pending;
+    } catch {
+      // Retry on a later request; send this one uncompressed
+      if (asset.encoded[encoding] === pending) delete asset.encoded[encoding];
+      return null;
+    }
+  }
+
+  /** Append each vendor asset's content hash so it can be cached forever. */
+  async function versionVendorRefs(html: string): Promise<string> {
+    const hashes = new Map<string, string>();
+    for (const match of html.matchAll(VENDOR_REF)) {
+      const ref = match[2]!;
+      try {
+        hashes.set(ref, (await load(path.join(publicDir, ref))).hash);
+      } catch {
+        // Missing vendor file — leave the reference unversioned
+      }
+    }
+    return html.replace(VENDOR_REF, (whole, prefix: string, ref: string) => {
+      const hash = hashes.get(ref);
+      return hash ? `${prefix}${ref}?v=${hash}"` : whole;
+    });
+  }
+
   return async (req: http.IncomingMessage, res: http.ServerResponse) => {
     // Parse URL to strip query strings, but use raw pathname for traversal check
     const rawUrl = req.url || "/";
     const qIndex = rawUrl.indexOf("?");
     const rawPath = qIndex >= 0 ? rawUrl.slice(0, qIndex) : rawUrl;
+    const version =
+      qIndex >= 0 ? new URLSearchParams(rawUrl.slice(qIndex + 1)).get("v") : null;
     const decodedPath = decodeURIComponent(rawPath);
     const pathname = decodedPath === "/" ? "/index.html" : decodedPath;
     const filePath = path.join(publicDir, pathname);
@@ -86,12 +198,37 @@ function serveStatic(
     }
 
     try {
-      const data = await fs.readFile(resolved);
+      const asset = await load(resolved);
       const ext = path.extname(resolved);
-      res.writeHead(200, {
+      const etag = `"${asset.hash}"`;
+      const headers: http.OutgoingHttpHeaders = {
         "Content-Type": MIME_TYPES[ext] || "application/octet-stream",
-      });
-      res.end(data);
+        "Cache-Control":
+          pathname.startsWith("/vendor/") && version === asset.hash
+            ? IMMUTABLE_CACHE
+            : "no-cache",
+        ETag: etag,
+      };
+      if (COMPRESSIBLE_EXTENSIONS.has(ext)) headers.Vary = "Accept-Encoding";
+
+      if (req.headers["if-none-match"] === etag) {
+        res.writeHead(304, headers);
+        res.end();
+        return;
+      }
+
+      const encoding =
+        COMPRESSIBLE_EXTENSIONS.has(ext) && asset.body.length >= MIN_COMPRESS_BYTES
+          ? negotiateEncoding(req.headers["accept-encoding"])
+          : null;
+      const body = encoding ? await encodedBody(asset, encoding) : null;
+      if (!encoding || !body) {
+        res.writeHead(200, headers);
+        res.end(asset.body);
+        return;
+      }
+      res.writeHead(200, { ...headers, "Content-Encoding": encoding });
+      res.end(body);
     } catch (err: unknown) {
       const code =
         err instanceof Error && "code" in err
@@ -149,9 +286,10 @@ function tryListen(
 export function handleRequest(
   publicDir: string,
   projectRoot: string,
+  options?: ApiHandlerOptions,
 ): (req: http.IncomingMessage, res: http.ServerResponse) => void {
   const staticHandler = serveStatic(publicDir);
-  const apiHandler = createApiHandler(projectRoot);
+  const apiHandler = createApiHandler(projectRoot, options);
   const resolvedProjectRoot = path.resolve(projectRoot);
 
   return (req: http.IncomingMessage, res: http.ServerResponse) => {
@@ -193,9 +331,11 @@ export function handleRequest(
  * Returns the server and actual port, or null if the dashboard is disabled.
  *
  * @param projectRoot - The project root directory (used for API data access)
+ * @param options - In-process sources for live data (e.g. metrics counters)
  */
 export async function startDashboard(
   projectRoot: string,
+  options?: ApiHandlerOptions,
 ): Promise<{ server: http.Server; port: number } | null> {
   const config = getDashboardConfig();
   if (!config.enabled) {
@@ -207,7 +347,7 @@ export async function startDashboard(
   const __dirname = path.dirname(__filename);
   const publicDir = path.join(__dirname, "public");
 
-  const server = http.createServer(handleRequest(publicDir, projectRoot));
+  const server = http.createServer(handleRequest(publicDir, projectRoot, options));
   const port = await tryListen(server, config.port, 5);
 
   const url = `http://127.0.0.1:${port}`;
@@ -247,6 +387,8 @@ export function setupDashboardShutdown(httpServer: http.Server): void {
     httpServer.close(() => {
       // Server closed cleanly
     });
+    // Open event streams would otherwise hold close() until the force exit
+    httpServer.closeAllConnections();
     // Force exit after 3 seconds if close hangs
     const timer = setTimeout(() => {
       process.exit(0);
@@ -0,0 +1,222 @@
+/**
+ * Cursor pagination, sorting, filtering and field projection for the
+ * dashboard's list routes.
+ *
+ * Records are ordered by a sort field with their ULID as the tiebreaker,
+ * and a cursor is the (sort value, ULID) of the last record on a page.
+ * Because it is a keyset rather than an offset, pages stay stable while
+ * new records arrive. Requests without any list parameters get the
+ * unpaginated, unsorted response the routes have always returned.
+ */
+import { TwiningError } from "../utils/errors.js";
+
+/** Largest page a client may ask for. */
+export const MAX_PAGE_SIZE = 1000;
+
+/** What one route allows. */
+export interface ListSpec {
+  /** Fields accepted by ?sort=; the first is the default */
+  sortable: string[];
+  /** Fields filtered by ?field=a,b (exact match; arrays match any element) */
+  filterable: string[];
+  /** Field compared against ?since= / ?until= */
+  timeField?: string;
+  defaultOrder: "asc" | "desc";
+}
+
+/** A parsed list request. */
+export interface ListQuery {
+  /** Whether any list parameter was given at all */
+  active: boolean;
+  limit: number | null;
+  cursor: [unknown, string] | null;
+  sort: string;
+  order: "asc" | "desc";
+  filters: Map<string, Set<string>>;
+  scope: string | null;
+  since: string | null;
+  until: string | null;
+  fields: string[] | null;
+}
+
+/** One page of results. */
+export interface ListPage<T> {
+  items: T[];
+  /** Matches across all pages */
+  total: number;
+  /** Cursor for the following page; null on the last page */
+  next_cursor: string | null;
+}
+
+const LIST_PARAMS = ["limit", "cursor", "sort", "order", "fields", "scope", "since", "until"];
+
+/** Parse list parameters for a route. Throws INVALID_INPUT on bad values. */
+export function parseListQuery(params: URLSearchParams, spec: ListSpec): ListQuery {
+  const active =
+    LIST_PARAMS.some((name) => params.has(name)) ||
+    spec.filterable.some((name) => params.has(name));
+
+  const limitParam = params.get("limit");
+  let limit: number | null = null;
+  if (limitParam !== null) {
+    limit = parseInt(limitParam, 10);
+    if (!Number.isFinite(limit) || limit < 1) {
+      throw new TwiningError("limit must be a positive integer", "INVALID_INPUT");
+    }
+    limit = Math.min(limit, MAX_PAGE_SIZE);
+  }
+
+  const sort = params.get("sort") ?? spec.sortable[0]!;
+  if (!spec.sortable.includes(sort)) {
+    throw new TwiningError(
+      `sort must be one of: ${spec.sortable.join(", ")}`,
+      "INVALID_INPUT",
+    );
+  }
+  const order = params.get("order") ?? spec.defaultOrder;
+  if (order !== "asc" && order !== "desc") {
+    throw new TwiningError("order must be asc or desc", "INVALID_INPUT");
+  }
+
+  const cursorParam = params.get("cursor");
+  const cursor = cursorParam ? decodeCursor(cursorParam) : null;
+
+  const filters = new Map<string, Set<string>>();
+  for (const name of spec.filterable) {
+    const value = params.get(name);
+    if (value) filters.set(name, new Set(splitList(value)));
+  }
+
+  const fieldsParam = params.get("fields");
+  return {
+    active,
+    limit,
+    cursor,
+    sort,
+    order,
+    filters,
+    scope: params.get("scope"),
+    since: spec.timeField ? params.get("since") : null,
+    until: spec.timeField ? params.get("until") : null,
+    fields: fieldsParam ? splitList(fieldsParam) : null,
+  };
+}
+
+/**
+ * Filter, sort and page records. Every record needs a string `id`.
+ * The input array is not modified.
+ */
+export function applyListQuery<T extends { id: string }>(
+  records: readonly T[],
+  query: ListQuery,
+  spec: ListSpec,
+): ListPage<T> {
+  const field = (record: T, name: string): unknown =>
+    (record as unknown as Record<string, unknown>)[name];
+
+  const matched = records.filter((record) => {
+    for (const [name, allowed] of query.filters) {
+      const value = field(record, name);
+      const values = Array.isArray(value) ? value : [value];
+      if (!values.some((v) => allowed.has(String(v)))) return false;
+    }
+    if (query.scope !== null) {
+      const scope = field(record, "scope");
+      if (typeof scope !== "string" || !scope.startsWith(query.scope)) return false;
+    }
+    if (spec.timeField && (query.since || query.until)) {
+      const time = String(field(record, spec.timeField) ?? "");
+      if (query.since && time < query.since) return false;
+      if (query.until && time > query.until) return false;
+    }
+    return true;
+  });
+
+  const direction = query.order === "asc" ? 1 : -1;
+  const compareKeys = (aValue: unknown, aId: string, bValue: unknown, bId: string) =>
+    direction * (compareValues(aValue, bValue) || compareValues(aId, bId));
+  matched.sort((a, b) =>
+    compareKeys(field(a, query.sort), a.id, field(b, query.sort), b.id),
+  );
+
+  let start = 0;
+  if (query.cursor) {
+    const [value, id] = query.cursor;
+    // First record strictly after the cursor; binary search over the sorted keys
+    let lo = 0;
+    let hi = matched.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      const record = matched[mid]!;
+      if (compareKeys(field(record, query.sort), record.id, value, id) <= 0) {
+        lo = mid + 1;
+      } else {
+        hi = mid;
+      }
+    }
+    start = lo;
+  }
+
+  const end = query.limit === null ? matched.length : start + query.limit;
+  const items = matched.slice(start, end);
+  const last = items[items.length - 1];
+  return {
+    items,
+    total: matched.length,
+    next_cursor:
+      end < matched.length && last
+        ? encodeCursor([field(last, query.sort) ?? null, last.id])
+        : null,
+  };
+}
+
+/** Keep only the requested top-level fields, always including `id`. */
+export function projectFields<T extends object>(
+  records: readonly T[],
+  fields: string[] | null,
+): Array<Partial<T>> {
+  if (!fields) return records as T[];
+  const keep = fields.includes("id") ? fields : ["id", ...fields];
+  return records.map((record) => {
+    const projected: Record<string, unknown> = {};
+    for (const name of keep) {
+      if (name in record) projected[name] = (record as Record<string, unknown>)[name];
+    }
+    return projected as Partial<T>;
+  });
+}
+
+function encodeCursor(key: [unknown, string]): string {
+  return Buffer.from(JSON.stringify(key)).toString("base64url");
+}
+
+function decodeCursor(cursor: string): [unknown, string] {
+  try {
+    const key: unknown = JSON.parse(Buffer.from(cursor, "base64url").toString("utf-8"));
+    if (Array.isArray(key) && key.length === 2 && typeof key[1] === "string") {
+      return [key[0], key[1]];
+    }
+  } catch {
+    // Fall through to the error below
+  }
+  throw new TwiningError("Invalid cursor", "INVALID_INPUT");
+}
+
+/** Order missing values first, numbers numerically, everything else as strings. */
+function compareValues(a: unknown, b: unknown): number {
+  if (a === b) return 0;
+  // Cursors carry a missing value as null
+  if (a === undefined || a === null) return b === undefined || b === null ? 0 : -1;
+  if (b === undefined || b === null) return 1;
+  if (typeof a === "number" && typeof b === "number") return a - b;
+  const sa = String(a);
+  const sb = String(b);
+  return sa < sb ? -1 : sa > sb ? 1 : 0;
+}
+
+function splitList(value: string): string[] {
+  return value
+    .split(",")
+    .map((part) => part.trim())
+    .filter((part) => part.length > 0);
+}
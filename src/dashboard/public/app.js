@@ -18,7 +18,7 @@ var state = {
   delegations: { data: [], sortKey: "timestamp", sortDir: "desc", page: 1, pageSize: 25, selectedId: null },
   handoffs: { data: [], sortKey: "created_at", sortDir: "desc", page: 1, pageSize: 25, selectedId: null },
   agentsSubView: "agents-list",
-  insights: { valueStats: null, toolUsage: [], errors: [] },
+  insights: { valueStats: null, toolUsage: [], errors: [], traces: [], selectedTraceId: null },
   globalScope: "",
   status: null,
   pollTimer: null,
@@ -26,7 +26,9 @@ var state = {
   connected: false,
   wasConnected: false,
   disconnectCount: 0,
-  sessionEnded: false
+  sessionEnded: false,
+  feed: null,
+  live: false
 };
 
 /* URL parameter overrides (e.g. ?poll=1000&demo=1 for faster refresh during demos) */
@@ -119,6 +121,7 @@ function updateConnectionIndicator() {
 function showSessionEnded() {
   state.sessionEnded = true;
   stopPolling();
+  disconnectFeed();
   var overlay = document.getElementById("session-overlay");
   if (overlay) overlay.style.display = "flex";
   // Try to close the tab (works if opened via window.open, otherwise no-op)
@@ -131,7 +134,7 @@ function updatePollIndicator(isPolling) {
   if (!dot || !text) return;
   if (isPolling) {
     dot.className = "status-dot polling";
-    text.textContent = "Polling";
+    text.textContent = state.live ? "Live" : "Polling";
   } else {
     dot.className = "status-dot paused";
     text.textContent = "Paused";
@@ -201,15 +204,65 @@ function fetchDecisions() {
     });
 }
 
+/* Entities per /api/graph page; more load as the graph view is zoomed out */
+var GRAPH_PAGE_SIZE = 500;
+
+/** Add entities and relations to the graph state, replacing any with the same ID. */
+function mergeGraph(entities, relations) {
+  var byId = {};
+  var merged = state.graph.data.slice();
+  for (var i = 0; i < merged.length; i++) byId[merged[i].id] = i;
+  for (var j = 0; j < entities.length; j++) {
+    var ent = entities[j];
+    if (byId[ent.id] !== undefined) merged[byId[ent.id]] = ent;
+    else { byId[ent.id] = merged.length; merged.push(ent); }
+  }
+  var relIds = {};
+  var mergedRels = state.graph.relations.slice();
+  for (var k = 0; k < mergedRels.length; k++) relIds[mergedRels[k].id] = true;
+  for (var m = 0; m < relations.length; m++) {
+    if (!relIds[relations[m].id]) {
+      relIds[relations[m].id] = true;
+      mergedRels.push(relations[m]);
+    }
+  }
+  state.graph.data = merged;
+  state.graph.relations = mergedRels;
+}
+
+/**
+ * Fetch the first page of the graph. Pages loaded beyond it are kept, so a
+ * resync does not collapse a graph the user has already zoomed out into.
+ */
 function fetchGraph() {
-  fetch("/api/graph")
+  fetch("/api/graph?limit=" + GRAPH_PAGE_SIZE)
     .then(function(res) {
       if (!res.ok) throw new Error("HTTP " + res.status);
       return res.json();
     })
     .then(function(data) {
-      state.graph.data = data.entities || [];
-      state.graph.relations = data.relations || [];
+      var entities = data.entities || [];
+      var relations = data.relations || [];
+      var tail = [];
+      if (data.next_cursor && entities.length > 0) {
+        // Entities are paged in ID order; anything past this page came from later pages
+        var lastId = entities[entities.length - 1].id;
+        tail = state.graph.data.filter(function(e) { return e.id > lastId; });
+      }
+      var previousRelations = state.graph.relations;
+      state.graph.data = entities;
+      state.graph.relations = relations;
+      if (tail.length > 0) {
+        var tailIds = {};
+        tail.forEach(function(e) { tailIds[e.id] = true; });
+        var tailRelations = previousRelations.filter(function(r) {
+          return tailIds[r.source] || tailIds[r.target];
+        });
+        mergeGraph(tail, tailRelations);
+      } else {
+        state.graph.nextCursor = data.next_cursor || null;
+      }
+      state.graph.total = data.entity_count;
       state.connected = true;
       updateConnectionIndicator();
       renderGraph();
@@ -220,6 +273,44 @@ function fetchGraph() {
     });
 }
 
+/** Load the next page of graph entities, if any remain. */
+function fetchGraphPage() {
+  if (!state.graph.nextCursor || state.graph.loadingPage) return;
+  state.graph.loadingPage = true;
+  fetch("/api/graph?limit=" + GRAPH_PAGE_SIZE + "&cursor=" + encodeURIComponent(state.graph.nextCursor))
+    .then(function(res) {
+      if (!res.ok) throw new Error("HTTP " + res.status);
+      return res.json();
+    })
+    .then(function(data) {
+      mergeGraph(data.entities || [], data.relations || []);
+      state.graph.nextCursor = data.next_cursor || null;
+      renderGraph();
+    })
+    .catch(function() {
+      // Try again on the next viewport change
+    })
+    .then(function() {
+      state.graph.loadingPage = false;
+    });
+}
+
+/** Load one entity's neighbors from the server, then call done. */
+function fetchGraphNeighbors(id, done) {
+  fetch("/api/graph/neighbors/" + encodeURIComponent(id))
+    .then(function(res) {
+      if (!res.ok) throw new Error("HTTP " + res.status);
+      return res.json();
+    })
+    .then(function(data) {
+      mergeGraph(data.entities || [], data.relations || []);
+      done();
+    })
+    .catch(function() {
+      done();
+    });
+}
+
 function fetchDecisionDetail(id) {
   fetch("/api/decisions/" + encodeURIComponent(id))
     .then(function(res) {
@@ -350,10 +441,30 @@ function fetchErrorBreakdown() {
     .catch(function() {});
 }
 
+function fetchSlowTraces() {
+  fetch("/api/traces?limit=25")
+    .then(function(res) { return res.json(); })
+    .then(function(data) {
+      state.insights.traces = data.traces || [];
+      renderSlowTraces();
+    })
+    .catch(function() {});
+}
+
+function fetchTraceDetail(id) {
+  fetch("/api/traces/" + encodeURIComponent(id))
+    .then(function(res) { return res.json(); })
+    .then(function(data) {
+      if (data.trace) renderTraceWaterfall(data.trace);
+    })
+    .catch(function() {});
+}
+
 function fetchInsights() {
   fetchValueStats();
   fetchToolUsage();
   fetchErrorBreakdown();
+  fetchSlowTraces();
 }
 
 /* ========== Polling Lifecycle ========== */
@@ -376,7 +487,9 @@ function refreshData() {
 
 function startPolling() {
   if (state.pollTimer) return;
-  state.pollTimer = setInterval(refreshData, state.pollInterval);
+  // While the change feed is live, polling is only a slow resync
+  var interval = state.live ? FEED_RESYNC_MS : state.pollInterval;
+  state.pollTimer = setInterval(refreshData, interval);
   updatePollIndicator(true);
 }
 
@@ -388,6 +501,111 @@ function stopPolling() {
   updatePollIndicator(false);
 }
 
+/* ========== Live Change Feed ========== */
+
+/** Full resync interval while the change feed is connected; ETags keep it cheap. */
+var FEED_RESYNC_MS = 30000;
+
+/** Where each delta kind lives in state and the field that identifies an item. */
+var FEED_TARGETS = {
+  entry: { key: "id", get: function() { return state.blackboard.data; }, set: function(v) { state.blackboard.data = v; } },
+  decision: { key: "id", get: function() { return state.decisions.data; }, set: function(v) { state.decisions.data = v; } },
+  entity: { key: "id", get: function() { return state.graph.data; }, set: function(v) { state.graph.data = v; } },
+  relation: { key: "id", get: function() { return state.graph.relations; }, set: function(v) { state.graph.relations = v; } },
+  handoff: { key: "id", get: function() { return state.handoffs.data; }, set: function(v) { state.handoffs.data = v; } },
+  agent: { key: "agent_id", get: function() { return state.agents.data; }, set: function(v) { state.agents.data = v; } }
+};
+
+/** Apply one batch of typed deltas from /api/events and re-render what changed. */
+function applyChanges(changes) {
+  var touched = {};
+  for (var i = 0; i < changes.length; i++) {
+    var change = changes[i];
+    if (change.type === "status") {
+      state.status = change.data;
+      touched.status = true;
+      continue;
+    }
+    var dot = change.type.indexOf(".");
+    var kind = change.type.slice(0, dot);
+    var action = change.type.slice(dot + 1);
+    var target = FEED_TARGETS[kind];
+    if (!target) continue;
+
+    var list = target.get().slice();
+    var index = -1;
+    for (var j = 0; j < list.length; j++) {
+      if (list[j][target.key] === change.id) { index = j; break; }
+    }
+    if (action === "removed") {
+      if (index >= 0) list.splice(index, 1);
+    } else if (index >= 0) {
+      list[index] = change.data;
+    } else {
+      list.push(change.data);
+    }
+    target.set(list);
+    touched[kind] = true;
+    if (kind === "entry" && change.data && change.data.entry_type === "need") touched.need = true;
+    if (kind === "entry" && action === "removed") touched.need = true;
+  }
+
+  if (touched.entry) {
+    renderBlackboard();
+    var streamView = document.getElementById('blackboard-stream-view');
+    if (streamView && streamView.style.display !== 'none') {
+      renderStream();
+    }
+    renderActivityBreakdown();
+    renderRecentActivity();
+  }
+  if (touched.decision) renderDecisions();
+  if (touched.entity || touched.relation) renderGraph();
+  if (touched.handoff) renderHandoffs();
+  if (touched.agent) renderAgents();
+  if (touched.status) renderStatus();
+  if ((touched.need || touched.agent) && state.activeTab === "agents" && state.agentsSubView === "delegations") {
+    fetchDelegations();
+  }
+}
+
+/** Subscribe to server-sent deltas; polling stays on as the fallback. */
+function connectFeed() {
+  if (!window.EventSource || state.feed || state.sessionEnded) return;
+  var source = new EventSource("/api/events");
+  state.feed = source;
+
+  source.onopen = function() {
+    state.live = true;
+    // Catch up on anything missed while disconnected, then slow polling to a resync
+    refreshData();
+    stopPolling();
+    startPolling();
+  };
+  source.addEventListener("changes", function(event) {
+    try {
+      applyChanges(JSON.parse(event.data));
+    } catch (e) {
+      refreshData();
+    }
+  });
+  source.onerror = function() {
+    // EventSource reconnects on its own; poll at full rate until it does
+    if (!state.live) return;
+    state.live = false;
+    stopPolling();
+    startPolling();
+  };
+}
+
+function disconnectFeed() {
+  if (state.feed) {
+    state.feed.close();
+    state.feed = null;
+  }
+  state.live = false;
+}
+
 /* ========== Tab Navigation ========== */
 
 function switchTab(tabName) {
@@ -2943,13 +3161,26 @@ function initGraphVis() {
       renderGraphVisualDetail(entity);
     }
 
-    // Expand neighbors if not already expanded
+    // Expand neighbors if not already expanded; with pages still unloaded
+    // some neighbors may not be in state yet, so ask the server first
     if (!state.graph.expandedNodes[nodeId]) {
       state.graph.expandedNodes[nodeId] = true;
-      expandNeighbors(nodeId);
+      if (state.graph.nextCursor) {
+        fetchGraphNeighbors(nodeId, function() { expandNeighbors(nodeId); });
+      } else {
+        expandNeighbors(nodeId);
+      }
     }
   });
 
+  // Zoomed out far enough to see everything loaded: fetch the next page
+  window.cyInstance.on('viewport', debounce(function() {
+    if (!state.graph.nextCursor || !window.cyInstance) return;
+    var extent = window.cyInstance.extent();
+    var bounds = window.cyInstance.elements().boundingBox();
+    if (extent.w >= bounds.w && extent.h >= bounds.h) fetchGraphPage();
+  }, 250));
+
   // Click background to clear highlight
   window.cyInstance.on('tap', function(evt) {
     if (evt.target === window.cyInstance) {
@@ -3303,6 +3534,109 @@ function renderErrorBreakdown() {
   }
 }
 
+function renderSlowTraces() {
+  var tbody = document.querySelector("#slow-traces-table tbody");
+  if (!tbody) return;
+  clearElement(tbody);
+
+  var traces = state.insights.traces;
+  if (traces.length === 0) {
+    var row = document.createElement("tr");
+    var cell = document.createElement("td");
+    cell.colSpan = 4;
+    cell.textContent = "No slow calls traced";
+    cell.className = "placeholder";
+    row.appendChild(cell);
+    tbody.appendChild(row);
+    return;
+  }
+
+  for (var i = 0; i < traces.length; i++) {
+    var t = traces[i];
+    var tr = document.createElement("tr");
+    if (t.trace_id === state.insights.selectedTraceId) tr.className = "selected";
+
+    var tdName = document.createElement("td");
+    tdName.textContent = t.name;
+    tr.appendChild(tdName);
+
+    var tdDuration = document.createElement("td");
+    tdDuration.textContent = Math.round(t.duration_ms);
+    if (t.error) tdDuration.className = "error-count";
+    tr.appendChild(tdDuration);
+
+    var tdSpans = document.createElement("td");
+    tdSpans.textContent = t.span_count;
+    tr.appendChild(tdSpans);
+
+    var tdStarted = document.createElement("td");
+    tdStarted.textContent = formatTimestamp(t.timestamp);
+    tr.appendChild(tdStarted);
+
+    tr.addEventListener("click", (function(id) {
+      return function() {
+        state.insights.selectedTraceId = id;
+        renderSlowTraces();
+        fetchTraceDetail(id);
+      };
+    })(t.trace_id));
+
+    tbody.appendChild(tr);
+  }
+}
+
+/** Render a trace's spans as a waterfall, children indented under parents. */
+function renderTraceWaterfall(trace) {
+  var container = document.getElementById("trace-waterfall");
+  if (!container) return;
+  clearElement(container);
+
+  var children = {};
+  for (var i = 0; i < trace.spans.length; i++) {
+    var s = trace.spans[i];
+    var key = s.parent_id === null ? "root" : String(s.parent_id);
+    (children[key] = children[key] || []).push(s);
+  }
+
+  var total = trace.duration_ms || 1;
+  function addRow(span, depth) {
+    var row = document.createElement("div");
+    row.className = "waterfall-row";
+
+    var label = document.createElement("div");
+    label.className = "waterfall-label";
+    label.style.paddingLeft = (depth * 12) + "px";
+    label.textContent = span.name;
+    var attrs = span.attributes || {};
+    var details = Object.keys(attrs).map(function(k) { return k + "=" + attrs[k]; });
+    if (span.error) details.push("error=" + span.error);
+    label.title = span.name + (details.length ? " (" + details.join(", ") + ")" : "");
+    row.appendChild(label);
+
+    var track = document.createElement("div");
+    track.className = "waterfall-track";
+    var bar = document.createElement("div");
+    bar.className = "waterfall-bar" + (span.error ? " error" : span.name === "lock" ? " lock" : "");
+    bar.style.left = (span.start_ms / total * 100) + "%";
+    bar.style.width = (span.duration_ms / total * 100) + "%";
+    track.appendChild(bar);
+    row.appendChild(track);
+
+    var duration = document.createElement("div");
+    duration.className = "waterfall-duration";
+    duration.textContent = span.duration_ms.toFixed(1) + " ms";
+    row.appendChild(duration);
+
+    container.appendChild(row);
+    var kids = children[String(span.id)] || [];
+    kids.sort(function(a, b) { return a.start_ms - b.start_ms; });
+    for (var j = 0; j < kids.length; j++) addRow(kids[j], depth + 1);
+  }
+
+  var roots = children.root || [];
+  for (var r = 0; r < roots.length; r++) addRow(roots[r], 0);
+}
+
 /* ========== Initialization ========== */
 
 document.addEventListener("DOMContentLoaded", function() {
@@ -3439,16 +3773,19 @@ document.addEventListener("DOMContentLoaded", function() {
   // Initial data load
   refreshData();
 
-  // Start polling
+  // Start polling, then switch to pushed changes once the feed connects
   startPolling();
+  connectFeed();
 
   // Visibility-aware lifecycle
   document.addEventListener("visibilitychange", function() {
     if (document.hidden) {
       stopPolling();
+      disconnectFeed();
     } else {
       refreshData();
       startPolling();
+      connectFeed();
     }
   });
 });
@@ -0,0 +1,427 @@
+/**
+ * Approximate nearest-neighbour index (IVF-flat) over an IndexManager vector view.
+ *
+ * Vectors are partitioned into k-means clusters; a query scores only the
+ * members of the clusters whose centroids are closest to it. Members are
+ * scored exactly against the packed Float32 vectors, so results are exact
+ * cosine scores over a pruned candidate set. Filters are applied while
+ * probing, and probing widens until enough accepted candidates are found.
+ *
+ * Only centroids and id -> cluster assignments are persisted, in
+ * .twining/embeddings/{name}.ivf.json. New vectors are assigned on the next
+ * search; removed vectors are skipped and dropped lazily. The clustering is
+ * retrained in the background when the index outgrows it.
+ */
+import fs from "node:fs";
+import type { VectorView } from "./index-manager.js";
+
+/** ANN tuning, from the `search.ann` section of config.yml. */
+export interface AnnOptions {
+  /** Use the ANN index at all (false = always exact scan). */
+  enabled: boolean;
+  /** Below this many live vectors an exact scan is used. */
+  min_vectors: number;
+  /** Number of clusters; 0 = sqrt(live vectors). */
+  nlist: number;
+  /** Clusters probed per query. Higher = better recall, slower queries. */
+  nprobe: number;
+}
+
+export const DEFAULT_ANN_OPTIONS: AnnOptions = {
+  enabled: true,
+  min_vectors: 2000,
+  nlist: 0,
+  nprobe: 8,
+};
+
+export interface AnnHit {
+  id: string;
+  score: number;
+}
+
+/** On-disk form of a trained index. */
+interface AnnFile {
+  format: number;
+  dimension: number;
+  nlist: number;
+  trained_on: number;
+  /** Base64 of the packed Float32 centroids. */
+  centroids: string;
+  /** Member ids per cluster. */
+  lists: string[][];
+}
+
+const FORMAT_VERSION = 1;
+
+/** Retrain once the index holds this many times the vectors it was trained on. */
+const RETRAIN_GROWTH = 4;
+
+/** Training sample size per cluster. */
+const SAMPLE_PER_LIST = 16;
+
+/** k-means iterations over the sample. */
+const KMEANS_ITERATIONS = 5;
+
+/**
+ * Multiply-adds between yields to the event loop during training, so a
+ * large (re)train never stalls request handling for more than a few ms.
+ */
+const TRAIN_CHUNK_FLOPS = 4_000_000;
+
+/** Unsaved incremental assignments tolerated before persisting. */
+const SAVE_EVERY = 1024;
+
+export class AnnIndex {
+  private readonly filePath: string;
+  private readonly options: AnnOptions;
+  private loaded = false;
+  private dimension = 0;
+  private nlist = 0;
+  private trainedOn = 0;
+  private centroids: Float32Array | null = null;
+  /** id -> cluster. Authoritative; lists may hold stale duplicates. */
+  private assignments = new Map<string, number>();
+  private lists: string[][] = [];
+  private syncedGeneration = -1;
+  private syncedSlots = 0;
+  private unsaved = 0;
+  private training: Promise<void> | null = null;
+
+  constructor(filePath: string, options?: Partial<AnnOptions>) {
+    this.filePath = filePath;
+    this.options = { ...DEFAULT_ANN_OPTIONS, ...options };
+  }
+
+  /**
+   * Top-k ids by dot product among ids accepted by `allow`.
+   * Returns null when the caller should fall back to an exact scan:
+   * ANN disabled, index too small, or clustering not trained yet.
+   */
+  search(
+    query: ArrayLike<number>,
+    view: VectorView,
+    k: number,
+    allow?: (id: string) => boolean,
+  ): AnnHit[] | null {
+    if (!this.options.enabled || view.slots.size < this.options.min_vectors) {
+      return null;
+    }
+    if (query.length !== view.dimension || k <= 0) return null;
+
+    this.ensureLoaded();
+    if (!this.centroids || this.dimension !== view.dimension) {
+      this.scheduleTraining(view);
+      return null;
+    }
+
+    this.sync(view);
+    if (view.slots.size > this.trainedOn * RETRAIN_GROWTH) {
+      this.scheduleTraining(view);
+    }
+
+    const dim = this.dimension;
+    const centroidScores: { list: number; score: number }[] = [];
+    for (let c = 0; c < this.nlist; c++) {
+      centroidScores.push({
+        list: c,
+        score: dotAt(query, this.centroids, c * dim, dim),
+      });
+    }
+    centroidScores.sort((a, b) => b.score - a.score);
+
+    const top = new TopK(k);
+    let probed = 0;
+    let accepted = 0;
+    for (const { list } of centroidScores) {
+      if (probed >= this.options.nprobe && accepted >= k) break;
+      probed++;
+      for (const id of this.lists[list] ?? []) {
+        if (this.assignments.get(id) !== list) continue; // stale duplicate
+        const slot = view.slots.get(id);
+        if (slot === undefined) continue; // removed since assignment
+        if (allow && !allow(id)) continue;
+        accepted++;
+        top.push(id, dotAt(query, view.data, slot * dim, dim));
+      }
+    }
+    return top.sorted();
+  }
+
+  /**
+   * Train (or retrain) the clustering now and wait for it.
+   * Normally training is scheduled in the background by search().
+   */
+  async train(view: VectorView): Promise<void> {
+    this.scheduleTraining(view, true);
+    await this.training;
+  }
+
+  /** Assign vectors added since the last sync to their nearest centroid. */
+  private sync(view: VectorView): void {
+    if (view.generation !== this.syncedGeneration) {
+      // Slots were renumbered (or first sync) — ids are stable, so only
+      // pick up ids that have never been assigned.
+      for (const [id, slot] of view.slots) {
+        if (!this.assignments.has(id)) this.assign(id, view, slot);
+      }
+    } else {
+      for (let slot = this.syncedSlots; slot < view.slotIds.length; slot++) {
+        const id = view.slotIds[slot];
+        if (id !== undefined && view.slots.get(id) === slot) {
+          this.assign(id, view, slot);
+        }
+      }
+    }
+    this.syncedGeneration = view.generation;
+    this.syncedSlots = view.slotIds.length;
+
+    if (this.unsaved >= SAVE_EVERY) {
+      this.save();
+    }
+  }
+
+  private assign(id: string, view: VectorView, slot: number): void {
+    const list = nearestCentroid(
+      view.data,
+      slot * this.dimension,
+      this.centroids!,
+      this.nlist,
+      this.dimension,
+    );
+    this.assignments.set(id, list);
+    this.lists[list]?.push(id);
+    this.unsaved++;
+  }
+
+  private scheduleTraining(view: VectorView, force = false): void {
+    if (this.training) return;
+    if (!force && view.slots.size < this.options.min_vectors) return;
+
+    // Snapshot the live slots: the view's maps are shared and keep moving,
+    // but the packed data for existing slots never changes in place.
+    const members = [...view.slots];
+    const data = view.data;
+    const dim = view.dimension;
+
+    this.training = this.runTraining(members, data, dim)
+      .catch((err) => {
+        console.error("[twining] ANN index training failed (non-fatal):", err);
+      })
+      .finally(() => {
+        this.training = null;
+      });
+  }
+
+  private async runTraining(
+    members: [string, number][],
+    data: Float32Array,
+    dim: number,
+  ): Promise<void> {
+    const n = members.length;
+    if (n === 0) return;
+
+    const nlist = Math.max(
+      1,
+      Math.min(
+        n,
+        this.options.nlist > 0 ? this.options.nlist : Math.round(Math.sqrt(n)),
+      ),
+    );
+
+    const chunk = Math.max(1, Math.floor(TRAIN_CHUNK_FLOPS / (nlist * dim)));
+
+    // Deterministic strided sample
+    const sampleSize = Math.min(n, nlist * SAMPLE_PER_LIST);
+    const sample: number[] = [];
+    for (let i = 0; i < sampleSize; i++) {
+      sample.push(members[Math.floor((i * n) / sampleSize)]![1]);
+    }
+
+    // Initialize centroids from evenly spaced sample points
+    const centroids = new Float32Array(nlist * dim);
+    for (let c = 0; c < nlist; c++) {
+      const slot = sample[Math.floor((c * sampleSize) / nlist)]!;
+      centroids.set(data.subarray(slot * dim, (slot + 1) * dim), c * dim);
+    }
+
+    // Spherical k-means: assign, average, renormalize
+    const sums = new Float64Array(nlist * dim);
+    const counts = new Uint32Array(nlist);
+    for (let iter = 0; iter < KMEANS_ITERATIONS; iter++) {
+      sums.fill(0);
+      counts.fill(0);
+      for (let i = 0; i < sample.length; i++) {
+        const offset = sample[i]! * dim;
+        const c = nearestCentroid(data, offset, centroids, nlist, dim);
+        counts[c] = counts[c]! + 1;
+        const base = c * dim;
+        for (let j = 0; j < dim; j++) {
+          sums[base + j] = sums[base + j]! + data[offset + j]!;
+        }
+        if (i % chunk === chunk - 1) await yieldToEventLoop();
+      }
+      for (let c = 0; c < nlist; c++) {
+        if (counts[c] === 0) continue; // keep the previous centroid
+        const base = c * dim;
+        let norm = 0;
+        for (let j = 0; j < dim; j++) norm += sums[base + j]! * sums[base + j]!;
+        norm = Math.sqrt(norm) || 1;
+        for (let j = 0; j < dim; j++) {
+          centroids[base + j] = sums[base + j]! / norm;
+        }
+      }
+    }
+
+    // Assign every member
+    const assignments = new Map<string, number>();
+    const lists: string[][] = Array.from({ length: nlist }, () => []);
+    for (let i = 0; i < n; i++) {
+      const [id, slot] = members[i]!;
+      const c = nearestCentroid(data, slot * dim, centroids, nlist, dim);
+      assignments.set(id, c);
+      lists[c]!.push(id);
+      if (i % chunk === chunk - 1) await yieldToEventLoop();
+    }
+
+    this.dimension = dim;
+    this.nlist = nlist;
+    this.trainedOn = n;
+    this.centroids = centroids;
+    this.assignments = assignments;
+    this.lists = lists;
+    // Force a full sync to pick up anything added while training
+    this.syncedGeneration = -1;
+    this.syncedSlots = 0;
+    this.loaded = true;
+    this.save();
+  }
+
+  private ensureLoaded(): void {
+    if (this.loaded) return;
+    this.loaded = true;
+    try {
+      if (!fs.existsSync(this.filePath)) return;
+      const file = JSON.parse(fs.readFileSync(this.filePath, "utf-8")) as AnnFile;
+      if (file.format !== FORMAT_VERSION) return;
+
+      const raw = Buffer.from(file.centroids, "base64");
+      if (raw.byteLength !== file.nlist * file.dimension * 4) return;
+      const centroids = new Float32Array(file.nlist * file.dimension);
+      new Uint8Array(centroids.buffer).set(raw);
+
+      if (file.lists.length !== file.nlist) return;
+      const lists = file.lists;
+      const assignments = new Map<string, number>();
+      for (let c = 0; c < lists.length; c++) {
+        for (const id of lists[c]!) assignments.set(id, c);
+      }
+
+      this.dimension = file.dimension;
+      this.nlist = file.nlist;
+      this.trainedOn = file.trained_on;
+      this.centroids = centroids;
+      this.assignments = assignments;
+      this.lists = lists;
+    } catch (err) {
+      console.error(
+        `[twining] Unreadable ANN index ${this.filePath}, retraining (non-fatal):`,
+        err,
+      );
+    }
+  }
+
+  /** Persist centroids and assignments (atomic replace). */
+  private save(): void {
+    if (!this.centroids) return;
+    this.unsaved = 0;
+    try {
+      // Rebuild the lists from the authoritative assignments, dropping
+      // stale duplicates
+      const lists: string[][] = Array.from({ length: this.nlist }, () => []);
+      for (const [id, list] of this.assignments) lists[list]!.push(id);
+      this.lists = lists;
+      const file: AnnFile = {
+        format: FORMAT_VERSION,
+        dimension: this.dimension,
+        nlist: this.nlist,
+        trained_on: this.trainedOn,
+        centroids: Buffer.from(
+          this.centroids.buffer,
+          this.centroids.byteOffset,
+          this.centroids.byteLength,
+        ).toString("base64"),
+        lists,
+      };
+      const tmp = `${this.filePath}.${process.pid}.tmp`;
+      fs.writeFileSync(tmp, JSON.stringify(file));
+      fs.renameSync(tmp, this.filePath);
+    } catch (err) {
+      console.error("[twining] Failed to save ANN index (non-fatal):", err);
+    }
+  }
+}
+
+/** Fixed-size max-score collector for small k. */
+class TopK {
+  private readonly k: number;
+  private readonly items: AnnHit[] = [];
+
+  constructor(k: number) {
+    this.k = k;
+  }
+
+  push(id: string, score: number): void {
+    const items = this.items;
+    if (items.length === this.k && score <= items[items.length - 1]!.score) {
+      return;
+    }
+    let i = items.length;
+    while (i > 0 && items[i - 1]!.score < score) i--;
+    items.splice(i, 0, { id, score });
+    if (items.length > this.k) items.pop();
+  }
+
+  sorted(): AnnHit[] {
+    return this.items;
+  }
+}
+
+function dotAt(
+  query: ArrayLike<number>,
+  data: Float32Array,
+  offset: number,
+  dim: number,
+): number {
+  let sum = 0;
+  for (let j = 0; j < dim; j++) {
+    sum += query[j]! * data[offset + j]!;
+  }
+  return sum;
+}
+
+function nearestCentroid(
+  data: Float32Array,
+  offset: number,
+  centroids: Float32Array,
+  nlist: number,
+  dim: number,
+): number {
+  let best = 0;
+  let bestScore = -Infinity;
+  for (let c = 0; c < nlist; c++) {
+    const base = c * dim;
+    let sum = 0;
+    for (let j = 0; j < dim; j++) {
+      sum += data[offset + j]! * centroids[base + j]!;
+    }
+    if (sum > bestScore) {
+      bestScore = sum;
+      best = c;
+    }
+  }
+  return best;
+}
+
+function yieldToEventLoop(): Promise<void> {
+  return new Promise((resolve) => setImmediate(resolve));
+}
@@ -2,8 +2,13 @@
  * Lazy-loaded singleton embedding pipeline using @huggingface/transformers.
  * Uses all-MiniLM-L6-v2 (384 dimensions) via ONNX runtime.
  * Falls back gracefully to keyword-only mode if ONNX fails.
+ * Inference runs in-process or, when configured, in a worker_threads pool.
+ * A worker that errors or exits leaves the pool and its calls fail; once
+ * none are left, the next call loads the pipeline in-process instead.
  */
 import path from "node:path";
+import { Worker } from "node:worker_threads";
+import { span } from "../utils/tracing.js";
 
 // Type for the pipeline function result
 type FeatureExtractionPipeline = (
@@ -11,23 +16,48 @@ type FeatureExtractionPipeline = (
   options?: { pooling?: string; normalize?: boolean },
 ) => Promise<{ data: Float32Array; dims: number[] }>;
 
+export interface EmbedderOptions {
+  /** Worker threads running inference; 0 = in-process (default). */
+  workers?: number;
+  /** Query embeddings kept in the LRU cache (default 256; 0 disables). */
+  query_cache_size?: number;
+}
+
+const MODEL_NAME = "Xenova/all-MiniLM-L6-v2";
+
+const DEFAULT_QUERY_CACHE_SIZE = 256;
+
 export class Embedder {
   private static instances = new Map<string, Embedder>();
 
   private readonly twiningDir: string;
+  private readonly workerCount: number;
+  private readonly queryCacheSize: number;
+  private readonly queryCache = new Map<string, number[]>();
   private pipeline: FeatureExtractionPipeline | null = null;
+  private workers: Worker[] = [];
+  /** Set once every pool worker has died; inference moves in-process. */
+  private workersLost = false;
   private fallbackMode = false;
   private initPromise: Promise<void> | null = null;
 
-  constructor(twiningDir: string) {
+  constructor(twiningDir: string, options?: EmbedderOptions) {
     this.twiningDir = twiningDir;
+    this.workerCount = Math.max(0, options?.workers ?? 0);
+    this.queryCacheSize = Math.max(
+      0,
+      options?.query_cache_size ?? DEFAULT_QUERY_CACHE_SIZE,
+    );
   }
 
-  /** Get or create a singleton instance for a given twiningDir. */
-  static getInstance(twiningDir: string): Embedder {
+  /**
+   * Get or create a singleton instance for a given twiningDir.
+   * Options only apply when the instance is first created.
+   */
+  static getInstance(twiningDir: string, options?: EmbedderOptions): Embedder {
     const existing = Embedder.instances.get(twiningDir);
     if (existing) return existing;
-    const instance = new Embedder(twiningDir);
+    const instance = new Embedder(twiningDir, options);
     Embedder.instances.set(twiningDir, instance);
     return instance;
   }
@@ -48,10 +78,10 @@ export class Embedder {
     if (this.fallbackMode || !this.pipeline) return null;
 
     try {
-      const output = await this.pipeline(text, {
-        pooling: "mean",
-        normalize: true,
-      });
+      const pipeline = this.pipeline;
+      const output = await span("embed", () =>
+        pipeline(text, { pooling: "mean", normalize: true }),
+      );
       return Array.from(output.data);
     } catch (error) {
       // Transient embedding errors don't trigger fallback mode
@@ -60,9 +90,38 @@ export class Embedder {
     }
   }
 
-  /** Generate embeddings for multiple texts. Returns null for any that fail. */
+  /**
+   * Embed a search query, serving repeats from a bounded LRU cache so
+   * repeated assemble tasks and dashboard searches skip inference.
+   */
+  async embedQuery(text: string): Promise<number[] | null> {
+    const cached = this.queryCache.get(text);
+    if (cached) {
+      // Refresh recency
+      this.queryCache.delete(text);
+      this.queryCache.set(text, cached);
+      return cached;
+    }
+
+    const vector = await this.embed(text);
+    if (vector && this.queryCacheSize > 0) {
+      this.queryCache.set(text, vector);
+      if (this.queryCache.size > this.queryCacheSize) {
+        const oldest = this.queryCache.keys().next().value;
+        if (oldest !== undefined) this.queryCache.delete(oldest);
+      }
+    }
+    return vector;
+  }
+
+  /**
+   * Generate embeddings for multiple texts in a single inference call.
+   * If the batch fails, texts are retried one at a time so one bad input
+   * doesn't sink the rest. Returns null for any that fail.
+   */
   async embedBatch(texts: string[]): Promise<(number[] | null)[]> {
     if (this.fallbackMode) return texts.map(() => null);
+    if (texts.length === 0) return [];
 
     if (!this.pipeline) {
       await this.initialize();
@@ -70,22 +129,47 @@ export class Embedder {
 
     if (this.fallbackMode || !this.pipeline) return texts.map(() => null);
 
+    try {
+      const pipeline = this.pipeline;
+      const output = await span(
+        "embed.batch",
+        () => pipeline(texts, { pooling: "mean", normalize: true }),
+        { texts: texts.length },
+      );
+      const dim = output.dims[output.dims.length - 1] ?? 0;
+      if (dim > 0 && output.data.length === texts.length * dim) {
+        return texts.map((_, i) =>
+          Array.from(output.data.subarray(i * dim, (i + 1) * dim)),
+        );
+      }
+      console.error(
+        `[twining] Unexpected batch embedding shape [${output.dims.join(", ")}] for ${texts.length} texts, retrying individually`,
+      );
+    } catch (error) {
+      console.error(
+        "[twining] Batch embedding error, retrying individually (non-fatal):",
+        error,
+      );
+    }
+
     const results: (number[] | null)[] = [];
     for (const text of texts) {
-      try {
-        const output = await this.pipeline(text, {
-          pooling: "mean",
-          normalize: true,
-        });
-        results.push(Array.from(output.data));
-      } catch (error) {
-        console.error("[twining] Batch embedding error (non-fatal):", error);
-        results.push(null);
-      }
+      results.push(await this.embed(text));
     }
     return results;
   }
 
+  /**
+   * Load the model ahead of the first embed so no tool call pays for it.
+   * Resolves true once ready, false if it fell back to keyword-only mode.
+   */
+  async warmUp(): Promise<boolean> {
+    if (!this.pipeline && !this.fallbackMode) {
+      await this.initialize();
+    }
+    return !this.fallbackMode;
+  }
+
   /** Whether the embedder has fallen back to keyword-only mode. */
   isFallbackMode(): boolean {
     return this.fallbackMode;
@@ -116,6 +200,11 @@ export class Embedder {
     }
 
     try {
+      if (this.workerCount > 0 && !this.workersLost) {
+        this.pipeline = await this.startWorkers();
+        return;
+      }
+
       // Dynamic import to avoid loading ONNX at module evaluation time
       const { pipeline, env } = await import("@huggingface/transformers");
 
@@ -125,7 +214,7 @@ export class Embedder {
       // Create the feature extraction pipeline
       this.pipeline = (await pipeline(
         "feature-extraction",
-        "Xenova/all-MiniLM-L6-v2",
+        MODEL_NAME,
       )) as unknown as FeatureExtractionPipeline;
     } catch (error) {
       console.error(
@@ -135,4 +224,122 @@ export class Embedder {
       this.fallbackMode = true;
     }
   }
+
+  /**
+   * Start the worker pool and return a pipeline that dispatches calls to
+   * it round-robin. Resolves once every worker has loaded the model.
+   */
+  private async startWorkers(
+    workerUrl: URL = new URL("./embedding-worker.js", import.meta.url),
+  ): Promise<FeatureExtractionPipeline> {
+    const cacheDir = path.join(this.twiningDir, "models");
+    const pending = new Map<
+      number,
+      {
+        worker: Worker;
+        resolve: (output: { data: Float32Array; dims: number[] }) => void;
+        reject: (error: Error) => void;
+      }
+    >();
+    const inFlight = new Map<Worker, number>();
+    let nextId = 0;
+    let started = false;
+
+    // Keep the process alive only while a worker has calls in flight
+    const settle = (worker: Worker) => {
+      const remaining = (inFlight.get(worker) ?? 1) - 1;
+      inFlight.set(worker, remaining);
+      if (remaining === 0) worker.unref();
+    };
+
+    // Take a dead worker out of rotation and fail the calls it held
+    const retire = (worker: Worker, error: Error) => {
+      const index = this.workers.indexOf(worker);
+      if (index >= 0) this.workers.splice(index, 1);
+      inFlight.delete(worker);
+      for (const [id, call] of pending) {
+        if (call.worker !== worker) continue;
+        pending.delete(id);
+        call.reject(error);
+      }
+      if (started && index >= 0 && this.workers.length === 0) {
+        console.error(
+          "[twining] All embedding workers exited, falling back to in-process inference:",
+          error.message,
+        );
+        this.workersLost = true;
+        this.pipeline = null;
+        this.initPromise = null;
+      }
+    };
+
+    const ready = Array.from({ length: this.workerCount }, () => {
+      const worker = new Worker(workerUrl, {
+        workerData: { cacheDir, model: MODEL_NAME },
+      });
+      // Idle workers must not keep the process alive
+      worker.unref();
+      this.workers.push(worker);
+
+      return new Promise<void>((resolve, reject) => {
+        worker.on("message", (msg: WorkerMessage) => {
+          if (msg.type === "ready") {
+            resolve();
+          } else if (msg.type === "init_error") {
+            reject(new Error(msg.error));
+          } else {
+            const call = pending.get(msg.id);
+            if (!call) return;
+            pending.delete(msg.id);
+            settle(worker);
+            if (msg.type === "result") {
+              call.resolve({ data: msg.data, dims: msg.dims });
+            } else {
+              call.reject(new Error(msg.error));
+            }
+          }
+        });
+        worker.on("error", (err) => {
+          reject(err);
+          retire(worker, err);
+        });
+        worker.on("exit", (code) => {
+          const err = new Error(`Embedding worker exited with code ${code}`);
+          reject(err);
+          retire(worker, err);
+        });
+      });
+    });
+
+    try {
+      await Promise.all(ready);
+    } catch (error) {
+      await Promise.all(this.workers.map((w) => w.terminate()));
+      this.workers = [];
+      throw error;
+    }
+    started = true;
+
+    let turn = 0;
+    return async (text, options) => {
+      if (this.workers.length === 0) {
+        throw new Error("No embedding workers left");
+      }
+      const worker = this.workers[turn++ % this.workers.length]!;
+      const id = nextId++;
+      inFlight.set(worker, (inFlight.get(worker) ?? 0) + 1);
+      worker.ref();
+      return new Promise((resolve, reject) => {
+        pending.set(id, { worker, resolve, reject });
+        worker.postMessage({ id, texts: text, options });
+      });
+    };
+  }
 }
+
+/** Messages posted by embedding-worker.ts. */
+type WorkerMessage =
+  | { type: "ready" }
+  | { type: "init_error"; error: string }
+  | { type: "result"; id: number; data: Float32Array; dims: number[] }
+  | { type: "error"; id: number; error: string };
@@ -0,0 +1,177 @@
+/**
+ * Background embedding queue.
+ * post/decide enqueue texts and return immediately; the queue coalesces
+ * pending texts into batched inference calls and appends the results to
+ * the index in one write per batch. Until an id's vector lands it is
+ * "pending" — it has no slot in the index, so search scores it by keyword.
+ */
+import type { Embedder } from "./embedder.js";
+import type { IndexManager, IndexName } from "./index-manager.js";
+
+export interface EmbeddingQueueOptions {
+  /** Most texts per inference call. */
+  batch_size: number;
+  /** How long to wait for more texts before running a partial batch. */
+  batch_delay_ms: number;
+}
+
+export const DEFAULT_EMBEDDING_QUEUE_OPTIONS: EmbeddingQueueOptions = {
+  batch_size: 32,
+  batch_delay_ms: 5,
+};
+
+export class EmbeddingQueue {
+  private readonly embedder: Embedder;
+  private readonly indexManager: IndexManager;
+  private readonly options: EmbeddingQueueOptions;
+  /** Texts waiting for a batch, per index: id -> text. */
+  private readonly queued = new Map<IndexName, Map<string, string>>();
+  /** Ids in a batch currently being embedded, per index. */
+  private readonly inFlight = new Map<IndexName, Set<string>>();
+  /** In-flight ids cancelled before their batch completed. */
+  private readonly cancelled = new Map<IndexName, Set<string>>();
+  private timer: NodeJS.Timeout | null = null;
+  private draining: Promise<void> | null = null;
+
+  constructor(
+    embedder: Embedder,
+    indexManager: IndexManager,
+    options?: Partial<EmbeddingQueueOptions>,
+  ) {
+    this.embedder = embedder;
+    this.indexManager = indexManager;
+    this.options = { ...DEFAULT_EMBEDDING_QUEUE_OPTIONS, ...options };
+  }
+
+  /** Queue a text for embedding. Re-queuing an id replaces its text. */
+  enqueue(indexName: IndexName, id: string, text: string): void {
+    if (this.embedder.isFallbackMode()) return;
+    this.cancelled.get(indexName)?.delete(id);
+    this.bucket(this.queued, indexName, () => new Map()).set(id, text);
+    this.schedule();
+  }
+
+  /** Drop ids whose entries were removed, so their vectors are never written. */
+  cancel(indexName: IndexName, ids: string[]): void {
+    const queued = this.queued.get(indexName);
+    const inFlight = this.inFlight.get(indexName);
+    for (const id of ids) {
+      queued?.delete(id);
+      if (inFlight?.has(id)) {
+        this.bucket(this.cancelled, indexName, () => new Set()).add(id);
+      }
+    }
+  }
+
+  /** Whether an id is waiting for (or in the middle of) embedding. */
+  isPending(indexName: IndexName, id: string): boolean {
+    return (
+      (this.queued.get(indexName)?.has(id) ?? false) ||
+      (this.inFlight.get(indexName)?.has(id) ?? false)
+    );
+  }
+
+  /** Number of ids waiting for a vector across all indexes. */
+  pendingCount(): number {
+    let count = 0;
+    for (const queued of this.queued.values()) count += queued.size;
+    for (const inFlight of this.inFlight.values()) count += inFlight.size;
+    return count;
+  }
+
+  /** Embed everything queued so far and wait for it to be written. */
+  async flush(): Promise<void> {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    while (this.draining || this.hasQueued()) {
+      if (!this.draining) this.draining = this.drain();
+      await this.draining;
+    }
+  }
+
+  private schedule(): void {
+    if (this.timer || this.draining) return;
+    const full = [...this.queued.values()].some(
+      (q) => q.size >= this.options.batch_size,
+    );
+    // Timer is deliberately not unref'd: queued work keeps the process
+    // alive until it has been written.
+    this.timer = setTimeout(
+      () => {
+        this.timer = null;
+        this.draining = this.drain();
+      },
+      full ? 0 : this.options.batch_delay_ms,
+    );
+  }
+
+  private async drain(): Promise<void> {
+    try {
+      while (this.hasQueued()) {
+        for (const [indexName, queued] of this.queued) {
+          if (queued.size === 0) continue;
+          const batch: [string, string][] = [];
+          for (const item of queued) {
+            batch.push(item);
+            if (batch.length >= this.options.batch_size) break;
+          }
+          for (const [id] of batch) queued.delete(id);
+          await this.runBatch(indexName, batch);
+        }
+      }
+    } finally {
+      this.draining = null;
+    }
+  }
+
+  private async runBatch(
+    indexName: IndexName,
+    batch: [string, string][],
+  ): Promise<void> {
+    const inFlight = this.bucket(this.inFlight, indexName, () => new Set());
+    const cancelled = this.bucket(this.cancelled, indexName, () => new Set());
+    for (const [id] of batch) inFlight.add(id);
+
+    try {
+      const vectors = await this.embedder.embedBatch(
+        batch.map(([, text]) => text),
+      );
+      const entries: { id: string; vector: number[] }[] = [];
+      batch.forEach(([id], i) => {
+        const vector = vectors[i];
+        if (vector && !cancelled.has(id)) entries.push({ id, vector });
+      });
+      await this.indexManager.addEntries(indexName, entries);
+    } catch (error) {
+      // Embedding is best-effort; affected ids stay keyword-only
+      console.error("[twining] Background embedding failed (non-fatal):", error);
+    } finally {
+      for (const [id] of batch) {
+        inFlight.delete(id);
+        cancelled.delete(id);
+      }
+    }
+  }
+
+  private hasQueued(): boolean {
+    for (const queued of this.queued.values()) {
+      if (queued.size > 0) return true;
+    }
+    return false;
+  }
+
+  private bucket<T>(
+    map: Map<IndexName, T>,
+    indexName: IndexName,
+    create: () => T,
+  ): T {
+    let value = map.get(indexName);
+    if (value === undefined) {
+      value = create();
+      map.set(indexName, value);
+    }
+    return value;
+  }
+}
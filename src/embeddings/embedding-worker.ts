@@ -0,0 +1,62 @@
+/**
+ * worker_threads entry point for embedding inference.
+ * Loads the feature-extraction pipeline once, then answers
+ * { id, texts, options } requests with packed Float32 output.
+ * Started by Embedder when embeddings.workers > 0.
+ */
+import { parentPort, workerData } from "node:worker_threads";
+
+interface WorkerInit {
+  cacheDir: string;
+  model: string;
+}
+
+type Extractor = (
+  text: string | string[],
+  options?: { pooling?: string; normalize?: boolean },
+) => Promise<{ data: Float32Array; dims: number[] }>;
+
+async function main(): Promise<void> {
+  const port = parentPort;
+  if (!port) return;
+  const init = workerData as WorkerInit;
+
+  let extractor: Extractor;
+  try {
+    const { pipeline, env } = await import("@huggingface/transformers");
+    env.cacheDir = init.cacheDir;
+    extractor = (await pipeline(
+      "feature-extraction",
+      init.model,
+    )) as unknown as Extractor;
+  } catch (error) {
+    port.postMessage({ type: "init_error", error: String(error) });
+    return;
+  }
+
+  port.on(
+    "message",
+    async (msg: {
+      id: number;
+      texts: string | string[];
+      options?: { pooling?: string; normalize?: boolean };
+    }) => {
+      try {
+        const output = await extractor(msg.texts, msg.options);
+        // Copy out of the runtime's buffer so it can be transferred
+        const data = new Float32Array(output.data);
+        port.postMessage(
+          { type: "result", id: msg.id, data, dims: output.dims },
+          [data.buffer],
+        );
+      } catch (error) {
+        port.postMessage({ type: "error", id: msg.id, error: String(error) });
+      }
+    },
+  );
+  port.postMessage({ type: "ready" });
+}
+
+main().catch((error) => {
+  parentPort?.postMessage({ type: "init_error", error: String(error) });
+});
@@ -1,12 +1,27 @@
 /**
- * Embedding index CRUD operations.
- * JSON-based storage in .twining/embeddings/ with file locking.
- * Matches spec section 5.3 index structure.
+ * Embedding index storage.
+ * Packed Float32 vectors in .twining/embeddings/ with a compact id sidecar:
+ *
+ *   {name}.meta.json     — model, dimension, current generation
+ *   {name}.{gen}.vec     — append-only Float32 slots (host byte order)
+ *   {name}.{gen}.ids     — one line per mutation: "+id" claims the next slot,
+ *                          "-id" tombstones the id's live slot
+ *
+ * Appends and removals are O(1) writes under a lock. Readers keep the parsed
+ * state in memory and only read the bytes appended since their last look.
+ * Compaction writes a fresh generation and swaps it in by replacing the meta
+ * file. Legacy JSON indexes (spec section 5.3) are migrated on first access.
  */
 import fs from "node:fs";
 import path from "node:path";
-import lockfile from "proper-lockfile";
-import { ensureDir } from "../storage/file-store.js";
+import {
+  acquireLock,
+  ensureDir,
+  LOCK_OPTIONS,
+  readRange,
+  readTail,
+} from "../storage/file-store.js";
+import { span } from "../utils/tracing.js";
 
 /** Embedding index structure — spec section 5.3 */
 export interface EmbeddingIndex {
@@ -18,10 +33,51 @@ export interface EmbeddingIndex {
   }[];
 }
 
-const LOCK_OPTIONS: lockfile.LockOptions = {
-  retries: { retries: 10, factor: 1.5, minTimeout: 50, maxTimeout: 1000 },
-  stale: 10000,
-};
+/**
+ * Zero-copy view over the live vectors of an index.
+ * Slot i occupies data[i * dimension, (i + 1) * dimension).
+ * The view is a snapshot of shared state and is only valid until the next
+ * call into the IndexManager.
+ */
+export interface VectorView {
+  dimension: number;
+  data: Float32Array;
+  /** Live id -> slot. */
+  slots: ReadonlyMap<string, number>;
+  /** Slot -> id for every slot claimed so far, live or dead. */
+  slotIds: readonly string[];
+  /** Bumped whenever compaction renumbers slots. */
+  generation: number;
+}
+
+/** On-disk metadata for a packed index. */
+interface IndexMeta {
+  format: number;
+  model: string;
+  dimension: number;
+  generation: number;
+}
+
+/** In-memory state of a packed index, advanced incrementally from disk. */
+interface IndexState {
+  meta: IndexMeta;
+  metaIno: number;
+  metaMtime: number;
+  /** Bytes of the ids sidecar consumed so far (always ends on a newline). */
+  idsBytes: number;
+  /** Slots claimed so far, live or dead. */
+  slotCount: number;
+  /** Live id -> slot. */
+  slots: Map<string, number>;
+  /** Slot -> id, including dead slots. */
+  slotIds: string[];
+  /** Slots that are replaced or tombstoned. */
+  dead: number;
+  /** Packed vectors; may have spare capacity beyond `floats`. */
+  data: Float32Array;
+  /** Floats of `data` loaded from disk. */
+  floats: number;
+}
 
 const DEFAULT_INDEX: EmbeddingIndex = {
   model: "all-MiniLM-L6-v2",
@@ -29,111 +85,166 @@ const DEFAULT_INDEX: EmbeddingIndex = {
   entries: [],
 };
 
+const FORMAT_VERSION = 1;
+
+/** Dead slots tolerated before a background compaction is scheduled. */
+const COMPACT_MIN_DEAD = 256;
+
 export type IndexName = "blackboard" | "decisions";
 
 export class IndexManager {
   private readonly embeddingsDir: string;
+  private readonly states = new Map<IndexName, IndexState>();
+  private readonly compacting = new Set<IndexName>();
 
   constructor(twiningDir: string) {
     this.embeddingsDir = path.join(twiningDir, "embeddings");
     ensureDir(this.embeddingsDir);
   }
 
-  /** Get the file path for a named index. */
-  private indexPath(indexName: IndexName): string {
-    return path.join(this.embeddingsDir, `${indexName}.index`);
-  }
-
-  /** Load an embedding index. Returns empty index if file doesn't exist. */
+  /** Load an embedding index as plain arrays. Returns empty index if none exists. */
   async load(indexName: IndexName): Promise<EmbeddingIndex> {
-    const filePath = this.indexPath(indexName);
-    if (!fs.existsSync(filePath)) {
+    const state = await this.open(indexName);
+    if (!state) {
       return { ...DEFAULT_INDEX, entries: [] };
     }
 
-    try {
-      const content = fs.readFileSync(filePath, "utf-8");
-      if (!content.trim()) {
-        return { ...DEFAULT_INDEX, entries: [] };
-      }
-      return JSON.parse(content) as EmbeddingIndex;
-    } catch {
-      console.error(
-        `[twining] Corrupt embedding index ${indexName}, returning empty`,
-      );
-      return { ...DEFAULT_INDEX, entries: [] };
+    const dim = state.meta.dimension;
+    const entries: EmbeddingIndex["entries"] = [];
+    for (const [id, slot] of state.slots) {
+      entries.push({
+        id,
+        vector: Array.from(state.data.subarray(slot * dim, (slot + 1) * dim)),
+      });
     }
+    return { model: state.meta.model, dimension: dim, entries };
   }
 
-  /** Save an embedding index atomically with file locking. */
-  async save(indexName: IndexName, index: EmbeddingIndex): Promise<void> {
-    const filePath = this.indexPath(indexName);
-
-    // Ensure file exists for proper-lockfile
-    if (!fs.existsSync(filePath)) {
-      fs.writeFileSync(filePath, "");
+  /** Get a zero-copy view of all live vectors, for scoring without materializing arrays. */
+  async getVectors(indexName: IndexName): Promise<VectorView> {
+    const state = await this.open(indexName);
+    if (!state) {
+      return {
+        dimension: DEFAULT_INDEX.dimension,
+        data: new Float32Array(0),
+        slots: new Map(),
+        slotIds: [],
+        generation: 0,
+      };
     }
+    return {
+      dimension: state.meta.dimension,
+      data: state.data,
+      slots: state.slots,
+      slotIds: state.slotIds,
+      generation: state.meta.generation,
+    };
+  }
 
-    const release = await lockfile.lock(filePath, LOCK_OPTIONS);
-    try {
-      fs.writeFileSync(filePath, JSON.stringify(index));
-    } finally {
-      await release();
-    }
+  /** Replace an embedding index wholesale by writing a new generation. */
+  async save(indexName: IndexName, index: EmbeddingIndex): Promise<void> {
+    await this.withLock(indexName, () => {
+      const previous = this.readMeta(indexName)?.generation ?? 0;
+      this.writeGeneration(
+        indexName,
+        index.model,
+        index.entries,
+        previous + 1,
+        index.entries[0]?.vector.length ?? index.dimension,
+      );
+      this.removeGeneration(indexName, previous);
+      fs.rmSync(this.legacyPath(indexName), { force: true });
+    });
   }
 
-  /** Add a single entry to an index. Loads, appends, saves atomically. */
+  /** Add or replace a single entry. Appends one slot; never rewrites the index. */
   async addEntry(
     indexName: IndexName,
     id: string,
     vector: number[],
   ): Promise<void> {
-    const filePath = this.indexPath(indexName);
+    await this.addEntries(indexName, [{ id, vector }]);
+  }
 
-    // Ensure file exists for proper-lockfile
-    if (!fs.existsSync(filePath)) {
-      fs.writeFileSync(filePath, "");
-    }
+  /** Add or replace several entries with a single locked append. */
+  async addEntries(
+    indexName: IndexName,
+    entries: { id: string; vector: number[] }[],
+  ): Promise<void> {
+    if (entries.length === 0) return;
 
-    const release = await lockfile.lock(filePath, LOCK_OPTIONS);
-    try {
-      // Read current index
-      const content = fs.readFileSync(filePath, "utf-8");
-      const index: EmbeddingIndex =
-        content.trim() ? (JSON.parse(content) as EmbeddingIndex) : { ...DEFAULT_INDEX, entries: [] };
-
-      // Replace existing entry with same ID, or append
-      const existingIdx = index.entries.findIndex((e) => e.id === id);
-      if (existingIdx >= 0) {
-        index.entries[existingIdx] = { id, vector };
-      } else {
-        index.entries.push({ id, vector });
+    await this.withLock(indexName, () => {
+      this.migrateLegacy(indexName);
+
+      let state = this.tryRefresh(indexName);
+      if (!state) {
+        this.writeGeneration(
+          indexName,
+          DEFAULT_INDEX.model,
+          [],
+          1,
+          entries[0]!.vector.length,
+        );
+        state = this.refreshState(indexName);
       }
+      if (!state) return;
 
-      // Write back
-      fs.writeFileSync(filePath, JSON.stringify(index));
-    } finally {
-      await release();
-    }
+      const dim = state.meta.dimension;
+      const accepted = entries.filter(({ id, vector }) => {
+        if (vector.length === dim) return true;
+        console.error(
+          `[twining] Embedding dimension mismatch for ${indexName}: ${vector.length} vs ${dim}. Skipping ${id}.`,
+        );
+        return false;
+      });
+      if (accepted.length === 0) return;
+
+      const gen = state.meta.generation;
+      this.truncateUncommitted(indexName, state);
+      const packed = new Float32Array(accepted.length * dim);
+      accepted.forEach(({ vector }, i) => packed.set(vector, i * dim));
+      fs.appendFileSync(
+        this.vecPath(indexName, gen),
+        Buffer.from(packed.buffer, packed.byteOffset, packed.byteLength),
+      );
+      fs.appendFileSync(
+        this.idsPath(indexName, gen),
+        accepted.map(({ id }) => `+${id}\n`).join(""),
+      );
+    });
   }
 
-  /** Remove entries by IDs from an index. */
+  /** Remove entries by IDs by appending tombstones. Compaction runs in the background. */
   async removeEntries(indexName: IndexName, ids: string[]): Promise<void> {
-    const filePath = this.indexPath(indexName);
-    if (!fs.existsSync(filePath)) return;
+    if (
+      !fs.existsSync(this.metaPath(indexName)) &&
+      !fs.existsSync(this.legacyPath(indexName))
+    ) {
+      return;
+    }
 
-    const release = await lockfile.lock(filePath, LOCK_OPTIONS);
-    try {
-      const content = fs.readFileSync(filePath, "utf-8");
-      if (!content.trim()) return;
+    const shouldCompact = await this.withLock(indexName, () => {
+      this.migrateLegacy(indexName);
+
+      const state = this.tryRefresh(indexName);
+      if (!state) return false;
+
+      const present = [...new Set(ids)].filter((id) => state.slots.has(id));
+      if (present.length === 0) return false;
+
+      this.truncateUncommitted(indexName, state);
+      fs.appendFileSync(
+        this.idsPath(indexName, state.meta.generation),
+        present.map((id) => `-${id}\n`).join(""),
+      );
 
-      const index = JSON.parse(content) as EmbeddingIndex;
-      const idSet = new Set(ids);
-      index.entries = index.entries.filter((e) => !idSet.has(e.id));
+      const dead = state.dead + present.length;
+      const live = state.slots.size - present.length;
+      return dead >= COMPACT_MIN_DEAD && dead > live;
+    });
 
-      fs.writeFileSync(filePath, JSON.stringify(index));
-    } finally {
-      await release();
+    if (shouldCompact) {
+      this.scheduleCompaction(indexName);
     }
   }
 
@@ -142,8 +253,356 @@ export class IndexManager {
     indexName: IndexName,
     id: string,
   ): Promise<number[] | null> {
-    const index = await this.load(indexName);
-    const entry = index.entries.find((e) => e.id === id);
-    return entry?.vector ?? null;
+    const state = await this.open(indexName);
+    const slot = state?.slots.get(id);
+    if (!state || slot === undefined) return null;
+    const dim = state.meta.dimension;
+    return Array.from(state.data.subarray(slot * dim, (slot + 1) * dim));
+  }
+
+  /**
+   * Rewrite an index without dead slots.
+   * Writes a new generation, swaps the meta file, then deletes the old files.
+   */
+  async compact(indexName: IndexName): Promise<void> {
+    await this.withLock(indexName, () => {
+      this.migrateLegacy(indexName);
+
+      const state = this.tryRefresh(indexName);
+      if (!state || state.dead === 0) return;
+
+      const dim = state.meta.dimension;
+      const entries = [...state.slots].map(([id, slot]) => ({
+        id,
+        vector: state.data.subarray(slot * dim, (slot + 1) * dim),
+      }));
+      const previous = state.meta.generation;
+      this.writeGeneration(indexName, state.meta.model, entries, previous + 1, dim);
+      this.removeGeneration(indexName, previous);
+    });
+  }
+
+  /** Directory holding the index files, for sidecar structures such as the ANN index. */
+  getDirectory(): string {
+    return this.embeddingsDir;
+  }
+
+  private metaPath(indexName: IndexName): string {
+    return path.join(this.embeddingsDir, `${indexName}.meta.json`);
   }
+
+  private idsPath(indexName: IndexName, generation: number): string {
+    return path.join(this.embeddingsDir, `${indexName}.${generation}.ids`);
+  }
+
+  private vecPath(indexName: IndexName, generation: number): string {
+    return path.join(this.embeddingsDir, `${indexName}.${generation}.vec`);
+  }
+
+  /** Pre-binary JSON index location. */
+  private legacyPath(indexName: IndexName): string {
+    return path.join(this.embeddingsDir, `${indexName}.index`);
+  }
+
+  /** Run fn while holding the index's advisory lock. */
+  private async withLock<T>(indexName: IndexName, fn: () => T): Promise<T> {
+    return span(
+      "index.write",
+      async () => {
+        ensureDir(this.embeddingsDir);
+        const release = await acquireLock(this.metaPath(indexName), {
+          ...LOCK_OPTIONS,
+          realpath: false,
+        });
+        try {
+          return fn();
+        } finally {
+          await release();
+        }
+      },
+      { index: indexName },
+    );
+  }
+
+  /** Migrate a legacy index if needed, then bring in-memory state up to date. */
+  private async open(indexName: IndexName): Promise<IndexState | null> {
+    if (
+      !fs.existsSync(this.metaPath(indexName)) &&
+      fs.existsSync(this.legacyPath(indexName))
+    ) {
+      await this.withLock(indexName, () => this.migrateLegacy(indexName));
+    }
+    return this.tryRefresh(indexName);
+  }
+
+  /**
+   * Refresh state, retrying once from scratch if the generation was swapped
+   * mid-read by a concurrent compaction. Returns null for missing or corrupt indexes.
+   */
+  private tryRefresh(indexName: IndexName): IndexState | null {
+    try {
+      return this.refreshState(indexName);
+    } catch {
+      this.states.delete(indexName);
+    }
+    try {
+      return this.refreshState(indexName);
+    } catch {
+      console.error(
+        `[twining] Corrupt embedding index ${indexName}, returning empty`,
+      );
+      this.states.delete(indexName);
+      return null;
+    }
+  }
+
+  /** Read only what was appended since the last refresh. Throws on I/O or parse errors. */
+  private refreshState(indexName: IndexName): IndexState | null {
+    let stat: fs.Stats;
+    try {
+      stat = fs.statSync(this.metaPath(indexName));
+    } catch {
+      this.states.delete(indexName);
+      return null;
+    }
+
+    let state = this.states.get(indexName);
+    if (
+      !state ||
+      state.metaIno !== stat.ino ||
+      state.metaMtime !== stat.mtimeMs
+    ) {
+      const meta = JSON.parse(
+        fs.readFileSync(this.metaPath(indexName), "utf-8"),
+      ) as IndexMeta;
+      state = emptyState(meta, stat);
+      this.states.set(indexName, state);
+    }
+
+    this.readIdsTail(indexName, state);
+    this.readVectorsTail(indexName, state);
+    return state;
+  }
+
+  /** Apply complete sidecar lines appended since the last read. */
+  private readIdsTail(indexName: IndexName, state: IndexState): void {
+    const file = this.idsPath(indexName, state.meta.generation);
+    const size = fs.statSync(file).size;
+    if (size < state.idsBytes) {
+      // Rewritten underneath us — start over from the beginning
+      Object.assign(state, emptyState(state.meta, {
+        ino: state.metaIno,
+        mtimeMs: state.metaMtime,
+      }));
+    }
+    const tail = readTail(file, state.idsBytes, size);
+    state.idsBytes += tail.bytes;
+    for (const line of tail.lines) {
+      if (line.length < 2) continue;
+      const id = line.slice(1);
+      if (line[0] === "+") {
+        if (state.slots.has(id)) state.dead++;
+        state.slotIds.push(id);
+        state.slots.set(id, state.slotCount++);
+      } else if (line[0] === "-") {
+        if (state.slots.delete(id)) state.dead++;
+      }
+    }
+  }
+
+  /** Load vector slots claimed by the sidecar but not yet in memory. */
+  private readVectorsTail(indexName: IndexName, state: IndexState): void {
+    const dim = state.meta.dimension;
+    const needed = state.slotCount * dim;
+    if (state.floats >= needed) return;
+
+    const file = this.vecPath(indexName, state.meta.generation);
+    let loaded: Float32Array;
+    if (state.floats === 0) {
+      // Cold load: view the file buffer directly instead of copying
+      const buf = fs.readFileSync(file);
+      loaded = float32View(buf, Math.min(needed, Math.floor(buf.byteLength / 4)));
+      state.data = loaded;
+    } else {
+      const buf = readRange(file, state.floats * 4, (needed - state.floats) * 4);
+      loaded = float32View(buf, Math.floor(buf.byteLength / 4));
+      ensureCapacity(state, state.floats + loaded.length);
+      state.data.set(loaded, state.floats);
+    }
+    state.floats += loaded.length;
+
+    if (state.floats < needed) {
+      // Vector file is shorter than the sidecar claims — drop unbacked slots
+      const available = Math.floor(state.floats / dim);
+      console.error(
+        `[twining] Embedding index ${indexName} is missing ${state.slotCount - available} vector(s); ignoring them`,
+      );
+      for (const [id, slot] of state.slots) {
+        if (slot >= available) {
+          state.slots.delete(id);
+          state.dead++;
+        }
+      }
+    }
+  }
+
+  /**
+   * Drop bytes past the last committed slot (a crashed writer's partial line
+   * or orphaned vector) so the next append stays aligned. Caller holds the lock.
+   */
+  private truncateUncommitted(indexName: IndexName, state: IndexState): void {
+    const gen = state.meta.generation;
+    const idsFile = this.idsPath(indexName, gen);
+    if (fs.statSync(idsFile).size !== state.idsBytes) {
+      fs.truncateSync(idsFile, state.idsBytes);
+    }
+    const vecFile = this.vecPath(indexName, gen);
+    const vecBytes = state.slotCount * state.meta.dimension * 4;
+    if (fs.statSync(vecFile).size !== vecBytes) {
+      fs.truncateSync(vecFile, vecBytes);
+    }
+  }
+
+  /** Convert a legacy JSON index to the packed format. Caller holds the lock. */
+  private migrateLegacy(indexName: IndexName): void {
+    const legacy = this.legacyPath(indexName);
+    if (fs.existsSync(this.metaPath(indexName)) || !fs.existsSync(legacy)) {
+      return;
+    }
+
+    let index: EmbeddingIndex | null = null;
+    try {
+      const content = fs.readFileSync(legacy, "utf-8");
+      if (content.trim()) {
+        index = JSON.parse(content) as EmbeddingIndex;
+      }
+    } catch {
+      console.error(
+        `[twining] Corrupt embedding index ${indexName}, discarding during migration`,
+      );
+    }
+
+    const entries = index?.entries ?? [];
+    if (entries.length > 0) {
+      this.writeGeneration(
+        indexName,
+        index?.model ?? DEFAULT_INDEX.model,
+        entries,
+        1,
+        entries[0]!.vector.length,
+      );
+    }
+    fs.rmSync(legacy, { force: true });
+  }
+
+  /**
+   * Write a complete generation and point the meta file at it.
+   * Entries whose length differs from the dimension are dropped.
+   */
+  private writeGeneration(
+    indexName: IndexName,
+    model: string,
+    entries: { id: string; vector: ArrayLike<number> }[],
+    generation: number,
+    dimension: number,
+  ): void {
+    ensureDir(this.embeddingsDir);
+    const live = entries.filter((e) => e.vector.length === dimension);
+    if (live.length < entries.length) {
+      console.error(
+        `[twining] Dropping ${entries.length - live.length} embedding(s) with wrong dimension from ${indexName}`,
+      );
+    }
+
+    const data = new Float32Array(live.length * dimension);
+    live.forEach((e, i) => data.set(e.vector, i * dimension));
+    fs.writeFileSync(
+      this.vecPath(indexName, generation),
+      Buffer.from(data.buffer, data.byteOffset, data.byteLength),
+    );
+    fs.writeFileSync(
+      this.idsPath(indexName, generation),
+      live.map((e) => `+${e.id}\n`).join(""),
+    );
+
+    const meta: IndexMeta = {
+      format: FORMAT_VERSION,
+      model,
+      dimension,
+      generation,
+    };
+    const tmp = this.metaPath(indexName) + ".tmp";
+    fs.writeFileSync(tmp, JSON.stringify(meta));
+    fs.renameSync(tmp, this.metaPath(indexName));
+  }
+
+  /** Delete a superseded generation's files. */
+  private removeGeneration(indexName: IndexName, generation: number): void {
+    if (generation <= 0) return;
+    fs.rmSync(this.vecPath(indexName, generation), { force: true });
+    fs.rmSync(this.idsPath(indexName, generation), { force: true });
+  }
+
+  /** Read the meta file, or null if missing or unreadable. */
+  private readMeta(indexName: IndexName): IndexMeta | null {
+    try {
+      return JSON.parse(
+        fs.readFileSync(this.metaPath(indexName), "utf-8"),
+      ) as IndexMeta;
+    } catch {
+      return null;
+    }
+  }
+
+  /** Compact off the request path; at most one pending compaction per index. */
+  private scheduleCompaction(indexName: IndexName): void {
+    if (this.compacting.has(indexName)) return;
+    this.compacting.add(indexName);
+    setImmediate(() => {
+      this.compact(indexName)
+        .catch((err) => {
+          console.error("[twining] Embedding index compaction failed (non-fatal):", err);
+        })
+        .finally(() => {
+          this.compacting.delete(indexName);
+        });
+    });
+  }
+}
+
+function emptyState(
+  meta: IndexMeta,
+  stat: { ino: number; mtimeMs: number },
+): IndexState {
+  return {
+    meta,
+    metaIno: stat.ino,
+    metaMtime: stat.mtimeMs,
+    idsBytes: 0,
+    slotCount: 0,
+    slots: new Map(),
+    slotIds: [],
+    dead: 0,
+    data: new Float32Array(0),
+    floats: 0,
+  };
+}
+
+/** Read `length` bytes starting at `position`. */
+/** View a buffer as floats without copying when it is 4-byte aligned. */
+function float32View(buf: Buffer, floats: number): Float32Array {
+  if (buf.byteOffset % 4 === 0) {
+    return new Float32Array(buf.buffer, buf.byteOffset, floats);
+  }
+  return new Float32Array(
+    buf.buffer.slice(buf.byteOffset, buf.byteOffset + floats * 4),
+  );
+}
+
+/** Grow the state's vector buffer geometrically to hold at least `floats`. */
+function ensureCapacity(state: IndexState, floats: number): void {
+  if (state.data.length >= floats) return;
+  const grown = new Float32Array(Math.max(floats, state.data.length * 2));
+  grown.set(state.data.subarray(0, state.floats));
+  state.data = grown;
 }
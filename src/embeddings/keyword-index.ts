@@ -0,0 +1,395 @@
+/**
+ * Persistent inverted index with BM25 scoring for keyword search.
+ *
+ * Each index is an append-only log in .twining/embeddings/{name}.terms.jsonl
+ * (one per embedding index, plus "archive" for archived blackboard entries):
+ *
+ *   ["+", id, length, {term: tf, ...}]   add or replace a document
+ *   ["-", id]                            remove a document
+ *
+ * Writers append under an advisory lock; readers keep postings in memory
+ * and only parse lines appended since their last look. The log is rewritten
+ * without dead lines once they outnumber live documents. Query cost is
+ * proportional to the postings of the query terms, not the corpus size.
+ */
+import fs from "node:fs";
+import path from "node:path";
+import {
+  acquireLock,
+  ensureDir,
+  LOCK_OPTIONS,
+  readTail,
+  tailInvalidated,
+} from "../storage/file-store.js";
+import { span } from "../utils/tracing.js";
+import type { IndexName } from "./index-manager.js";
+
+/** BM25 term-frequency saturation. */
+const K1 = 1.2;
+/** BM25 length normalization. */
+const B = 0.75;
+
+/** Query terms shorter than this only match exactly, not as prefixes. */
+const MIN_PREFIX_LENGTH = 3;
+
+/** Dead log lines tolerated before compaction is considered. */
+const COMPACT_MIN_DEAD = 512;
+
+type LogLine =
+  | ["+", string, number, Record<string, number>]
+  | ["-", string];
+
+interface Doc {
+  length: number;
+  terms: Record<string, number>;
+}
+
+/** In-memory state of one index, advanced incrementally from the log. */
+interface KeywordState {
+  ino: number;
+  /** Bytes of the log consumed so far (always ends on a newline). */
+  bytes: number;
+  docs: Map<string, Doc>;
+  /** term -> (id -> tf) */
+  postings: Map<string, Map<string, number>>;
+  totalLength: number;
+  /** Log lines that no longer describe a live document. */
+  dead: number;
+  /** Vocabulary in sorted order for prefix lookups; null when stale. */
+  sortedTerms: string[] | null;
+}
+
+/** An embedding index's name, or "archive" for archived blackboard entries. */
+export type KeywordIndexName = IndexName | "archive";
+
+/** Parsed index logs carried over between processes. */
+export type KeywordSnapshot = Partial<Record<KeywordIndexName, Omit<KeywordState, "sortedTerms">>>;
+
+export interface KeywordHit {
+  id: string;
+  score: number;
+}
+
+/** Split text into lowercase word tokens. */
+export function tokenize(text: string): string[] {
+  return text
+    .toLowerCase()
+    .split(/[^\p{L}\p{N}_]+/u)
+    .filter((t) => t.length > 0);
+}
+
+export class KeywordIndex {
+  private readonly dir: string;
+  private readonly states = new Map<KeywordIndexName, KeywordState>();
+
+  constructor(dir: string) {
+    this.dir = dir;
+  }
+
+  /** Add or replace documents. */
+  async add(
+    indexName: KeywordIndexName,
+    docs: { id: string; text: string }[],
+  ): Promise<void> {
+    if (docs.length === 0) return;
+    const lines = docs.map(({ id, text }) => {
+      const tokens = tokenize(text);
+      const terms: Record<string, number> = {};
+      for (const t of tokens) terms[t] = (terms[t] ?? 0) + 1;
+      return JSON.stringify(["+", id, tokens.length, terms] satisfies LogLine);
+    });
+    await this.append(indexName, lines);
+  }
+
+  /** Remove documents by id. Unknown ids are ignored. */
+  async remove(indexName: KeywordIndexName, ids: string[]): Promise<void> {
+    const state = this.refresh(indexName);
+    const present = [...new Set(ids)].filter((id) => state.docs.has(id));
+    if (present.length === 0) return;
+    await this.append(
+      indexName,
+      present.map((id) => JSON.stringify(["-", id] satisfies LogLine)),
+    );
+  }
+
+  /**
+   * Index any items not yet in the index. Lets the index catch up with
+   * entries written before it existed or by processes that skipped it.
+   */
+  async ensure<T extends { id: string }>(
+    indexName: KeywordIndexName,
+    items: Iterable<T>,
+    textOf: (item: T) => string,
+  ): Promise<void> {
+    const state = this.refresh(indexName);
+    const missing: { id: string; text: string }[] = [];
+    for (const item of items) {
+      if (!state.docs.has(item.id)) {
+        missing.push({ id: item.id, text: textOf(item) });
+      }
+    }
+    await this.add(indexName, missing);
+  }
+
+  /** The ids not in the index, for callers that load items lazily. */
+  missing(indexName: KeywordIndexName, ids: Iterable<string>): string[] {
+    const state = this.refresh(indexName);
+    const missing: string[] = [];
+    for (const id of ids) {
+      if (!state.docs.has(id)) missing.push(id);
+    }
+    return missing;
+  }
+
+  /**
+   * BM25-ranked ids for a query, restricted to ids accepted by `allow`.
+   * Query terms also match indexed terms they are a prefix of.
+   */
+  search(
+    indexName: KeywordIndexName,
+    query: string,
+    options?: { allow?: (id: string) => boolean; limit?: number },
+  ): KeywordHit[] {
+    const state = this.refresh(indexName);
+    const queryTerms = [...new Set(tokenize(query))];
+    if (queryTerms.length === 0 || state.docs.size === 0) return [];
+
+    const allow = options?.allow;
+    const n = state.docs.size;
+    const avgLength = state.totalLength / n || 1;
+    const scores = new Map<string, number>();
+
+    for (const queryTerm of queryTerms) {
+      // Best expansion per document, so "auth" doesn't outscore an exact
+      // term just because a document has many auth* words
+      const termScores = new Map<string, number>();
+      for (const term of expand(state, queryTerm)) {
+        const postings = state.postings.get(term);
+        if (!postings) continue;
+        const idf = Math.log(1 + (n - postings.size + 0.5) / (postings.size + 0.5));
+        for (const [id, tf] of postings) {
+          if (allow && !allow(id)) continue;
+          const length = state.docs.get(id)?.length ?? avgLength;
+          const score =
+            (idf * tf * (K1 + 1)) /
+            (tf + K1 * (1 - B + (B * length) / avgLength));
+          if (score > (termScores.get(id) ?? 0)) termScores.set(id, score);
+        }
+      }
+      for (const [id, score] of termScores) {
+        scores.set(id, (scores.get(id) ?? 0) + score);
+      }
+    }
+
+    const hits: KeywordHit[] = [];
+    for (const [id, score] of scores) hits.push({ id, score });
+    hits.sort((a, b) => b.score - a.score);
+    return options?.limit !== undefined ? hits.slice(0, options.limit) : hits;
+  }
+
+  /** Number of live documents in an index. */
+  size(indexName: KeywordIndexName): number {
+    return this.refresh(indexName).docs.size;
+  }
+
+  /** The parsed indexes, for a state snapshot. */
+  exportSnapshot(): KeywordSnapshot {
+    const snapshot: KeywordSnapshot = {};
+    for (const [indexName, { sortedTerms: _sortedTerms, ...state }] of this.states) {
+      snapshot[indexName] = state;
+    }
+    return snapshot;
+  }
+
+  /**
+   * Seed indexes this process has not read yet from a snapshot taken by
+   * an earlier one. Each is checked against its log on first use like any
+   * cached index, and only the lines appended since are parsed.
+   */
+  restoreSnapshot(snapshot: KeywordSnapshot): void {
+    for (const [indexName, state] of Object.entries(snapshot) as [
+      KeywordIndexName,
+      Omit<KeywordState, "sortedTerms">,
+    ][]) {
+      if (!this.states.has(indexName)) {
+        this.states.set(indexName, { ...state, sortedTerms: null });
+      }
+    }
+  }
+
+  /** Rewrite the log without dead lines. */
+  async compact(indexName: KeywordIndexName): Promise<void> {
+    await this.withLock(indexName, () => {
+      const state = this.refresh(indexName);
+      if (state.dead === 0) return;
+
+      const file = this.logPath(indexName);
+      const tmp = `${file}.${process.pid}.tmp`;
+      const lines: string[] = [];
+      for (const [id, doc] of state.docs) {
+        lines.push(
+          JSON.stringify(["+", id, doc.length, doc.terms] satisfies LogLine),
+        );
+      }
+      fs.writeFileSync(tmp, lines.length > 0 ? lines.join("\n") + "\n" : "");
+      fs.renameSync(tmp, file);
+      this.states.delete(indexName);
+    });
+  }
+
+  private logPath(indexName: KeywordIndexName): string {
+    return path.join(this.dir, `${indexName}.terms.jsonl`);
+  }
+
+  private async withLock<T>(indexName: KeywordIndexName, fn: () => T): Promise<T> {
+    return span(
+      "keyword_index.write",
+      async () => {
+        ensureDir(this.dir);
+        const release = await acquireLock(this.logPath(indexName), {
+          ...LOCK_OPTIONS,
+          realpath: false,
+        });
+        try {
+          return fn();
+        } finally {
+          await release();
+        }
+      },
+      { index: indexName },
+    );
+  }
+
+  /** Append log lines under the lock, then compact if dead lines dominate. */
+  private async append(indexName: KeywordIndexName, lines: string[]): Promise<void> {
+    const shouldCompact = await this.withLock(indexName, () => {
+      const file = this.logPath(indexName);
+      const state = this.refresh(indexName);
+      // Drop a crashed writer's partial line so ours starts on a boundary
+      if (fs.existsSync(file) && fs.statSync(file).size !== state.bytes) {
+        fs.truncateSync(file, state.bytes);
+      }
+      fs.appendFileSync(file, lines.join("\n") + "\n");
+      const updated = this.refresh(indexName);
+      return updated.dead >= COMPACT_MIN_DEAD && updated.dead > updated.docs.size;
+    });
+
+    if (shouldCompact) {
+      await this.compact(indexName).catch((err) => {
+        console.error(
+          `[twining] Keyword index compaction failed for ${indexName} (non-fatal):`,
+          err,
+        );
+      });
+    }
+  }
+
+  /** Apply complete log lines appended since the last refresh. */
+  private refresh(indexName: KeywordIndexName): KeywordState {
+    const file = this.logPath(indexName);
+    let state = this.states.get(indexName);
+
+    let stat: fs.Stats;
+    try {
+      stat = fs.statSync(file);
+    } catch {
+      state = emptyState(0);
+      this.states.set(indexName, state);
+      return state;
+    }
+
+    if (!state || tailInvalidated(stat, state.ino, state.bytes)) {
+      // First load, or the log was compacted underneath us
+      state = emptyState(stat.ino);
+      this.states.set(indexName, state);
+    }
+
+    const tail = readTail(file, state.bytes, stat.size);
+    state.bytes += tail.bytes;
+    for (const line of tail.lines) {
+      if (!line) continue;
+      let parsed: LogLine;
+      try {
+        parsed = JSON.parse(line) as LogLine;
+      } catch {
+        state.dead++;
+        continue;
+      }
+      applyLine(state, parsed);
+    }
+    return state;
+  }
+}
+
+function emptyState(ino: number): KeywordState {
+  return {
+    ino,
+    bytes: 0,
+    docs: new Map(),
+    postings: new Map(),
+    totalLength: 0,
+    dead: 0,
+    sortedTerms: null,
+  };
+}
+
+function applyLine(state: KeywordState, line: LogLine): void {
+  const id = line[1];
+  const previous = state.docs.get(id);
+  if (previous) {
+    for (const term of Object.keys(previous.terms)) {
+      const postings = state.postings.get(term);
+      postings?.delete(id);
+      if (postings && postings.size === 0) {
+        state.postings.delete(term);
+        state.sortedTerms = null;
+      }
+    }
+    state.totalLength -= previous.length;
+    state.docs.delete(id);
+    state.dead++;
+  }
+
+  if (line[0] === "-") {
+    state.dead++;
+    return;
+  }
+
+  const [, , length, terms] = line;
+  state.docs.set(id, { length, terms });
+  state.totalLength += length;
+  for (const [term, tf] of Object.entries(terms)) {
+    let postings = state.postings.get(term);
+    if (!postings) {
+      postings = new Map();
+      state.postings.set(term, postings);
+      state.sortedTerms = null;
+    }
+    postings.set(id, tf);
+  }
+}
+
+/** The term itself plus indexed terms it is a prefix of. */
+function expand(state: KeywordState, queryTerm: string): string[] {
+  if (queryTerm.length < MIN_PREFIX_LENGTH) return [queryTerm];
+
+  if (!state.sortedTerms) {
+    state.sortedTerms = [...state.postings.keys()].sort();
+  }
+  const terms = state.sortedTerms;
+
+  // Binary search for the first term >= queryTerm
+  let lo = 0;
+  let hi = terms.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (terms[mid]! < queryTerm) lo = mid + 1;
+    else hi = mid;
+  }
+
+  const expanded: string[] = [];
+  for (let i = lo; i < terms.length && terms[i]!.startsWith(queryTerm); i++) {
+    expanded.push(terms[i]!);
+  }
+  return expanded;
+}
@@ -1,15 +1,28 @@
 /**
  * Semantic search with cosine similarity and keyword fallback.
- * Uses embedder for vector search, falls back to term-frequency
- * keyword search when ONNX is unavailable.
+ * Uses embedder for vector search, falls back to BM25 keyword search over
+ * a persistent inverted index when ONNX is unavailable — and, per item,
+ * for entries whose vector is still pending in the embedding queue. Large
+ * indexes are searched through an IVF ANN index; small ones by exact scan.
  */
+import path from "node:path";
 import type { Embedder } from "./embedder.js";
-import type { IndexManager } from "./index-manager.js";
-import type { BlackboardEntry, Decision } from "../utils/types.js";
+import type { IndexManager, IndexName, VectorView } from "./index-manager.js";
+import { AnnIndex, type AnnOptions } from "./ann-index.js";
+import { KeywordIndex, type KeywordIndexName } from "./keyword-index.js";
+import type { BlackboardStore } from "../storage/blackboard-store.js";
+import type { DecisionStore } from "../storage/decision-store.js";
+import type {
+  BlackboardEntry,
+  Decision,
+  SearchCandidates,
+} from "../utils/types.js";
 
 export interface BlackboardSearchResult {
   entry: BlackboardEntry;
   relevance: number;
+  /** Found among archived entries (include_archived queries only) */
+  archived?: boolean;
 }
 
 export interface DecisionSearchResult {
@@ -17,6 +30,9 @@ export interface DecisionSearchResult {
   relevance: number;
 }
 
+/** Search candidates, from a store or as a plain list. */
+export type Candidates<T> = SearchCandidates<T> | readonly T[];
+
 export interface SearchResults<T> {
   results: T[];
   fallback_mode: boolean;
@@ -25,173 +41,339 @@ export interface SearchResults<T> {
 export class SearchEngine {
   private readonly embedder: Embedder;
   private readonly indexManager: IndexManager;
+  private readonly keywordIndex: KeywordIndex;
+  private readonly annOptions: Partial<AnnOptions> | undefined;
+  private readonly annIndexes = new Map<IndexName, AnnIndex>();
 
-  constructor(embedder: Embedder, indexManager: IndexManager) {
+  constructor(
+    embedder: Embedder,
+    indexManager: IndexManager,
+    annOptions?: Partial<AnnOptions>,
+  ) {
     this.embedder = embedder;
     this.indexManager = indexManager;
+    this.keywordIndex = new KeywordIndex(indexManager.getDirectory());
+    this.annOptions = annOptions;
   }
 
-  /** Search blackboard entries by semantic similarity or keyword fallback. */
+  /**
+   * Search blackboard entries by semantic similarity or keyword fallback.
+   * Filters belong to the candidates (see BlackboardStore.searchCandidates):
+   * they are checked as the indexes turn up ids, so they never crowd out
+   * matching results and never cost a pass over the blackboard.
+   */
   async searchBlackboard(
     query: string,
-    entries: BlackboardEntry[],
-    options?: { entry_types?: string[]; limit?: number },
+    candidates: Candidates<BlackboardEntry>,
+    options?: { limit?: number },
   ): Promise<SearchResults<BlackboardSearchResult>> {
-    const limit = options?.limit ?? 10;
-    let filtered = entries;
+    const { ranked, fallbackMode, items } = await this.search(
+      "blackboard",
+      query,
+      candidates,
+      options?.limit ?? 10,
+    );
+    return {
+      results: ranked.flatMap(({ id, relevance }) => {
+        const entry = items.get(id);
+        return entry ? [{ entry, relevance }] : [];
+      }),
+      fallback_mode: fallbackMode,
+    };
+  }
 
-    // Apply type filter
-    if (options?.entry_types && options.entry_types.length > 0) {
-      filtered = filtered.filter((e) =>
-        options.entry_types!.includes(e.entry_type),
-      );
+  /**
+   * Search decisions by semantic similarity or keyword fallback.
+   * Filters belong to the candidates (see DecisionStore.searchCandidates);
+   * only the ranked decisions are loaded.
+   */
+  async searchDecisions(
+    query: string,
+    candidates: Candidates<Decision>,
+    options?: { limit?: number },
+  ): Promise<SearchResults<DecisionSearchResult>> {
+    const { ranked, fallbackMode, items } = await this.search(
+      "decisions",
+      query,
+      candidates,
+      options?.limit ?? 10,
+    );
+    return {
+      results: ranked.flatMap(({ id, relevance }) => {
+        const decision = items.get(id);
+        return decision ? [{ decision, relevance }] : [];
+      }),
+      fallback_mode: fallbackMode,
+    };
+  }
+
+  /**
+   * Keyword search over archived blackboard entries. They have no vectors,
+   * so they score as live entries without one do: BM25 mapped into [0, 1),
+   * halved when ranked alongside semantic results.
+   */
+  async searchArchivedBlackboard(
+    query: string,
+    candidates: Candidates<BlackboardEntry>,
+    options?: { limit?: number; semantic?: boolean },
+  ): Promise<BlackboardSearchResult[]> {
+    const { has, load } = asCandidates(candidates);
+    const discount = options?.semantic ? 0.5 : 1;
+    const ranked = this.keywordRank("archive", query, has, options?.limit ?? 10);
+    const entries = new Map(
+      (await load(ranked.map((r) => r.id))).map((e) => [e.id, e]),
+    );
+    return ranked.flatMap(({ id, relevance }) => {
+      const entry = entries.get(id);
+      return entry ? [{ entry, relevance: relevance * discount, archived: true }] : [];
+    });
+  }
+
+  /** Add or refresh blackboard entries in the keyword index (best-effort). */
+  async indexBlackboardEntries(entries: BlackboardEntry[]): Promise<void> {
+    await this.indexItems("blackboard", entries, blackboardText);
+  }
+
+  /** Add entries just moved to the archive to the archive keyword index (best-effort). */
+  async indexArchivedEntries(entries: BlackboardEntry[]): Promise<void> {
+    await this.indexItems("archive", entries, blackboardText);
+  }
+
+  /** Add or refresh decisions in the keyword index (best-effort). */
+  async indexDecisions(decisions: Decision[]): Promise<void> {
+    await this.indexItems("decisions", decisions, decisionText);
+  }
+
+  /**
+   * Keyword-index live blackboard entries the index lacks: ones written
+   * before it existed or by a process whose indexing failed. Run at
+   * startup; searches never catch the index up themselves.
+   */
+  async indexMissingBlackboardEntries(entries: Iterable<BlackboardEntry>): Promise<void> {
+    try {
+      await this.keywordIndex.ensure("blackboard", entries, blackboardText);
+    } catch (error) {
+      console.error("[twining] Keyword indexing failed (non-fatal):", error);
     }
+  }
 
-    if (filtered.length === 0) {
-      return { results: [], fallback_mode: this.embedder.isFallbackMode() };
+  /** indexMissingBlackboardEntries for the archive keyword index. */
+  async indexMissingArchivedEntries(entries: Iterable<BlackboardEntry>): Promise<void> {
+    try {
+      await this.keywordIndex.ensure("archive", entries, blackboardText);
+    } catch (error) {
+      console.error("[twining] Keyword indexing failed (non-fatal):", error);
     }
+  }
 
-    // Try semantic search first
-    if (!this.embedder.isFallbackMode()) {
-      const queryVector = await this.embedder.embed(query);
-      if (queryVector) {
-        const index = await this.indexManager.load("blackboard");
-        const vectorMap = new Map(
-          index.entries.map((e) => [e.id, e.vector]),
-        );
-
-        const scored: BlackboardSearchResult[] = [];
-        for (const entry of filtered) {
-          const entryVector = vectorMap.get(entry.id);
-          if (entryVector) {
-            const relevance = cosineSimilarity(queryVector, entryVector);
-            scored.push({ entry, relevance });
-          } else {
-            // Entry has no embedding — use keyword as individual fallback
-            const text = entry.summary + " " + entry.detail;
-            const kwResults = keywordSearch(
-              query,
-              [{ id: entry.id, text }],
-              1,
-            );
-            const score = kwResults[0]?.score ?? 0;
-            if (score > 0) {
-              scored.push({ entry, relevance: score * 0.5 }); // Discount keyword scores
-            }
-          }
-        }
-
-        scored.sort((a, b) => b.relevance - a.relevance);
-        return {
-          results: scored.slice(0, limit),
-          fallback_mode: false,
-        };
-      }
+  /** indexMissingBlackboardEntries for decisions; only missing ones are loaded. */
+  async indexMissingDecisions(
+    ids: Iterable<string>,
+    load: (ids: string[]) => Promise<Decision[]>,
+  ): Promise<void> {
+    try {
+      const missing = this.keywordIndex.missing("decisions", ids);
+      if (missing.length > 0) await this.indexDecisions(await load(missing));
+    } catch (error) {
+      console.error("[twining] Keyword indexing failed (non-fatal):", error);
     }
+  }
 
-    // Keyword fallback
-    const items = filtered.map((e) => ({
-      id: e.id,
-      text: e.summary + " " + e.detail,
-    }));
-    const kwResults = keywordSearch(query, items, limit);
-    const idToScore = new Map(kwResults.map((r) => [r.id, r.score]));
-
-    const results: BlackboardSearchResult[] = [];
-    for (const entry of filtered) {
-      const score = idToScore.get(entry.id);
-      if (score !== undefined && score > 0) {
-        results.push({ entry, relevance: score });
-      }
+  /** Run every indexMissing* catch-up against the stores' current contents. */
+  async indexMissing(
+    blackboardStore: BlackboardStore,
+    decisionStore: DecisionStore,
+  ): Promise<void> {
+    await this.indexMissingBlackboardEntries((await blackboardStore.read()).entries);
+    await this.indexMissingArchivedEntries(await blackboardStore.readArchived());
+    await this.indexMissingDecisions(
+      (await decisionStore.getIndex()).map((entry) => entry.id),
+      (ids) => decisionStore.getMany(ids),
+    );
+  }
+
+  /** Drop removed items from the keyword index (best-effort). */
+  async unindex(indexName: IndexName, ids: string[]): Promise<void> {
+    try {
+      await this.keywordIndex.remove(indexName, ids);
+    } catch (error) {
+      console.error("[twining] Keyword index removal failed (non-fatal):", error);
     }
-    results.sort((a, b) => b.relevance - a.relevance);
+  }
 
-    return {
-      results: results.slice(0, limit),
-      fallback_mode: true,
-    };
+  /**
+   * Version of an embedding index as seen by search: changes when vectors
+   * are added, removed or compacted, or the embedder leaves fallback mode.
+   */
+  async indexVersion(indexName: IndexName): Promise<string> {
+    const vectors = await this.indexManager.getVectors(indexName);
+    return [
+      this.embedder.isFallbackMode() ? "fallback" : "semantic",
+      vectors.generation,
+      vectors.slotIds.length,
+      vectors.slots.size,
+    ].join(":");
   }
 
-  /** Search decisions by semantic similarity or keyword fallback. */
-  async searchDecisions(
-    query: string,
-    decisions: Decision[],
-    options?: { limit?: number },
-  ): Promise<SearchResults<DecisionSearchResult>> {
-    const limit = options?.limit ?? 10;
+  /** The keyword index backing keyword search. */
+  getKeywordIndex(): KeywordIndex {
+    return this.keywordIndex;
+  }
 
-    if (decisions.length === 0) {
-      return { results: [], fallback_mode: this.embedder.isFallbackMode() };
+  /** Get (lazily creating) the ANN index for an embedding index. */
+  getAnnIndex(indexName: IndexName): AnnIndex {
+    let ann = this.annIndexes.get(indexName);
+    if (!ann) {
+      ann = new AnnIndex(
+        path.join(this.indexManager.getDirectory(), `${indexName}.ivf.json`),
+        this.annOptions,
+      );
+      this.annIndexes.set(indexName, ann);
     }
+    return ann;
+  }
+
+  private async indexItems<T extends { id: string }>(
+    indexName: KeywordIndexName,
+    items: T[],
+    textOf: (item: T) => string,
+  ): Promise<void> {
+    try {
+      await this.keywordIndex.add(
+        indexName,
+        items.map((item) => ({ id: item.id, text: textOf(item) })),
+      );
+    } catch (error) {
+      console.error("[twining] Keyword indexing failed (non-fatal):", error);
+    }
+  }
+
+  /** Rank by vector similarity, or by keyword when there is no query vector. */
+  private async search<T extends { id: string }>(
+    indexName: IndexName,
+    query: string,
+    candidates: Candidates<T>,
+    limit: number,
+  ): Promise<{
+    ranked: { id: string; relevance: number }[];
+    fallbackMode: boolean;
+    items: Map<string, T>;
+  }> {
+    const { has, load } = asCandidates(candidates);
 
     // Try semantic search first
+    let ranked: { id: string; relevance: number }[] | null = null;
     if (!this.embedder.isFallbackMode()) {
-      const queryVector = await this.embedder.embed(query);
+      const queryVector = await this.embedder.embedQuery(query);
       if (queryVector) {
-        const index = await this.indexManager.load("decisions");
-        const vectorMap = new Map(
-          index.entries.map((e) => [e.id, e.vector]),
-        );
-
-        const scored: DecisionSearchResult[] = [];
-        for (const decision of decisions) {
-          const decisionVector = vectorMap.get(decision.id);
-          if (decisionVector) {
-            const relevance = cosineSimilarity(queryVector, decisionVector);
-            scored.push({ decision, relevance });
-          } else {
-            const text =
-              decision.summary + " " + decision.rationale + " " + decision.context;
-            const kwResults = keywordSearch(
-              query,
-              [{ id: decision.id, text }],
-              1,
-            );
-            const score = kwResults[0]?.score ?? 0;
-            if (score > 0) {
-              scored.push({ decision, relevance: score * 0.5 });
-            }
-          }
-        }
-
-        scored.sort((a, b) => b.relevance - a.relevance);
-        return {
-          results: scored.slice(0, limit),
-          fallback_mode: false,
-        };
+        ranked = await this.rank(indexName, query, queryVector, has, limit);
       }
     }
+    const fallbackMode = ranked === null;
 
     // Keyword fallback
-    const items = decisions.map((d) => ({
-      id: d.id,
-      text: d.summary + " " + d.rationale + " " + d.context,
-    }));
-    const kwResults = keywordSearch(query, items, limit);
-    const idToScore = new Map(kwResults.map((r) => [r.id, r.score]));
-
-    const results: DecisionSearchResult[] = [];
-    for (const decision of decisions) {
-      const score = idToScore.get(decision.id);
-      if (score !== undefined && score > 0) {
-        results.push({ decision, relevance: score });
+    ranked ??= this.keywordRank(indexName, query, has, limit);
+
+    const items = new Map<string, T>();
+    for (const item of await load(ranked.map((r) => r.id))) {
+      items.set(item.id, item);
+    }
+    return { ranked, fallbackMode, items };
+  }
+
+  /**
+   * Rank candidates by vector similarity. Candidates with an embedding go
+   * through the ANN index (or an exact scan for small indexes); candidates
+   * without one get a discounted keyword score. Those are found among the
+   * keyword hits by their missing vector slot, not by a candidate scan.
+   */
+  private async rank(
+    indexName: IndexName,
+    query: string,
+    queryVector: number[],
+    has: (id: string) => boolean,
+    limit: number,
+  ): Promise<{ id: string; relevance: number }[]> {
+    const vectors = await this.indexManager.getVectors(indexName);
+    const scored: { id: string; relevance: number }[] = [];
+
+    const hits = this.getAnnIndex(indexName).search(queryVector, vectors, limit, has);
+    if (hits) {
+      for (const hit of hits) scored.push({ id: hit.id, relevance: hit.score });
+    } else {
+      for (const [id, slot] of vectors.slots) {
+        if (!has(id)) continue;
+        scored.push({ id, relevance: similarityAt(queryVector, vectors, slot) });
       }
     }
-    results.sort((a, b) => b.relevance - a.relevance);
 
-    return {
-      results: results.slice(0, limit),
-      fallback_mode: true,
-    };
+    // Items with no embedding (yet) — use keyword as individual fallback
+    const unembedded = this.keywordRank(
+      indexName,
+      query,
+      (id) => !vectors.slots.has(id) && has(id),
+      limit,
+    );
+    for (const { id, relevance } of unembedded) {
+      scored.push({ id, relevance: relevance * 0.5 }); // Discount keyword scores
+    }
+
+    scored.sort((a, b) => b.relevance - a.relevance);
+    return scored.slice(0, limit);
+  }
+
+  /**
+   * Rank candidates with the BM25 keyword index. Items reach the index on
+   * write (and at startup, for ones written before it existed), never here.
+   */
+  private keywordRank(
+    indexName: KeywordIndexName,
+    query: string,
+    has: (id: string) => boolean,
+    limit: number,
+  ): { id: string; relevance: number }[] {
+    return this.keywordIndex
+      .search(indexName, query, { allow: has, limit })
+      .map((hit) => ({
+        id: hit.id,
+        relevance: hit.score / (hit.score + BM25_SCALE),
+      }));
   }
 }
 
+/** BM25 score that maps to relevance 0.5; keeps keyword relevance in [0, 1). */
+const BM25_SCALE = 1;
+
+function blackboardText(entry: BlackboardEntry): string {
+  return entry.summary + " " + entry.detail;
+}
+
+function decisionText(decision: Decision): string {
+  return decision.summary + " " + decision.rationale + " " + decision.context;
+}
+
+/** Candidates from a store as they are; a plain list gets an id map. */
+function asCandidates<T extends { id: string }>(
+  candidates: Candidates<T>,
+): SearchCandidates<T> {
+  if (!Array.isArray(candidates)) return candidates as SearchCandidates<T>;
+  const items = candidates as readonly T[];
+  const byId = new Map(items.map((item) => [item.id, item]));
+  return {
+    has: (id) => byId.has(id),
+    load: async (ids) => ids.flatMap((id) => byId.get(id) ?? []),
+  };
+}
+
 /**
  * Cosine similarity for pre-normalized vectors (dot product).
  * Since all-MiniLM-L6-v2 outputs normalized vectors, cosine similarity
  * simplifies to the dot product.
  */
-export function cosineSimilarity(a: number[], b: number[]): number {
+export function cosineSimilarity(
+  a: ArrayLike<number>,
+  b: ArrayLike<number>,
+): number {
   if (a.length !== b.length) {
     console.error(
       `[twining] Cosine similarity dimension mismatch: ${a.length} vs ${b.length}. Returning 0.`,
@@ -205,45 +387,15 @@ export function cosineSimilarity(a: number[], b: number[]): number {
   return sum;
 }
 
-/**
- * Term-frequency based keyword search for fallback mode.
- * Scores each item by how many query terms appear and how often.
- */
-export function keywordSearch(
-  query: string,
-  items: { id: string; text: string }[],
-  limit: number,
-): { id: string; score: number }[] {
-  const queryTerms = query
-    .toLowerCase()
-    .split(/\s+/)
-    .filter((t) => t.length > 0);
-
-  if (queryTerms.length === 0) return [];
-
-  const results: { id: string; score: number }[] = [];
-
-  for (const item of items) {
-    const textLower = item.text.toLowerCase();
-    let score = 0;
-
-    for (const term of queryTerms) {
-      if (textLower.includes(term)) {
-        // Count occurrences with diminishing returns
-        const parts = textLower.split(term);
-        const matches = parts.length - 1;
-        score += Math.log(1 + matches);
-      }
-    }
-
-    // Normalize by number of query terms
-    const normalizedScore = score / queryTerms.length;
-
-    if (normalizedScore > 0) {
-      results.push({ id: item.id, score: normalizedScore });
-    }
-  }
-
-  results.sort((a, b) => b.score - a.score);
-  return results.slice(0, limit);
+/** Cosine similarity between a query and one packed slot of a vector view. */
+function similarityAt(
+  query: ArrayLike<number>,
+  vectors: VectorView,
+  slot: number,
+): number {
+  const dim = vectors.dimension;
+  return cosineSimilarity(
+    query,
+    vectors.data.subarray(slot * dim, (slot + 1) * dim),
+  );
 }
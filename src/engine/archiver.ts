@@ -4,20 +4,12 @@
  * Posts summary findings after archiving.
  * Phase 3: LIFE-01, LIFE-02, LIFE-03 implementation.
  */
-import fs from "node:fs";
 import path from "node:path";
-import lockfile from "proper-lockfile";
-import { ensureDir } from "../storage/file-store.js";
 import type { BlackboardStore } from "../storage/blackboard-store.js";
 import type { BlackboardEngine } from "./blackboard.js";
 import type { IndexManager } from "../embeddings/index-manager.js";
 import type { BlackboardEntry } from "../utils/types.js";
 
-const LOCK_OPTIONS: lockfile.LockOptions = {
-  retries: { retries: 10, factor: 1.5, minTimeout: 50, maxTimeout: 1000 },
-  stale: 10000,
-};
-
 export class Archiver {
   private readonly twiningDir: string;
   private readonly blackboardStore: BlackboardStore;
@@ -55,85 +47,26 @@ export class Archiver {
     const keepDecisions = options?.keep_decisions ?? true;
     const summarize = options?.summarize ?? true;
 
-    const bbPath = path.join(this.twiningDir, "blackboard.jsonl");
-
-    // Ensure blackboard file exists for locking
-    if (!fs.existsSync(bbPath)) {
+    // Entries are moved segment by segment; posts keep appending meanwhile
+    const dateStr = cutoff.slice(0, 10); // YYYY-MM-DD
+    const archiveFile = path.join(
+      this.twiningDir,
+      "archive",
+      `${dateStr}-blackboard.jsonl`,
+    );
+    const toArchive = await this.blackboardStore.archive(cutoff, archiveFile, {
+      keep_decisions: keepDecisions,
+    });
+    if (toArchive.length === 0) {
       return { archived_count: 0, archive_file: "" };
     }
 
-    // Lock blackboard for the full read-partition-rewrite cycle
-    if (!fs.existsSync(bbPath)) {
-      fs.writeFileSync(bbPath, "");
-    }
-    const release = await lockfile.lock(bbPath, LOCK_OPTIONS);
-
-    let toArchive: BlackboardEntry[] = [];
-    let toKeep: BlackboardEntry[] = [];
-    let archiveFile = "";
-
-    try {
-      // Read all entries (no lock needed since we hold it)
-      const content = fs.readFileSync(bbPath, "utf-8");
-      const lines = content
-        .split("\n")
-        .filter((line) => line.trim().length > 0);
-      const allEntries: BlackboardEntry[] = [];
-      for (const line of lines) {
-        try {
-          allEntries.push(JSON.parse(line) as BlackboardEntry);
-        } catch {
-          // Skip corrupt lines
-        }
-      }
-
-      // Partition: entries before cutoff go to archive, UNLESS they are decisions
-      for (const entry of allEntries) {
-        const isOldEnough = entry.timestamp < cutoff;
-        const isDecision = entry.entry_type === "decision";
-        const shouldKeep = !isOldEnough || (keepDecisions && isDecision);
-
-        if (shouldKeep) {
-          toKeep.push(entry);
-        } else {
-          toArchive.push(entry);
-        }
-      }
-
-      // If nothing to archive, release lock and return early
-      if (toArchive.length === 0) {
-        return { archived_count: 0, archive_file: "" };
-      }
-
-      // Write archived entries to archive file BEFORE rewriting blackboard.
-      // This ensures entries exist in the archive before being removed from
-      // the blackboard, preventing data loss on crash.
-      const archiveDir = path.join(this.twiningDir, "archive");
-      ensureDir(archiveDir);
-
-      const dateStr = cutoff.slice(0, 10); // YYYY-MM-DD
-      archiveFile = path.join(archiveDir, `${dateStr}-blackboard.jsonl`);
-
-      // Direct append (no nested lock since we already hold the blackboard lock)
-      const archiveContent = toArchive
-        .map((e) => JSON.stringify(e))
-        .join("\n") + "\n";
-      fs.appendFileSync(archiveFile, archiveContent);
-
-      // Now rewrite blackboard with only kept entries
-      const keptContent =
-        toKeep.length > 0
-          ? toKeep.map((e) => JSON.stringify(e)).join("\n") + "\n"
-          : "";
-      fs.writeFileSync(bbPath, keptContent);
-    } finally {
-      await release();
-    }
-
-    // Remove archived entry embeddings (best-effort)
+    // Move keyword postings to the archive index and drop embeddings (best-effort)
+    const archivedIds = toArchive.map((e) => e.id);
+    await this.blackboardEngine.unindex(archivedIds);
+    await this.blackboardEngine.indexArchived(toArchive);
     if (this.indexManager) {
       try {
-        const archivedIds = toArchive.map((e) => e.id);
         await this.indexManager.removeEntries("blackboard", archivedIds);
       } catch {
         // Best-effort — don't fail archive if embedding cleanup fails
@@ -1,18 +1,76 @@
 /**
  * Blackboard business logic.
  * Validates input, applies defaults, delegates to BlackboardStore.
- * Generates embeddings on post (Phase 2) with graceful fallback.
+ * Generates embeddings on post (Phase 2) with graceful fallback and keeps
+ * the keyword index in step with posts, dismissals and archiving.
  */
 import { BlackboardStore } from "../storage/blackboard-store.js";
 import { ENTRY_TYPES } from "../utils/types.js";
 import type { BlackboardEntry, EntryType, TwiningConfig } from "../utils/types.js";
-import { TwiningError } from "../utils/errors.js";
+import { TwiningError, batchItemError } from "../utils/errors.js";
+import type { BatchItemError } from "../utils/errors.js";
 import type { Embedder } from "../embeddings/embedder.js";
 import type { IndexManager } from "../embeddings/index-manager.js";
+import type { EmbeddingQueue } from "../embeddings/embedding-queue.js";
 import type { SearchEngine, BlackboardSearchResult } from "../embeddings/search.js";
 import type { Archiver } from "./archiver.js";
 import type { GraphAutoPopulator } from "./graph-auto-populator.js";
 
+/** Input accepted by post() and postBatch(). */
+export interface PostInput {
+  entry_type: string;
+  summary: string;
+  detail?: string;
+  tags?: string[];
+  scope?: string;
+  relates_to?: string[];
+  agent_id?: string;
+  _internal?: boolean;
+}
+
+/** One postBatch() item: the new entry, or why it was rejected. */
+export type PostBatchResult = { id: string; timestamp: string } | BatchItemError;
+
+/** Validate a post and apply defaults. Throws INVALID_INPUT. */
+function toEntry(input: PostInput): Omit<BlackboardEntry, "id" | "timestamp"> {
+  // Validate entry_type
+  if (!ENTRY_TYPES.includes(input.entry_type as EntryType)) {
+    throw new TwiningError(
+      `Invalid entry_type "${input.entry_type}". Must be one of: ${ENTRY_TYPES.join(", ")}`,
+      "INVALID_INPUT",
+    );
+  }
+
+  // Reject direct decision posts — agents must use twining_decide for rationale capture
+  if (input.entry_type === "decision" && !input._internal) {
+    throw new TwiningError(
+      `Use twining_decide to record decisions (ensures rationale, graph linkage, and conflict detection). twining_post does not accept entry_type "decision".`,
+      "INVALID_INPUT",
+    );
+  }
+
+  // Validate summary length
+  if (!input.summary || input.summary.length === 0) {
+    throw new TwiningError("summary is required", "INVALID_INPUT");
+  }
+  if (input.summary.length > 200) {
+    throw new TwiningError(
+      "summary must be at most 200 characters",
+      "INVALID_INPUT",
+    );
+  }
+
+  return {
+    entry_type: input.entry_type as EntryType,
+    summary: input.summary,
+    detail: input.detail ?? "",
+    tags: input.tags ?? [],
+    scope: input.scope ?? "project",
+    relates_to: input.relates_to,
+    agent_id: input.agent_id ?? "main",
+  };
+}
+
 export class BlackboardEngine {
   private readonly store: BlackboardStore;
   private readonly embedder: Embedder | null;
@@ -21,6 +79,7 @@ export class BlackboardEngine {
   private archiver: Archiver | null = null;
   private archiveThreshold: number | null = null;
   private graphPopulator: GraphAutoPopulator | null = null;
+  private embeddingQueue: EmbeddingQueue | null = null;
 
   constructor(
     store: BlackboardStore,
@@ -45,84 +104,100 @@ export class BlackboardEngine {
     this.graphPopulator = populator;
   }
 
+  /** Inject background embedding queue so post() never waits on inference. */
+  setEmbeddingQueue(queue: EmbeddingQueue): void {
+    this.embeddingQueue = queue;
+  }
+
   /** Post a new blackboard entry with validation and defaults. */
-  async post(input: {
-    entry_type: string;
-    summary: string;
-    detail?: string;
-    tags?: string[];
-    scope?: string;
-    relates_to?: string[];
-    agent_id?: string;
-    _internal?: boolean;
-  }): Promise<{ id: string; timestamp: string }> {
-    // Validate entry_type
-    if (!ENTRY_TYPES.includes(input.entry_type as EntryType)) {
-      throw new TwiningError(
-        `Invalid entry_type "${input.entry_type}". Must be one of: ${ENTRY_TYPES.join(", ")}`,
-        "INVALID_INPUT",
-      );
-    }
+  async post(input: PostInput): Promise<{ id: string; timestamp: string }> {
+    const entry = await this.store.append(toEntry(input));
 
-    // Reject direct decision posts — agents must use twining_decide for rationale capture
-    if (input.entry_type === "decision" && !input._internal) {
-      throw new TwiningError(
-        `Use twining_decide to record decisions (ensures rationale, graph linkage, and conflict detection). twining_post does not accept entry_type "decision".`,
-        "INVALID_INPUT",
-      );
+    // Auto-populate graph with scope/relation entities (best-effort)
+    if (this.graphPopulator) {
+      await this.graphPopulator.onPost(entry);
     }
 
-    // Validate summary length
-    if (!input.summary || input.summary.length === 0) {
-      throw new TwiningError("summary is required", "INVALID_INPUT");
-    }
-    if (input.summary.length > 200) {
-      throw new TwiningError(
-        "summary must be at most 200 characters",
-        "INVALID_INPUT",
-      );
-    }
+    await this.afterAppend([entry]);
+    return { id: entry.id, timestamp: entry.timestamp };
+  }
 
-    const entry = await this.store.append({
-      entry_type: input.entry_type as EntryType,
-      summary: input.summary,
-      detail: input.detail ?? "",
-      tags: input.tags ?? [],
-      scope: input.scope ?? "project",
-      relates_to: input.relates_to,
-      agent_id: input.agent_id ?? "main",
+  /**
+   * Post several entries at once: one append, one graph batch, one
+   * embedding batch and one archive-threshold check for the lot.
+   * Results come back in input order; an invalid item gets an error in
+   * its slot and the rest are still posted.
+   */
+  async postBatch(inputs: PostInput[]): Promise<PostBatchResult[]> {
+    const results: PostBatchResult[] = new Array(inputs.length);
+    const valid: Array<{ index: number; entry: Omit<BlackboardEntry, "id" | "timestamp"> }> = [];
+    inputs.forEach((input, index) => {
+      try {
+        valid.push({ index, entry: toEntry(input) });
+      } catch (e) {
+        results[index] = batchItemError(e);
+      }
     });
 
-    // Auto-populate graph with scope/relation entities (best-effort)
-    if (this.graphPopulator) {
-      await this.graphPopulator.onPost(entry);
+    const entries = await this.store.appendBatch(valid.map((v) => v.entry));
+    entries.forEach((entry, i) => {
+      results[valid[i]!.index] = { id: entry.id, timestamp: entry.timestamp };
+    });
+
+    if (entries.length > 0) {
+      if (this.graphPopulator) {
+        await this.graphPopulator.onPostBatch(entries);
+      }
+      await this.afterAppend(entries);
     }
+    return results;
+  }
 
-    // Generate embedding (Phase 2) — never let embedding failure prevent the post
-    if (this.embedder && this.indexManager) {
+  /** Embedding, keyword indexing and the auto-archive check for new entries. */
+  private async afterAppend(entries: BlackboardEntry[]): Promise<void> {
+    // Generate embeddings (Phase 2) — never let embedding failure prevent the post.
+    // With a queue the vectors are written in the background; until then
+    // search scores the entries by keyword.
+    if (this.embeddingQueue) {
+      for (const entry of entries) {
+        this.embeddingQueue.enqueue(
+          "blackboard",
+          entry.id,
+          entry.summary + " " + entry.detail,
+        );
+      }
+    } else if (this.embedder && this.indexManager) {
       try {
-        const text = entry.summary + " " + entry.detail;
-        const vector = await this.embedder.embed(text);
-        if (vector) {
-          await this.indexManager.addEntry("blackboard", entry.id, vector);
-        }
+        const texts = entries.map((entry) => entry.summary + " " + entry.detail);
+        const vectors =
+          texts.length === 1
+            ? [await this.embedder.embed(texts[0]!)]
+            : await this.embedder.embedBatch(texts);
+        const embedded: { id: string; vector: number[] }[] = [];
+        vectors.forEach((vector, i) => {
+          if (vector) embedded.push({ id: entries[i]!.id, vector });
+        });
+        await this.indexManager.addEntries("blackboard", embedded);
       } catch (error) {
         // Silent failure — embedding is best-effort
         console.error("[twining] Embedding generation failed (non-fatal):", error);
       }
     }
 
+    // Keep the persistent keyword index current (best-effort)
+    if (this.searchEngine) {
+      await this.searchEngine.indexBlackboardEntries(entries);
+    }
+
     // Auto-archive if threshold exceeded (fire-and-forget, non-fatal) — spec §6.1.3
     if (this.archiver && this.archiveThreshold) {
-      const { total_count } = await this.store.read();
+      const total_count = await this.store.count();
       if (total_count >= this.archiveThreshold) {
         this.archiver.archive({ summarize: true }).catch((err) => {
           console.error("[twining] Auto-archive failed (non-fatal):", err);
         });
       }
     }
-
-    return { id: entry.id, timestamp: entry.timestamp };
   }
 
   /** Read blackboard entries with optional filters. */
@@ -132,6 +207,7 @@ export class BlackboardEngine {
     scope?: string;
     since?: string;
     limit?: number;
+    include_archived?: boolean;
   }): Promise<{ entries: BlackboardEntry[]; total_count: number }> {
     return this.store.read({
       entry_types: filters?.entry_types,
@@ -139,28 +215,54 @@ export class BlackboardEngine {
       scope: filters?.scope,
       since: filters?.since,
       limit: filters?.limit ?? 50,
+      include_archived: filters?.include_archived,
     });
   }
 
-  /** Semantic search across blackboard entries. Default limit: 10. */
+  /**
+   * Semantic search across blackboard entries. Default limit: 10.
+   * With include_archived, archived entries are also matched through the
+   * archive keyword index (they have no vectors) and ranked alongside live
+   * results, scored as live entries without a vector are.
+   */
   async query(
     query: string,
-    options?: { entry_types?: string[]; limit?: number },
+    options?: {
+      entry_types?: string[];
+      scope?: string;
+      limit?: number;
+      include_archived?: boolean;
+    },
   ): Promise<{
     results: BlackboardSearchResult[];
     fallback_mode: boolean;
   }> {
-    if (!this.searchEngine) {
-      return { results: [], fallback_mode: true };
-    }
-
-    const { entries } = await this.store.read();
     const limit = options?.limit ?? 10;
+    let live: { results: BlackboardSearchResult[]; fallback_mode: boolean } = {
+      results: [],
+      fallback_mode: true,
+    };
+    if (this.searchEngine) {
+      // Type and scope are checked per id as the search indexes turn them up
+      const candidates = await this.store.searchCandidates({
+        entry_types: options?.entry_types,
+        scope: options?.scope,
+      });
+      live = await this.searchEngine.searchBlackboard(query, candidates, { limit });
+    }
+    if (!options?.include_archived || !this.searchEngine) return live;
 
-    return this.searchEngine.searchBlackboard(query, entries, {
-      entry_types: options?.entry_types,
-      limit,
-    });
+    const archived = await this.searchEngine.searchArchivedBlackboard(
+      query,
+      await this.store.archivedSearchCandidates({
+        entry_types: options.entry_types,
+        scope: options.scope,
+      }),
+      { limit, semantic: !live.fallback_mode },
+    );
+    const results = [...live.results, ...archived];
+    results.sort((a, b) => b.relevance - a.relevance);
+    return { results: results.slice(0, limit), fallback_mode: live.fallback_mode };
   }
 
   /** Get the N most recent entries, optionally filtered by type. */
@@ -181,6 +283,7 @@ export class BlackboardEngine {
     const result = await this.store.dismiss(ids);
 
     // Clean up embeddings for dismissed entries (best-effort)
+    await this.unindex(result.dismissed);
     if (this.indexManager && result.dismissed.length > 0) {
       try {
         await this.indexManager.removeEntries("blackboard", result.dismissed);
@@ -191,4 +294,22 @@ export class BlackboardEngine {
 
     return result;
   }
+
+  /** Move archived entries into the archive keyword index (best-effort). */
+  async indexArchived(entries: BlackboardEntry[]): Promise<void> {
+    if (entries.length === 0 || !this.searchEngine) return;
+    await this.searchEngine.indexArchivedEntries(entries);
+  }
+
+  /**
+   * Drop removed entries from the embedding queue and keyword index.
+   * Called on dismiss and by the archiver (best-effort).
+   */
+  async unindex(ids: string[]): Promise<void> {
+    if (ids.length === 0) return;
+    this.embeddingQueue?.cancel("blackboard", ids);
+    if (this.searchEngine) {
+      await this.searchEngine.unindex("blackboard", ids);
+    }
+  }
 }
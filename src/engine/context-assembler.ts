@@ -10,6 +10,7 @@ import type { GraphEngine } from "./graph.js";
 import type { PlanningBridge } from "./planning-bridge.js";
 import type { HandoffStore } from "../storage/handoff-store.js";
 import type { AgentStore } from "../storage/agent-store.js";
+import type { MetricsSink } from "../analytics/metrics-collector.js";
 import type {
   AssembledContext,
   BlackboardEntry,
@@ -22,6 +23,7 @@ import { DEFAULT_LIVENESS_THRESHOLDS } from "../utils/liveness.js";
 import { computeLiveness } from "../utils/liveness.js";
 import { normalizeTags } from "../utils/tags.js";
 import { estimateTokens } from "../utils/tokens.js";
+import { span } from "../utils/tracing.js";
 
 /** Half-life for recency decay in hours (one week). */
 const RECENCY_HALF_LIFE = 168;
@@ -35,6 +37,129 @@ interface ScoredItem {
   data: Decision | BlackboardEntry;
 }
 
+/** Memoized (task, scope) sets kept by default; 0 disables memoization. */
+const DEFAULT_CACHE_MAX_ENTRIES = 64;
+
+/** How long a memoized result is served before recency scores are recomputed. */
+const DEFAULT_CACHE_TTL_MS = 30_000;
+
+/** Deadline for each optional assemble stage by default; 0 disables deadlines. */
+const DEFAULT_STAGE_TIMEOUT_MS = 2_000;
+
+/** Generation stamps of the stores assemble reads. */
+interface StoreGenerations {
+  blackboard: string;
+  decisions: string;
+  graph: string;
+  handoffs: string;
+}
+
+/** Scored and budgeted output of assemble steps 1–9. */
+interface CoreAssembly {
+  tokensUsed: number;
+  activeDecisions: AssembledContext["active_decisions"];
+  openNeeds: AssembledContext["open_needs"];
+  recentFindings: AssembledContext["recent_findings"];
+  activeWarnings: AssembledContext["active_warnings"];
+  recentQuestions: AssembledContext["recent_questions"];
+  relatedEntities: AssembledContext["related_entities"];
+}
+
+/** Memoized assemble parts for one (task, scope), each tagged with the stamp it was built from. */
+interface AssemblyMemo {
+  decisions?: { stamp: string; merged: Map<string, Decision>; relevance: Map<string, number> };
+  entries?: { stamp: string; merged: Map<string, BlackboardEntry>; relevance: Map<string, number> };
+  reachability?: { stamp: string; scores: Map<string, number>; paths: Map<string, string> };
+  related?: { stamp: string; value: AssembledContext["related_entities"] };
+  handoffs?: { stamp: string; value: AssembledContext["recent_handoffs"] };
+  /** Full core results by token budget. */
+  results: Map<number, { stamp: string; at: number; core: CoreAssembly }>;
+}
+
+type MemoPartKey = Exclude<keyof AssemblyMemo, "results">;
+type MemoPart<K extends MemoPartKey> = NonNullable<AssemblyMemo[K]>;
+
+const TIMED_OUT = Symbol("timed out");
+
+/** Per-call bookkeeping for assemble: stage timings, deadlines and memo reuse. */
+class AssemblyRun {
+  /** Milliseconds spent in each stage, by stage name. */
+  readonly stages: Record<string, number> = {};
+  /** Optional stages that missed their deadline. */
+  readonly timedOut = new Set<string>();
+  /** Whether any memoized part was reused. */
+  reused = false;
+  private readonly deadlineMs: number;
+
+  constructor(deadlineMs: number) {
+    this.deadlineMs = deadlineMs;
+  }
+
+  /** Run and time a required stage. */
+  async stage<T>(name: string, fn: () => Promise<T>): Promise<T> {
+    const start = performance.now();
+    try {
+      return await span(`assemble.${name}`, fn);
+    } finally {
+      this.record(name, start);
+    }
+  }
+
+  /**
+   * Run and time an optional stage, settling with `fallback` if it misses
+   * the deadline. The stage keeps running; its late result is dropped.
+   */
+  async optional<T>(name: string, fn: () => Promise<T>, fallback: T): Promise<T> {
+    if (this.deadlineMs <= 0) return this.stage(name, fn);
+
+    const start = performance.now();
+    let timer: NodeJS.Timeout | undefined;
+    const deadline = new Promise<typeof TIMED_OUT>((resolve) => {
+      timer = setTimeout(() => resolve(TIMED_OUT), this.deadlineMs);
+    });
+    try {
+      const result = await Promise.race([span(`assemble.${name}`, fn), deadline]);
+      if (result !== TIMED_OUT) return result;
+      this.timedOut.add(name);
+      console.error(
+        `[twining] Assemble stage ${name} exceeded ${this.deadlineMs}ms; continuing without it (non-fatal)`,
+      );
+      return fallback;
+    } finally {
+      clearTimeout(timer);
+      this.record(name, start);
+    }
+  }
+
+  /** Run and time a synchronous stage. */
+  sync<T>(name: string, fn: () => T): T {
+    const start = performance.now();
+    try {
+      return fn();
+    } finally {
+      this.record(name, start);
+    }
+  }
+
+  /** Record a stage that started at `start` (a performance.now() value). */
+  record(name: string, start: number): void {
+    this.stages[name] = Math.round((performance.now() - start) * 100) / 100;
+  }
+}
+
+/** Copy a core result's arrays so callers can append without touching the memo. */
+function cloneCore(core: CoreAssembly): CoreAssembly {
+  return {
+    tokensUsed: core.tokensUsed,
+    activeDecisions: core.activeDecisions.slice(),
+    openNeeds: core.openNeeds.slice(),
+    recentFindings: core.recentFindings.slice(),
+    activeWarnings: core.activeWarnings.slice(),
+    recentQuestions: core.recentQuestions.slice(),
+    relatedEntities: core.relatedEntities.slice(),
+  };
+}
+
 export class ContextAssembler {
   private readonly blackboardStore: BlackboardStore;
   private readonly decisionStore: DecisionStore;
@@ -47,6 +172,9 @@ export class ContextAssembler {
 
   /** In-memory log of last assembly time per agent (not persisted across restarts). */
   private readonly assemblyLog = new Map<string, string>();
+  /** Memoized assemble parts per (task, scope), in LRU order. */
+  private readonly memos = new Map<string, AssemblyMemo>();
+  private metrics: MetricsSink | null = null;
 
   constructor(
     blackboardStore: BlackboardStore,
@@ -68,6 +196,11 @@ export class ContextAssembler {
     this.agentStore = agentStore ?? null;
   }
 
+  /** Set the sink for assemble cache counters and stage timings. */
+  setMetrics(metrics: MetricsSink): void {
+    this.metrics = metrics;
+  }
+
   /** Check if an agent has called assemble() recently (in this session). */
   hasRecentAssembly(agentId: string): boolean {
     return this.assemblyLog.has(agentId);
@@ -76,6 +209,16 @@ export class ContextAssembler {
   /**
    * Build tailored context for a specific task within a token budget.
    * Implements spec section 4.3 (twining_assemble).
+   *
+   * Results are memoized per (task, scope, budget) and keyed by the store
+   * generations they were built from, so a repeat call with nothing changed
+   * skips loading and rescoring. When only some stores changed, the parts
+   * built from the others (scope candidates and their relevance, graph
+   * reachability, related entities, handoffs) are reused.
+   *
+   * Independent stages run concurrently. Optional ones (semantic search,
+   * graph, handoffs, agents) have a deadline and are left out if they miss
+   * it; per-stage timings go to the metrics sink.
    */
   async assemble(
     task: string,
@@ -86,91 +229,213 @@ export class ContextAssembler {
     const budget = maxTokens ?? this.config.context_assembly.default_max_tokens;
     const weights = this.config.context_assembly.priority_weights;
     const now = Date.now();
+    const run = new AssemblyRun(
+      this.config.context_assembly.stage_timeout_ms ?? DEFAULT_STAGE_TIMEOUT_MS,
+    );
 
-    // Load all data once upfront to avoid redundant disk reads
-    const { entries: allEntries } = await this.blackboardStore.read();
-    const allIndex = await this.decisionStore.getIndex();
+    const generations = await run.stage("generations", () => this.readGenerations());
+    const memo = generations ? this.getMemo(task, scope) : null;
 
-    // 1. Retrieve scope-matched decisions
-    const scopeDecisions = await this.decisionStore.getByScope(scope);
-    const activeDecisions = scopeDecisions.filter(
-      (d) => d.status === "active" || d.status === "provisional",
+    // Handoffs and agents don't depend on the scored core; start them first
+    const handoffsReady = this.handoffStore
+      ? run.optional("handoffs", () => this.recentHandoffs(scope, generations, memo), undefined)
+      : Promise.resolve(undefined);
+    const agentsReady = this.agentStore
+      ? run.optional("agents", () => this.suggestAgents(task), undefined)
+      : Promise.resolve(undefined);
+
+    const coreReady = this.cachedCore(task, scope, budget, now, generations, memo, run);
+
+    // 10. Planning state is a synchronous read; it overlaps the I/O above
+    const planningState = run.sync(
+      "planning",
+      () => this.planningBridge?.readPlanningState() ?? null,
     );
 
-    // 2. Retrieve semantically relevant decisions (merge by ID, keep highest relevance)
-    const decisionRelevance = new Map<string, number>();
-    if (this.searchEngine) {
-      const allDecisions: Decision[] = [];
-      for (const entry of allIndex) {
-        if (entry.status === "active" || entry.status === "provisional") {
-          const d = await this.decisionStore.get(entry.id);
-          if (d) allDecisions.push(d);
-        }
-      }
+    const [core, recentHandoffs, suggestedAgents] = await Promise.all([
+      coreReady,
+      handoffsReady,
+      agentsReady,
+    ]);
 
-      const { results: semanticDecisions } =
-        await this.searchEngine.searchDecisions(task, allDecisions);
-      for (const sr of semanticDecisions) {
-        decisionRelevance.set(sr.decision.id, sr.relevance);
+    const result: AssembledContext = {
+      assembled_at: new Date().toISOString(),
+      task,
+      scope,
+      token_estimate: core.tokensUsed,
+      active_decisions: core.activeDecisions,
+      open_needs: core.openNeeds,
+      recent_findings: core.recentFindings,
+      active_warnings: core.activeWarnings,
+      recent_questions: core.recentQuestions,
+      related_entities: core.relatedEntities,
+    };
+    const tokensUsed = core.tokensUsed;
+    const recentFindings = core.recentFindings;
+
+    // 10. Integrate planning state from .planning/ directory
+    if (planningState) {
+      // Always include planning_state as metadata (not subject to token budget)
+      result.planning_state = planningState;
+
+      // Add a synthetic scored finding for planning context so it competes
+      // for token budget alongside other items (GSDB-04)
+      let planningText = `Planning: Phase ${planningState.current_phase}, Progress: ${planningState.progress}`;
+      if (planningState.blockers.length > 0) {
+        planningText += `. Blockers: ${planningState.blockers.join("; ")}`;
+      }
+      const planningTokenCost = estimateTokens(planningText);
+      const planningScore =
+        1.0 * weights.recency +    // always fresh
+        0.5 * weights.relevance +  // moderate default relevance
+        0.5 * weights.decision_confidence;
+      if (tokensUsed + planningTokenCost <= budget) {
+        recentFindings.push({
+          id: "planning-state",
+          summary: planningText,
+          detail: planningState.open_requirements.length > 0
+            ? `Open requirements: ${planningState.open_requirements.join(", ")}`
+            : "",
+          scope: "project",
+          timestamp: new Date().toISOString(),
+        });
+        result.token_estimate += planningTokenCost;
       }
     }
 
-    // Merge scope-matched and semantic decisions (union by ID)
-    const mergedDecisionMap = new Map<string, Decision>();
-    for (const d of activeDecisions) {
-      mergedDecisionMap.set(d.id, d);
-      if (!decisionRelevance.has(d.id)) {
-        decisionRelevance.set(d.id, 0.5); // Default relevance for scope-only matches
-      }
+    // 11. Include recent handoffs matching scope (HND-03)
+    if (recentHandoffs && recentHandoffs.length > 0) {
+      result.recent_handoffs = recentHandoffs.slice();
     }
-    if (this.searchEngine) {
-      for (const entry of allIndex) {
-        if (
-          decisionRelevance.has(entry.id) &&
-          !mergedDecisionMap.has(entry.id)
-        ) {
-          const d = await this.decisionStore.get(entry.id);
-          if (d && (d.status === "active" || d.status === "provisional")) {
-            mergedDecisionMap.set(d.id, d);
-          }
-        }
-      }
+
+    // 12. Include suggested agents with matching capabilities (HND-06)
+    if (suggestedAgents && suggestedAgents.length > 0) {
+      result.suggested_agents = suggestedAgents;
     }
 
-    // 3. Retrieve scope-matched blackboard entries (filter from cached allEntries)
-    const scopeEntries = allEntries.filter(
-      (e) => e.scope.startsWith(scope) || scope.startsWith(e.scope),
-    );
+    // Log assembly for assembly-before-decision tracking
+    this.assemblyLog.set(agentId ?? "main", result.assembled_at);
 
-    // 4. Retrieve semantically relevant findings
-    const entryRelevance = new Map<string, number>();
-    if (this.searchEngine) {
-      const { results: semanticEntries } =
-        await this.searchEngine.searchBlackboard(task, allEntries);
-      for (const sr of semanticEntries) {
-        entryRelevance.set(sr.entry.id, sr.relevance);
-      }
+    this.metrics?.recordStages(run.stages);
+    for (const stage of run.timedOut) {
+      this.metrics?.increment(`assemble.stage_timeout.${stage}`);
     }
 
-    // Merge entries — scope + semantic
-    const mergedEntryMap = new Map<string, BlackboardEntry>();
-    for (const e of scopeEntries) {
-      mergedEntryMap.set(e.id, e);
-      if (!entryRelevance.has(e.id)) {
-        entryRelevance.set(e.id, 0.5);
-      }
+    return result;
+  }
+
+  /** Steps 1–9: serve the memoized core result if still current, else build it. */
+  private async cachedCore(
+    task: string,
+    scope: string,
+    budget: number,
+    now: number,
+    generations: StoreGenerations | null,
+    memo: AssemblyMemo | null,
+    run: AssemblyRun,
+  ): Promise<CoreAssembly> {
+    const coreStamp = generations
+      ? [
+          generations.blackboard,
+          generations.decisions,
+          generations.graph,
+          JSON.stringify(this.config.context_assembly.priority_weights),
+        ].join("|")
+      : "";
+
+    const cached = memo?.results.get(budget);
+    if (cached && cached.stamp === coreStamp && now - cached.at < this.cacheTtlMs()) {
+      this.metrics?.increment("assemble.cache.hit");
+      return cloneCore(cached.core);
     }
-    if (this.searchEngine) {
-      for (const e of allEntries) {
-        if (entryRelevance.has(e.id) && !mergedEntryMap.has(e.id)) {
-          mergedEntryMap.set(e.id, e);
-        }
-      }
+
+    const core = await this.assembleCore(task, scope, budget, now, generations, memo, run);
+    // A result missing a timed-out stage is served once but not remembered
+    if (memo && run.timedOut.size === 0) {
+      memo.results.set(budget, { stamp: coreStamp, at: now, core: cloneCore(core) });
     }
+    this.metrics?.increment(
+      run.reused ? "assemble.cache.partial" : "assemble.cache.miss",
+    );
+    return core;
+  }
+
+  /**
+   * Steps 1–9 of assemble: candidates, scoring and budget filling. Reuses
+   * memoized parts whose stamps still match the current generations.
+   * Decisions, entries and related entities load concurrently; graph
+   * reachability waits only on the decisions.
+   */
+  private async assembleCore(
+    task: string,
+    scope: string,
+    budget: number,
+    now: number,
+    generations: StoreGenerations | null,
+    memo: AssemblyMemo | null,
+    run: AssemblyRun,
+  ): Promise<CoreAssembly> {
+    const weights = this.config.context_assembly.priority_weights;
+
+    // 1–2. Scope-matched and semantically relevant decisions
+    const decisionsReady = this.memoPart(
+      memo,
+      "decisions",
+      generations?.decisions ?? "",
+      run,
+      ["semantic_decisions"],
+      () => this.collectDecisions(task, scope, run),
+    );
+
+    // 3–4. Scope-matched blackboard entries and semantically relevant findings
+    const entriesReady = this.memoPart(
+      memo,
+      "entries",
+      generations?.blackboard ?? "",
+      run,
+      ["semantic_entries"],
+      () => this.collectEntries(task, scope, run),
+    );
+
+    // 9. Populate related_entities from knowledge graph
+    const relatedReady = this.memoPart(
+      memo,
+      "related",
+      generations?.graph ?? "",
+      run,
+      ["related_entities"],
+      async () => ({
+        value: await run.optional(
+          "related_entities",
+          () => this.getRelatedEntities(scope),
+          [],
+        ),
+      }),
+    );
 
     // 5. Compute graph reachability scores for decisions
-    const { scores: reachabilityScores, paths: reachabilityPaths } =
-      await this.computeGraphReachability(scope, mergedDecisionMap);
+    const reachabilityReady = decisionsReady.then((decisionPart) =>
+      this.memoPart(
+        memo,
+        "reachability",
+        `${generations?.graph}|${decisionPart.stamp}`,
+        run,
+        ["graph_reachability"],
+        () =>
+          run.optional(
+            "graph_reachability",
+            () => this.computeGraphReachability(scope, decisionPart.merged),
+            { scores: new Map<string, number>(), paths: new Map<string, string>() },
+          ),
+      ),
+    );
+
+    const [decisionPart, entryPart, reachabilityPart, relatedPart] =
+      await Promise.all([decisionsReady, entriesReady, reachabilityReady, relatedReady]);
+    const { merged: mergedDecisionMap, relevance: decisionRelevance } = decisionPart;
+    const { merged: mergedEntryMap, relevance: entryRelevance } = entryPart;
+    const { scores: reachabilityScores, paths: reachabilityPaths } = reachabilityPart;
+    const scoringStart = performance.now();
 
     // 6. Score each item
     const scoredItems: ScoredItem[] = [];
@@ -351,103 +616,251 @@ export class ContextAssembler {
       }
     }
 
-    // 9. Populate related_entities from knowledge graph
-    const relatedEntities = await this.getRelatedEntities(scope);
+    run.record("scoring", scoringStart);
 
-    const result: AssembledContext = {
-      assembled_at: new Date().toISOString(),
-      task,
-      scope,
-      token_estimate: tokensUsed,
-      active_decisions: activeDecisionResults,
-      open_needs: openNeeds,
-      recent_findings: recentFindings,
-      active_warnings: activeWarnings,
-      recent_questions: recentQuestions,
-      related_entities: relatedEntities,
+    return {
+      tokensUsed,
+      activeDecisions: activeDecisionResults,
+      openNeeds,
+      recentFindings,
+      activeWarnings,
+      recentQuestions,
+      relatedEntities: relatedPart.value.slice(),
     };
+  }
 
-    // 10. Integrate planning state from .planning/ directory
-    const planningState = this.planningBridge?.readPlanningState() ?? null;
-    if (planningState) {
-      // Always include planning_state as metadata (not subject to token budget)
-      result.planning_state = planningState;
+  /**
+   * Reuse a memoized part whose stamp matches, or build it. A part built
+   * while one of its optional stages timed out is not memoized.
+   */
+  private async memoPart<K extends MemoPartKey>(
+    memo: AssemblyMemo | null,
+    key: K,
+    stamp: string,
+    run: AssemblyRun,
+    stages: string[],
+    build: () => Promise<Omit<MemoPart<K>, "stamp">>,
+  ): Promise<MemoPart<K>> {
+    const cached = memo?.[key];
+    if (cached && cached.stamp === stamp) {
+      run.reused = true;
+      return cached as MemoPart<K>;
+    }
+    const part = { stamp, ...(await build()) } as MemoPart<K>;
+    if (memo && !stages.some((stage) => run.timedOut.has(stage))) {
+      memo[key] = part as AssemblyMemo[K];
+    }
+    return part;
+  }
 
-      // Add a synthetic scored finding for planning context so it competes
-      // for token budget alongside other items (GSDB-04)
-      let planningText = `Planning: Phase ${planningState.current_phase}, Progress: ${planningState.progress}`;
-      if (planningState.blockers.length > 0) {
-        planningText += `. Blockers: ${planningState.blockers.join("; ")}`;
+  /** Steps 1–2: active scope-matched decisions merged with semantic matches. */
+  private async collectDecisions(
+    task: string,
+    scope: string,
+    run: AssemblyRun,
+  ): Promise<{ merged: Map<string, Decision>; relevance: Map<string, number> }> {
+    const searchEngine = this.searchEngine;
+    const [scopeDecisions, semantic] = await Promise.all([
+      // 1. Retrieve scope-matched decisions
+      run.stage("scope_decisions", () => this.decisionStore.getByScope(scope)),
+      // 2. Retrieve semantically relevant decisions (merge by ID, keep highest relevance)
+      searchEngine
+        ? run.optional(
+            "semantic_decisions",
+            async () => {
+              const candidates = await this.decisionStore.searchCandidates(
+                (e) => e.status === "active" || e.status === "provisional",
+              );
+              return (await searchEngine.searchDecisions(task, candidates)).results;
+            },
+            null,
+          )
+        : null,
+    ]);
+    const activeDecisions = scopeDecisions.filter(
+      (d) => d.status === "active" || d.status === "provisional",
+    );
+
+    const decisionRelevance = new Map<string, number>();
+    for (const sr of semantic ?? []) {
+      decisionRelevance.set(sr.decision.id, sr.relevance);
+    }
+
+    // Merge scope-matched and semantic decisions (union by ID)
+    const mergedDecisionMap = new Map<string, Decision>();
+    for (const d of activeDecisions) {
+      mergedDecisionMap.set(d.id, d);
+      if (!decisionRelevance.has(d.id)) {
+        decisionRelevance.set(d.id, 0.5); // Default relevance for scope-only matches
       }
-      const planningTokenCost = estimateTokens(planningText);
-      const planningScore =
-        1.0 * weights.recency +    // always fresh
-        0.5 * weights.relevance +  // moderate default relevance
-        0.5 * weights.decision_confidence;
-      if (tokensUsed + planningTokenCost <= budget) {
-        recentFindings.push({
-          id: "planning-state",
-          summary: planningText,
-          detail: planningState.open_requirements.length > 0
-            ? `Open requirements: ${planningState.open_requirements.join(", ")}`
-            : "",
-          scope: "project",
-          timestamp: new Date().toISOString(),
-        });
-        result.token_estimate += planningTokenCost;
+    }
+    for (const { decision } of semantic ?? []) {
+      if (!mergedDecisionMap.has(decision.id)) {
+        mergedDecisionMap.set(decision.id, decision);
       }
     }
 
-    // 11. Include recent handoffs matching scope (HND-03)
-    if (this.handoffStore) {
-      const handoffEntries = await this.handoffStore.list({ scope, limit: 5 });
-      if (handoffEntries.length > 0) {
-        result.recent_handoffs = handoffEntries.map((h) => ({
-          id: h.id,
-          source_agent: h.source_agent,
-          target_agent: h.target_agent ?? "",
-          scope: h.scope ?? "",
-          summary: h.summary,
-          result_status: h.result_status,
-          acknowledged: h.acknowledged,
-          created_at: h.created_at,
-        }));
-      }
+    return { merged: mergedDecisionMap, relevance: decisionRelevance };
+  }
+
+  /** Steps 3–4: scope-matched blackboard entries merged with semantic matches. */
+  private async collectEntries(
+    task: string,
+    scope: string,
+    run: AssemblyRun,
+  ): Promise<{ merged: Map<string, BlackboardEntry>; relevance: Map<string, number> }> {
+    const searchEngine = this.searchEngine;
+    const [scopeEntries, semantic] = await Promise.all([
+      // 3. Retrieve scope-matched blackboard entries (via the store's scope index)
+      run.stage(
+        "scope_entries",
+        async () => (await this.blackboardStore.read({ scope })).entries,
+      ),
+      // 4. Retrieve semantically relevant findings
+      searchEngine
+        ? run.optional(
+            "semantic_entries",
+            async () => {
+              const candidates = await this.blackboardStore.searchCandidates();
+              return (await searchEngine.searchBlackboard(task, candidates)).results;
+            },
+            null,
+          )
+        : null,
+    ]);
+
+    const entryRelevance = new Map<string, number>();
+    for (const sr of semantic ?? []) {
+      entryRelevance.set(sr.entry.id, sr.relevance);
     }
 
-    // 12. Include suggested agents with matching capabilities (HND-06)
-    if (this.agentStore) {
-      const allAgents = await this.agentStore.getAll();
-      const thresholds = this.config.agents?.liveness ?? DEFAULT_LIVENESS_THRESHOLDS;
-      const taskTerms = normalizeTags(task.split(/\s+/));
-
-      const suggestedAgents: NonNullable<AssembledContext["suggested_agents"]> = [];
-      for (const agent of allAgents) {
-        const liveness = computeLiveness(agent.last_active, new Date(), thresholds);
-        if (liveness === "gone") continue;
-
-        const normalizedCaps = normalizeTags(agent.capabilities);
-        const hasMatch = normalizedCaps.some((cap) =>
-          taskTerms.some((term) => term.includes(cap) || cap.includes(term)),
-        );
-        if (hasMatch) {
-          suggestedAgents.push({
-            agent_id: agent.agent_id,
-            capabilities: agent.capabilities,
-            liveness,
-          });
-        }
+    // Merge entries — scope + semantic
+    const mergedEntryMap = new Map<string, BlackboardEntry>();
+    for (const e of scopeEntries) {
+      mergedEntryMap.set(e.id, e);
+      if (!entryRelevance.has(e.id)) {
+        entryRelevance.set(e.id, 0.5);
       }
+    }
+    for (const { entry } of semantic ?? []) {
+      if (!mergedEntryMap.has(entry.id)) {
+        mergedEntryMap.set(entry.id, entry);
+      }
+    }
 
-      if (suggestedAgents.length > 0) {
-        result.suggested_agents = suggestedAgents;
+    return { merged: mergedEntryMap, relevance: entryRelevance };
+  }
+
+  /** Step 11: recent handoffs matching scope, memoized by handoff generation. */
+  private async recentHandoffs(
+    scope: string,
+    generations: StoreGenerations | null,
+    memo: AssemblyMemo | null,
+  ): Promise<AssembledContext["recent_handoffs"]> {
+    if (!this.handoffStore) return undefined;
+    if (memo?.handoffs && memo.handoffs.stamp === generations?.handoffs) {
+      return memo.handoffs.value;
+    }
+
+    const handoffEntries = await this.handoffStore.list({ scope, limit: 5 });
+    const value = handoffEntries.map((h) => ({
+      id: h.id,
+      source_agent: h.source_agent,
+      target_agent: h.target_agent ?? "",
+      scope: h.scope ?? "",
+      summary: h.summary,
+      result_status: h.result_status,
+      acknowledged: h.acknowledged,
+      created_at: h.created_at,
+    }));
+    if (memo && generations) {
+      memo.handoffs = { stamp: generations.handoffs, value };
+    }
+    return value;
+  }
+
+  /** Step 12: live agents whose capabilities match the task. */
+  private async suggestAgents(
+    task: string,
+  ): Promise<AssembledContext["suggested_agents"]> {
+    if (!this.agentStore) return undefined;
+    const allAgents = await this.agentStore.getAll();
+    const thresholds = this.config.agents?.liveness ?? DEFAULT_LIVENESS_THRESHOLDS;
+    const taskTerms = normalizeTags(task.split(/\s+/));
+
+    const suggestedAgents: NonNullable<AssembledContext["suggested_agents"]> = [];
+    for (const agent of allAgents) {
+      const liveness = computeLiveness(agent.last_active, new Date(), thresholds);
+      if (liveness === "gone") continue;
+
+      const normalizedCaps = normalizeTags(agent.capabilities);
+      const hasMatch = normalizedCaps.some((cap) =>
+        taskTerms.some((term) => term.includes(cap) || cap.includes(term)),
+      );
+      if (hasMatch) {
+        suggestedAgents.push({
+          agent_id: agent.agent_id,
+          capabilities: agent.capabilities,
+          liveness,
+        });
       }
     }
+    return suggestedAgents;
+  }
 
-    // Log assembly for assembly-before-decision tracking
-    this.assemblyLog.set(agentId ?? "main", result.assembled_at);
+  /**
+   * Current generation of every store assemble reads, combined with the
+   * matching embedding index version. Null when memoization is disabled or
+   * a generation can't be read, in which case nothing is cached.
+   */
+  private async readGenerations(): Promise<StoreGenerations | null> {
+    if (this.cacheMaxEntries() <= 0) return null;
+    try {
+      const [blackboard, decisions, graph, handoffs, blackboardVectors, decisionVectors] =
+        await Promise.all([
+          this.blackboardStore.generation(),
+          this.decisionStore.generation(),
+          this.graphEngine?.generation() ?? -1,
+          this.handoffStore?.generation() ?? -1,
+          this.searchEngine?.indexVersion("blackboard") ?? "",
+          this.searchEngine?.indexVersion("decisions") ?? "",
+        ]);
+      return {
+        blackboard: `${blackboard}:${blackboardVectors}`,
+        decisions: `${decisions}:${decisionVectors}`,
+        graph: String(graph),
+        handoffs: String(handoffs),
+      };
+    } catch (error) {
+      console.error("[twining] Assemble cache generations unavailable (non-fatal):", error);
+      return null;
+    }
+  }
 
-    return result;
+  /** Get (or create) the memo for a task and scope, refreshing its LRU position. */
+  private getMemo(task: string, scope: string): AssemblyMemo {
+    const key = `${task}\0${scope}`;
+    let memo = this.memos.get(key);
+    if (memo) {
+      this.memos.delete(key);
+    } else {
+      memo = { results: new Map() };
+    }
+    this.memos.set(key, memo);
+    while (this.memos.size > this.cacheMaxEntries()) {
+      const oldest = this.memos.keys().next().value;
+      if (oldest === undefined) break;
+      this.memos.delete(oldest);
+    }
+    return memo;
+  }
+
+  private cacheMaxEntries(): number {
+    return this.config.context_assembly.cache?.max_entries ?? DEFAULT_CACHE_MAX_ENTRIES;
+  }
+
+  private cacheTtlMs(): number {
+    return this.config.context_assembly.cache?.ttl_ms ?? DEFAULT_CACHE_TTL_MS;
   }
 
   /**
@@ -458,14 +871,12 @@ export class ContextAssembler {
     const targetScope = scope ?? "project";
 
     // Get decisions
-    const index = await this.decisionStore.getIndex();
     const scopeIndex = targetScope === "project"
-      ? index
-      : index.filter(
-          (e) =>
-            e.scope.startsWith(targetScope) ||
-            targetScope.startsWith(e.scope),
-        );
+      ? await this.decisionStore.getIndex()
+      : await this.decisionStore.getIndexByScope(targetScope, {
+          affected_files: false,
+          affected_symbols: false,
+        });
 
     const activeDecisions = scopeIndex.filter(
       (e) => e.status === "active",
@@ -552,14 +963,13 @@ export class ContextAssembler {
     }));
 
     // Get decisions since timestamp
-    const index = await this.decisionStore.getIndex();
-    let filteredIndex = index.filter((e) => e.timestamp >= since);
-    if (scope) {
-      filteredIndex = filteredIndex.filter(
-        (e) =>
-          e.scope.startsWith(scope) || scope.startsWith(e.scope),
-      );
-    }
+    const scopedIndex = scope
+      ? await this.decisionStore.getIndexByScope(scope, {
+          affected_files: false,
+          affected_symbols: false,
+        })
+      : await this.decisionStore.getIndex();
+    const filteredIndex = scopedIndex.filter((e) => e.timestamp >= since);
 
     const newDecisions = filteredIndex
       .filter((e) => e.status === "active" || e.status === "provisional")
@@ -567,17 +977,16 @@ export class ContextAssembler {
 
     // Find overridden decisions since timestamp
     const overriddenDecisions: WhatChangedResult["overridden_decisions"] = [];
-    const allOverridden = index.filter((e) => e.status === "overridden");
-    for (const entry of allOverridden) {
-      const decision = await this.decisionStore.get(entry.id);
-      if (decision && decision.timestamp >= since) {
-        if (!scope || decision.scope.startsWith(scope) || scope.startsWith(decision.scope)) {
-          overriddenDecisions.push({
-            id: decision.id,
-            summary: decision.summary,
-            reason: decision.override_reason ?? "No reason provided",
-          });
-        }
+    const allOverridden = await this.decisionStore.getMany(
+      scopedIndex.filter((e) => e.status === "overridden").map((e) => e.id),
+    );
+    for (const decision of allOverridden) {
+      if (decision.timestamp >= since) {
+        overriddenDecisions.push({
+          id: decision.id,
+          summary: decision.summary,
+          reason: decision.override_reason ?? "No reason provided",
+        });
       }
     }
 
@@ -643,6 +1052,20 @@ export class ContextAssembler {
       // Build set of decision IDs for quick lookup
       const decisionIds = new Set(decisions.keys());
 
+      // Decisions by affected file/symbol name, so each visited neighbor
+      // costs one lookup rather than a scan of every decision
+      const decisionsByTarget = new Map<string, string[]>();
+      for (const [decisionId, decision] of decisions) {
+        for (const name of new Set([
+          ...decision.affected_files,
+          ...decision.affected_symbols,
+        ])) {
+          const ids = decisionsByTarget.get(name);
+          if (ids) ids.push(decisionId);
+          else decisionsByTarget.set(name, [decisionId]);
+        }
+      }
+
       // 2. For each scope entity, do typed BFS traversal (max depth 3)
       for (const scopeEntity of filteredScopeEntities) {
         try {
@@ -678,23 +1101,18 @@ export class ContextAssembler {
             }
 
             // Also check if the neighbor's name matches affected_files of any decision
-            for (const [decisionId, decision] of decisions) {
-              if (
-                decision.affected_files.includes(neighbor.entity.name) ||
-                decision.affected_symbols.includes(neighbor.entity.name)
-              ) {
-                const relType = neighbor.relation.type;
-                const bonus = relationBonus[relType] ?? 0.5;
-                const pathScore = depthScore[1] * bonus; // 2-hop equivalent
-
-                const existing = scores.get(decisionId) ?? 0;
-                if (pathScore > existing) {
-                  scores.set(decisionId, pathScore);
-                  paths.set(
-                    decisionId,
-                    `${scopeEntity.name} → ${relType} → ${neighbor.entity.name} → decided_by → ${decisionId}`,
-                  );
-                }
+            for (const decisionId of decisionsByTarget.get(neighbor.entity.name) ?? []) {
+              const relType = neighbor.relation.type;
+              const bonus = relationBonus[relType] ?? 0.5;
+              const pathScore = depthScore[1] * bonus; // 2-hop equivalent
+
+              const existing = scores.get(decisionId) ?? 0;
+              if (pathScore > existing) {
+                scores.set(decisionId, pathScore);
+                paths.set(
+                  decisionId,
+                  `${scopeEntity.name} → ${relType} → ${neighbor.entity.name} → decided_by → ${decisionId}`,
+                );
               }
             }
           }
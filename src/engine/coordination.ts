@@ -240,16 +240,15 @@ export class CoordinationEngine {
   private async assembleContextSnapshot(
     scope?: string,
   ): Promise<HandoffRecord["context_snapshot"]> {
-    // 1. Get decision index and filter to active decisions
-    const decisionIndex = await this.decisionStore.getIndex();
-    let activeDecisions = decisionIndex.filter((d) => d.status === "active");
-
-    // If scope provided, use bidirectional prefix matching
-    if (scope) {
-      activeDecisions = activeDecisions.filter(
-        (d) => d.scope.startsWith(scope) || scope.startsWith(d.scope),
-      );
-    }
+    // 1. Get decision index (bidirectional scope prefix match if scoped)
+    // and filter to active decisions
+    const decisionIndex = scope
+      ? await this.decisionStore.getIndexByScope(scope, {
+          affected_files: false,
+          affected_symbols: false,
+        })
+      : await this.decisionStore.getIndex();
+    const activeDecisions = decisionIndex.filter((d) => d.status === "active");
 
     // 2. Read blackboard entries for warnings and findings
     const { entries: bbEntries } = await this.blackboardStore.read({
@@ -10,14 +10,20 @@ import fs from "node:fs";
 import path from "node:path";
 import { DecisionStore } from "../storage/decision-store.js";
 import { BlackboardEngine } from "./blackboard.js";
-import { TwiningError } from "../utils/errors.js";
+import type { PostInput } from "./blackboard.js";
+import { TwiningError, batchItemError } from "../utils/errors.js";
+import type { BatchItemError } from "../utils/errors.js";
+import { ScopeIndex } from "../utils/scope-index.js";
+import { span } from "../utils/tracing.js";
 import type {
   Decision,
   DecisionConfidence,
+  DecisionIndexEntry,
   DecisionStatus,
 } from "../utils/types.js";
 import type { Embedder } from "../embeddings/embedder.js";
 import type { IndexManager } from "../embeddings/index-manager.js";
+import type { EmbeddingQueue } from "../embeddings/embedding-queue.js";
 import type { SearchEngine } from "../embeddings/search.js";
 import type { GraphEngine } from "./graph.js";
 import { GraphAutoPopulator } from "./graph-auto-populator.js";
@@ -31,6 +37,58 @@ export interface TraceEntry {
   status: string;
 }
 
+/** Input accepted by decide() and decideBatch(). */
+export interface DecideInput {
+  domain: string;
+  scope: string;
+  summary: string;
+  context: string;
+  rationale: string;
+  constraints?: string[];
+  alternatives?: Array<{
+    option: string;
+    pros?: string[];
+    cons?: string[];
+    reason_rejected: string;
+  }>;
+  depends_on?: string[];
+  supersedes?: string;
+  confidence?: "high" | "medium" | "low";
+  reversible?: boolean;
+  affected_files?: string[];
+  affected_symbols?: string[];
+  agent_id?: string;
+  commit_hash?: string;
+}
+
+export interface DecideResult {
+  id: string;
+  timestamp: string;
+  conflicts?: { id: string; summary: string }[];
+}
+
+/** One decideBatch() item: the new decision, or why it was rejected. */
+export type DecideBatchResult = DecideResult | BatchItemError;
+
+/** Check required fields. Throws INVALID_INPUT. */
+function validateDecideInput(input: DecideInput): void {
+  if (!input.domain) {
+    throw new TwiningError("domain is required", "INVALID_INPUT");
+  }
+  if (!input.scope) {
+    throw new TwiningError("scope is required", "INVALID_INPUT");
+  }
+  if (!input.summary) {
+    throw new TwiningError("summary is required", "INVALID_INPUT");
+  }
+  if (!input.context) {
+    throw new TwiningError("context is required", "INVALID_INPUT");
+  }
+  if (!input.rationale) {
+    throw new TwiningError("rationale is required", "INVALID_INPUT");
+  }
+}
+
 export class DecisionEngine {
   private readonly decisionStore: DecisionStore;
   private readonly blackboardEngine: BlackboardEngine;
@@ -40,6 +98,7 @@ export class DecisionEngine {
   private readonly searchEngine: SearchEngine | null;
   private readonly graphPopulator: GraphAutoPopulator | null;
   private assemblyChecker?: (agentId: string) => boolean;
+  private embeddingQueue: EmbeddingQueue | null = null;
 
   constructor(
     decisionStore: DecisionStore,
@@ -64,14 +123,19 @@ export class DecisionEngine {
     this.assemblyChecker = checker;
   }
 
+  /** Inject background embedding queue so decide() never waits on inference. */
+  setEmbeddingQueue(queue: EmbeddingQueue): void {
+    this.embeddingQueue = queue;
+  }
+
   /**
-   * Sync a decision summary to .planning/STATE.md.
+   * Sync decision summaries to .planning/STATE.md.
    * Appends to the "### Decisions" section under "## Accumulated Context".
    * Never throws — planning sync failure must not prevent decide().
    * Uses direct fs calls because STATE.md is a GSD planning file, not Twining data.
    */
-  private syncToPlanning(summary: string): void {
-    if (!this.projectRoot) return;
+  private syncToPlanning(summaries: string[]): void {
+    if (!this.projectRoot || summaries.length === 0) return;
 
     try {
       const statePath = path.join(this.projectRoot, ".planning", "STATE.md");
@@ -107,8 +171,8 @@ export class DecisionEngine {
         insertAt--;
       }
 
-      const newLine = `- ${summary}`;
-      lines.splice(insertAt, 0, newLine);
+      const newLines = summaries.map((summary) => `- ${summary}`);
+      lines.splice(insertAt, 0, ...newLines);
 
       fs.writeFileSync(statePath, lines.join("\n"), "utf-8");
     } catch (error) {
@@ -121,98 +185,28 @@ export class DecisionEngine {
   }
 
   /** Record a decision with full rationale and conflict detection. */
-  async decide(input: {
-    domain: string;
-    scope: string;
-    summary: string;
-    context: string;
-    rationale: string;
-    constraints?: string[];
-    alternatives?: Array<{
-      option: string;
-      pros?: string[];
-      cons?: string[];
-      reason_rejected: string;
-    }>;
-    depends_on?: string[];
-    supersedes?: string;
-    confidence?: "high" | "medium" | "low";
-    reversible?: boolean;
-    affected_files?: string[];
-    affected_symbols?: string[];
-    agent_id?: string;
-    commit_hash?: string;
-  }): Promise<{
-    id: string;
-    timestamp: string;
-    conflicts?: { id: string; summary: string }[];
-  }> {
-    // Validate required fields
-    if (!input.domain) {
-      throw new TwiningError("domain is required", "INVALID_INPUT");
-    }
-    if (!input.scope) {
-      throw new TwiningError("scope is required", "INVALID_INPUT");
-    }
-    if (!input.summary) {
-      throw new TwiningError("summary is required", "INVALID_INPUT");
-    }
-    if (!input.context) {
-      throw new TwiningError("context is required", "INVALID_INPUT");
-    }
-    if (!input.rationale) {
-      throw new TwiningError("rationale is required", "INVALID_INPUT");
-    }
+  async decide(input: DecideInput): Promise<DecideResult> {
+    validateDecideInput(input);
 
     // If supersedes, mark old decision
     if (input.supersedes) {
       await this.decisionStore.updateStatus(input.supersedes, "superseded");
     }
 
-    // Conflict detection: scan for active decisions in same domain with overlapping scope
-    const index = await this.decisionStore.getIndex();
-    const conflicts = index.filter(
+    // Conflict detection: active decisions in same domain with overlapping scope
+    const overlapping = await this.decisionStore.getIndexByScope(input.scope, {
+      affected_files: false,
+      affected_symbols: false,
+    });
+    const conflicts = overlapping.filter(
       (entry) =>
         entry.domain === input.domain &&
-        (entry.scope.startsWith(input.scope) ||
-          input.scope.startsWith(entry.scope)) &&
         entry.status === "active" &&
         entry.summary !== input.summary,
     );
 
-    // Normalize alternatives: ensure pros/cons arrays exist
-    const alternatives = (input.alternatives ?? []).map((alt) => ({
-      option: alt.option,
-      pros: alt.pros ?? [],
-      cons: alt.cons ?? [],
-      reason_rejected: alt.reason_rejected,
-    }));
-
     // Create decision with defaults — provisional if conflicts found
-    // Check if agent assembled context before making this decision
-    const agentId = input.agent_id ?? "main";
-    const assembledBefore = this.assemblyChecker
-      ? this.assemblyChecker(agentId)
-      : undefined;
-
-    const decision = await this.decisionStore.create({
-      agent_id: agentId,
-      domain: input.domain,
-      scope: input.scope,
-      summary: input.summary,
-      context: input.context,
-      rationale: input.rationale,
-      constraints: input.constraints ?? [],
-      alternatives,
-      depends_on: input.depends_on ?? [],
-      supersedes: input.supersedes,
-      confidence: (input.confidence ?? "medium") as DecisionConfidence,
-      reversible: input.reversible ?? true,
-      affected_files: input.affected_files ?? [],
-      affected_symbols: input.affected_symbols ?? [],
-      commit_hashes: input.commit_hash ? [input.commit_hash] : [],
-      ...(assembledBefore !== undefined ? { assembled_before: assembledBefore } : {}),
-    });
+    const decision = await this.decisionStore.create(this.toNewDecision(input));
 
     // If conflicts exist, mark new decision as provisional and post warning
     if (conflicts.length > 0) {
@@ -242,7 +236,13 @@ export class DecisionEngine {
     });
 
     // Generate embedding (Phase 2) — never let embedding failure prevent the decide
-    if (this.embedder && this.indexManager) {
+    if (this.embeddingQueue) {
+      this.embeddingQueue.enqueue(
+        "decisions",
+        decision.id,
+        decision.summary + " " + decision.rationale + " " + decision.context,
+      );
+    } else if (this.embedder && this.indexManager) {
       try {
         const text =
           decision.summary + " " + decision.rationale + " " + decision.context;
@@ -259,8 +259,13 @@ export class DecisionEngine {
       }
     }
 
+    // Keep the persistent keyword index current (best-effort)
+    if (this.searchEngine) {
+      await this.searchEngine.indexDecisions([decision]);
+    }
+
     // Sync decision summary to .planning/STATE.md (Phase 5 GSD bridge)
-    this.syncToPlanning(decision.summary);
+    await span("planning.sync", () => this.syncToPlanning([decision.summary]));
 
     // Auto-populate knowledge graph (delegated to GraphAutoPopulator)
     if (this.graphPopulator) {
@@ -278,11 +283,7 @@ export class DecisionEngine {
       );
     }
 
-    const result: {
-      id: string;
-      timestamp: string;
-      conflicts?: { id: string; summary: string }[];
-    } = { id: decision.id, timestamp: decision.timestamp };
+    const result: DecideResult = { id: decision.id, timestamp: decision.timestamp };
 
     if (conflicts.length > 0) {
       result.conflicts = conflicts.map((c) => ({
@@ -294,6 +295,217 @@ export class DecisionEngine {
     return result;
   }
 
+  /**
+   * Record several decisions at once. Conflicts are found against one read
+   * of the index, through its scope lookups, and against earlier decisions
+   * in the same batch, through a scope index of the batch. The decisions
+   * and the ones they supersede are written under one index lock in one
+   * log append, their warnings and cross-posts go to the blackboard as one
+   * batch, and the graph and embeddings are updated once for the lot.
+   * Results come back in input order; an invalid item gets an error in
+   * its slot.
+   */
+  async decideBatch(inputs: DecideInput[]): Promise<DecideBatchResult[]> {
+    const results: DecideBatchResult[] = new Array(inputs.length);
+    const valid: Array<{ index: number; input: DecideInput }> = [];
+    inputs.forEach((input, index) => {
+      try {
+        validateDecideInput(input);
+        valid.push({ index, input });
+      } catch (e) {
+        results[index] = batchItemError(e);
+      }
+    });
+    if (valid.length === 0) return results;
+
+    // Superseded with the new decisions' write; conflict detection
+    // treats them as superseded already
+    const supersede = new Set<string>();
+    for (const { input } of valid) {
+      if (input.supersedes) supersede.add(input.supersedes);
+    }
+
+    // Conflict detection: active decisions in the same domain with an
+    // overlapping scope, already recorded or earlier in this batch
+    // (referenced by batch position until they have IDs)
+    const conflicts = valid.map(() => [] as Array<{ id: string; summary: string } | number>);
+    const overlapping = await this.decisionStore.getIndexByScopes(
+      valid.map(({ input }) => input.scope),
+      { affected_files: false, affected_symbols: false },
+    );
+    const batchScopes = new ScopeIndex<number>();
+    for (let i = 0; i < valid.length; i++) {
+      const input = valid[i]!.input;
+      for (const entry of overlapping[i]!) {
+        if (
+          entry.domain === input.domain &&
+          entry.status === "active" &&
+          !supersede.has(entry.id) &&
+          entry.summary !== input.summary
+        ) {
+          conflicts[i]!.push({ id: entry.id, summary: entry.summary });
+        }
+      }
+      const earlierOverlapping = [...batchScopes.match(input.scope)].sort((a, b) => a - b);
+      for (const j of earlierOverlapping) {
+        const earlier = valid[j]!.input;
+        if (
+          conflicts[j]!.length === 0 &&
+          earlier.domain === input.domain &&
+          earlier.summary !== input.summary
+        ) {
+          conflicts[i]!.push(j);
+        }
+      }
+      batchScopes.add(input.scope, i);
+    }
+
+    // Conflicting decisions start out provisional
+    const decisions = await this.decisionStore.createBatch(
+      valid.map(({ input }, i) => ({
+        ...this.toNewDecision(input),
+        ...(conflicts[i]!.length > 0 ? { status: "provisional" as const } : {}),
+      })),
+      { supersede: [...supersede] },
+    );
+    const found = conflicts.map((list) =>
+      list.map((c) =>
+        typeof c === "number"
+          ? { id: decisions[c]!.id, summary: decisions[c]!.summary }
+          : c,
+      ),
+    );
+
+    // Conflict warnings and cross-posts, as one blackboard batch
+    const posts: PostInput[] = [];
+    decisions.forEach((decision, i) => {
+      const conflicting = found[i]!;
+      if (conflicting.length > 0) {
+        const conflictDetails = conflicting
+          .map((c) => `- ${c.id}: "${c.summary}"`)
+          .join("\n");
+        posts.push({
+          entry_type: "warning",
+          summary: `Potential conflict: new decision may conflict with ${conflicting.length} existing decision(s)`,
+          detail: `New decision "${decision.summary}" conflicts with:\n${conflictDetails}`,
+          tags: [decision.domain],
+          scope: decision.scope,
+          agent_id: decision.agent_id,
+        });
+      }
+      posts.push({
+        entry_type: "decision",
+        summary: decision.summary,
+        detail: decision.rationale,
+        tags: [decision.domain],
+        scope: decision.scope,
+        agent_id: decision.agent_id,
+        _internal: true,
+      });
+    });
+    await this.blackboardEngine.postBatch(posts);
+
+    // Generate embeddings (Phase 2) — never let embedding failure prevent the decide
+    const texts = decisions.map(
+      (decision) => decision.summary + " " + decision.rationale + " " + decision.context,
+    );
+    if (this.embeddingQueue) {
+      const queue = this.embeddingQueue;
+      decisions.forEach((decision, i) => queue.enqueue("decisions", decision.id, texts[i]!));
+    } else if (this.embedder && this.indexManager) {
+      try {
+        const vectors = await this.embedder.embedBatch(texts);
+        const embedded: { id: string; vector: number[] }[] = [];
+        vectors.forEach((vector, i) => {
+          if (vector) embedded.push({ id: decisions[i]!.id, vector });
+        });
+        await this.indexManager.addEntries("decisions", embedded);
+      } catch (error) {
+        // Silent failure — embedding is best-effort
+        console.error(
+          "[twining] Decision embedding generation failed (non-fatal):",
+          error,
+        );
+      }
+    }
+
+    // Keep the persistent keyword index current (best-effort)
+    if (this.searchEngine) {
+      await this.searchEngine.indexDecisions(decisions);
+    }
+
+    // Sync decision summaries to .planning/STATE.md (Phase 5 GSD bridge)
+    await span("planning.sync", () =>
+      this.syncToPlanning(decisions.map((decision) => decision.summary)),
+    );
+
+    // Auto-populate knowledge graph as one batch
+    if (this.graphPopulator) {
+      await this.graphPopulator.onDecideBatch(
+        decisions.map((decision, i) => {
+          const input = valid[i]!.input;
+          return {
+            input: {
+              affected_files: decision.affected_files,
+              affected_symbols: decision.affected_symbols,
+              depends_on: input.depends_on,
+              supersedes: input.supersedes,
+              commit_hash: input.commit_hash,
+              scope: decision.scope,
+              summary: decision.summary,
+            },
+            decisionId: decision.id,
+          };
+        }),
+      );
+    }
+
+    decisions.forEach((decision, i) => {
+      const result: DecideResult = { id: decision.id, timestamp: decision.timestamp };
+      if (found[i]!.length > 0) result.conflicts = found[i];
+      results[valid[i]!.index] = result;
+    });
+    return results;
+  }
+
+  /** Apply defaults to a validated decide input. */
+  private toNewDecision(
+    input: DecideInput,
+  ): Omit<Decision, "id" | "timestamp" | "status"> {
+    // Normalize alternatives: ensure pros/cons arrays exist
+    const alternatives = (input.alternatives ?? []).map((alt) => ({
+      option: alt.option,
+      pros: alt.pros ?? [],
+      cons: alt.cons ?? [],
+      reason_rejected: alt.reason_rejected,
+    }));
+
+    // Check if agent assembled context before making this decision
+    const agentId = input.agent_id ?? "main";
+    const assembledBefore = this.assemblyChecker
+      ? this.assemblyChecker(agentId)
+      : undefined;
+
+    return {
+      agent_id: agentId,
+      domain: input.domain,
+      scope: input.scope,
+      summary: input.summary,
+      context: input.context,
+      rationale: input.rationale,
+      constraints: input.constraints ?? [],
+      alternatives,
+      depends_on: input.depends_on ?? [],
+      supersedes: input.supersedes,
+      confidence: (input.confidence ?? "medium") as DecisionConfidence,
+      reversible: input.reversible ?? true,
+      affected_files: input.affected_files ?? [],
+      affected_symbols: input.affected_symbols ?? [],
+      commit_hashes: input.commit_hash ? [input.commit_hash] : [],
+      ...(assembledBefore !== undefined ? { assembled_before: assembledBefore } : {}),
+    };
+  }
+
   /** Retrieve decision chain for a scope or file. */
   async why(scope: string): Promise<{
     decisions: Array<{
@@ -416,9 +628,8 @@ export class DecisionEngine {
     // Load all decisions to build the dependency maps
     const index = await this.decisionStore.getIndex();
     const decisions = new Map<string, Decision>();
-    for (const entry of index) {
-      const d = await this.decisionStore.get(entry.id);
-      if (d) decisions.set(d.id, d);
+    for (const d of await this.decisionStore.getMany(index.map((e) => e.id))) {
+      decisions.set(d.id, d);
     }
 
     // Build reverse dependency map: parentId -> [childIds that depend on parent]
@@ -510,9 +721,8 @@ export class DecisionEngine {
     // Check for downstream dependents
     const index = await this.decisionStore.getIndex();
     const downstreamIds: string[] = [];
-    for (const entry of index) {
-      const d = await this.decisionStore.get(entry.id);
-      if (d && d.depends_on.includes(decisionId)) {
+    for (const d of await this.decisionStore.getMany(index.map((e) => e.id))) {
+      if (d.depends_on.includes(decisionId)) {
         downstreamIds.push(d.id);
       }
     }
@@ -680,7 +890,7 @@ export class DecisionEngine {
 
   /**
    * Search decisions across all scopes by keyword or semantic similarity.
-   * Supports filtering by domain, status, and confidence.
+   * Supports filtering by domain, status, confidence, and scope.
    * Never throws — returns empty results on error.
    */
   async searchDecisions(
@@ -689,6 +899,7 @@ export class DecisionEngine {
       domain?: string;
       status?: DecisionStatus;
       confidence?: DecisionConfidence;
+      scope?: string;
     },
     limit?: number,
   ): Promise<{
@@ -713,42 +924,27 @@ export class DecisionEngine {
         return { results: [], total_matched: 0, fallback_mode: true };
       }
 
-      // Load index and apply filters before loading full decision files
-      const index = await this.decisionStore.getIndex();
-      let filtered = index;
-
-      if (filters?.domain) {
-        filtered = filtered.filter(
-          (entry) => entry.domain === filters.domain,
-        );
-      }
-      if (filters?.status) {
-        filtered = filtered.filter(
-          (entry) => entry.status === filters.status,
-        );
-      }
-      if (filters?.confidence) {
-        filtered = filtered.filter(
-          (entry) => entry.confidence === filters.confidence,
-        );
-      }
-
-      if (filtered.length === 0) {
-        return { results: [], total_matched: 0, fallback_mode: true };
-      }
-
-      // Load full Decision objects for filtered entries
-      const decisions: Decision[] = [];
-      for (const entry of filtered) {
-        const d = await this.decisionStore.get(entry.id);
-        if (d) decisions.push(d);
-      }
-
-      // Delegate to SearchEngine if available
+      // Filter on index entries, so no decision file is read to be rejected
+      const inScope = filters?.scope
+        ? new Set(
+            (
+              await this.decisionStore.getIndexByScope(filters.scope, {
+                affected_symbols: false,
+              })
+            ).map((entry) => entry.id),
+          )
+        : null;
+      const accept = (entry: DecisionIndexEntry): boolean =>
+        (!inScope || inScope.has(entry.id)) &&
+        (!filters?.domain || entry.domain === filters.domain) &&
+        (!filters?.status || entry.status === filters.status) &&
+        (!filters?.confidence || entry.confidence === filters.confidence);
+
+      // Delegate to SearchEngine if available; it loads only the hits
       if (this.searchEngine) {
         const searchResults = await this.searchEngine.searchDecisions(
           query,
-          decisions,
+          await this.decisionStore.searchCandidates(accept),
           { limit: maxResults },
         );
         return {
@@ -768,6 +964,14 @@ export class DecisionEngine {
         };
       }
 
+      const filtered = (await this.decisionStore.getIndex()).filter(accept);
+      if (filtered.length === 0) {
+        return { results: [], total_matched: 0, fallback_mode: true };
+      }
+      const decisions = await this.decisionStore.getMany(
+        filtered.map((entry) => entry.id),
+      );
+
       // Keyword fallback: manual keyword matching
       const queryTerms = query
         .toLowerCase()
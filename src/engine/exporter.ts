@@ -36,9 +36,7 @@ export class Exporter {
   async exportMarkdown(
     scope?: string,
   ): Promise<{ markdown: string; stats: ExportStats }> {
-    // Load all data
-    const { entries: allEntries } = await this.blackboardStore.read();
-    const allIndex = await this.decisionStore.getIndex();
+    // Load graph data (blackboard and decisions are loaded per scope below)
     const allEntities = await this.graphStore.getEntities();
     const allRelations = await this.graphStore.getRelations();
 
@@ -50,24 +48,15 @@ export class Exporter {
 
     if (scope) {
       // Blackboard: bidirectional prefix match
-      entries = allEntries.filter(
-        (e) => e.scope.startsWith(scope) || scope.startsWith(e.scope),
-      );
+      ({ entries } = await this.blackboardStore.read({ scope }));
 
       // Decisions: filter index by scope prefix match or affected_files prefix match
-      const matchingIndex = allIndex.filter(
-        (e) =>
-          e.scope.startsWith(scope) ||
-          scope.startsWith(e.scope) ||
-          e.affected_files.some(
-            (f) => f.startsWith(scope) || scope.startsWith(f),
-          ),
+      const matchingIndex = await this.decisionStore.getIndexByScope(scope, {
+        affected_symbols: false,
+      });
+      decisions = await this.decisionStore.getMany(
+        matchingIndex.map((e) => e.id),
       );
-      decisions = [];
-      for (const entry of matchingIndex) {
-        const decision = await this.decisionStore.get(entry.id);
-        if (decision) decisions.push(decision);
-      }
 
       // Graph: entities where name or any property value contains the scope substring
       entities = allEntities.filter(
@@ -82,13 +71,10 @@ export class Exporter {
           includedEntityIds.has(r.source) || includedEntityIds.has(r.target),
       );
     } else {
-      entries = allEntries;
+      ({ entries } = await this.blackboardStore.read());
       // Load all full decisions
-      decisions = [];
-      for (const entry of allIndex) {
-        const decision = await this.decisionStore.get(entry.id);
-        if (decision) decisions.push(decision);
-      }
+      const allIndex = await this.decisionStore.getIndex();
+      decisions = await this.decisionStore.getMany(allIndex.map((e) => e.id));
       entities = allEntities;
       relations = allRelations;
     }
@@ -2,9 +2,13 @@
  * GraphAutoPopulator — auto-extracts entities and relations from tool calls.
  * Each method is independently try/catch wrapped — failures are logged but never propagated.
  * The graph is an optimization layer, not a correctness requirement.
+ * Each tool call is written as a single graph batch (one lock, one append);
+ * relations whose endpoints don't resolve are skipped and logged.
  */
 import type { GraphEngine } from "./graph.js";
-import type { BlackboardEntry, Entity, Relation } from "../utils/types.js";
+import type { GraphMutation } from "../storage/graph-store.js";
+import type { BlackboardEntry, Entity } from "../utils/types.js";
+import { span } from "../utils/tracing.js";
 
 /** Determine if a scope looks like a file path (contains / and has a file extension). */
 function isFileLikeScope(scope: string): boolean {
@@ -16,6 +20,171 @@ function isDirectoryLikeScope(scope: string): boolean {
   return scope.includes("/") && !isFileLikeScope(scope);
 }
 
+/** What onDecide needs to know about a decision. */
+export interface DecideGraphInput {
+  affected_files?: string[];
+  affected_symbols?: string[];
+  depends_on?: string[];
+  supersedes?: string;
+  commit_hash?: string;
+  scope: string;
+  summary: string;
+}
+
+/** Graph mutations for a new decision. */
+function decideMutations(input: DecideGraphInput, decisionId: string): GraphMutation[] {
+  // Concept entity for the decision itself
+  const batch: GraphMutation[] = [
+    {
+      kind: "entity",
+      name: decisionId,
+      type: "concept",
+      properties: { summary: input.summary, scope: input.scope },
+    },
+  ];
+
+  // File entities with decided_by relations
+  for (const filePath of input.affected_files ?? []) {
+    batch.push(
+      {
+        kind: "entity",
+        name: filePath,
+        type: "file",
+        properties: { scope: input.scope },
+      },
+      {
+        kind: "relation",
+        source: filePath,
+        target: decisionId,
+        type: "decided_by",
+        properties: { decision_summary: input.summary },
+      },
+    );
+  }
+
+  // Symbol entities with decided_by relations
+  for (const symbol of input.affected_symbols ?? []) {
+    batch.push(
+      {
+        kind: "entity",
+        name: symbol,
+        type: "function",
+        properties: { scope: input.scope },
+      },
+      {
+        kind: "relation",
+        source: symbol,
+        target: decisionId,
+        type: "decided_by",
+        properties: { decision_summary: input.summary },
+      },
+    );
+  }
+
+  // depends_on relations between decision concept nodes
+  for (const depId of input.depends_on ?? []) {
+    batch.push({
+      kind: "relation",
+      source: decisionId,
+      target: depId,
+      type: "depends_on",
+    });
+  }
+
+  // supersedes relation
+  if (input.supersedes) {
+    batch.push({
+      kind: "relation",
+      source: decisionId,
+      target: input.supersedes,
+      type: "supersedes",
+    });
+  }
+
+  // commit entity with decided_by relation
+  if (input.commit_hash) {
+    batch.push(
+      {
+        kind: "entity",
+        name: input.commit_hash,
+        type: "commit",
+        properties: { decision: decisionId },
+      },
+      {
+        kind: "relation",
+        source: input.commit_hash,
+        target: decisionId,
+        type: "decided_by",
+      },
+    );
+  }
+
+  return batch;
+}
+
+/** Graph mutations for a new blackboard entry; none for project-wide posts. */
+function postMutations(entry: BlackboardEntry): GraphMutation[] {
+  const scope = entry.scope;
+  if (!scope || scope === "project") return [];
+
+  // Scope entity
+  let scopeType: Entity["type"];
+  if (isFileLikeScope(scope)) {
+    scopeType = "file";
+  } else if (isDirectoryLikeScope(scope)) {
+    scopeType = "module";
+  } else {
+    return [];
+  }
+  const batch: GraphMutation[] = [
+    {
+      kind: "entity",
+      name: scope,
+      type: scopeType,
+      properties: { entry_type: entry.entry_type },
+    },
+  ];
+
+  // Warning or finding → affects relation
+  if (entry.entry_type === "warning" || entry.entry_type === "finding") {
+    // Create a concept entity for the warning/finding
+    const conceptName = `${entry.entry_type}:${entry.id}`;
+    batch.push(
+      {
+        kind: "entity",
+        name: conceptName,
+        type: "concept",
+        properties: { summary: entry.summary, entry_type: entry.entry_type },
+      },
+      {
+        kind: "relation",
+        source: conceptName,
+        target: scope,
+        type: "affects",
+        properties: { summary: entry.summary },
+      },
+    );
+  }
+
+  // relates_to → related_to relations between scope entities
+  if (entry.relates_to && entry.relates_to.length > 0) {
+    // We create related_to relations from this entry's scope to related entries' scopes
+    // We can't look up the related entries here (no blackboard access), but we create
+    // relations using the entry IDs as potential entity names
+    for (const relatedId of entry.relates_to) {
+      batch.push({
+        kind: "relation",
+        source: scope,
+        target: relatedId,
+        type: "related_to",
+        properties: { via: entry.id },
+      });
+    }
+  }
+
+  return batch;
+}
+
 export class GraphAutoPopulator {
   constructor(private readonly graphEngine: GraphEngine) {}
 
@@ -25,92 +194,28 @@ export class GraphAutoPopulator {
    * function entities for affected_symbols, decided_by relations,
    * depends_on relations, supersedes relation, commit entity.
    */
-  async onDecide(
-    input: {
-      affected_files?: string[];
-      affected_symbols?: string[];
-      depends_on?: string[];
-      supersedes?: string;
-      commit_hash?: string;
-      scope: string;
-      summary: string;
-    },
-    decisionId: string,
-  ): Promise<void> {
+  async onDecide(input: DecideGraphInput, decisionId: string): Promise<void> {
     try {
-      // Create concept entity for the decision itself
-      const decisionEntity = await this.graphEngine.addEntity({
-        name: decisionId,
-        type: "concept",
-        properties: { summary: input.summary, scope: input.scope },
-      });
-
-      // File entities with decided_by relations
-      for (const filePath of input.affected_files ?? []) {
-        const entity = await this.graphEngine.addEntity({
-          name: filePath,
-          type: "file",
-          properties: { scope: input.scope },
-        });
-        await this.graphEngine.addRelation({
-          source: entity.name,
-          target: decisionEntity.name,
-          type: "decided_by",
-          properties: { decision_summary: input.summary },
-        });
-      }
-
-      // Symbol entities with decided_by relations
-      for (const symbol of input.affected_symbols ?? []) {
-        const entity = await this.graphEngine.addEntity({
-          name: symbol,
-          type: "function",
-          properties: { scope: input.scope },
-        });
-        await this.graphEngine.addRelation({
-          source: entity.name,
-          target: decisionEntity.name,
-          type: "decided_by",
-          properties: { decision_summary: input.summary },
-        });
-      }
-
-      // depends_on relations between decision concept nodes
-      for (const depId of input.depends_on ?? []) {
-        await this.graphEngine.addRelation({
-          source: decisionId,
-          target: depId,
-          type: "depends_on",
-        });
-      }
-
-      // supersedes relation
-      if (input.supersedes) {
-        await this.graphEngine.addRelation({
-          source: decisionId,
-          target: input.supersedes,
-          type: "supersedes",
-        });
-      }
-
-      // commit entity with decided_by relation
-      if (input.commit_hash) {
-        await this.graphEngine.addEntity({
-          name: input.commit_hash,
-          type: "commit",
-          properties: { decision: decisionId },
-        });
-        await this.graphEngine.addRelation({
-          source: input.commit_hash,
-          target: decisionId,
-          type: "decided_by",
-        });
-      }
+      await this.apply("onDecide", decideMutations(input, decisionId));
     } catch (error) {
       console.error("[twining] GraphAutoPopulator.onDecide failed (non-fatal):", error);
     }
   }
 
+  /** onDecide for several decisions, written as one graph batch. */
+  async onDecideBatch(
+    decisions: Array<{ input: DecideGraphInput; decisionId: string }>,
+  ): Promise<void> {
+    try {
+      await this.apply(
+        "onDecideBatch",
+        decisions.flatMap(({ input, decisionId }) => decideMutations(input, decisionId)),
+      );
+    } catch (error) {
+      console.error("[twining] GraphAutoPopulator.onDecideBatch failed (non-fatal):", error);
+    }
+  }
+
   /**
    * Auto-populate from twining_post.
    * Creates scope entities (file or module), relates_to relations,
@@ -118,62 +223,25 @@ export class GraphAutoPopulator {
    */
   async onPost(entry: BlackboardEntry): Promise<void> {
     try {
-      const scope = entry.scope;
-      if (!scope || scope === "project") return;
-
-      // Create scope entity
-      let scopeEntity: Entity | undefined;
-      if (isFileLikeScope(scope)) {
-        scopeEntity = await this.graphEngine.addEntity({
-          name: scope,
-          type: "file",
-          properties: { entry_type: entry.entry_type },
-        });
-      } else if (isDirectoryLikeScope(scope)) {
-        scopeEntity = await this.graphEngine.addEntity({
-          name: scope,
-          type: "module",
-          properties: { entry_type: entry.entry_type },
-        });
-      }
-
-      if (!scopeEntity) return;
-
-      // Warning or finding → affects relation
-      if (entry.entry_type === "warning" || entry.entry_type === "finding") {
-        // Create a concept entity for the warning/finding
-        const conceptEntity = await this.graphEngine.addEntity({
-          name: `${entry.entry_type}:${entry.id}`,
-          type: "concept",
-          properties: { summary: entry.summary, entry_type: entry.entry_type },
-        });
-        await this.graphEngine.addRelation({
-          source: conceptEntity.name,
-          target: scopeEntity.name,
-          type: "affects",
-          properties: { summary: entry.summary },
-        });
-      }
-
-      // relates_to → related_to relations between scope entities
-      if (entry.relates_to && entry.relates_to.length > 0) {
-        // We create related_to relations from this entry's scope to related entries' scopes
-        // We can't look up the related entries here (no blackboard access), but we create
-        // relations using the entry IDs as potential entity names
-        for (const relatedId of entry.relates_to) {
-          await this.graphEngine.addRelation({
-            source: scopeEntity.name,
-            target: relatedId,
-            type: "related_to",
-            properties: { via: entry.id },
-          });
-        }
-      }
+      const batch = postMutations(entry);
+      if (batch.length === 0) return;
+      await this.apply("onPost", batch);
     } catch (error) {
       console.error("[twining] GraphAutoPopulator.onPost failed (non-fatal):", error);
     }
   }
 
+  /** onPost for several entries, written as one graph batch. */
+  async onPostBatch(entries: BlackboardEntry[]): Promise<void> {
+    try {
+      const batch = entries.flatMap(postMutations);
+      if (batch.length === 0) return;
+      await this.apply("onPostBatch", batch);
+    } catch (error) {
+      console.error("[twining] GraphAutoPopulator.onPostBatch failed (non-fatal):", error);
+    }
+  }
+
   /**
    * Auto-populate from twining_handoff.
    * Creates agent entities, handoff relation, file entities for artifacts,
@@ -187,39 +255,42 @@ export class GraphAutoPopulator {
   }): Promise<void> {
     try {
       // Source agent entity
-      const sourceEntity = await this.graphEngine.addEntity({
-        name: input.source_agent,
-        type: "agent",
-      });
+      const batch: GraphMutation[] = [
+        { kind: "entity", name: input.source_agent, type: "agent" },
+      ];
 
       // Target agent entity + handoff relation
       if (input.target_agent) {
-        const targetEntity = await this.graphEngine.addEntity({
-          name: input.target_agent,
-          type: "agent",
-        });
-        await this.graphEngine.addRelation({
-          source: sourceEntity.name,
-          target: targetEntity.name,
-          type: "related_to",
-          properties: { type: "handoff" },
-        });
+        batch.push(
+          { kind: "entity", name: input.target_agent, type: "agent" },
+          {
+            kind: "relation",
+            source: input.source_agent,
+            target: input.target_agent,
+            type: "related_to",
+            properties: { type: "handoff" },
+          },
+        );
       }
 
       // Artifact file entities with produces relations
       if (input.results) {
         for (const result of input.results) {
           for (const artifact of result.artifacts ?? []) {
-            await this.graphEngine.addEntity({
-              name: artifact,
-              type: "file",
-              properties: { produced_by: input.source_agent },
-            });
-            await this.graphEngine.addRelation({
-              source: input.source_agent,
-              target: artifact,
-              type: "produces",
-            });
+            batch.push(
+              {
+                kind: "entity",
+                name: artifact,
+                type: "file",
+                properties: { produced_by: input.source_agent },
+              },
+              {
+                kind: "relation",
+                source: input.source_agent,
+                target: artifact,
+                type: "produces",
+              },
+            );
           }
         }
       }
@@ -230,17 +301,19 @@ export class GraphAutoPopulator {
         if (isFileLikeScope(input.scope)) {
           scopeType = "file";
         }
-        const scopeEntity = await this.graphEngine.addEntity({
-          name: input.scope,
-          type: scopeType,
-        });
-        await this.graphEngine.addRelation({
-          source: input.source_agent,
-          target: scopeEntity.name,
-          type: "affects",
-          properties: { via: "handoff" },
-        });
+        batch.push(
+          { kind: "entity", name: input.scope, type: scopeType },
+          {
+            kind: "relation",
+            source: input.source_agent,
+            target: input.scope,
+            type: "affects",
+            properties: { via: "handoff" },
+          },
+        );
       }
+
+      await this.apply("onHandoff", batch);
     } catch (error) {
       console.error("[twining] GraphAutoPopulator.onHandoff failed (non-fatal):", error);
     }
@@ -252,16 +325,20 @@ export class GraphAutoPopulator {
    */
   async onLinkCommit(decisionId: string, commitHash: string): Promise<void> {
     try {
-      await this.graphEngine.addEntity({
-        name: commitHash,
-        type: "commit",
-        properties: { decision: decisionId },
-      });
-      await this.graphEngine.addRelation({
-        source: commitHash,
-        target: decisionId,
-        type: "decided_by",
-      });
+      await this.apply("onLinkCommit", [
+        {
+          kind: "entity",
+          name: commitHash,
+          type: "commit",
+          properties: { decision: decisionId },
+        },
+        {
+          kind: "relation",
+          source: commitHash,
+          target: decisionId,
+          type: "decided_by",
+        },
+      ]);
     } catch (error) {
       console.error("[twining] GraphAutoPopulator.onLinkCommit failed (non-fatal):", error);
     }
@@ -305,18 +382,30 @@ export class GraphAutoPopulator {
   ): Promise<void> {
     try {
       // Ensure agent entity exists
-      await this.graphEngine.addEntity({
-        name: agentId,
-        type: "agent",
-      });
-      await this.graphEngine.addRelation({
-        source: agentId,
-        target: decisionId,
-        type: "challenged",
-        properties: { action },
-      });
+      await this.apply("onChallenge", [
+        { kind: "entity", name: agentId, type: "agent" },
+        {
+          kind: "relation",
+          source: agentId,
+          target: decisionId,
+          type: "challenged",
+          properties: { action },
+        },
+      ]);
     } catch (error) {
       console.error("[twining] GraphAutoPopulator.onChallenge failed (non-fatal):", error);
     }
   }
+
+  /** Write one hook's mutations as a single batch, logging skipped relations. */
+  private async apply(hook: string, batch: GraphMutation[]): Promise<void> {
+    const { skipped } = await span(
+      "graph.populate",
+      () => this.graphEngine.applyBatch(batch, { skip_unresolved: true }),
+      { hook, mutations: batch.length },
+    );
+    for (const error of skipped) {
+      console.error(`[twining] GraphAutoPopulator.${hook} skipped relation (non-fatal):`, error.message);
+    }
+  }
 }
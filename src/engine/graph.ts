@@ -1,9 +1,14 @@
 /**
  * Knowledge graph engine.
  * Business logic for BFS neighbor traversal and substring entity queries.
- * Delegates storage operations to GraphStore.
+ * Delegates storage operations to GraphStore; traversals run directly on
+ * the store's cached CSR adjacency.
  */
-import type { GraphStore } from "../storage/graph-store.js";
+import type {
+  GraphBatchResult,
+  GraphMutation,
+  GraphStore,
+} from "../storage/graph-store.js";
 import type { Entity, Relation, TestCoverageResult } from "../utils/types.js";
 import { TwiningError } from "../utils/errors.js";
 
@@ -54,6 +59,19 @@ export class GraphEngine {
     return this.graphStore.addRelation(input);
   }
 
+  /** Generation of the underlying graph store; changes on every graph write. */
+  async generation(): Promise<number> {
+    return this.graphStore.generation();
+  }
+
+  /** Delegate a batch of entity upserts and relations to store. */
+  async applyBatch(
+    mutations: GraphMutation[],
+    options?: { skip_unresolved?: boolean },
+  ): Promise<GraphBatchResult> {
+    return this.graphStore.applyBatch(mutations, options);
+  }
+
   /**
    * BFS neighbor traversal from a center entity.
    * Traverses both outgoing and incoming relations.
@@ -74,66 +92,43 @@ export class GraphEngine {
     }
 
     const maxDepth = Math.min(Math.max(depth ?? 1, 1), 3);
-    const relations = await this.graphStore.getRelations();
-    const entities = await this.graphStore.getEntities();
-
-    // Build entity lookup map
-    const entityMap = new Map<string, Entity>();
-    for (const e of entities) {
-      entityMap.set(e.id, e);
-    }
+    const adjacency = await this.graphStore.getAdjacency();
+    const entityMap = await this.graphStore.getEntityMap();
 
     // Filter relations by type if specified
-    const filteredRelations = relationTypes
-      ? relations.filter((r) => relationTypes.includes(r.type))
-      : relations;
-
-    // Build adjacency list: entityId -> [{neighborId, relation, direction}]
-    const adjacency = new Map<
-      string,
-      { neighborId: string; relation: Relation; direction: RelationDirection }[]
-    >();
-
-    for (const rel of filteredRelations) {
-      // Outgoing: source -> target
-      if (!adjacency.has(rel.source)) adjacency.set(rel.source, []);
-      adjacency.get(rel.source)!.push({
-        neighborId: rel.target,
-        relation: rel,
-        direction: "outgoing",
-      });
-
-      // Incoming: target -> source
-      if (!adjacency.has(rel.target)) adjacency.set(rel.target, []);
-      adjacency.get(rel.target)!.push({
-        neighborId: rel.source,
-        relation: rel,
-        direction: "incoming",
-      });
-    }
-
-    // BFS
-    const visited = new Set<string>();
-    visited.add(center.id);
+    const mask = adjacency.typeMask(relationTypes);
+    const typeSet = relationTypes ? new Set(relationTypes) : undefined;
 
+    // BFS over the adjacency; cost is proportional to the edges visited
     const result: NeighborEntry[] = [];
-    let frontier = [center.id];
+    const start = adjacency.indexOf(center.id);
+    if (start === undefined) return { center, neighbors: result };
+
+    const visited = new Set<number>([start]);
+    let frontier = [start];
 
     for (let d = 0; d < maxDepth; d++) {
-      const nextFrontier: string[] = [];
-
-      for (const nodeId of frontier) {
-        const neighbors = adjacency.get(nodeId) ?? [];
-        for (const { neighborId, relation, direction } of neighbors) {
-          if (!visited.has(neighborId)) {
-            visited.add(neighborId);
-            const entity = entityMap.get(neighborId);
+      const nextFrontier: number[] = [];
+
+      for (const node of frontier) {
+        adjacency.forEachEdge(
+          node,
+          mask,
+          (neighbor, relation, incoming) => {
+            if (visited.has(neighbor)) return;
+            visited.add(neighbor);
+            const entity = entityMap.get(adjacency.idOf(neighbor));
             if (entity) {
-              result.push({ entity, relation, direction });
-              nextFrontier.push(neighborId);
+              result.push({
+                entity,
+                relation,
+                direction: incoming ? "incoming" : "outgoing",
+              });
+              nextFrontier.push(neighbor);
             }
-          }
-        }
+          },
+          typeSet,
+        );
       }
 
       frontier = nextFrontier;
@@ -181,36 +176,30 @@ export class GraphEngine {
   async getTestCoverage(
     decisions: Array<{ id: string; summary: string; affected_files: string[] }>,
   ): Promise<TestCoverageResult> {
-    const entities = await this.graphStore.getEntities();
-    const relations = await this.graphStore.getRelations();
-
-    // Build set of entity IDs that are sources in `tested_by` relations
-    const coveredEntityIds = new Set<string>();
-    for (const rel of relations) {
-      if (rel.type === "tested_by") {
-        coveredEntityIds.add(rel.source);
-      }
-    }
-
-    // Build name→entity lookup for matching affected files
-    const entityByName = new Map<string, Entity>();
-    for (const e of entities) {
-      entityByName.set(e.name, e);
-    }
+    const adjacency = await this.graphStore.getAdjacency();
+    const testedBy = adjacency.typeMask(["tested_by"]);
+
+    // An affected file is covered if its entity is the source of a
+    // `tested_by` relation (last entity wins when names collide)
+    const isCovered = async (filePath: string): Promise<boolean> => {
+      const entity = (await this.graphStore.getEntityByName(filePath)).at(-1);
+      if (!entity) return false;
+      const node = adjacency.indexOf(entity.id);
+      return node !== undefined && adjacency.hasOutgoing(node, testedBy);
+    };
 
     const uncovered: TestCoverageResult["uncovered"] = [];
     let coveredCount = 0;
 
     for (const decision of decisions) {
-      let isCovered = false;
+      let covered = false;
       for (const filePath of decision.affected_files) {
-        const entity = entityByName.get(filePath);
-        if (entity && coveredEntityIds.has(entity.id)) {
-          isCovered = true;
+        if (await isCovered(filePath)) {
+          covered = true;
           break;
         }
       }
-      if (isCovered) {
+      if (covered) {
         coveredCount++;
       } else {
         uncovered.push({
@@ -253,17 +242,10 @@ export class GraphEngine {
     dry_run: boolean;
   }> {
     const entities = await this.graphStore.getEntities();
-    const relations = await this.graphStore.getRelations();
-
-    // Find all entity IDs that participate in at least one relation
-    const connectedIds = new Set<string>();
-    for (const r of relations) {
-      connectedIds.add(r.source);
-      connectedIds.add(r.target);
-    }
+    const adjacency = await this.graphStore.getAdjacency();
 
-    // Find orphans
-    let orphans = entities.filter((e) => !connectedIds.has(e.id));
+    // Find orphans: entities that participate in no relation
+    let orphans = entities.filter((e) => adjacency.indexOf(e.id) === undefined);
     const total_orphans_found = orphans.length;
 
     // Filter by type if requested
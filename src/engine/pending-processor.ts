@@ -1,11 +1,12 @@
 /**
  * Processes pending posts and actions from `.twining/` on startup.
  * Reads `pending-posts.jsonl` and `pending-actions.jsonl`, processes each line,
- * then truncates the files. One failure doesn't block others.
+ * then truncates the files. One failure doesn't block others. Pending posts
+ * are replayed as a single batch.
  */
 import fs from "node:fs";
 import path from "node:path";
-import type { BlackboardEngine } from "./blackboard.js";
+import type { BlackboardEngine, PostInput } from "./blackboard.js";
 import type { Archiver } from "./archiver.js";
 
 interface PendingPost {
@@ -55,11 +56,12 @@ export class PendingProcessor {
       const content = fs.readFileSync(postsPath, "utf-8");
       const lines = content.split("\n").filter((l) => l.trim().length > 0);
 
+      const posts: PostInput[] = [];
       for (const line of lines) {
         try {
           const post = JSON.parse(line) as PendingPost;
-          await this.blackboardEngine.post({
-            entry_type: post.entry_type as "finding",
+          posts.push({
+            entry_type: post.entry_type,
             summary: post.summary,
             detail: post.detail ?? "",
             tags: post.tags ?? [],
@@ -67,7 +69,6 @@ export class PendingProcessor {
             agent_id: post.agent_id ?? "pending-processor",
             relates_to: post.relates_to,
           });
-          posts_processed++;
         } catch (error) {
           console.error(
             "[twining] Failed to process pending post (skipping):",
@@ -76,6 +77,22 @@ export class PendingProcessor {
         }
       }
 
+      // One batch: a single append, graph write and archive check
+      try {
+        for (const result of await this.blackboardEngine.postBatch(posts)) {
+          if ("error" in result) {
+            console.error(
+              "[twining] Failed to process pending post (skipping):",
+              result.error,
+            );
+          } else {
+            posts_processed++;
+          }
+        }
+      } catch (error) {
+        console.error("[twining] Failed to process pending posts:", error);
+      }
+
       // Truncate after processing
       fs.writeFileSync(postsPath, "");
     }
@@ -2,13 +2,29 @@
 /**
  * Twining MCP Server entry point.
  * Connects via stdio transport — never use console.log (corrupts JSON-RPC).
+ *
+ * With `daemon.enabled` in config the process is a thin relay to the
+ * project's shared state daemon instead; `--daemon` runs that daemon.
+ *
+ * Startup is ordered for time to first tool response: tools are
+ * registered and the transport connected before any state is read. The
+ * daemon, dashboard and telemetry modules are only loaded when used, and
+ * state loading and model warm-up start once the handshake completes.
  */
+import { performance } from "node:perf_hooks";
 import { StdioServerTransport } from "@modelcontextprotocol/sdk/server/stdio.js";
-import { createServer } from "./server.js";
-import { startDashboard, setupDashboardShutdown } from "./dashboard/http-server.js";
-import { TelemetryClient } from "./analytics/telemetry-client.js";
+import type { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
+import type { Transport } from "@modelcontextprotocol/sdk/shared/transport.js";
+import { createServer, PKG_VERSION, saveSnapshot, warmUp } from "./server.js";
+import type { TwiningServices } from "./server.js";
+import { loadConfig } from "./config.js";
+import { ensureInitialized } from "./storage/init.js";
+import { flushAppends } from "./storage/file-store.js";
+import type { DaemonHandle } from "./daemon/daemon-server.js";
 
 async function main(): Promise<void> {
+  const modulesLoaded = performance.now();
+
   // Parse --project argument, default to cwd
   let projectRoot = process.cwd();
   const projectArgIndex = process.argv.indexOf("--project");
@@ -16,16 +32,100 @@ async function main(): Promise<void> {
     projectRoot = process.argv[projectArgIndex + 1]!;
   }
 
-  const { server, metricsCollector, config } = createServer(projectRoot);
-  const transport = new StdioServerTransport();
-  await server.connect(transport);
+  if (process.argv.includes("--daemon")) {
+    await runDaemon(projectRoot);
+    return;
+  }
+
+  const twiningDir = ensureInitialized(projectRoot);
+  const config = loadConfig(twiningDir);
+  if (config.daemon?.enabled) {
+    const { connectOrSpawnDaemon, DaemonRelay } = await import("./daemon/daemon-client.js");
+    const socket = await connectOrSpawnDaemon(projectRoot, twiningDir, {
+      spawn_timeout_ms: config.daemon.spawn_timeout_ms,
+    });
+    if (socket) {
+      const relay = new DaemonRelay(process.stdin, process.stdout, socket, () =>
+        startLocal(projectRoot),
+      );
+      relay.start();
+      await relay.done;
+      return;
+    }
+    console.error("[twining] State daemon unavailable, running standalone (non-fatal)");
+  }
+
+  const { server, services } = createServer(projectRoot);
+  services.metricsCollector.markStartup("modules_loaded", modulesLoaded);
+  warmUpAfterHandshake(server, services);
+  await server.connect(new StdioServerTransport());
+  services.metricsCollector.markStartup("connected");
+  startBackground(projectRoot, services);
+}
+
+/** Serve the project's state to thin clients until idle. */
+async function runDaemon(projectRoot: string): Promise<void> {
+  const config = loadConfig(ensureInitialized(projectRoot));
+  const { startDaemon } = await import("./daemon/daemon-server.js");
+  const stop = (handle: DaemonHandle) => {
+    handle
+      .close()
+      .catch((err) => {
+        console.error("[twining] Daemon shutdown flush failed (non-fatal):", err);
+      })
+      .finally(() => process.exit(0));
+  };
+
+  const daemon: DaemonHandle | null = await startDaemon(projectRoot, {
+    idle_timeout_ms: config.daemon?.idle_timeout_ms,
+    onIdle: () => {
+      console.error("[twining] State daemon idle, exiting");
+      if (daemon) stop(daemon);
+    },
+  });
+  if (!daemon) {
+    // Another daemon won the race for this project
+    process.exit(0);
+  }
+  for (const signal of ["SIGTERM", "SIGINT"] as const) {
+    process.once(signal, () => stop(daemon));
+  }
+  startBackground(projectRoot, daemon.services, { shutdownHandlers: false });
+}
+
+/** Direct-file server for a relay whose daemon went away. */
+async function startLocal(projectRoot: string): Promise<Transport> {
+  const { InMemoryTransport } = await import("@modelcontextprotocol/sdk/inMemory.js");
+  const { server, services } = createServer(projectRoot);
+  warmUpAfterHandshake(server, services);
+  const [relaySide, serverSide] = InMemoryTransport.createLinkedPair();
+  await server.connect(serverSide);
+  startBackground(projectRoot, services);
+  return relaySide;
+}
+
+/** Load state and the embedding model once the client has its tool list. */
+function warmUpAfterHandshake(server: McpServer, services: TwiningServices): void {
+  server.server.oninitialized = () => {
+    services.metricsCollector.markStartup("initialized");
+    void warmUp(services);
+  };
+}
+
+/** Telemetry, shutdown flushing and the dashboard for a state-owning process. */
+function startBackground(
+  projectRoot: string,
+  services: TwiningServices,
+  options?: { shutdownHandlers?: boolean },
+): void {
+  const { metricsCollector, config, embeddingQueue } = services;
 
   // Initialize opt-in telemetry (fire-and-forget)
-  const telemetry = new TelemetryClient();
-  const pkgVersion = (server as unknown as { serverInfo?: { version?: string } })
-    .serverInfo?.version || "unknown";
-  telemetry.init(config.analytics, projectRoot, pkgVersion).then((enabled) => {
-    if (enabled) {
+  const telemetryClient = import("./analytics/telemetry-client.js").then(
+    ({ TelemetryClient }) => new TelemetryClient(),
+  );
+  telemetryClient.then(async (telemetry) => {
+    if (await telemetry.init(config.analytics, projectRoot, PKG_VERSION)) {
       metricsCollector.setTelemetryClient(telemetry);
 
       // Session summary every 5 minutes (unref so it doesn't keep process alive)
@@ -39,13 +139,31 @@ async function main(): Promise<void> {
     // Telemetry init failure is always non-fatal
   });
 
-  // Graceful shutdown for telemetry
+  // Graceful shutdown for telemetry, queued embeddings and buffered appends
   process.on("beforeExit", () => {
-    telemetry.shutdown().catch(() => {});
+    telemetryClient.then((telemetry) => telemetry.shutdown()).catch(() => {});
+    if (embeddingQueue.pendingCount() > 0) {
+      embeddingQueue.flush().catch(() => {});
+    }
+    flushAppends().catch(() => {});
   });
+  process.once("beforeExit", () => saveSnapshot(services));
+  if (options?.shutdownHandlers !== false) {
+    for (const signal of ["SIGTERM", "SIGINT"] as const) {
+      process.once(signal, () => {
+        saveSnapshot(services);
+        flushAppends()
+          .catch((err) => {
+            console.error("[twining] Append flush on shutdown failed (non-fatal):", err);
+          })
+          .finally(() => process.exit(0));
+      });
+    }
+  }
 
   // Start dashboard HTTP server (fire-and-forget — never blocks MCP)
-  startDashboard(projectRoot).then((result) => {
+  import("./dashboard/http-server.js").then(async ({ startDashboard, setupDashboardShutdown }) => {
+    const result = await startDashboard(projectRoot, { metricsCollector });
     if (result) {
       setupDashboardShutdown(result.server);
     }
@@ -2,14 +2,27 @@
  * MCP server creation with all tool registrations.
  * Creates stores, engines, and registers all tools.
  * Phase 3: Adds knowledge graph layer and lifecycle management.
+ *
+ * Building services and registering tools does no file I/O beyond the
+ * config, so a client gets its tool list without waiting on any store.
+ * Loading state and the embedding model is left to warmUp(), which runs
+ * in the background once the client has connected.
  */
 import { createRequire } from "node:module";
 import { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
 import { ensureInitialized } from "./storage/init.js";
 
 const require = createRequire(import.meta.url);
-const { version: PKG_VERSION } = require("../package.json") as { version: string };
+export const { version: PKG_VERSION } = require("../package.json") as {
+  version: string;
+};
 import { loadConfig } from "./config.js";
+import { configureAppends } from "./storage/file-store.js";
+import {
+  restoreStateSnapshot,
+  saveStateSnapshot,
+  type SnapshotSources,
+} from "./storage/state-snapshot.js";
 import { BlackboardStore } from "./storage/blackboard-store.js";
 import { DecisionStore } from "./storage/decision-store.js";
 import { GraphStore } from "./storage/graph-store.js";
@@ -24,6 +37,7 @@ import { PendingProcessor } from "./engine/pending-processor.js";
 import { Embedder } from "./embeddings/embedder.js";
 import { IndexManager } from "./embeddings/index-manager.js";
 import { SearchEngine } from "./embeddings/search.js";
+import { EmbeddingQueue } from "./embeddings/embedding-queue.js";
 import { registerBlackboardTools } from "./tools/blackboard-tools.js";
 import { registerDecisionTools } from "./tools/decision-tools.js";
 import { registerContextTools } from "./tools/context-tools.js";
@@ -41,23 +55,73 @@ import { createInstrumentedServer } from "./analytics/instrumented-server.js";
 import { TWINING_INSTRUCTIONS } from "./instructions.js";
 import { GraphAutoPopulator } from "./engine/graph-auto-populator.js";
 
-/**
- * Create and configure the Twining MCP server.
- * Auto-creates .twining/ directory on first use.
- */
 export interface ServerContext {
   server: McpServer;
   metricsCollector: MetricsCollector;
   twiningDir: string;
   config: import("./utils/types.js").TwiningConfig;
+  embeddingQueue: EmbeddingQueue;
+  services: TwiningServices;
+}
+
+/**
+ * Stores, engines and the embedding layer for one .twining/ directory.
+ * One set can back any number of MCP server instances — the state
+ * daemon shares a single set across all of its client connections.
+ */
+export interface TwiningServices {
+  twiningDir: string;
+  config: import("./utils/types.js").TwiningConfig;
+  blackboardStore: BlackboardStore;
+  decisionStore: DecisionStore;
+  graphStore: GraphStore;
+  agentStore: AgentStore;
+  blackboardEngine: BlackboardEngine;
+  decisionEngine: DecisionEngine;
+  graphEngine: GraphEngine;
+  graphPopulator: GraphAutoPopulator;
+  archiver: Archiver;
+  contextAssembler: ContextAssembler;
+  coordinationEngine: CoordinationEngine;
+  verifyEngine: VerifyEngine;
+  exporter: Exporter;
+  metricsCollector: MetricsCollector;
+  embedder: Embedder;
+  searchEngine: SearchEngine;
+  embeddingQueue: EmbeddingQueue;
+  pendingProcessor: PendingProcessor;
 }
 
+/**
+ * Create and configure the Twining MCP server.
+ * Auto-creates .twining/ directory on first use.
+ */
 export function createServer(projectRoot: string): ServerContext {
+  const services = createServices(projectRoot);
+  return {
+    server: createMcpServer(services),
+    metricsCollector: services.metricsCollector,
+    twiningDir: services.twiningDir,
+    config: services.config,
+    embeddingQueue: services.embeddingQueue,
+    services,
+  };
+}
+
+/**
+ * Build the stores and engines for a project.
+ * Auto-creates .twining/ directory on first use.
+ */
+export function createServices(projectRoot: string): TwiningServices {
   // Ensure .twining/ directory exists
   const twiningDir = ensureInitialized(projectRoot);
 
   // Load config
   const config = loadConfig(twiningDir);
+  configureAppends({
+    window_ms: config.storage?.append_window_ms,
+    fsync: config.storage?.fsync,
+  });
 
   // Create stores
   const blackboardStore = new BlackboardStore(twiningDir);
@@ -65,9 +129,14 @@ export function createServer(projectRoot: string): ServerContext {
   const graphStore = new GraphStore(twiningDir);
 
   // Create embedding layer (lazy-loaded — no ONNX init cost at startup)
-  const embedder = Embedder.getInstance(twiningDir);
+  const embedder = Embedder.getInstance(twiningDir, config.embeddings);
   const indexManager = new IndexManager(twiningDir);
-  const searchEngine = new SearchEngine(embedder, indexManager);
+  const searchEngine = new SearchEngine(embedder, indexManager, config.search?.ann);
+  const embeddingQueue = new EmbeddingQueue(
+    embedder,
+    indexManager,
+    config.embeddings,
+  );
 
   // Create engines (with embedding support)
   const blackboardEngine = new BlackboardEngine(
@@ -102,6 +171,10 @@ export function createServer(projectRoot: string): ServerContext {
   // Wire auto-archive threshold into blackboard engine (spec §6.1.3)
   blackboardEngine.setArchiver(archiver, config);
 
+  // Embed posts and decisions in the background, off the tool-call path
+  blackboardEngine.setEmbeddingQueue(embeddingQueue);
+  decisionEngine.setEmbeddingQueue(embeddingQueue);
+
   const planningBridge = new PlanningBridge(projectRoot);
 
   // Create coordination stores (before ContextAssembler which depends on them)
@@ -149,15 +222,68 @@ export function createServer(projectRoot: string): ServerContext {
   // Create exporter
   const exporter = new Exporter(blackboardStore, decisionStore, graphStore);
 
-  // Process pending posts and actions (fire-and-forget, non-fatal)
+  // Pending posts and actions are applied by warmUp(), off the startup path
   const pendingProcessor = new PendingProcessor(
     twiningDir,
     blackboardEngine,
     archiver,
   );
-  pendingProcessor.processOnStartup().catch((err) => {
-    console.error("[twining] Pending processor failed (non-fatal):", err);
+
+  // Metrics collection, shared by every server built on these services
+  const metricsRotateDays = config.analytics?.metrics?.rotate_age_days;
+  const metricsCollector = new MetricsCollector(twiningDir, {
+    rotate_bytes: config.analytics?.metrics?.rotate_bytes,
+    rotate_age_ms:
+      metricsRotateDays !== undefined ? metricsRotateDays * 24 * 60 * 60 * 1000 : undefined,
   });
+  metricsCollector.setTracing(config.analytics?.tracing);
+  metricsCollector.markStartup("services");
+  contextAssembler.setMetrics(metricsCollector);
+
+  return {
+    twiningDir,
+    config,
+    blackboardStore,
+    decisionStore,
+    graphStore,
+    agentStore,
+    blackboardEngine,
+    decisionEngine,
+    graphEngine,
+    graphPopulator,
+    archiver,
+    contextAssembler,
+    coordinationEngine,
+    verifyEngine,
+    exporter,
+    metricsCollector,
+    embedder,
+    searchEngine,
+    embeddingQueue,
+    pendingProcessor,
+  };
+}
+
+/** Create an MCP server with every tool registered against the services. */
+export function createMcpServer(services: TwiningServices): McpServer {
+  const {
+    twiningDir,
+    config,
+    blackboardStore,
+    decisionStore,
+    graphStore,
+    agentStore,
+    blackboardEngine,
+    decisionEngine,
+    graphEngine,
+    graphPopulator,
+    archiver,
+    contextAssembler,
+    coordinationEngine,
+    verifyEngine,
+    exporter,
+    metricsCollector,
+  } = services;
 
   // Create MCP server with workflow instructions for non-plugin clients
   const server = new McpServer(
@@ -173,7 +299,6 @@ export function createServer(projectRoot: string): ServerContext {
   );
 
   // Instrument tool calls with metrics collection
-  const metricsCollector = new MetricsCollector(twiningDir);
   if (config.analytics?.metrics?.enabled !== false) {
     createInstrumentedServer(server, metricsCollector);
   }
@@ -203,6 +328,72 @@ export function createServer(projectRoot: string): ServerContext {
     );
     registerGraphTools(server, graphEngine);
   }
+  metricsCollector.markStartup("tools_registered");
+
+  return server;
+}
+
+/**
+ * Work kept off the startup path, run once a client has completed the
+ * handshake (or once the daemon is listening): preload the state
+ * snapshot, apply pending posts and actions, parse the stores and load
+ * the embedding model. Every step is non-fatal, and a tool call arriving
+ * meanwhile just does whatever loading it needs itself.
+ */
+export async function warmUp(services: TwiningServices): Promise<void> {
+  const { twiningDir, config, metricsCollector } = services;
+  try {
+    if (
+      config.startup?.snapshot &&
+      restoreStateSnapshot(twiningDir, snapshotSources(services), PKG_VERSION)
+    ) {
+      metricsCollector.markStartup("snapshot_restored");
+    }
+
+    try {
+      await services.pendingProcessor.processOnStartup();
+    } catch (err) {
+      console.error("[twining] Pending processor failed (non-fatal):", err);
+    }
+    metricsCollector.markStartup("pending_processed");
+
+    // Parse the stores now rather than inside the first tool call
+    await Promise.all([
+      services.blackboardStore.count(),
+      services.decisionStore.getIndex(),
+      services.graphStore.getEntities(),
+    ]);
+    const keywordIndex = services.searchEngine.getKeywordIndex();
+    keywordIndex.size("blackboard");
+    keywordIndex.size("decisions");
+    metricsCollector.markStartup("stores_loaded");
+
+    // Catch the keyword indexes up with anything written without them
+    await services.searchEngine.indexMissing(
+      services.blackboardStore,
+      services.decisionStore,
+    );
+
+    if (config.startup?.warm_embedder !== false && (await services.embedder.warmUp())) {
+      metricsCollector.markStartup("embedder_ready");
+    }
+  } catch (err) {
+    console.error("[twining] Startup warm-up failed (non-fatal):", err);
+  } finally {
+    metricsCollector.settleStartup();
+  }
+}
+
+/** Save the parsed stores for the next process, if snapshots are enabled. */
+export function saveSnapshot(services: TwiningServices): void {
+  if (!services.config.startup?.snapshot) return;
+  saveStateSnapshot(services.twiningDir, snapshotSources(services), PKG_VERSION);
+}
 
-  return { server, metricsCollector, twiningDir, config };
+function snapshotSources(services: TwiningServices): SnapshotSources {
+  return {
+    blackboardStore: services.blackboardStore,
+    decisionStore: services.decisionStore,
+    keywordIndex: services.searchEngine.getKeywordIndex(),
+  };
 }
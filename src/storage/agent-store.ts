@@ -4,6 +4,7 @@
  * Uses file-store readJSON/writeJSON for locked file I/O.
  * Upsert semantics by agent_id with capability merging.
  */
+import fs from "node:fs";
 import path from "node:path";
 import { readJSON, writeJSON, ensureDir } from "./file-store.js";
 import { normalizeTags } from "../utils/tags.js";
@@ -12,6 +13,9 @@ import type { AgentRecord } from "../utils/types.js";
 export class AgentStore {
   private readonly registryPath: string;
   private readonly agentsDir: string;
+  private gen = 0;
+  /** mtime:size of the registry when the generation was last bumped. */
+  private genVersion = "";
 
   constructor(twiningDir: string) {
     this.agentsDir = path.join(twiningDir, "agents");
@@ -32,6 +36,27 @@ export class AgentStore {
   private async writeRegistry(agents: AgentRecord[]): Promise<void> {
     ensureDir(this.agentsDir);
     await writeJSON(this.registryPath, agents);
+    // Same-millisecond rewrites of equal size would look unchanged
+    this.genVersion = "";
+  }
+
+  /**
+   * Counter that increases whenever the registry changes, whether written
+   * by this store or another process.
+   */
+  async generation(): Promise<number> {
+    let version = "missing";
+    try {
+      const stat = fs.statSync(this.registryPath);
+      version = `${stat.mtimeMs}:${stat.size}`;
+    } catch {
+      // No registry yet — no agents
+    }
+    if (version !== this.genVersion) {
+      this.genVersion = version;
+      this.gen++;
+    }
+    return this.gen;
   }
 
   /**
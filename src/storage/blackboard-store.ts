@@ -1,90 +1,468 @@
 /**
  * Blackboard CRUD operations.
- * Append-only JSONL storage for shared state entries.
- * Includes mtime-based caching to avoid redundant disk reads.
+ * Entries live in a segmented, append-only JSONL log:
+ * - blackboard.jsonl is the head segment that posts append to.
+ * - blackboard/segment-NNNNNN.jsonl are sealed segments, listed in time
+ *   order by blackboard/manifest.json.
+ * - blackboard/tombstones.jsonl holds dismissed IDs until compaction.
+ * Once the head passes its size cap it is sealed by a hard link and a
+ * manifest update, so it is never rewritten. Archiving moves whole sealed
+ * segments and dismissal appends a tombstone; neither holds the head lock
+ * for longer than a roll, so concurrent posts are not stalled.
+ *
+ * Parsed entries are kept in memory: sealed segments are parsed once and
+ * only lines appended to the head since the last read are parsed after
+ * that. Entry type, tag and scope indexes keep filtered reads off the
+ * full list.
  */
 import fs from "node:fs";
 import path from "node:path";
-import { appendJSONL, readJSONL } from "./file-store.js";
+import {
+  acquireLock,
+  appendJSONLBatch,
+  ensureDir,
+  readJSONL,
+  readRange,
+  readTail,
+} from "./file-store.js";
 import { generateId } from "../utils/ids.js";
-import type { BlackboardEntry } from "../utils/types.js";
+import { ScopeIndex, scopeOverlaps } from "../utils/scope-index.js";
+import type { BlackboardEntry, SearchCandidates } from "../utils/types.js";
+
+/** Seal the head segment once it grows past this size (1 MiB). */
+const DEFAULT_SEGMENT_MAX_BYTES = 1024 * 1024;
+
+/** Tombstones that trigger rewriting the sealed segments they point into. */
+const DEFAULT_TOMBSTONE_COMPACT_THRESHOLD = 256;
+
+/** One sealed segment, as listed in the manifest. */
+export interface SegmentInfo {
+  /** File name inside blackboard/ */
+  file: string;
+  count: number;
+  min_timestamp: string;
+  max_timestamp: string;
+  /** Decision entries, which archiving carries forward */
+  decisions: number;
+}
+
+/** blackboard/manifest.json */
+interface SegmentManifest {
+  next_segment: number;
+  /** Oldest first */
+  segments: SegmentInfo[];
+}
+
+/** Parse progress through the head segment, blackboard.jsonl. */
+interface HeadState {
+  ino: number;
+  mtimeMs: number;
+  /** Bytes of the file consumed so far (always ends on a newline). */
+  bytes: number;
+  /** The last consumed line, used to detect in-place rewrites. */
+  lastLine: string;
+  entries: BlackboardEntry[];
+}
+
+/** In-memory view over sealed segments and the head, minus tombstones. */
+interface BlackboardState {
+  /** Manifest and tombstone file signatures this view was built from */
+  sealedKey: string;
+  tombstones: Set<string>;
+  /** Position in `entries` by ID; a roll interrupted mid-way can repeat IDs */
+  positions: Map<string, number>;
+  entries: BlackboardEntry[];
+  /** Positions in `entries`, ascending, keyed by entry_type / tag. */
+  byType: Map<string, number[]>;
+  byTag: Map<string, number[]>;
+  /** Positions in `entries` by scope, for bidirectional prefix lookups. */
+  byScope: ScopeIndex<number>;
+}
+
+/** A parsed archive file, reused until it changes. */
+interface ArchiveFile {
+  mtimeMs: number;
+  size: number;
+  entries: BlackboardEntry[];
+}
+
+/** Filters a search applies through the store, per candidate id. */
+export interface CandidateFilters {
+  entry_types?: string[];
+  scope?: string;
+}
+
+/** Parsed blackboard files carried over between processes. */
+export interface BlackboardSnapshot {
+  /** Sealed segments, with the stat they were parsed from */
+  segments: { file: string; mtimeMs: number; size: number; entries: BlackboardEntry[] }[];
+  head: HeadState | null;
+}
 
 export class BlackboardStore {
   private readonly blackboardPath: string;
-  private cachedEntries: BlackboardEntry[] | null = null;
-  private cachedMtime: number = 0;
+  private readonly segmentsDir: string;
+  private readonly manifestPath: string;
+  private readonly tombstonesPath: string;
+  private readonly archiveDir: string;
+  private readonly segmentMaxBytes: number;
+  private readonly tombstoneCompactThreshold: number;
+  private state: BlackboardState | null = null;
+  private head: HeadState | null = null;
+  /** Parsed sealed segments by file name; segment files never change */
+  private readonly segments = new Map<string, BlackboardEntry[]>();
+  private readonly archives = new Map<string, ArchiveFile>();
+  /** Archived entries by ID, for archive searches; null when stale */
+  private archivedById: Map<string, BlackboardEntry> | null = null;
+  private gen = 0;
+  private compacting: Promise<void> | null = null;
 
-  constructor(twiningDir: string) {
+  constructor(
+    twiningDir: string,
+    options?: { segment_max_bytes?: number; tombstone_compact_threshold?: number },
+  ) {
     this.blackboardPath = path.join(twiningDir, "blackboard.jsonl");
+    this.segmentsDir = path.join(twiningDir, "blackboard");
+    this.manifestPath = path.join(this.segmentsDir, "manifest.json");
+    this.tombstonesPath = path.join(this.segmentsDir, "tombstones.jsonl");
+    this.archiveDir = path.join(twiningDir, "archive");
+    this.segmentMaxBytes = options?.segment_max_bytes ?? DEFAULT_SEGMENT_MAX_BYTES;
+    this.tombstoneCompactThreshold = Math.max(
+      1,
+      options?.tombstone_compact_threshold ?? DEFAULT_TOMBSTONE_COMPACT_THRESHOLD,
+    );
   }
 
-  /** Read all entries from disk, using mtime cache when possible. */
-  private async readAll(): Promise<BlackboardEntry[]> {
-    try {
-      if (!fs.existsSync(this.blackboardPath)) {
-        this.cachedEntries = [];
-        this.cachedMtime = 0;
-        return [];
+  /** Bring the in-memory state up to date with the files. */
+  private refresh(): BlackboardState {
+    const sealedKey = `${signature(this.manifestPath)}|${signature(this.tombstonesPath)}`;
+    const headChanged = this.refreshHeadIdentity();
+
+    let state = this.state;
+    if (!state || state.sealedKey !== sealedKey || headChanged) {
+      // Roll, archive, dismissal or a rewritten head: rebuild the view.
+      // Sealed segments come from cache; the head is re-read only if it changed.
+      state = emptyState(sealedKey);
+      for (const id of this.readTombstones()) state.tombstones.add(id);
+      for (const segment of this.readManifest().segments) {
+        for (const entry of this.loadSegment(segment.file)) addEntry(state, entry);
       }
-      const stat = fs.statSync(this.blackboardPath);
-      if (this.cachedEntries !== null && stat.mtimeMs === this.cachedMtime) {
-        return this.cachedEntries;
+      for (const entry of this.head!.entries) addEntry(state, entry);
+      this.state = state;
+      this.gen++;
+    }
+
+    const added = this.readHeadTail();
+    for (const entry of added) addEntry(state, entry);
+    if (added.length > 0) this.gen++;
+    return state;
+  }
+
+  /**
+   * Check the head file against what has been parsed. Returns true (and
+   * starts the head over) if it was replaced, truncated or rewritten.
+   */
+  private refreshHeadIdentity(): boolean {
+    let stat: fs.Stats | null = null;
+    try {
+      stat = fs.statSync(this.blackboardPath);
+    } catch {
+      // Missing head: an empty board, or one that only has sealed segments
+    }
+    const head = this.head;
+    const ino = stat?.ino ?? 0;
+    const size = stat?.size ?? 0;
+    if (
+      head &&
+      head.ino === ino &&
+      size >= head.bytes &&
+      ((stat?.mtimeMs === head.mtimeMs && size === head.bytes) || this.tailMatches(head))
+    ) {
+      return false;
+    }
+    const wasEmpty = !head || head.bytes === 0;
+    this.head = { ino, mtimeMs: 0, bytes: 0, lastLine: "", entries: [] };
+    // A missing head that was already empty is not a change
+    return !(wasEmpty && head !== null && size === 0);
+  }
+
+  /** Parse whole lines appended to the head since the last read. */
+  private readHeadTail(): BlackboardEntry[] {
+    const head = this.head!;
+    let stat: fs.Stats;
+    try {
+      stat = fs.statSync(this.blackboardPath);
+    } catch {
+      return [];
+    }
+    head.mtimeMs = stat.mtimeMs;
+
+    const tail = readTail(this.blackboardPath, head.bytes, stat.size);
+    head.bytes += tail.bytes;
+    const added: BlackboardEntry[] = [];
+    for (const line of tail.lines) {
+      head.lastLine = line;
+      if (line.trim().length === 0) continue;
+      try {
+        added.push(JSON.parse(line) as BlackboardEntry);
+      } catch {
+        console.error(
+          `[twining] Skipping corrupt JSONL line in ${path.basename(this.blackboardPath)}`,
+        );
       }
-      const entries = await readJSONL<BlackboardEntry>(this.blackboardPath);
-      this.cachedEntries = entries;
-      this.cachedMtime = stat.mtimeMs;
-      return entries;
+    }
+    head.entries.push(...added);
+    return added;
+  }
+
+  /** Whether the last head line we consumed is still where we left it. */
+  private tailMatches(head: HeadState): boolean {
+    if (head.bytes === 0) return true;
+    const expected = Buffer.from(head.lastLine + "\n", "utf-8");
+    const start = head.bytes - expected.length;
+    if (start < 0) return false;
+    return readRange(this.blackboardPath, start, expected.length).equals(expected);
+  }
+
+  private readManifest(): SegmentManifest {
+    try {
+      return JSON.parse(fs.readFileSync(this.manifestPath, "utf-8")) as SegmentManifest;
     } catch {
-      // On any stat/read error, fall through to uncached read
-      this.cachedEntries = null;
-      this.cachedMtime = 0;
-      return readJSONL<BlackboardEntry>(this.blackboardPath);
+      return { next_segment: 1, segments: [] };
     }
   }
 
+  /** Replace the manifest atomically. Caller holds the manifest lock. */
+  private writeManifest(manifest: SegmentManifest): void {
+    const tmp = `${this.manifestPath}.${process.pid}.tmp`;
+    fs.writeFileSync(tmp, JSON.stringify(manifest, null, 2));
+    fs.renameSync(tmp, this.manifestPath);
+  }
+
+  private loadSegment(file: string): BlackboardEntry[] {
+    let entries = this.segments.get(file);
+    if (!entries) {
+      entries = parseLines(fs.readFileSync(path.join(this.segmentsDir, file), "utf-8"), file);
+      this.segments.set(file, entries);
+    }
+    return entries;
+  }
+
+  private readTombstones(): string[] {
+    if (!fs.existsSync(this.tombstonesPath)) return [];
+    return parseLines<{ id: string }>(
+      fs.readFileSync(this.tombstonesPath, "utf-8"),
+      path.basename(this.tombstonesPath),
+    ).map((t) => t.id);
+  }
+
+  /** Lock the manifest, creating the segments directory on first use. */
+  private async lockManifest(): Promise<() => Promise<void>> {
+    ensureDir(this.segmentsDir);
+    try {
+      // Exclusive create: never clobber a manifest another process just wrote
+      fs.writeFileSync(
+        this.manifestPath,
+        JSON.stringify({ next_segment: 1, segments: [] }, null, 2),
+        { flag: "wx" },
+      );
+    } catch (err) {
+      if ((err as NodeJS.ErrnoException).code !== "EEXIST") throw err;
+    }
+    return acquireLock(this.manifestPath);
+  }
+
+  /** Write entries as a new sealed segment file; returns its manifest record. */
+  private writeSegment(
+    manifest: SegmentManifest,
+    entries: BlackboardEntry[],
+  ): SegmentInfo {
+    const file = segmentFileName(manifest.next_segment++);
+    fs.writeFileSync(
+      path.join(this.segmentsDir, file),
+      entries.map((e) => JSON.stringify(e)).join("\n") + "\n",
+    );
+    this.segments.set(file, entries);
+    return segmentInfo(file, entries);
+  }
+
+  /** Read all entries, parsing only what was appended since last time. */
+  private async readAll(): Promise<BlackboardState | null> {
+    try {
+      return this.refresh();
+    } catch {
+      // On any stat/read error, fall back to an uncached read
+      this.state = null;
+      this.head = null;
+      return null;
+    }
+  }
+
+  /** Every live entry, read straight from disk without the cache. */
+  private async readUncached(): Promise<BlackboardEntry[]> {
+    const tombstones = new Set(this.readTombstones());
+    const entries: BlackboardEntry[] = [];
+    for (const segment of this.readManifest().segments) {
+      entries.push(
+        ...(await readJSONL<BlackboardEntry>(path.join(this.segmentsDir, segment.file))),
+      );
+    }
+    entries.push(...(await readJSONL<BlackboardEntry>(this.blackboardPath)));
+    return entries.filter((e) => !tombstones.has(e.id));
+  }
+
   /** Append a new entry, generating ID and timestamp. */
   async append(
     entry: Omit<BlackboardEntry, "id" | "timestamp">,
   ): Promise<BlackboardEntry> {
-    const full: BlackboardEntry = {
+    const [full] = await this.appendBatch([entry]);
+    return full!;
+  }
+
+  /**
+   * Append several entries in one write, in order. They share a
+   * timestamp; their ULIDs still sort in input order.
+   */
+  async appendBatch(
+    entries: Array<Omit<BlackboardEntry, "id" | "timestamp">>,
+  ): Promise<BlackboardEntry[]> {
+    if (entries.length === 0) return [];
+    const timestamp = new Date().toISOString();
+    const full: BlackboardEntry[] = entries.map((entry) => ({
       ...entry,
       id: generateId(),
-      timestamp: new Date().toISOString(),
-    };
-    await appendJSONL(this.blackboardPath, full);
-    // Invalidate cache — next read will re-parse
-    this.cachedEntries = null;
+      timestamp,
+    }));
+    await appendJSONLBatch(this.blackboardPath, full);
+    // No invalidation — the next read parses just the appended lines
+    if (fs.statSync(this.blackboardPath).size >= this.segmentMaxBytes) {
+      await this.roll();
+    }
     return full;
   }
 
-  /** Read entries with optional filters. */
+  /**
+   * Seal the head segment: hard-link it into blackboard/, list it in the
+   * manifest, then swap in an empty head. Holds the head lock only for
+   * those three steps. No-op if the head is empty.
+   */
+  async roll(): Promise<void> {
+    if (!fs.existsSync(this.blackboardPath)) return;
+    const release = await acquireLock(this.blackboardPath);
+    try {
+      const releaseManifest = await this.lockManifest();
+      try {
+        const state = this.refresh();
+        const head = this.head!;
+        if (head.bytes === 0) return;
+        // A partial line from a crashed writer stays behind in the new head
+        const partial = readRange(
+          this.blackboardPath,
+          head.bytes,
+          fs.statSync(this.blackboardPath).size - head.bytes,
+        );
+        const live = head.entries.filter((e) => !state.tombstones.has(e.id));
+
+        const manifest = this.readManifest();
+        const file = segmentFileName(manifest.next_segment++);
+        const segmentPath = path.join(this.segmentsDir, file);
+        if (partial.length > 0) {
+          fs.writeFileSync(segmentPath, readRange(this.blackboardPath, 0, head.bytes));
+        } else {
+          fs.linkSync(this.blackboardPath, segmentPath);
+        }
+        this.segments.set(file, head.entries);
+        if (live.length > 0) {
+          manifest.segments.push(segmentInfo(file, head.entries));
+        } else {
+          fs.unlinkSync(segmentPath);
+          this.segments.delete(file);
+        }
+        // Readers between these two steps see the entries twice; the view
+        // skips repeated IDs
+        this.writeManifest(manifest);
+        const tmp = `${this.blackboardPath}.${process.pid}.tmp`;
+        fs.writeFileSync(tmp, partial);
+        fs.renameSync(tmp, this.blackboardPath);
+      } finally {
+        await releaseManifest();
+      }
+    } finally {
+      await release();
+    }
+  }
+
+  /**
+   * Counter that increases whenever the entries change, whether written by
+   * this store or another process. Lets callers memoize derived results.
+   */
+  async generation(): Promise<number> {
+    if (!(await this.readAll())) this.gen++;
+    return this.gen;
+  }
+
+  /** Number of entries on the blackboard. */
+  async count(): Promise<number> {
+    const state = await this.readAll();
+    if (!state) {
+      return (await this.readUncached()).length;
+    }
+    return state.entries.length;
+  }
+
+  /** The parsed segments and head, for a state snapshot. Entries are shared. */
+  exportSnapshot(): BlackboardSnapshot {
+    const segments: BlackboardSnapshot["segments"] = [];
+    for (const [file, entries] of this.segments) {
+      try {
+        const stat = fs.statSync(path.join(this.segmentsDir, file));
+        segments.push({ file, mtimeMs: stat.mtimeMs, size: stat.size, entries });
+      } catch {
+        // Archived or compacted away since it was parsed
+      }
+    }
+    return { segments, head: this.head ? { ...this.head } : null };
+  }
+
+  /**
+   * Seed the parse caches from a snapshot taken by an earlier process.
+   * Segments are used only if their mtime and size still match; the head
+   * is then checked and advanced like any cached head. No-op once this
+   * store has read the board itself.
+   */
+  restoreSnapshot(snapshot: BlackboardSnapshot): void {
+    if (this.state || this.head) return;
+    for (const { file, mtimeMs, size, entries } of snapshot.segments) {
+      try {
+        const stat = fs.statSync(path.join(this.segmentsDir, file));
+        if (stat.mtimeMs === mtimeMs && stat.size === size) this.segments.set(file, entries);
+      } catch {
+        // Gone since the snapshot
+      }
+    }
+    if (snapshot.head) this.head = { ...snapshot.head };
+  }
+
+  /**
+   * Read entries with optional filters. `include_archived` also searches
+   * archived entries, oldest first ahead of the live ones; archive files
+   * are parsed on first use and cached until they change.
+   */
   async read(filters?: {
     entry_types?: string[];
     tags?: string[];
     scope?: string;
     since?: string;
     limit?: number;
+    include_archived?: boolean;
   }): Promise<{ entries: BlackboardEntry[]; total_count: number }> {
-    let entries = await this.readAll();
+    const state = await this.readAll();
+    let entries = state
+      ? select(state, filters)
+      : filterEntries(await this.readUncached(), filters);
 
-    if (filters?.entry_types && filters.entry_types.length > 0) {
-      entries = entries.filter((e) =>
-        filters.entry_types!.includes(e.entry_type),
-      );
-    }
-
-    if (filters?.tags && filters.tags.length > 0) {
-      entries = entries.filter((e) =>
-        e.tags.some((t) => filters.tags!.includes(t)),
-      );
-    }
-
-    if (filters?.scope) {
-      const filterScope = filters.scope;
-      entries = entries.filter(
-        (e) =>
-          e.scope.startsWith(filterScope) || filterScope.startsWith(e.scope),
-      );
+    if (filters?.include_archived) {
+      entries = [...filterEntries(await this.readArchived(), filters), ...entries];
     }
 
     if (filters?.since) {
@@ -101,64 +479,423 @@ export class BlackboardStore {
     return { entries, total_count };
   }
 
+  /**
+   * Live entries as search candidates. Type and scope filters are checked
+   * per id through the ID index, so a search pays only for the ids its
+   * own indexes turn up, never for a pass over the blackboard.
+   */
+  async searchCandidates(filters?: CandidateFilters): Promise<SearchCandidates<BlackboardEntry>> {
+    const state = await this.readAll();
+    if (state) {
+      return candidatesOver((id) => {
+        const position = state.positions.get(id);
+        return position === undefined ? undefined : state.entries[position];
+      }, filters);
+    }
+    const byId = new Map((await this.readUncached()).map((e) => [e.id, e]));
+    return candidatesOver((id) => byId.get(id), filters);
+  }
+
+  /** searchCandidates for archived entries; the ID map is kept until an archive changes. */
+  async archivedSearchCandidates(
+    filters?: CandidateFilters,
+  ): Promise<SearchCandidates<BlackboardEntry>> {
+    const archives = this.refreshArchives();
+    this.archivedById ??= new Map(
+      archives.flatMap((archive) => archive.entries.map((e) => [e.id, e] as const)),
+    );
+    const byId = this.archivedById;
+    return candidatesOver((id) => byId.get(id), filters);
+  }
+
+  /** Every archived entry, from archive/*-blackboard.jsonl in date order. */
+  async readArchived(): Promise<BlackboardEntry[]> {
+    return this.refreshArchives().flatMap((archive) => archive.entries);
+  }
+
+  /** Parsed archive files in date order, re-reading any that changed. */
+  private refreshArchives(): ArchiveFile[] {
+    let files: string[];
+    try {
+      files = fs
+        .readdirSync(this.archiveDir)
+        .filter((f) => f.endsWith("-blackboard.jsonl"))
+        .sort();
+    } catch {
+      files = [];
+    }
+    for (const name of this.archives.keys()) {
+      if (!files.includes(name)) {
+        this.archives.delete(name);
+        this.archivedById = null;
+      }
+    }
+    return files.map((file) => {
+      const filePath = path.join(this.archiveDir, file);
+      const stat = fs.statSync(filePath);
+      let cached = this.archives.get(file);
+      if (!cached || cached.mtimeMs !== stat.mtimeMs || cached.size !== stat.size) {
+        cached = {
+          mtimeMs: stat.mtimeMs,
+          size: stat.size,
+          entries: parseLines(fs.readFileSync(filePath, "utf-8"), file),
+        };
+        this.archives.set(file, cached);
+        this.archivedById = null;
+      }
+      return cached;
+    });
+  }
+
   /** Get the N most recent entries, optionally filtered by type. */
   async recent(n?: number, entry_types?: string[]): Promise<BlackboardEntry[]> {
-    let entries = await this.readAll();
+    const count = n ?? 20;
+    const state = await this.readAll();
+    if (!state) {
+      const entries = filterEntries(await this.readUncached(), { entry_types });
+      return entries.slice(-count).reverse();
+    }
 
-    if (entry_types && entry_types.length > 0) {
-      entries = entries.filter((e) => entry_types.includes(e.entry_type));
+    if (!entry_types || entry_types.length === 0) {
+      return state.entries.slice(-count).reverse();
     }
 
-    const count = n ?? 20;
-    return entries.slice(-count).reverse();
+    const positions = union(entry_types.map((t) => state.byType.get(t)));
+    return positions
+      .slice(-count)
+      .reverse()
+      .map((i) => state.entries[i]!);
   }
 
-  /** Remove entries by ID. Returns the IDs that were actually found and removed. */
+  /**
+   * Remove entries by ID by appending tombstones; no segment is rewritten.
+   * Tombstoned entries in sealed segments are compacted away in the
+   * background once enough accumulate. Returns the IDs that were found.
+   */
   async dismiss(ids: string[]): Promise<{ dismissed: string[]; not_found: string[] }> {
-    const idSet = new Set(ids);
-    const bbPath = this.blackboardPath;
-
-    if (!fs.existsSync(bbPath)) {
+    const state = await this.readAll();
+    if (!state) {
       return { dismissed: [], not_found: ids };
     }
 
-    const lockfileModule = await import("proper-lockfile");
-    const release = await lockfileModule.default.lock(bbPath, {
-      retries: { retries: 10, factor: 1.5, minTimeout: 50, maxTimeout: 1000 },
-      stale: 10000,
-    });
+    const live = new Set(state.entries.map((e) => e.id));
+    const dismissed = [...new Set(ids)].filter((id) => live.has(id));
+    const not_found = ids.filter((id) => !live.has(id));
+    if (dismissed.length === 0) {
+      return { dismissed, not_found };
+    }
+
+    const timestamp = new Date().toISOString();
+    await appendJSONLBatch(
+      this.tombstonesPath,
+      dismissed.map((id) => ({ id, timestamp })),
+    );
+
+    if (state.tombstones.size + dismissed.length >= this.tombstoneCompactThreshold && !this.compacting) {
+      this.compacting = this.compactTombstones()
+        .catch((err) => {
+          console.error("[twining] Blackboard tombstone compaction failed (non-fatal):", err);
+        })
+        .finally(() => {
+          this.compacting = null;
+        });
+    }
+
+    return { dismissed, not_found };
+  }
 
+  /**
+   * Rewrite sealed segments that hold tombstoned entries and drop those
+   * tombstones. Tombstones for entries still in the head wait for the
+   * head to be sealed. Does not take the head lock.
+   */
+  async compactTombstones(): Promise<void> {
+    if (!fs.existsSync(this.tombstonesPath)) return;
+    const releaseManifest = await this.lockManifest();
     try {
-      const content = fs.readFileSync(bbPath, "utf-8");
-      const lines = content.split("\n").filter((line) => line.trim().length > 0);
-      const kept: string[] = [];
-      const dismissed: string[] = [];
-
-      for (const line of lines) {
-        try {
-          const entry = JSON.parse(line) as BlackboardEntry;
-          if (idSet.has(entry.id)) {
-            dismissed.push(entry.id);
-          } else {
-            kept.push(line);
+      const releaseTombstones = await acquireLock(this.tombstonesPath);
+      try {
+        const tombstones = new Set(this.readTombstones());
+        if (tombstones.size === 0) return;
+        // Every tombstoned head entry was written before its tombstone
+        this.refresh();
+
+        const manifest = this.readManifest();
+        const removed: string[] = [];
+        const segments: SegmentInfo[] = [];
+        for (const segment of manifest.segments) {
+          const entries = this.loadSegment(segment.file);
+          const kept = entries.filter((e) => !tombstones.has(e.id));
+          if (kept.length === entries.length) {
+            segments.push(segment);
+            continue;
           }
-        } catch {
-          kept.push(line); // Preserve unparseable lines
+          removed.push(segment.file);
+          if (kept.length > 0) segments.push(this.writeSegment(manifest, kept));
         }
+
+        // Tombstones still needed: entries in the head, or not yet visible
+        const sealed = new Set(
+          segments.flatMap((s) => this.loadSegment(s.file).map((e) => e.id)),
+        );
+        const stillLive = new Set(
+          (this.head?.entries ?? []).map((e) => e.id).filter((id) => !sealed.has(id)),
+        );
+        const remaining = this.readTombstones().filter((id) => stillLive.has(id));
+
+        manifest.segments = segments;
+        this.writeManifest(manifest);
+        const tmp = `${this.tombstonesPath}.${process.pid}.tmp`;
+        fs.writeFileSync(
+          tmp,
+          remaining.map((id) => JSON.stringify({ id })).join("\n") + (remaining.length > 0 ? "\n" : ""),
+        );
+        fs.renameSync(tmp, this.tombstonesPath);
+        this.removeSegmentFiles(removed);
+      } finally {
+        await releaseTombstones();
       }
+    } finally {
+      await releaseManifest();
+    }
+  }
 
-      const not_found = ids.filter((id) => !dismissed.includes(id));
+  /**
+   * Move entries older than `before` to archiveFile and return them.
+   * The head is sealed first; then every sealed segment older than the
+   * cutoff leaves the manifest. A segment that is entirely old is moved
+   * as a file when nothing else needs it; one that straddles the cutoff,
+   * or holds decisions to keep, has those entries carried forward into a
+   * new segment in its place. Only the seal takes the head lock.
+   */
+  async archive(
+    before: string,
+    archiveFile: string,
+    options?: { keep_decisions?: boolean },
+  ): Promise<BlackboardEntry[]> {
+    const keepDecisions = options?.keep_decisions ?? true;
+    const state = await this.readAll();
+    if (!state) return [];
+    if ((this.head?.entries ?? []).some((e) => e.timestamp < before)) {
+      await this.roll();
+    }
+
+    const releaseManifest = await this.lockManifest();
+    const archived: BlackboardEntry[] = [];
+    try {
+      const manifest = this.readManifest();
+      const tombstones = new Set(this.readTombstones());
+      const removed: string[] = [];
+      const segments: SegmentInfo[] = [];
+      ensureDir(path.dirname(archiveFile));
+
+      for (const segment of manifest.segments) {
+        if (segment.min_timestamp >= before) {
+          segments.push(segment);
+          continue;
+        }
+        const entries = this.loadSegment(segment.file);
+        const keep = (e: BlackboardEntry) =>
+          e.timestamp >= before || (keepDecisions && e.entry_type === "decision");
+        const kept = entries.filter((e) => keep(e) && !tombstones.has(e.id));
+        const moved = entries.filter((e) => !keep(e) && !tombstones.has(e.id));
+        if (moved.length === 0) {
+          segments.push(segment);
+          continue;
+        }
 
-      if (dismissed.length > 0) {
-        const newContent = kept.length > 0 ? kept.join("\n") + "\n" : "";
-        fs.writeFileSync(bbPath, newContent);
-        // Invalidate cache
-        this.cachedEntries = null;
+        const segmentPath = path.join(this.segmentsDir, segment.file);
+        if (kept.length === 0 && moved.length === entries.length && !fs.existsSync(archiveFile)) {
+          // The whole segment goes: move the file itself
+          fs.renameSync(segmentPath, archiveFile);
+          this.segments.delete(segment.file);
+        } else {
+          // Archive first, so a crash never loses entries
+          fs.appendFileSync(archiveFile, moved.map((e) => JSON.stringify(e)).join("\n") + "\n");
+          removed.push(segment.file);
+          if (kept.length > 0) segments.push(this.writeSegment(manifest, kept));
+        }
+        archived.push(...moved);
       }
 
-      return { dismissed, not_found };
+      if (archived.length > 0) {
+        manifest.segments = segments;
+        this.writeManifest(manifest);
+        this.removeSegmentFiles(removed);
+      }
     } finally {
-      await release();
+      await releaseManifest();
+    }
+    return archived;
+  }
+
+  /** Delete segment files that have left the manifest. */
+  private removeSegmentFiles(files: string[]): void {
+    for (const file of files) {
+      this.segments.delete(file);
+      try {
+        fs.unlinkSync(path.join(this.segmentsDir, file));
+      } catch {
+        // Already gone
+      }
     }
   }
 }
+
+function segmentFileName(seq: number): string {
+  return `segment-${String(seq).padStart(6, "0")}.jsonl`;
+}
+
+function segmentInfo(file: string, entries: BlackboardEntry[]): SegmentInfo {
+  let min = entries[0]?.timestamp ?? "";
+  let max = min;
+  let decisions = 0;
+  for (const entry of entries) {
+    if (entry.timestamp < min) min = entry.timestamp;
+    if (entry.timestamp > max) max = entry.timestamp;
+    if (entry.entry_type === "decision") decisions++;
+  }
+  return { file, count: entries.length, min_timestamp: min, max_timestamp: max, decisions };
+}
+
+/** mtime:size of a file, or "-" if it does not exist. */
+function signature(file: string): string {
+  try {
+    const stat = fs.statSync(file);
+    return `${stat.mtimeMs}:${stat.size}:${stat.ino}`;
+  } catch {
+    return "-";
+  }
+}
+
+function parseLines<T = BlackboardEntry>(content: string, name: string): T[] {
+  const results: T[] = [];
+  for (const line of content.split("\n")) {
+    if (line.trim().length === 0) continue;
+    try {
+      results.push(JSON.parse(line) as T);
+    } catch {
+      console.error(`[twining] Skipping corrupt JSONL line in ${name}`);
+    }
+  }
+  return results;
+}
+
+function emptyState(sealedKey: string): BlackboardState {
+  return {
+    sealedKey,
+    tombstones: new Set(),
+    positions: new Map(),
+    entries: [],
+    byType: new Map(),
+    byTag: new Map(),
+    byScope: new ScopeIndex(),
+  };
+}
+
+function addEntry(state: BlackboardState, entry: BlackboardEntry): void {
+  if (state.tombstones.has(entry.id) || state.positions.has(entry.id)) return;
+  const position = state.entries.length;
+  state.positions.set(entry.id, position);
+  state.entries.push(entry);
+  addPosition(state.byType, entry.entry_type, position);
+  for (const tag of new Set(entry.tags ?? [])) {
+    addPosition(state.byTag, tag, position);
+  }
+  state.byScope.add(entry.scope, position);
+}
+
+function addPosition(
+  index: Map<string, number[]>,
+  key: string,
+  position: number,
+): void {
+  const positions = index.get(key);
+  if (positions) positions.push(position);
+  else index.set(key, [position]);
+}
+
+/** Sorted, de-duplicated union of ascending position lists. */
+function union(lists: (number[] | undefined)[]): number[] {
+  const present = lists.filter((l): l is number[] => l !== undefined);
+  if (present.length === 0) return [];
+  if (present.length === 1) return present[0]!;
+  return [...new Set(present.flat())].sort((a, b) => a - b);
+}
+
+/**
+ * Apply type/tag/scope filters through the indexes. The most selective
+ * filter picks the candidates; the others are checked per candidate.
+ */
+function select(
+  state: BlackboardState,
+  filters?: { entry_types?: string[]; tags?: string[]; scope?: string },
+): BlackboardEntry[] {
+  const candidateLists: number[][] = [];
+  if (filters?.entry_types && filters.entry_types.length > 0) {
+    candidateLists.push(
+      union(filters.entry_types.map((t) => state.byType.get(t))),
+    );
+  }
+  if (filters?.tags && filters.tags.length > 0) {
+    candidateLists.push(union(filters.tags.map((t) => state.byTag.get(t))));
+  }
+  if (filters?.scope) {
+    candidateLists.push(
+      [...state.byScope.match(filters.scope)].sort((a, b) => a - b),
+    );
+  }
+
+  if (candidateLists.length === 0) return state.entries.slice();
+
+  candidateLists.sort((a, b) => a.length - b.length);
+  const candidates = candidateLists[0]!.map((i) => state.entries[i]!);
+  return candidateLists.length === 1
+    ? candidates
+    : filterEntries(candidates, filters);
+}
+
+/** Search candidates over an id lookup, checking filters per id. */
+function candidatesOver(
+  entryOf: (id: string) => BlackboardEntry | undefined,
+  filters?: CandidateFilters,
+): SearchCandidates<BlackboardEntry> {
+  const types =
+    filters?.entry_types && filters.entry_types.length > 0
+      ? new Set(filters.entry_types)
+      : null;
+  const scope = filters?.scope;
+  const accepts = (entry: BlackboardEntry | undefined): entry is BlackboardEntry =>
+    entry !== undefined &&
+    (!types || types.has(entry.entry_type)) &&
+    (!scope || scopeOverlaps(entry.scope, scope));
+  return {
+    has: (id) => accepts(entryOf(id)),
+    load: async (ids) => ids.map((id) => entryOf(id)).filter(accepts),
+  };
+}
+
+/** Plain type/tag/scope filtering, for lists without indexes. */
+function filterEntries(
+  entries: BlackboardEntry[],
+  filters?: { entry_types?: string[]; tags?: string[]; scope?: string },
+): BlackboardEntry[] {
+  let result = entries;
+
+  if (filters?.entry_types && filters.entry_types.length > 0) {
+    const types = filters.entry_types;
+    result = result.filter((e) => types.includes(e.entry_type));
+  }
+
+  if (filters?.tags && filters.tags.length > 0) {
+    const tags = filters.tags;
+    result = result.filter((e) => e.tags.some((t) => tags.includes(t)));
+  }
+
+  if (filters?.scope) {
+    const filterScope = filters.scope;
+    result = result.filter((e) => scopeOverlaps(e.scope, filterScope));
+  }
+
+  return result;
+}
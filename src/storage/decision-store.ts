@@ -1,95 +1,206 @@
 /**
  * Decision CRUD operations.
  * Individual JSON files per decision with a fast-lookup index.
+ *
+ * The index is a snapshot (decisions/index.json) plus an append-only
+ * mutation log (decisions/index.log.jsonl) of create, status and commit
+ * records. Writes append one log line under the index lock, so their cost
+ * doesn't grow with the number of decisions; readers replay the log onto
+ * the snapshot and then only parse newly appended lines. Once the log
+ * crosses a size threshold it is folded into a new snapshot in the
+ * background. Decision files remain the source of truth for bodies.
+ *
+ * The in-memory index carries scope, affected-file and affected-symbol
+ * lookups so scope queries don't scan every decision. Parsed decision
+ * files are kept in a bounded LRU cache validated against file mtimes.
  */
 import fs from "node:fs";
 import path from "node:path";
-import lockfile from "proper-lockfile";
-import { readJSON, writeJSON } from "./file-store.js";
+import {
+  acquireLock,
+  readTail,
+  statOrNull,
+  tailInvalidated,
+  type TailRead,
+} from "./file-store.js";
 import { generateId } from "../utils/ids.js";
+import { ScopeIndex } from "../utils/scope-index.js";
 import type {
   Decision,
   DecisionIndexEntry,
   DecisionStatus,
+  SearchCandidates,
 } from "../utils/types.js";
 
-const INDEX_LOCK_OPTIONS: lockfile.LockOptions = {
-  retries: { retries: 10, factor: 1.5, minTimeout: 50, maxTimeout: 1000 },
-  stale: 10000,
-};
+/** Parsed decision files kept in memory by default. */
+const DEFAULT_DECISION_CACHE_SIZE = 5000;
+
+/** Log records that trigger folding the log into a new snapshot. */
+const DEFAULT_COMPACT_THRESHOLD = 500;
+
+/** One line of the index mutation log. */
+type IndexLogRecord =
+  | { op: "create"; entry: DecisionIndexEntry }
+  | { op: "status"; id: string; status: DecisionStatus }
+  | { op: "commit"; id: string; hash: string };
+
+/** The index as replayed from snapshot + log, advanced incrementally. */
+interface IndexState {
+  snapshotMtimeMs: number;
+  snapshotSize: number;
+  logIno: number;
+  /** Bytes of the log consumed so far (always ends on a newline). */
+  logBytes: number;
+  /** Log records applied since the snapshot. */
+  logRecords: number;
+  entries: DecisionIndexEntry[];
+  positions: Map<string, number>;
+  /** Built on first scope query, then kept current as entries are added. */
+  lookups: ScopeLookups | null;
+}
+
+/** A parsed decision file and the stat it was parsed from. */
+interface CachedDecision {
+  decision: Decision;
+  mtimeMs: number;
+  size: number;
+  /**
+   * Index version when the file stat was last confirmed. Every store
+   * write touches the index, so while it is unchanged the file is too.
+   */
+  indexVersion: string;
+}
+
+/** Positions in a decision index array, by scope, file and symbol. */
+interface ScopeLookups {
+  scopes: ScopeIndex<number>;
+  files: ScopeIndex<number>;
+  symbols: Map<string, number[]>;
+}
+
+/** Which fields besides the decision scope a scope lookup matches on. */
+export interface ScopeMatchOptions {
+  affected_files?: boolean;
+  affected_symbols?: boolean;
+}
+
+/** Parsed index and decision files carried over between processes. */
+export interface DecisionSnapshot {
+  index: Omit<IndexState, "lookups"> | null;
+  /** Cached decision files, least recently used first */
+  decisions: { decision: Decision; mtimeMs: number; size: number }[];
+}
 
 export class DecisionStore {
   private readonly decisionsDir: string;
   private readonly indexPath: string;
-  private cachedIndex: DecisionIndexEntry[] | null = null;
-  private cachedIndexMtime: number = 0;
+  private readonly logPath: string;
+  private readonly compactThreshold: number;
+  private indexState: IndexState | null = null;
+  private gen = 0;
+  private compacting: Promise<void> | null = null;
+  private readonly decisionCache = new Map<string, CachedDecision>();
+  private readonly decisionCacheSize: number;
 
-  constructor(twiningDir: string) {
+  constructor(
+    twiningDir: string,
+    options?: { cache_size?: number; compact_threshold?: number },
+  ) {
     this.decisionsDir = path.join(twiningDir, "decisions");
     this.indexPath = path.join(this.decisionsDir, "index.json");
+    this.logPath = path.join(this.decisionsDir, "index.log.jsonl");
+    this.decisionCacheSize = Math.max(
+      0,
+      options?.cache_size ?? DEFAULT_DECISION_CACHE_SIZE,
+    );
+    this.compactThreshold = Math.max(
+      1,
+      options?.compact_threshold ?? DEFAULT_COMPACT_THRESHOLD,
+    );
   }
 
-  /** Create a new decision. Writes individual file and updates index atomically. */
+  /** Create a new decision. Writes individual file and logs the index entry. */
   async create(
     input: Omit<Decision, "id" | "timestamp" | "status">,
   ): Promise<Decision> {
-    const decision: Decision = {
+    const [decision] = await this.createBatch([input]);
+    return decision!;
+  }
+
+  /**
+   * Create several decisions under one index lock, logging their index
+   * entries in one append. Each may set its initial status (default
+   * "active"). Decisions listed in `supersede` are marked superseded in
+   * the same write, ahead of the new ones; unknown IDs are skipped.
+   * Returned in input order.
+   */
+  async createBatch(
+    inputs: Array<Omit<Decision, "id" | "timestamp" | "status"> & { status?: DecisionStatus }>,
+    options?: { supersede?: string[] },
+  ): Promise<Decision[]> {
+    if (inputs.length === 0) return [];
+    const timestamp = new Date().toISOString();
+    const decisions: Decision[] = inputs.map((input) => ({
       ...input,
       commit_hashes: input.commit_hashes ?? [],
       id: generateId(),
-      timestamp: new Date().toISOString(),
-      status: "active",
-    };
-
-    const filePath = path.join(this.decisionsDir, `${decision.id}.json`);
+      timestamp,
+      status: input.status ?? "active",
+    }));
 
-    // Lock index for atomic read-modify-write
-    const release = await lockfile.lock(this.indexPath, INDEX_LOCK_OPTIONS);
-    try {
-      // Write individual decision file
-      fs.writeFileSync(filePath, JSON.stringify(decision, null, 2));
-
-      // Update index
-      const index = JSON.parse(
-        fs.readFileSync(this.indexPath, "utf-8"),
-      ) as DecisionIndexEntry[];
-      index.push(this.toIndexEntry(decision));
-      fs.writeFileSync(this.indexPath, JSON.stringify(index, null, 2));
-    } finally {
-      await release();
-    }
+    const superseded = [...new Set(options?.supersede ?? [])].flatMap(
+      (id) => this.statusWrite(id, "superseded") ?? [],
+    );
+    await this.writeManyUnderLock([
+      ...superseded,
+      ...decisions.map((decision) => {
+        const filePath = path.join(this.decisionsDir, `${decision.id}.json`);
+        return {
+          filePath,
+          write: () => {
+            // Write individual decision file, then log the index entry
+            fs.writeFileSync(filePath, JSON.stringify(decision, null, 2));
+            return {
+              decision,
+              record: { op: "create", entry: this.toIndexEntry(decision) } as const,
+            };
+          },
+        };
+      }),
+    ]);
 
-    this.cachedIndex = null; // Invalidate index cache
-    return decision;
+    return decisions;
   }
 
-  /** Get a single decision by ID. Returns null if not found. */
+  /**
+   * Get a single decision by ID. Returns null if not found.
+   * Decisions are shared with the cache — treat them as read-only.
+   */
   async get(id: string): Promise<Decision | null> {
-    const filePath = path.join(this.decisionsDir, `${id}.json`);
-    if (!fs.existsSync(filePath)) return null;
-    return readJSON<Decision>(filePath);
+    return this.load(id, this.indexVersion());
+  }
+
+  /**
+   * Get many decisions by ID, in the order given; missing IDs are skipped.
+   * Cached decisions cost nothing while the index is unchanged and one
+   * stat otherwise; only new or changed files are read and parsed.
+   */
+  async getMany(ids: Iterable<string>): Promise<Decision[]> {
+    const version = this.indexVersion();
+    const decisions: Decision[] = [];
+    for (const id of ids) {
+      const decision = this.load(id, version);
+      if (decision) decisions.push(decision);
+    }
+    return decisions;
   }
 
   /** Get all decisions matching a scope (prefix match or affected files/symbols match). */
   async getByScope(scope: string): Promise<Decision[]> {
-    const index = await this.getIndex();
-
-    const matching = index.filter(
-      (entry) =>
-        entry.scope.startsWith(scope) ||
-        scope.startsWith(entry.scope) ||
-        entry.affected_files.some(
-          (f) => f.startsWith(scope) || scope.startsWith(f),
-        ) ||
-        entry.affected_symbols.some((s) => s === scope),
-    );
+    const matching = await this.getIndexByScope(scope);
 
     // Load full decision files for matches
-    const decisions: Decision[] = [];
-    for (const entry of matching) {
-      const decision = await this.get(entry.id);
-      if (decision) decisions.push(decision);
-    }
+    const decisions = await this.getMany(matching.map((e) => e.id));
 
     // Sort by timestamp descending, then by ID descending (ULID is monotonic)
     decisions.sort(
@@ -101,62 +212,68 @@ export class DecisionStore {
     return decisions;
   }
 
+  /**
+   * Index entries matching a scope, in index order: bidirectional prefix
+   * match on the decision scope and (unless disabled) on affected_files,
+   * plus exact match on affected_symbols.
+   */
+  async getIndexByScope(
+    scope: string,
+    options?: ScopeMatchOptions,
+  ): Promise<DecisionIndexEntry[]> {
+    return matchScope(this.currentIndex(), scope, options);
+  }
+
+  /**
+   * getIndexByScope for several scopes against one read of the index, for
+   * batch callers. Results are in `scopes` order.
+   */
+  async getIndexByScopes(
+    scopes: string[],
+    options?: ScopeMatchOptions,
+  ): Promise<DecisionIndexEntry[][]> {
+    const state = this.currentIndex();
+    return scopes.map((scope) => matchScope(state, scope, options));
+  }
+
+  /**
+   * Decisions as search candidates, limited to index entries `accept`
+   * passes. Each id is checked through the index positions, and only the
+   * ranked hits are loaded.
+   */
+  async searchCandidates(
+    accept?: (entry: DecisionIndexEntry) => boolean,
+  ): Promise<SearchCandidates<Decision>> {
+    const { entries, positions } = this.currentIndex();
+    return {
+      has: (id) => {
+        const position = positions.get(id);
+        const entry = position === undefined ? undefined : entries[position];
+        return entry !== undefined && (!accept || accept(entry));
+      },
+      load: (ids) => this.getMany(ids),
+    };
+  }
+
   /** Update a decision's status (and optionally other fields). */
   async updateStatus(
     id: string,
     status: DecisionStatus,
     extra?: Partial<Decision>,
   ): Promise<void> {
-    const filePath = path.join(this.decisionsDir, `${id}.json`);
-    if (!fs.existsSync(filePath)) return;
+    const update = this.statusWrite(id, status, extra);
+    if (!update) return;
 
     // Lock index for the full atomic update of both file and index
-    const release = await lockfile.lock(this.indexPath, INDEX_LOCK_OPTIONS);
-    try {
-      // Update individual decision file
-      const decision = JSON.parse(
-        fs.readFileSync(filePath, "utf-8"),
-      ) as Decision;
-      decision.status = status;
-      if (extra) {
-        Object.assign(decision, extra);
-      }
-      fs.writeFileSync(filePath, JSON.stringify(decision, null, 2));
-
-      // Update index
-      const index = JSON.parse(
-        fs.readFileSync(this.indexPath, "utf-8"),
-      ) as DecisionIndexEntry[];
-      const indexEntry = index.find((e) => e.id === id);
-      if (indexEntry) {
-        indexEntry.status = status;
-      }
-      fs.writeFileSync(this.indexPath, JSON.stringify(index, null, 2));
-    } finally {
-      await release();
-    }
-    this.cachedIndex = null; // Invalidate index cache
+    await this.writeUnderLock(update.filePath, update.write);
   }
 
-  /** Get the full decision index, with mtime-based caching. */
+  /**
+   * Get the full decision index. The returned array is a snapshot: later
+   * writes produce a new array rather than mutating it.
+   */
   async getIndex(): Promise<DecisionIndexEntry[]> {
-    try {
-      if (fs.existsSync(this.indexPath)) {
-        const stat = fs.statSync(this.indexPath);
-        if (this.cachedIndex !== null && stat.mtimeMs === this.cachedIndexMtime) {
-          return this.cachedIndex;
-        }
-        const index = await readJSON<DecisionIndexEntry[]>(this.indexPath);
-        this.cachedIndex = index;
-        this.cachedIndexMtime = stat.mtimeMs;
-        return index;
-      }
-    } catch {
-      // Fall through to uncached read
-      this.cachedIndex = null;
-      this.cachedIndexMtime = 0;
-    }
-    return readJSON<DecisionIndexEntry[]>(this.indexPath);
+    return this.currentIndex().entries;
   }
 
   /** Link a commit hash to an existing decision. Updates both file and index. */
@@ -167,8 +284,7 @@ export class DecisionStore {
     }
 
     // Lock index for the full atomic update of both file and index
-    const release = await lockfile.lock(this.indexPath, INDEX_LOCK_OPTIONS);
-    try {
+    await this.writeUnderLock(filePath, () => {
       // Update individual decision file
       const decision = JSON.parse(
         fs.readFileSync(filePath, "utf-8"),
@@ -180,25 +296,8 @@ export class DecisionStore {
         decision.commit_hashes.push(commitHash);
       }
       fs.writeFileSync(filePath, JSON.stringify(decision, null, 2));
-
-      // Update index
-      const index = JSON.parse(
-        fs.readFileSync(this.indexPath, "utf-8"),
-      ) as DecisionIndexEntry[];
-      const indexEntry = index.find((e) => e.id === id);
-      if (indexEntry) {
-        if (!indexEntry.commit_hashes) {
-          indexEntry.commit_hashes = [];
-        }
-        if (!indexEntry.commit_hashes.includes(commitHash)) {
-          indexEntry.commit_hashes.push(commitHash);
-        }
-      }
-      fs.writeFileSync(this.indexPath, JSON.stringify(index, null, 2));
-    } finally {
-      await release();
-    }
-    this.cachedIndex = null; // Invalidate index cache
+      return { decision, record: { op: "commit", id, hash: commitHash } };
+    });
   }
 
   /** Get decisions linked to a specific commit hash. */
@@ -208,11 +307,7 @@ export class DecisionStore {
       (entry) => entry.commit_hashes && entry.commit_hashes.includes(commitHash),
     );
 
-    const decisions: Decision[] = [];
-    for (const entry of matching) {
-      const decision = await this.get(entry.id);
-      if (decision) decisions.push(decision);
-    }
+    const decisions = await this.getMany(matching.map((e) => e.id));
 
     // Sort by timestamp descending
     decisions.sort(
@@ -224,6 +319,306 @@ export class DecisionStore {
     return decisions;
   }
 
+  /**
+   * Counter that increases whenever the index changes, whether written by
+   * this store or another process. Lets callers memoize derived results.
+   */
+  async generation(): Promise<number> {
+    try {
+      this.refreshIndex();
+    } catch {
+      this.indexState = null;
+      this.gen++;
+    }
+    return this.gen;
+  }
+
+  /** The replayed index and cached decision files, for a state snapshot. */
+  exportSnapshot(): DecisionSnapshot {
+    let index: DecisionSnapshot["index"] = null;
+    if (this.indexState) {
+      const { lookups: _lookups, ...rest } = this.indexState;
+      index = rest;
+    }
+    const decisions: DecisionSnapshot["decisions"] = [];
+    for (const { decision, mtimeMs, size } of this.decisionCache.values()) {
+      decisions.push({ decision, mtimeMs, size });
+    }
+    return { index, decisions };
+  }
+
+  /**
+   * Seed the index and decision cache from a snapshot taken by an earlier
+   * process. The index is checked against index.json and the log on first
+   * use like any cached index; decision files are re-checked by mtime and
+   * size before being served. No-op once this store has read the index.
+   */
+  restoreSnapshot(snapshot: DecisionSnapshot): void {
+    if (this.indexState) return;
+    if (snapshot.index) this.indexState = { ...snapshot.index, lookups: null };
+    for (const { decision, mtimeMs, size } of snapshot.decisions) {
+      if (this.decisionCache.has(decision.id)) continue;
+      // An empty index version never matches, forcing a stat check
+      this.rememberDecision(decision.id, { decision, mtimeMs, size, indexVersion: "" });
+    }
+  }
+
+  /**
+   * Fold the mutation log into a new index.json snapshot and empty the log.
+   * Runs automatically in the background once the log is long enough.
+   */
+  async compact(): Promise<void> {
+    const release = await acquireLock(this.indexPath);
+    try {
+      const state = this.refreshIndex();
+      if (state.logRecords === 0) return;
+
+      // Snapshot first, then truncate: a crash in between leaves log
+      // records that replay idempotently onto the new snapshot
+      const tmp = `${this.indexPath}.${process.pid}.tmp`;
+      fs.writeFileSync(tmp, JSON.stringify(state.entries, null, 2));
+      fs.renameSync(tmp, this.indexPath);
+      fs.truncateSync(this.logPath, 0);
+    } finally {
+      await release();
+    }
+  }
+
+  /**
+   * Run a decision-file write under the index lock and log its index
+   * record. `write` updates the decision file and returns the decision as
+   * written plus the record to log.
+   */
+  private async writeUnderLock(
+    filePath: string,
+    write: () => { decision: Decision; record: IndexLogRecord },
+  ): Promise<void> {
+    await this.writeManyUnderLock([{ filePath, write }]);
+  }
+
+  /** A status change to run under the index lock, or null if the decision doesn't exist. */
+  private statusWrite(
+    id: string,
+    status: DecisionStatus,
+    extra?: Partial<Decision>,
+  ): { filePath: string; write: () => { decision: Decision; record: IndexLogRecord } } | null {
+    const filePath = path.join(this.decisionsDir, `${id}.json`);
+    if (!fs.existsSync(filePath)) return null;
+    return {
+      filePath,
+      write: () => {
+        // Update individual decision file
+        const decision = JSON.parse(
+          fs.readFileSync(filePath, "utf-8"),
+        ) as Decision;
+        decision.status = status;
+        if (extra) {
+          Object.assign(decision, extra);
+        }
+        fs.writeFileSync(filePath, JSON.stringify(decision, null, 2));
+        return { decision, record: { op: "status", id, status } };
+      },
+    };
+  }
+
+  /** writeUnderLock for several decision files, logged in one append. */
+  private async writeManyUnderLock(
+    writes: Array<{
+      filePath: string;
+      write: () => { decision: Decision; record: IndexLogRecord };
+    }>,
+  ): Promise<void> {
+    let shouldCompact = false;
+    const release = await acquireLock(this.indexPath);
+    try {
+      const versionBefore = this.indexVersion();
+      const written = writes.map(({ filePath, write }) => ({ filePath, ...write() }));
+
+      // Drop a crashed writer's partial line so ours starts on a boundary
+      const state = this.refreshIndex();
+      if (fs.existsSync(this.logPath)) {
+        if (fs.statSync(this.logPath).size !== state.logBytes) {
+          fs.truncateSync(this.logPath, state.logBytes);
+        }
+      }
+      fs.appendFileSync(
+        this.logPath,
+        written.map(({ record }) => JSON.stringify(record) + "\n").join(""),
+      );
+
+      shouldCompact = this.refreshIndex().logRecords >= this.compactThreshold;
+      for (const { filePath, decision } of written) {
+        this.cacheWritten(filePath, decision, versionBefore);
+      }
+    } finally {
+      await release();
+    }
+
+    if (shouldCompact && !this.compacting) {
+      this.compacting = this.compact()
+        .catch((err) => {
+          console.error("[twining] Decision index compaction failed (non-fatal):", err);
+        })
+        .finally(() => {
+          this.compacting = null;
+        });
+    }
+  }
+
+  /** The refreshed index, or a fresh uncached read if refreshing fails. */
+  private currentIndex(): IndexState {
+    try {
+      return this.refreshIndex();
+    } catch {
+      this.indexState = null;
+    }
+    return this.loadIndexState();
+  }
+
+  /**
+   * Bring the in-memory index up to date: reload snapshot and log when the
+   * snapshot changed or the log was truncated, otherwise apply only log
+   * lines appended since the last refresh.
+   */
+  private refreshIndex(): IndexState {
+    const snapshot = fs.statSync(this.indexPath);
+    const log = statOrNull(this.logPath);
+    let state = this.indexState;
+
+    if (
+      !state ||
+      state.snapshotMtimeMs !== snapshot.mtimeMs ||
+      state.snapshotSize !== snapshot.size ||
+      tailInvalidated(log, state.logIno, state.logBytes)
+    ) {
+      state = this.loadIndexState();
+      this.indexState = state;
+      this.gen++;
+      return state;
+    }
+
+    if (log && log.size > state.logBytes) {
+      const before = state.logBytes;
+      applyLog(state, readTail(this.logPath, state.logBytes, log.size));
+      if (state.logBytes !== before) this.gen++;
+    }
+    return state;
+  }
+
+  /** Read the snapshot and replay the whole log. */
+  private loadIndexState(): IndexState {
+    const snapshot = fs.statSync(this.indexPath);
+    const entries = JSON.parse(
+      fs.readFileSync(this.indexPath, "utf-8"),
+    ) as DecisionIndexEntry[];
+    const positions = new Map<string, number>();
+    entries.forEach((e, i) => positions.set(e.id, i));
+
+    const state: IndexState = {
+      snapshotMtimeMs: snapshot.mtimeMs,
+      snapshotSize: snapshot.size,
+      logIno: 0,
+      logBytes: 0,
+      logRecords: 0,
+      entries,
+      positions,
+      lookups: null,
+    };
+
+    const log = statOrNull(this.logPath);
+    if (log) {
+      state.logIno = log.ino;
+      applyLog(state, readTail(this.logPath, 0, log.size));
+    }
+    return state;
+  }
+
+  /**
+   * Version of the index as a whole (snapshot + log), used to validate
+   * cached decision files; null (never equal) if unreadable.
+   */
+  private indexVersion(): string | null {
+    try {
+      const snapshot = fs.statSync(this.indexPath);
+      const log = statOrNull(this.logPath);
+      return `${snapshot.mtimeMs}:${snapshot.size}:${log?.mtimeMs ?? 0}:${log?.size ?? 0}`;
+    } catch {
+      return null;
+    }
+  }
+
+  /** Load one decision through the cache. */
+  private load(id: string, version: string | null): Decision | null {
+    const cached = this.decisionCache.get(id);
+    if (cached && version !== null && cached.indexVersion === version) {
+      this.rememberDecision(id, cached);
+      return cached.decision;
+    }
+
+    const filePath = path.join(this.decisionsDir, `${id}.json`);
+    let stat: fs.Stats;
+    try {
+      stat = fs.statSync(filePath);
+    } catch {
+      this.decisionCache.delete(id);
+      return null;
+    }
+
+    if (cached && cached.mtimeMs === stat.mtimeMs && cached.size === stat.size) {
+      cached.indexVersion = version ?? "";
+      this.rememberDecision(id, cached);
+      return cached.decision;
+    }
+
+    const decision = JSON.parse(fs.readFileSync(filePath, "utf-8")) as Decision;
+    this.rememberDecision(id, {
+      decision,
+      mtimeMs: stat.mtimeMs,
+      size: stat.size,
+      indexVersion: version ?? "",
+    });
+    return decision;
+  }
+
+  /** Insert or refresh a cache entry, evicting the least recently used. */
+  private rememberDecision(id: string, cached: CachedDecision): void {
+    if (this.decisionCacheSize === 0) return;
+    this.decisionCache.delete(id);
+    this.decisionCache.set(id, cached);
+    if (this.decisionCache.size > this.decisionCacheSize) {
+      const oldest = this.decisionCache.keys().next().value;
+      if (oldest !== undefined) this.decisionCache.delete(oldest);
+    }
+  }
+
+  /**
+   * Record a decision file this store just wrote (under the index lock,
+   * after logging its index record). Entries confirmed against the index
+   * before our write are still valid after it.
+   */
+  private cacheWritten(
+    filePath: string,
+    decision: Decision,
+    versionBefore: string | null,
+  ): void {
+    const versionAfter = this.indexVersion();
+    if (versionAfter === null) return;
+    if (versionBefore !== null) {
+      for (const cached of this.decisionCache.values()) {
+        if (cached.indexVersion === versionBefore) {
+          cached.indexVersion = versionAfter;
+        }
+      }
+    }
+    const stat = fs.statSync(filePath);
+    this.rememberDecision(decision.id, {
+      decision,
+      mtimeMs: stat.mtimeMs,
+      size: stat.size,
+      indexVersion: versionAfter,
+    });
+  }
+
   /** Extract index entry from a full decision. */
   private toIndexEntry(decision: Decision): DecisionIndexEntry {
     return {
@@ -240,3 +635,94 @@ export class DecisionStore {
     };
   }
 }
+
+/** Index entries matching a scope, in index order (see getIndexByScope). */
+function matchScope(
+  state: IndexState,
+  scope: string,
+  options?: ScopeMatchOptions,
+): DecisionIndexEntry[] {
+  const entries = state.entries;
+  const lookups = (state.lookups ??= buildLookups(entries));
+
+  const positions = lookups.scopes.match(scope);
+  if (options?.affected_files ?? true) {
+    lookups.files.match(scope, positions);
+  }
+  if (options?.affected_symbols ?? true) {
+    for (const p of lookups.symbols.get(scope) ?? []) positions.add(p);
+  }
+
+  return [...positions].sort((a, b) => a - b).map((p) => entries[p]!);
+}
+
+/**
+ * Apply log lines read at state.logBytes. Entries are copied on write so
+ * arrays handed out earlier never change.
+ */
+function applyLog(state: IndexState, tail: TailRead): void {
+  if (tail.bytes === 0) return;
+  state.logBytes += tail.bytes;
+
+  const entries = state.entries.slice();
+  for (const line of tail.lines) {
+    if (line.trim().length === 0) continue;
+    let record: IndexLogRecord;
+    try {
+      record = JSON.parse(line) as IndexLogRecord;
+    } catch {
+      console.error("[twining] Skipping corrupt line in decisions/index.log.jsonl");
+      continue;
+    }
+    state.logRecords++;
+
+    if (record.op === "create") {
+      // Already in the snapshot if the log outlived a compaction
+      if (state.positions.has(record.entry.id)) continue;
+      const position = entries.length;
+      entries.push(record.entry);
+      state.positions.set(record.entry.id, position);
+      if (state.lookups) addLookups(state.lookups, record.entry, position);
+      continue;
+    }
+
+    const position = state.positions.get(record.id);
+    if (position === undefined) continue;
+    const entry = entries[position]!;
+    if (record.op === "status") {
+      entries[position] = { ...entry, status: record.status };
+    } else if (!(entry.commit_hashes ?? []).includes(record.hash)) {
+      entries[position] = {
+        ...entry,
+        commit_hashes: [...(entry.commit_hashes ?? []), record.hash],
+      };
+    }
+  }
+  state.entries = entries;
+}
+
+function buildLookups(entries: DecisionIndexEntry[]): ScopeLookups {
+  const lookups: ScopeLookups = {
+    scopes: new ScopeIndex(),
+    files: new ScopeIndex(),
+    symbols: new Map(),
+  };
+  entries.forEach((entry, position) => addLookups(lookups, entry, position));
+  return lookups;
+}
+
+function addLookups(
+  lookups: ScopeLookups,
+  entry: DecisionIndexEntry,
+  position: number,
+): void {
+  lookups.scopes.add(entry.scope, position);
+  for (const file of entry.affected_files ?? []) {
+    lookups.files.add(file, position);
+  }
+  for (const symbol of entry.affected_symbols ?? []) {
+    const positions = lookups.symbols.get(symbol);
+    if (positions) positions.push(position);
+    else lookups.symbols.set(symbol, [position]);
+  }
+}
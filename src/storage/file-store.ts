@@ -2,12 +2,29 @@
  * Low-level file I/O with advisory locking.
  * All writes use proper-lockfile for concurrent safety.
  * Engine and store modules use these — never direct fs calls.
+ *
+ * JSONL appends are group-committed: appends to the same file that arrive
+ * within the append window, or while the previous batch is being written,
+ * go out together as one locked write. Each caller's promise resolves once
+ * its line is on disk.
+ *
+ * acquireLock() is the one way stores take a lock: it applies the retry
+ * policy itself so lock waits and retries show up as a traced span.
+ * LOCK_OPTIONS is the shared policy, and readRange()/readTail() are the
+ * shared readers for stores that follow an append-only file's tail.
  */
 import fs from "node:fs";
 import path from "node:path";
+import { performance } from "node:perf_hooks";
 import lockfile from "proper-lockfile";
+import { span, setSpanAttributes } from "../utils/tracing.js";
 
-const LOCK_OPTIONS: lockfile.LockOptions = {
+/**
+ * The lock policy every store uses: retry with backoff for about 4.5s,
+ * and treat a lock as stale after 10s. Pass it to acquireLock(), spread
+ * with any per-file options (e.g. `realpath: false`).
+ */
+export const LOCK_OPTIONS: lockfile.LockOptions = {
   retries: { retries: 10, factor: 1.5, minTimeout: 50, maxTimeout: 1000 },
   stale: 10000,
   onCompromised: (err) => {
@@ -15,6 +32,120 @@ const LOCK_OPTIONS: lockfile.LockOptions = {
   },
 };
 
+/** When to fsync group-committed appends. */
+export type FsyncPolicy = "none" | "batch";
+
+export interface AppendOptions {
+  /** Wait this long for more appends before writing a batch (0 = same tick) */
+  window_ms: number;
+  /** "batch" fsyncs after each group write; "none" leaves it to the OS */
+  fsync: FsyncPolicy;
+}
+
+const DEFAULT_APPEND_OPTIONS: AppendOptions = { window_ms: 0, fsync: "none" };
+
+let appendOptions: AppendOptions = { ...DEFAULT_APPEND_OPTIONS };
+
+interface PendingAppend {
+  line: string;
+  resolve: () => void;
+  reject: (err: unknown) => void;
+}
+
+/** Per-file group-commit state. */
+interface AppendQueue {
+  pending: PendingAppend[];
+  /** Batch currently being written, if any. */
+  writing: Promise<void> | null;
+  timer: NodeJS.Timeout | null;
+}
+
+const appendQueues = new Map<string, AppendQueue>();
+
+/** Set the append window and fsync policy (process-wide). */
+export function configureAppends(options?: Partial<AppendOptions>): void {
+  appendOptions = {
+    window_ms: options?.window_ms ?? DEFAULT_APPEND_OPTIONS.window_ms,
+    fsync: options?.fsync ?? DEFAULT_APPEND_OPTIONS.fsync,
+  };
+}
+
+/** Write every queued append now. Call on shutdown so no lines are lost. */
+export async function flushAppends(): Promise<void> {
+  const writes: Promise<void>[] = [];
+  for (const [filePath, queue] of appendQueues) {
+    if (queue.timer) {
+      clearTimeout(queue.timer);
+      queue.timer = null;
+    }
+    writes.push(drainAppends(filePath, queue));
+  }
+  await Promise.all(writes);
+}
+
+/**
+ * Take an advisory lock on filePath, retrying with the backoff in
+ * `options.retries` (LOCK_OPTIONS by default) while another holder has
+ * it. Recorded as a "lock" span with the wait time and number of retries.
+ */
+export async function acquireLock(
+  filePath: string,
+  options: lockfile.LockOptions = LOCK_OPTIONS,
+): Promise<() => Promise<void>> {
+  return span(
+    "lock",
+    async () => {
+      const policy = retryPolicy(options.retries);
+      const started = performance.now();
+      for (let attempt = 0; ; attempt++) {
+        try {
+          const release = await lockfile.lock(filePath, { ...options, retries: 0 });
+          setSpanAttributes({
+            retries: attempt,
+            wait_ms: Math.round((performance.now() - started) * 1000) / 1000,
+          });
+          return release;
+        } catch (err) {
+          if ((err as { code?: string }).code !== "ELOCKED" || attempt >= policy.retries) {
+            setSpanAttributes({ retries: attempt });
+            throw err;
+          }
+          const delay = Math.min(
+            policy.minTimeout * policy.factor ** attempt,
+            policy.maxTimeout,
+          );
+          await new Promise((resolve) => setTimeout(resolve, delay));
+        }
+      }
+    },
+    { file: path.basename(filePath) },
+  );
+}
+
+interface RetryPolicy {
+  retries: number;
+  factor: number;
+  minTimeout: number;
+  maxTimeout: number;
+}
+
+/** proper-lockfile's `retries` option with the retry package's defaults filled in. */
+function retryPolicy(retries: lockfile.LockOptions["retries"]): RetryPolicy {
+  const defaults: RetryPolicy = {
+    retries: 0,
+    factor: 2,
+    minTimeout: 1000,
+    maxTimeout: Infinity,
+  };
+  if (typeof retries === "number") return { ...defaults, retries };
+  return {
+    retries: retries?.retries ?? defaults.retries,
+    factor: retries?.factor ?? defaults.factor,
+    minTimeout: retries?.minTimeout ?? defaults.minTimeout,
+    maxTimeout: retries?.maxTimeout ?? defaults.maxTimeout,
+  };
+}
+
 /** Read and parse a JSON file. Throws if file doesn't exist. */
 export async function readJSON<T>(filePath: string): Promise<T> {
   const content = fs.readFileSync(filePath, "utf-8");
@@ -35,7 +166,7 @@ export async function writeJSON(
   if (!fs.existsSync(filePath)) {
     fs.writeFileSync(filePath, "");
   }
-  const release = await lockfile.lock(filePath, LOCK_OPTIONS);
+  const release = await acquireLock(filePath, LOCK_OPTIONS);
   try {
     fs.writeFileSync(filePath, JSON.stringify(data, null, 2));
   } finally {
@@ -43,10 +174,93 @@ export async function writeJSON(
   }
 }
 
-/** Append a single JSON object as a line to a JSONL file under advisory lock. */
+/**
+ * Append a single JSON object as a line to a JSONL file under advisory lock.
+ * Resolves once the line is written; concurrent appends to the same file
+ * share one locked write.
+ */
 export async function appendJSONL(
   filePath: string,
   data: unknown,
+): Promise<void> {
+  return enqueueAppend(filePath, JSON.stringify(data) + "\n");
+}
+
+/**
+ * Append several JSON objects as lines in one write. The lines always
+ * land together and in order, never split across group commits.
+ */
+export async function appendJSONLBatch(
+  filePath: string,
+  records: unknown[],
+): Promise<void> {
+  if (records.length === 0) return;
+  return enqueueAppend(
+    filePath,
+    records.map((record) => JSON.stringify(record) + "\n").join(""),
+  );
+}
+
+/** Queue text for the file's next group write. */
+function enqueueAppend(filePath: string, line: string): Promise<void> {
+  let queue = appendQueues.get(filePath);
+  if (!queue) {
+    queue = { pending: [], writing: null, timer: null };
+    appendQueues.set(filePath, queue);
+  }
+  const done = new Promise<void>((resolve, reject) => {
+    queue.pending.push({ line, resolve, reject });
+  });
+  // A batch in flight picks up the queue when it finishes
+  if (!queue.writing && !queue.timer) {
+    const q = queue;
+    q.timer = setTimeout(() => {
+      q.timer = null;
+      void drainAppends(filePath, q);
+    }, appendOptions.window_ms);
+  }
+  return done;
+}
+
+/** Write queued appends in batches until the queue is empty. */
+async function drainAppends(filePath: string, queue: AppendQueue): Promise<void> {
+  while (queue.writing) await queue.writing;
+  if (queue.pending.length === 0) return;
+
+  const batch = queue.pending;
+  queue.pending = [];
+  queue.writing = writeAppendBatch(filePath, batch);
+  try {
+    await queue.writing;
+  } finally {
+    queue.writing = null;
+  }
+  if (queue.pending.length > 0 && !queue.timer) {
+    await drainAppends(filePath, queue);
+  }
+}
+
+/** One locked write for a batch of lines; settles every caller in it. */
+async function writeAppendBatch(
+  filePath: string,
+  batch: PendingAppend[],
+): Promise<void> {
+  try {
+    await span("append.batch", () => writeBatchLines(filePath, batch), {
+      file: path.basename(filePath),
+      lines: batch.length,
+    });
+  } catch (err) {
+    for (const p of batch) p.reject(err);
+    return;
+  }
+  for (const p of batch) p.resolve();
+}
+
+/** Append a batch's lines to filePath under lock. */
+async function writeBatchLines(
+  filePath: string,
+  batch: PendingAppend[],
 ): Promise<void> {
   // Ensure file exists for locking
   if (!fs.existsSync(filePath)) {
@@ -56,9 +270,15 @@ export async function appendJSONL(
     }
     fs.writeFileSync(filePath, "");
   }
-  const release = await lockfile.lock(filePath, LOCK_OPTIONS);
+  const release = await acquireLock(filePath, LOCK_OPTIONS);
   try {
-    fs.appendFileSync(filePath, JSON.stringify(data) + "\n");
+    const fd = fs.openSync(filePath, "a");
+    try {
+      fs.appendFileSync(fd, batch.map((p) => p.line).join(""));
+      if (appendOptions.fsync === "batch") fs.fsyncSync(fd);
+    } finally {
+      fs.closeSync(fd);
+    }
   } finally {
     await release();
   }
@@ -86,6 +306,65 @@ export async function readJSONL<T>(filePath: string): Promise<T[]> {
   return results;
 }
 
+/** Read up to `length` bytes of a file starting at `position`. */
+export function readRange(filePath: string, position: number, length: number): Buffer {
+  const fd = fs.openSync(filePath, "r");
+  try {
+    const buf = Buffer.allocUnsafe(length);
+    const read = fs.readSync(fd, buf, 0, length, position);
+    return buf.subarray(0, read);
+  } finally {
+    fs.closeSync(fd);
+  }
+}
+
+/** Complete lines read from the end of an append-only file. */
+export interface TailRead {
+  /** Lines up to the last newline, without their newlines */
+  lines: string[];
+  /** Bytes consumed: the caller's offset advances by this much */
+  bytes: number;
+}
+
+/**
+ * Read the lines appended to filePath between byte `offset` and `end`.
+ * Stops at the last newline, so a line still being written is left for
+ * the next read; returns no lines (and 0 bytes) until one is complete.
+ */
+export function readTail(filePath: string, offset: number, end: number): TailRead {
+  if (end <= offset) return { lines: [], bytes: 0 };
+  const buf = readRange(filePath, offset, end - offset);
+  const lastNewline = buf.lastIndexOf(0x0a);
+  if (lastNewline < 0) return { lines: [], bytes: 0 }; // Only a partial line so far
+  return {
+    lines: buf.toString("utf-8", 0, lastNewline).split("\n"),
+    bytes: lastNewline + 1,
+  };
+}
+
+/**
+ * Whether an append-only file read up to `offset` was replaced or
+ * truncated since, so the caller has to re-read it from the start.
+ * `stat` is null when the file is missing.
+ */
+export function tailInvalidated(
+  stat: fs.Stats | null,
+  ino: number,
+  offset: number,
+): boolean {
+  if (!stat) return offset > 0;
+  return stat.ino !== ino || stat.size < offset;
+}
+
+/** fs.statSync, or null if the file doesn't exist. */
+export function statOrNull(filePath: string): fs.Stats | null {
+  try {
+    return fs.statSync(filePath);
+  } catch {
+    return null;
+  }
+}
+
 /**
  * Overwrite a JSONL file atomically under lock.
  * Used by archiver to rewrite blackboard after removing archived entries.
@@ -103,7 +382,7 @@ export async function writeJSONL(
   if (!fs.existsSync(filePath)) {
     fs.writeFileSync(filePath, "");
   }
-  const release = await lockfile.lock(filePath, LOCK_OPTIONS);
+  const release = await acquireLock(filePath, LOCK_OPTIONS);
   try {
     const content =
       data.length > 0
@@ -0,0 +1,216 @@
+/**
+ * Compact adjacency for knowledge graph traversal.
+ * Edges are stored CSR-style: one offsets array indexed by node and flat
+ * typed arrays of neighbor, relation and relation-type per edge slot, with
+ * each relation contributing an outgoing slot at its source and an
+ * incoming slot at its target. Relation types are interned to bit
+ * positions so a traversal filters with one AND per edge, and per-node
+ * masks let it skip nodes with no matching edges at all.
+ *
+ * Relations added after the CSR arrays were built go to a small overflow
+ * list per node; the owner rebuilds once that grows (needsRebuild).
+ * Neighbor order per node matches relation order, outgoing before incoming
+ * for a self-loop, as the old adjacency-list traversal produced.
+ */
+import type { Relation } from "../utils/types.js";
+
+/** Relation types beyond this many share the last bit and are re-checked by name. */
+const MAX_TYPE_BITS = 32;
+
+/** Mask matching every relation type. */
+export const ALL_RELATION_TYPES = 0xffffffff;
+
+interface PendingEdge {
+  target: number;
+  relation: number;
+  typeBit: number;
+  incoming: boolean;
+}
+
+export class GraphAdjacency {
+  private readonly nodeIds: string[] = [];
+  private readonly nodeIndex = new Map<string, number>();
+  private readonly typeBits = new Map<string, number>();
+  private readonly relations: Relation[] = [];
+  /** Bitmask of relation types on each node's outgoing and incoming edges. */
+  private readonly outMask: number[] = [];
+  private readonly inMask: number[] = [];
+
+  // CSR arrays covering the first `baseNodes` nodes
+  private offsets = new Uint32Array(1);
+  private neighbors = new Uint32Array(0);
+  private edgeRelations = new Uint32Array(0);
+  private edgeTypes = new Uint8Array(0);
+  private edgeIncoming = new Uint8Array(0);
+  private baseNodes = 0;
+
+  private readonly pending = new Map<number, PendingEdge[]>();
+  private pendingCount = 0;
+
+  /** Build adjacency for a set of relations, in order. */
+  static build(relations: Iterable<Relation>): GraphAdjacency {
+    const adjacency = new GraphAdjacency();
+    const sources: number[] = [];
+    const targets: number[] = [];
+    const types: number[] = [];
+
+    for (const relation of relations) {
+      sources.push(adjacency.node(relation.source));
+      targets.push(adjacency.node(relation.target));
+      types.push(adjacency.typeBit(relation.type));
+      adjacency.relations.push(relation);
+    }
+
+    const n = adjacency.nodeIds.length;
+    const m = adjacency.relations.length;
+    const offsets = new Uint32Array(n + 1);
+    for (let r = 0; r < m; r++) {
+      const s = sources[r]! + 1;
+      const t = targets[r]! + 1;
+      offsets[s] = offsets[s]! + 1;
+      offsets[t] = offsets[t]! + 1;
+    }
+    for (let i = 0; i < n; i++) offsets[i + 1] = offsets[i + 1]! + offsets[i]!;
+
+    const cursor = offsets.slice(0, n);
+    const neighbors = new Uint32Array(2 * m);
+    const edgeRelations = new Uint32Array(2 * m);
+    const edgeTypes = new Uint8Array(2 * m);
+    const edgeIncoming = new Uint8Array(2 * m);
+    for (let r = 0; r < m; r++) {
+      const s = sources[r]!;
+      const t = targets[r]!;
+      const bit = types[r]!;
+
+      const out = cursor[s]!;
+      cursor[s] = out + 1;
+      neighbors[out] = t;
+      edgeRelations[out] = r;
+      edgeTypes[out] = bit;
+      adjacency.outMask[s] = adjacency.outMask[s]! | (1 << bit);
+
+      const inc = cursor[t]!;
+      cursor[t] = inc + 1;
+      neighbors[inc] = s;
+      edgeRelations[inc] = r;
+      edgeTypes[inc] = bit;
+      edgeIncoming[inc] = 1;
+      adjacency.inMask[t] = adjacency.inMask[t]! | (1 << bit);
+    }
+
+    adjacency.offsets = offsets;
+    adjacency.neighbors = neighbors;
+    adjacency.edgeRelations = edgeRelations;
+    adjacency.edgeTypes = edgeTypes;
+    adjacency.edgeIncoming = edgeIncoming;
+    adjacency.baseNodes = n;
+    return adjacency;
+  }
+
+  /** Add a relation without rebuilding the CSR arrays. */
+  addRelation(relation: Relation): void {
+    const s = this.node(relation.source);
+    const t = this.node(relation.target);
+    const bit = this.typeBit(relation.type);
+    const r = this.relations.length;
+    this.relations.push(relation);
+
+    this.pushPending(s, { target: t, relation: r, typeBit: bit, incoming: false });
+    this.pushPending(t, { target: s, relation: r, typeBit: bit, incoming: true });
+    this.outMask[s] = this.outMask[s]! | (1 << bit);
+    this.inMask[t] = this.inMask[t]! | (1 << bit);
+  }
+
+  /** True once enough relations were added incrementally to warrant a rebuild. */
+  needsRebuild(): boolean {
+    return this.pendingCount > 256 + this.neighbors.length / 8;
+  }
+
+  /** Node index of an entity ID, or undefined if it has no relations. */
+  indexOf(id: string): number | undefined {
+    return this.nodeIndex.get(id);
+  }
+
+  /** Entity ID of a node. */
+  idOf(node: number): string {
+    return this.nodeIds[node]!;
+  }
+
+  /** Mask for a set of relation types; undefined means all types. */
+  typeMask(types?: readonly string[]): number {
+    if (!types) return ALL_RELATION_TYPES;
+    let mask = 0;
+    for (const type of types) {
+      const bit = this.typeBits.get(type);
+      if (bit !== undefined) mask |= 1 << bit;
+    }
+    return mask;
+  }
+
+  /** Whether a node has an outgoing edge of a type in `mask`. */
+  hasOutgoing(node: number, mask: number): boolean {
+    return ((this.outMask[node] ?? 0) & mask) !== 0;
+  }
+
+  /**
+   * Visit a node's edges whose relation type is in `mask`, in relation
+   * order. `types` is only consulted for types sharing the overflow bit.
+   */
+  forEachEdge(
+    node: number,
+    mask: number,
+    visit: (neighbor: number, relation: Relation, incoming: boolean) => void,
+    types?: ReadonlySet<string>,
+  ): void {
+    if ((((this.outMask[node] ?? 0) | (this.inMask[node] ?? 0)) & mask) === 0) {
+      return;
+    }
+
+    const matches = (bit: number, relation: Relation): boolean =>
+      (mask & (1 << bit)) !== 0 &&
+      (bit < MAX_TYPE_BITS - 1 || !types || types.has(relation.type));
+
+    if (node < this.baseNodes) {
+      const end = this.offsets[node + 1]!;
+      for (let slot = this.offsets[node]!; slot < end; slot++) {
+        const relation = this.relations[this.edgeRelations[slot]!]!;
+        if (!matches(this.edgeTypes[slot]!, relation)) continue;
+        visit(this.neighbors[slot]!, relation, this.edgeIncoming[slot] === 1);
+      }
+    }
+
+    for (const edge of this.pending.get(node) ?? []) {
+      const relation = this.relations[edge.relation]!;
+      if (!matches(edge.typeBit, relation)) continue;
+      visit(edge.target, relation, edge.incoming);
+    }
+  }
+
+  private node(id: string): number {
+    let index = this.nodeIndex.get(id);
+    if (index === undefined) {
+      index = this.nodeIds.length;
+      this.nodeIds.push(id);
+      this.nodeIndex.set(id, index);
+      this.outMask.push(0);
+      this.inMask.push(0);
+    }
+    return index;
+  }
+
+  private typeBit(type: string): number {
+    let bit = this.typeBits.get(type);
+    if (bit === undefined) {
+      bit = Math.min(this.typeBits.size, MAX_TYPE_BITS - 1);
+      this.typeBits.set(type, bit);
+    }
+    return bit;
+  }
+
+  private pushPending(node: number, edge: PendingEdge): void {
+    const edges = this.pending.get(node);
+    if (edges) edges.push(edge);
+    else this.pending.set(node, [edge]);
+    this.pendingCount++;
+  }
+}
@@ -1,30 +1,105 @@
 /**
  * Knowledge graph storage layer.
  * Manages entities (upsert semantics) and relations with entity resolution.
- * Uses file-store readJSON/writeJSON with proper-lockfile for concurrent safety.
+ *
+ * The graph is held in memory with hash indexes by id, by name+type and by
+ * name. On disk it is a snapshot (graph/entities.json, graph/relations.json)
+ * plus a write-ahead log (graph/graph.log.jsonl) of entity upserts, new
+ * relations and removals. Writes go through applyBatch(), which resolves a
+ * whole batch against the in-memory graph and appends it as a single write
+ * under one lock. Readers replay the log onto the snapshot once, then only
+ * apply lines appended since. The log is folded into a new snapshot in the
+ * background once it crosses a size threshold. A CSR adjacency for
+ * traversals is built on demand and extended as relations are appended.
  */
 import fs from "node:fs";
 import path from "node:path";
-import lockfile from "proper-lockfile";
+import {
+  acquireLock,
+  readTail,
+  statOrNull,
+  tailInvalidated,
+  type TailRead,
+} from "./file-store.js";
 import { generateId } from "../utils/ids.js";
+import { GraphAdjacency } from "./graph-adjacency.js";
 import type { Entity, Relation } from "../utils/types.js";
+import { TwiningError } from "../utils/errors.js";
 
-const LOCK_OPTIONS: lockfile.LockOptions = {
-  retries: { retries: 10, factor: 1.5, minTimeout: 50, maxTimeout: 1000 },
-  stale: 10000,
-};
+/** Log records that trigger folding the log into a new snapshot. */
+const DEFAULT_COMPACT_THRESHOLD = 1000;
 
-import { TwiningError } from "../utils/errors.js";
+/** One mutation in a graph batch. Relation endpoints are entity IDs or names. */
+export type GraphMutation =
+  | {
+      kind: "entity";
+      name: string;
+      type: Entity["type"];
+      properties?: Record<string, string>;
+    }
+  | {
+      kind: "relation";
+      source: string;
+      target: string;
+      type: Relation["type"];
+      properties?: Record<string, string>;
+    };
+
+/** Outcome of applyBatch(), in mutation order. */
+export interface GraphBatchResult {
+  entities: Entity[];
+  relations: Relation[];
+  /** Relations dropped because an endpoint didn't resolve (skip_unresolved). */
+  skipped: TwiningError[];
+}
+
+/** One line of the graph write-ahead log. */
+type GraphLogRecord =
+  | { op: "entity"; entity: Entity }
+  | { op: "relation"; relation: Relation }
+  | { op: "remove"; ids: string[] };
+
+/** The graph as replayed from snapshot + log, advanced incrementally. */
+interface GraphState {
+  /** mtime:size of each snapshot file ("" if missing). */
+  entitiesVersion: string;
+  relationsVersion: string;
+  logIno: number;
+  /** Bytes of the log consumed so far (always ends on a newline). */
+  logBytes: number;
+  /** Log records applied since the snapshot. */
+  logRecords: number;
+  entities: Map<string, Entity>;
+  /** `${name}\0${type}` -> entity id */
+  byKey: Map<string, string>;
+  byName: Map<string, Set<string>>;
+  relations: Map<string, Relation>;
+  /** Array views handed to readers; rebuilt after changes. */
+  entityList: Entity[] | null;
+  relationList: Relation[] | null;
+  /** Built on first traversal; extended on new relations, dropped on removals. */
+  adjacency: GraphAdjacency | null;
+}
 
 export class GraphStore {
   private readonly entitiesPath: string;
   private readonly relationsPath: string;
+  private readonly logPath: string;
   private readonly graphDir: string;
+  private readonly compactThreshold: number;
+  private state: GraphState | null = null;
+  private gen = 0;
+  private compacting: Promise<void> | null = null;
 
-  constructor(twiningDir: string) {
+  constructor(twiningDir: string, options?: { compact_threshold?: number }) {
     this.graphDir = path.join(twiningDir, "graph");
     this.entitiesPath = path.join(this.graphDir, "entities.json");
     this.relationsPath = path.join(this.graphDir, "relations.json");
+    this.logPath = path.join(this.graphDir, "graph.log.jsonl");
+    this.compactThreshold = Math.max(
+      1,
+      options?.compact_threshold ?? DEFAULT_COMPACT_THRESHOLD,
+    );
   }
 
   /** Ensure graph directory and files exist. */
@@ -50,51 +125,8 @@ export class GraphStore {
     type: Entity["type"];
     properties?: Record<string, string>;
   }): Promise<Entity> {
-    this.ensureFiles();
-
-    const release = await lockfile.lock(this.entitiesPath, LOCK_OPTIONS);
-    try {
-      const entities = JSON.parse(
-        fs.readFileSync(this.entitiesPath, "utf-8"),
-      ) as Entity[];
-
-      const now = new Date().toISOString();
-      const existing = entities.find(
-        (e) => e.name === input.name && e.type === input.type,
-      );
-
-      if (existing) {
-        // Upsert: merge properties and update timestamp
-        existing.properties = {
-          ...existing.properties,
-          ...(input.properties ?? {}),
-        };
-        existing.updated_at = now;
-        fs.writeFileSync(
-          this.entitiesPath,
-          JSON.stringify(entities, null, 2),
-        );
-        return existing;
-      }
-
-      // Create new
-      const entity: Entity = {
-        id: generateId(),
-        name: input.name,
-        type: input.type,
-        properties: input.properties ?? {},
-        created_at: now,
-        updated_at: now,
-      };
-      entities.push(entity);
-      fs.writeFileSync(
-        this.entitiesPath,
-        JSON.stringify(entities, null, 2),
-      );
-      return entity;
-    } finally {
-      await release();
-    }
+    const result = await this.applyBatch([{ kind: "entity", ...input }]);
+    return result.entities[0]!;
   }
 
   /**
@@ -108,83 +140,174 @@ export class GraphStore {
     type: Relation["type"];
     properties?: Record<string, string>;
   }): Promise<Relation> {
-    this.ensureFiles();
+    const result = await this.applyBatch([{ kind: "relation", ...input }]);
+    return result.relations[0]!;
+  }
 
-    const entities = JSON.parse(
-      fs.readFileSync(this.entitiesPath, "utf-8"),
-    ) as Entity[];
-
-    const resolveEntity = (ref: string): Entity => {
-      // Try by ID first
-      const byId = entities.find((e) => e.id === ref);
-      if (byId) return byId;
-
-      // Try by name
-      const byName = entities.filter((e) => e.name === ref);
-      if (byName.length === 0) {
-        throw new TwiningError(
-          `Entity not found: "${ref}"`,
-          "NOT_FOUND",
-        );
-      }
-      if (byName.length > 1) {
-        const matches = byName.map((e) => `${e.name} (${e.type})`).join(", ");
-        throw new TwiningError(
-          `Ambiguous entity name "${ref}" matches: ${matches}`,
-          "AMBIGUOUS_ENTITY",
-        );
-      }
-      return byName[0]!;
-    };
+  /**
+   * Apply entity upserts and new relations as one durable write.
+   * Mutations are resolved in order, so relations may refer to entities
+   * created earlier in the same batch. The batch is all-or-nothing: if a
+   * relation endpoint is missing or ambiguous, nothing is written and the
+   * error is thrown — unless skip_unresolved is set, in which case that
+   * relation is dropped and reported in `skipped`.
+   */
+  async applyBatch(
+    mutations: GraphMutation[],
+    options?: { skip_unresolved?: boolean },
+  ): Promise<GraphBatchResult> {
+    const result: GraphBatchResult = { entities: [], relations: [], skipped: [] };
+    if (mutations.length === 0) return result;
 
-    const sourceEntity = resolveEntity(input.source);
-    const targetEntity = resolveEntity(input.target);
+    await this.writeUnderLock((state) => {
+      // Stage changes over the current graph; only logged once all resolve
+      const staged = new Map<string, Entity>();
+      const stagedByKey = new Map<string, string>();
+      const stagedByName = new Map<string, Set<string>>();
+      const relations: Relation[] = [];
+      const now = new Date().toISOString();
 
-    const release = await lockfile.lock(this.relationsPath, LOCK_OPTIONS);
-    try {
-      const relations = JSON.parse(
-        fs.readFileSync(this.relationsPath, "utf-8"),
-      ) as Relation[];
+      const lookup = (id: string): Entity | undefined =>
+        staged.get(id) ?? state.entities.get(id);
 
-      const relation: Relation = {
-        id: generateId(),
-        source: sourceEntity.id,
-        target: targetEntity.id,
-        type: input.type,
-        properties: input.properties ?? {},
-        created_at: new Date().toISOString(),
+      const resolveEntity = (ref: string): Entity => {
+        // Try by ID first
+        const byId = lookup(ref);
+        if (byId) return byId;
+
+        // Try by name
+        const ids = new Set([
+          ...(state.byName.get(ref) ?? []),
+          ...(stagedByName.get(ref) ?? []),
+        ]);
+        const byName = [...ids].map((id) => lookup(id)!);
+        if (byName.length === 0) {
+          throw new TwiningError(
+            `Entity not found: "${ref}"`,
+            "NOT_FOUND",
+          );
+        }
+        if (byName.length > 1) {
+          const matches = byName.map((e) => `${e.name} (${e.type})`).join(", ");
+          throw new TwiningError(
+            `Ambiguous entity name "${ref}" matches: ${matches}`,
+            "AMBIGUOUS_ENTITY",
+          );
+        }
+        return byName[0]!;
       };
-      relations.push(relation);
-      fs.writeFileSync(
-        this.relationsPath,
-        JSON.stringify(relations, null, 2),
-      );
-      return relation;
-    } finally {
-      await release();
-    }
+
+      for (const mutation of mutations) {
+        if (mutation.kind === "entity") {
+          const key = entityKey(mutation.name, mutation.type);
+          const existingId = stagedByKey.get(key) ?? state.byKey.get(key);
+          const existing = existingId !== undefined ? lookup(existingId) : undefined;
+
+          let entity: Entity;
+          if (existing) {
+            // Upsert: merge properties and update timestamp
+            entity = {
+              ...existing,
+              properties: {
+                ...existing.properties,
+                ...(mutation.properties ?? {}),
+              },
+              updated_at: now,
+            };
+          } else {
+            entity = {
+              id: generateId(),
+              name: mutation.name,
+              type: mutation.type,
+              properties: mutation.properties ?? {},
+              created_at: now,
+              updated_at: now,
+            };
+            stagedByKey.set(key, entity.id);
+            addToSet(stagedByName, entity.name, entity.id);
+          }
+          staged.set(entity.id, entity);
+          result.entities.push(entity);
+          continue;
+        }
+
+        let source: Entity;
+        let target: Entity;
+        try {
+          source = resolveEntity(mutation.source);
+          target = resolveEntity(mutation.target);
+        } catch (error) {
+          if (options?.skip_unresolved && error instanceof TwiningError) {
+            result.skipped.push(error);
+            continue;
+          }
+          throw error;
+        }
+
+        const relation: Relation = {
+          id: generateId(),
+          source: source.id,
+          target: target.id,
+          type: mutation.type,
+          properties: mutation.properties ?? {},
+          created_at: now,
+        };
+        relations.push(relation);
+        result.relations.push(relation);
+      }
+
+      // Entities first so replay can resolve relation endpoints
+      const records: GraphLogRecord[] = [];
+      for (const entity of staged.values()) {
+        records.push({ op: "entity", entity });
+      }
+      for (const relation of relations) {
+        records.push({ op: "relation", relation });
+      }
+      return records;
+    });
+
+    return result;
   }
 
   /** Get all entities. Returns [] if file doesn't exist. */
   async getEntities(): Promise<Entity[]> {
-    if (!fs.existsSync(this.entitiesPath)) return [];
-    return JSON.parse(
-      fs.readFileSync(this.entitiesPath, "utf-8"),
-    ) as Entity[];
+    const state = this.refresh();
+    return (state.entityList ??= [...state.entities.values()]);
   }
 
   /** Get all relations. Returns [] if file doesn't exist. */
   async getRelations(): Promise<Relation[]> {
-    if (!fs.existsSync(this.relationsPath)) return [];
-    return JSON.parse(
-      fs.readFileSync(this.relationsPath, "utf-8"),
-    ) as Relation[];
+    const state = this.refresh();
+    return (state.relationList ??= [...state.relations.values()]);
+  }
+
+  /** All entities by ID. A live view — treat as read-only. */
+  async getEntityMap(): Promise<ReadonlyMap<string, Entity>> {
+    return this.refresh().entities;
+  }
+
+  /** Adjacency over all relations, for traversals. Treat as read-only. */
+  async getAdjacency(): Promise<GraphAdjacency> {
+    const state = this.refresh();
+    if (!state.adjacency || state.adjacency.needsRebuild()) {
+      state.adjacency = GraphAdjacency.build(state.relations.values());
+    }
+    return state.adjacency;
+  }
+
+  /**
+   * Counter that increases whenever the graph changes, whether written by
+   * this store or another process. Lets callers memoize derived results.
+   */
+  async generation(): Promise<number> {
+    this.refresh();
+    return this.gen;
   }
 
   /** Find entity by ID. Returns undefined if not found. */
   async getEntityById(id: string): Promise<Entity | undefined> {
-    const entities = await this.getEntities();
-    return entities.find((e) => e.id === id);
+    return this.refresh().entities.get(id);
   }
 
   /** Find entities by name, optionally filtered by type. */
@@ -192,10 +315,13 @@ export class GraphStore {
     name: string,
     type?: string,
   ): Promise<Entity[]> {
-    const entities = await this.getEntities();
-    return entities.filter(
-      (e) => e.name === name && (type === undefined || e.type === type),
-    );
+    const state = this.refresh();
+    const matches: Entity[] = [];
+    for (const id of state.byName.get(name) ?? []) {
+      const entity = state.entities.get(id)!;
+      if (type === undefined || entity.type === type) matches.push(entity);
+    }
+    return matches;
   }
 
   /**
@@ -205,52 +331,237 @@ export class GraphStore {
   async removeEntities(
     entityIds: Set<string>,
   ): Promise<{ removedEntities: number; removedRelations: number }> {
-    this.ensureFiles();
-
     let removedEntities = 0;
     let removedRelations = 0;
 
-    // Lock both files — entities first, then relations
-    const releaseEntities = await lockfile.lock(
-      this.entitiesPath,
-      LOCK_OPTIONS,
-    );
+    await this.writeUnderLock((state) => {
+      const ids = [...entityIds].filter((id) => state.entities.has(id));
+      removedEntities = ids.length;
+      for (const r of state.relations.values()) {
+        if (entityIds.has(r.source) || entityIds.has(r.target)) {
+          removedRelations++;
+        }
+      }
+      return removedEntities > 0 || removedRelations > 0
+        ? [{ op: "remove", ids: [...entityIds] }]
+        : [];
+    });
+
+    return { removedEntities, removedRelations };
+  }
+
+  /**
+   * Fold the log into new entities.json/relations.json snapshots and empty
+   * it. Runs automatically in the background once the log is long enough.
+   */
+  async compact(): Promise<void> {
+    this.ensureFiles();
+    const release = await acquireLock(this.entitiesPath);
     try {
-      const entities = JSON.parse(
-        fs.readFileSync(this.entitiesPath, "utf-8"),
-      ) as Entity[];
-      const before = entities.length;
-      const kept = entities.filter((e) => !entityIds.has(e.id));
-      removedEntities = before - kept.length;
+      const state = this.refresh();
+      if (state.logRecords === 0) return;
+
+      // Snapshots first, then truncate: a crash in between leaves log
+      // records that replay idempotently onto the new snapshots
+      const suffix = `${process.pid}.tmp`;
+      fs.writeFileSync(
+        `${this.entitiesPath}.${suffix}`,
+        JSON.stringify([...state.entities.values()], null, 2),
+      );
       fs.writeFileSync(
-        this.entitiesPath,
-        JSON.stringify(kept, null, 2),
+        `${this.relationsPath}.${suffix}`,
+        JSON.stringify([...state.relations.values()], null, 2),
       );
+      fs.renameSync(`${this.entitiesPath}.${suffix}`, this.entitiesPath);
+      fs.renameSync(`${this.relationsPath}.${suffix}`, this.relationsPath);
+      fs.truncateSync(this.logPath, 0);
     } finally {
-      await releaseEntities();
+      await release();
     }
+  }
 
-    const releaseRelations = await lockfile.lock(
-      this.relationsPath,
-      LOCK_OPTIONS,
-    );
+  /**
+   * Take the graph lock, build log records against the current state and
+   * append them in a single write. Compacts in the background afterwards
+   * if the log has grown past the threshold.
+   */
+  private async writeUnderLock(
+    build: (state: GraphState) => GraphLogRecord[],
+  ): Promise<void> {
+    this.ensureFiles();
+
+    let shouldCompact = false;
+    const release = await acquireLock(this.entitiesPath);
     try {
+      const state = this.refresh();
+      const records = build(state);
+      if (records.length === 0) return;
+
+      // Drop a crashed writer's partial line so ours starts on a boundary
+      if (fs.existsSync(this.logPath)) {
+        if (fs.statSync(this.logPath).size !== state.logBytes) {
+          fs.truncateSync(this.logPath, state.logBytes);
+        }
+      }
+      fs.appendFileSync(
+        this.logPath,
+        records.map((r) => JSON.stringify(r)).join("\n") + "\n",
+      );
+
+      shouldCompact = this.refresh().logRecords >= this.compactThreshold;
+    } finally {
+      await release();
+    }
+
+    if (shouldCompact && !this.compacting) {
+      this.compacting = this.compact()
+        .catch((err) => {
+          console.error("[twining] Graph log compaction failed (non-fatal):", err);
+        })
+        .finally(() => {
+          this.compacting = null;
+        });
+    }
+  }
+
+  /**
+   * Bring the in-memory graph up to date: reload snapshots and log when a
+   * snapshot changed or the log was truncated, otherwise apply only log
+   * lines appended since the last refresh.
+   */
+  private refresh(): GraphState {
+    const entitiesVersion = fileVersion(this.entitiesPath);
+    const relationsVersion = fileVersion(this.relationsPath);
+    const log = statOrNull(this.logPath);
+    const state = this.state;
+
+    if (
+      !state ||
+      state.entitiesVersion !== entitiesVersion ||
+      state.relationsVersion !== relationsVersion ||
+      tailInvalidated(log, state.logIno, state.logBytes)
+    ) {
+      this.state = this.load(entitiesVersion, relationsVersion, log);
+      this.gen++;
+      return this.state;
+    }
+
+    if (log && log.size > state.logBytes) {
+      const before = state.logBytes;
+      applyLog(state, readTail(this.logPath, state.logBytes, log.size));
+      if (state.logBytes !== before) this.gen++;
+    }
+    return state;
+  }
+
+  /** Read both snapshots and replay the whole log. */
+  private load(
+    entitiesVersion: string,
+    relationsVersion: string,
+    log: fs.Stats | null,
+  ): GraphState {
+    const state: GraphState = {
+      entitiesVersion,
+      relationsVersion,
+      logIno: log?.ino ?? 0,
+      logBytes: 0,
+      logRecords: 0,
+      entities: new Map(),
+      byKey: new Map(),
+      byName: new Map(),
+      relations: new Map(),
+      entityList: null,
+      relationList: null,
+      adjacency: null,
+    };
+
+    if (entitiesVersion) {
+      const entities = JSON.parse(
+        fs.readFileSync(this.entitiesPath, "utf-8"),
+      ) as Entity[];
+      for (const entity of entities) putEntity(state, entity);
+    }
+    if (relationsVersion) {
       const relations = JSON.parse(
         fs.readFileSync(this.relationsPath, "utf-8"),
       ) as Relation[];
-      const before = relations.length;
-      const kept = relations.filter(
-        (r) => !entityIds.has(r.source) && !entityIds.has(r.target),
-      );
-      removedRelations = before - kept.length;
-      fs.writeFileSync(
-        this.relationsPath,
-        JSON.stringify(kept, null, 2),
-      );
-    } finally {
-      await releaseRelations();
+      for (const relation of relations) state.relations.set(relation.id, relation);
     }
+    if (log) applyLog(state, readTail(this.logPath, 0, log.size));
+    return state;
+  }
+}
 
-    return { removedEntities, removedRelations };
+/**
+ * Apply log lines read at state.logBytes. Records are idempotent, so
+ * replaying lines already folded into a snapshot is harmless.
+ */
+function applyLog(state: GraphState, tail: TailRead): void {
+  state.logBytes += tail.bytes;
+
+  for (const line of tail.lines) {
+    if (line.trim().length === 0) continue;
+    let record: GraphLogRecord;
+    try {
+      record = JSON.parse(line) as GraphLogRecord;
+    } catch {
+      console.error("[twining] Skipping corrupt line in graph/graph.log.jsonl");
+      continue;
+    }
+    state.logRecords++;
+
+    if (record.op === "entity") {
+      putEntity(state, record.entity);
+      state.entityList = null;
+    } else if (record.op === "relation") {
+      if (state.relations.has(record.relation.id)) {
+        state.adjacency = null;
+      } else {
+        state.adjacency?.addRelation(record.relation);
+      }
+      state.relations.set(record.relation.id, record.relation);
+      state.relationList = null;
+    } else {
+      const ids = new Set(record.ids);
+      for (const id of ids) {
+        const entity = state.entities.get(id);
+        if (!entity) continue;
+        state.entities.delete(id);
+        const key = entityKey(entity.name, entity.type);
+        if (state.byKey.get(key) === id) state.byKey.delete(key);
+        const named = state.byName.get(entity.name);
+        named?.delete(id);
+        if (named && named.size === 0) state.byName.delete(entity.name);
+      }
+      for (const [id, r] of state.relations) {
+        if (ids.has(r.source) || ids.has(r.target)) state.relations.delete(id);
+      }
+      state.entityList = null;
+      state.relationList = null;
+      state.adjacency = null;
+    }
   }
 }
+
+/** Insert or replace an entity and keep the name indexes current. */
+function putEntity(state: GraphState, entity: Entity): void {
+  state.entities.set(entity.id, entity);
+  state.byKey.set(entityKey(entity.name, entity.type), entity.id);
+  addToSet(state.byName, entity.name, entity.id);
+}
+
+function entityKey(name: string, type: string): string {
+  return `${name}\0${type}`;
+}
+
+function addToSet(map: Map<string, Set<string>>, key: string, value: string): void {
+  const set = map.get(key);
+  if (set) set.add(value);
+  else map.set(key, new Set([value]));
+}
+
+/** mtime:size of a file, or "" if it doesn't exist. */
+function fileVersion(filePath: string): string {
+  const stat = statOrNull(filePath);
+  return stat ? `${stat.mtimeMs}:${stat.size}` : "";
+}
@@ -2,10 +2,10 @@
  * Handoff CRUD operations.
  * Individual JSON files per handoff with a JSONL index for fast listing.
  * Follows DecisionStore's individual-file pattern.
+ * The index is cached by mtime along with a scope lookup for list().
  */
 import fs from "node:fs";
 import path from "node:path";
-import lockfile from "proper-lockfile";
 import {
   readJSON,
   writeJSON,
@@ -13,22 +13,31 @@ import {
   readJSONL,
   writeJSONL,
   ensureDir,
+  acquireLock,
 } from "./file-store.js";
 import { generateId } from "../utils/ids.js";
+import { ScopeIndex } from "../utils/scope-index.js";
 import type {
   HandoffRecord,
   HandoffResult,
   HandoffIndexEntry,
 } from "../utils/types.js";
 
-const INDEX_LOCK_OPTIONS: lockfile.LockOptions = {
-  retries: { retries: 10, factor: 1.5, minTimeout: 50, maxTimeout: 1000 },
-  stale: 10000,
-};
+/** Parsed handoff index plus positions by scope. */
+interface CachedIndex {
+  mtimeMs: number;
+  size: number;
+  entries: HandoffIndexEntry[];
+  byScope: ScopeIndex<number>;
+}
 
 export class HandoffStore {
   private readonly handoffsDir: string;
   private readonly indexPath: string;
+  private cachedIndex: CachedIndex | null = null;
+  private gen = 0;
+  /** mtime:size of the index when the generation was last bumped. */
+  private genVersion = "";
 
   constructor(twiningDir: string) {
     this.handoffsDir = path.join(twiningDir, "handoffs");
@@ -88,7 +97,17 @@ export class HandoffStore {
       limit?: number;
     },
   ): Promise<HandoffIndexEntry[]> {
-    let entries = await readJSONL<HandoffIndexEntry>(this.indexPath);
+    const index = await this.readIndex();
+    let entries = index.entries;
+
+    if (filters?.scope) {
+      // Bidirectional prefix match; entries without a scope match any filter
+      entries = [...index.byScope.match(filters.scope)]
+        .sort((a, b) => a - b)
+        .map((p) => index.entries[p]!);
+    } else {
+      entries = entries.slice();
+    }
 
     if (filters) {
       if (filters.source_agent) {
@@ -101,14 +120,6 @@ export class HandoffStore {
           (e) => e.target_agent === filters.target_agent,
         );
       }
-      if (filters.scope) {
-        const filterScope = filters.scope;
-        entries = entries.filter(
-          (e) =>
-            e.scope?.startsWith(filterScope) ||
-            filterScope.startsWith(e.scope ?? ""),
-        );
-      }
       if (filters.since) {
         const since = filters.since;
         entries = entries.filter((e) => e.created_at >= since);
@@ -149,7 +160,7 @@ export class HandoffStore {
     // Lock index for atomic read-modify-write of both file and index.
     // We do direct fs reads/writes inside the lock to avoid nested locking
     // (readJSONL/writeJSONL/writeJSON use their own locks internally).
-    const release = await lockfile.lock(this.indexPath, INDEX_LOCK_OPTIONS);
+    const release = await acquireLock(this.indexPath);
     try {
       let record: HandoffRecord;
       try {
@@ -185,6 +196,51 @@ export class HandoffStore {
     }
   }
 
+  /**
+   * Counter that increases whenever the handoff index changes, whether
+   * written by this store or another process.
+   */
+  async generation(): Promise<number> {
+    await this.readIndex();
+    return this.gen;
+  }
+
+  /** Read the JSONL index, reusing the parsed copy while the file is unchanged. */
+  private async readIndex(): Promise<CachedIndex> {
+    let stat: fs.Stats | null = null;
+    try {
+      stat = fs.statSync(this.indexPath);
+    } catch {
+      // Missing index — nothing to list
+    }
+    if (
+      stat &&
+      this.cachedIndex &&
+      this.cachedIndex.mtimeMs === stat.mtimeMs &&
+      this.cachedIndex.size === stat.size
+    ) {
+      return this.cachedIndex;
+    }
+
+    const version = stat ? `${stat.mtimeMs}:${stat.size}` : "";
+    if (version !== this.genVersion) {
+      this.genVersion = version;
+      this.gen++;
+    }
+
+    const entries = await readJSONL<HandoffIndexEntry>(this.indexPath);
+    const byScope = new ScopeIndex<number>();
+    entries.forEach((e, position) => byScope.add(e.scope ?? "", position));
+    const index: CachedIndex = {
+      mtimeMs: stat?.mtimeMs ?? 0,
+      size: stat?.size ?? 0,
+      entries,
+      byScope,
+    };
+    this.cachedIndex = stat ? index : null;
+    return index;
+  }
+
   /**
    * Compute aggregate result_status and create a lightweight index entry.
    */
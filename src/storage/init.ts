@@ -55,7 +55,7 @@ export function initTwiningDir(projectRoot: string): void {
   // Gitignore (spec section 2.3 + model cache)
   fs.writeFileSync(
     path.join(twiningDir, ".gitignore"),
-    "embeddings/*.index\narchive/\nmodels/\nmetrics.jsonl\n",
+    "embeddings/*.index\nembeddings/*.vec\nembeddings/*.ids\nembeddings/*.meta.json\nembeddings/*.ivf.json\nembeddings/*.terms.jsonl\narchive/\nmodels/\nmetrics.jsonl\nmetrics.rollup.json\ntraces.jsonl\ndaemon.sock\ndaemon.log\nstate.snapshot\n",
   );
 }
 
@@ -0,0 +1,96 @@
+/**
+ * Startup state snapshot.
+ * A fresh process pays for parsing the blackboard segments, the decision
+ * index and the keyword indexes on its first tool calls. With
+ * `startup.snapshot` enabled, a process saves those parsed caches to
+ * .twining/state.snapshot as it shuts down, and the next one preloads them
+ * right after the MCP handshake. Nothing in a snapshot is trusted: each
+ * cached file is checked against its current mtime and size (inode and
+ * length for append-only logs) before use, and only bytes appended since
+ * are parsed. A stale snapshot costs a re-parse, never wrong results.
+ */
+import fs from "node:fs";
+import path from "node:path";
+import v8 from "node:v8";
+import type { BlackboardStore, BlackboardSnapshot } from "./blackboard-store.js";
+import type { DecisionStore, DecisionSnapshot } from "./decision-store.js";
+import type { KeywordIndex, KeywordSnapshot } from "../embeddings/keyword-index.js";
+
+/** Bump when the shape of any store snapshot changes. */
+const FORMAT_VERSION = 1;
+
+interface StateSnapshot {
+  format: number;
+  /** Package version that wrote it; snapshots from other versions are ignored */
+  writer: string;
+  blackboard: BlackboardSnapshot;
+  decisions: DecisionSnapshot;
+  keywords: KeywordSnapshot;
+}
+
+/** The caches a snapshot covers. */
+export interface SnapshotSources {
+  blackboardStore: BlackboardStore;
+  decisionStore: DecisionStore;
+  keywordIndex: KeywordIndex;
+}
+
+export function snapshotPath(twiningDir: string): string {
+  return path.join(twiningDir, "state.snapshot");
+}
+
+/** Write the current parsed state atomically. Never throws. */
+export function saveStateSnapshot(
+  twiningDir: string,
+  sources: SnapshotSources,
+  writer: string,
+): boolean {
+  const file = snapshotPath(twiningDir);
+  const tmp = `${file}.${process.pid}.tmp`;
+  try {
+    const snapshot: StateSnapshot = {
+      format: FORMAT_VERSION,
+      writer,
+      blackboard: sources.blackboardStore.exportSnapshot(),
+      decisions: sources.decisionStore.exportSnapshot(),
+      keywords: sources.keywordIndex.exportSnapshot(),
+    };
+    fs.writeFileSync(tmp, v8.serialize(snapshot));
+    fs.renameSync(tmp, file);
+    return true;
+  } catch (err) {
+    console.error("[twining] State snapshot write failed (non-fatal):", err);
+    try {
+      fs.unlinkSync(tmp);
+    } catch {
+      // Never created
+    }
+    return false;
+  }
+}
+
+/**
+ * Seed the sources' caches from the last snapshot. Returns false when
+ * there is none or it is unreadable or from another version.
+ */
+export function restoreStateSnapshot(
+  twiningDir: string,
+  sources: SnapshotSources,
+  writer: string,
+): boolean {
+  let snapshot: StateSnapshot;
+  try {
+    snapshot = v8.deserialize(fs.readFileSync(snapshotPath(twiningDir))) as StateSnapshot;
+  } catch (err) {
+    if ((err as NodeJS.ErrnoException).code !== "ENOENT") {
+      console.error("[twining] State snapshot unreadable, ignoring (non-fatal):", err);
+    }
+    return false;
+  }
+  if (snapshot?.format !== FORMAT_VERSION || snapshot.writer !== writer) return false;
+
+  sources.blackboardStore.restoreSnapshot(snapshot.blackboard);
+  sources.decisionStore.restoreSnapshot(snapshot.decisions);
+  sources.keywordIndex.restoreSnapshot(snapshot.keywords);
+  return true;
+}
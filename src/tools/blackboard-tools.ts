@@ -1,6 +1,6 @@
 /**
  * MCP tool handlers for blackboard operations.
- * Registers twining_post, twining_read, and twining_recent.
+ * Registers twining_post, twining_post_batch, twining_read, and twining_recent.
  */
 import { z } from "zod";
 import type { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
@@ -8,6 +8,32 @@ import type { BlackboardEngine } from "../engine/blackboard.js";
 import { ENTRY_TYPES } from "../utils/types.js";
 import { toolResult, toolError, TwiningError } from "../utils/errors.js";
 
+/** Fields of one post, shared by twining_post and twining_post_batch. */
+const postInputShape = {
+  entry_type: z.enum(ENTRY_TYPES).describe("Type of blackboard entry"),
+  summary: z
+    .string()
+    .max(200)
+    .describe("One-line summary (max 200 chars)"),
+  detail: z.string().optional().describe("Full context and details"),
+  tags: z
+    .array(z.string())
+    .optional()
+    .describe("Domain tags for filtering"),
+  scope: z
+    .string()
+    .optional()
+    .describe('File path, module name, or "project"'),
+  relates_to: z
+    .array(z.string())
+    .optional()
+    .describe("IDs of related entries"),
+  agent_id: z
+    .string()
+    .optional()
+    .describe("Identifier for the posting agent"),
+};
+
 export function registerBlackboardTools(
   server: McpServer,
   engine: BlackboardEngine,
@@ -18,30 +44,7 @@ export function registerBlackboardTools(
     {
       description:
         "Post an entry to the shared blackboard. Use this to share findings, needs, warnings, status updates, and other coordination messages with other agents. Does NOT accept entry_type 'decision' — use twining_decide instead.",
-      inputSchema: {
-        entry_type: z.enum(ENTRY_TYPES).describe("Type of blackboard entry"),
-        summary: z
-          .string()
-          .max(200)
-          .describe("One-line summary (max 200 chars)"),
-        detail: z.string().optional().describe("Full context and details"),
-        tags: z
-          .array(z.string())
-          .optional()
-          .describe("Domain tags for filtering"),
-        scope: z
-          .string()
-          .optional()
-          .describe('File path, module name, or "project"'),
-        relates_to: z
-          .array(z.string())
-          .optional()
-          .describe("IDs of related entries"),
-        agent_id: z
-          .string()
-          .optional()
-          .describe("Identifier for the posting agent"),
-      },
+      inputSchema: postInputShape,
     },
     async (args) => {
       try {
@@ -59,6 +62,37 @@ export function registerBlackboardTools(
     },
   );
 
+  // twining_post_batch — Post several entries in one call
+  server.registerTool(
+    "twining_post_batch",
+    {
+      description:
+        "Post several blackboard entries in one call, e.g. a batch of findings. Each item takes the same fields as twining_post. Returns one result per item, in order: the entry's id, or an error for that item alone.",
+      inputSchema: {
+        entries: z
+          .array(z.object(postInputShape))
+          .min(1)
+          .max(100)
+          .describe("Entries to post (max 100)"),
+      },
+    },
+    async (args) => {
+      try {
+        const results = await engine.postBatch(args.entries);
+        const failed = results.filter((r) => "error" in r).length;
+        return toolResult({ results, posted: results.length - failed, failed });
+      } catch (e) {
+        if (e instanceof TwiningError) {
+          return toolError(e.message, e.code);
+        }
+        return toolError(
+          e instanceof Error ? e.message : "Unknown error",
+          "INTERNAL_ERROR",
+        );
+      }
+    },
+  );
+
   // twining_read — Read blackboard entries with optional filters
   server.registerTool(
     "twining_read",
@@ -89,6 +123,10 @@ export function registerBlackboardTools(
           .number()
           .optional()
           .describe("Max entries to return (default: 50)"),
+        include_archived: z
+          .boolean()
+          .optional()
+          .describe("Also read archived entries (slower; default: false)"),
       },
     },
     async (args) => {
@@ -120,6 +158,10 @@ export function registerBlackboardTools(
           .number()
           .optional()
           .describe("Max results (default: 10)"),
+        include_archived: z
+          .boolean()
+          .optional()
+          .describe("Also search archived entries by keyword (default: false)"),
       },
     },
     async (args) => {
@@ -127,6 +169,7 @@ export function registerBlackboardTools(
         const result = await engine.query(args.query, {
           entry_types: args.entry_types,
           limit: args.limit,
+          include_archived: args.include_archived,
         });
         return toolResult(result);
       } catch (e) {
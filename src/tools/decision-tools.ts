@@ -1,12 +1,82 @@
 /**
  * MCP tool handlers for decision operations.
- * Registers twining_decide, twining_why, twining_commits, twining_trace, twining_reconsider, twining_override, twining_promote.
+ * Registers twining_decide, twining_decide_batch, twining_why, twining_commits, twining_trace, twining_reconsider, twining_override, twining_promote.
  */
 import { z } from "zod";
 import type { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
 import type { DecisionEngine } from "../engine/decisions.js";
 import { toolResult, toolError, TwiningError } from "../utils/errors.js";
 
+/** Fields of one decision, shared by twining_decide and twining_decide_batch. */
+const decisionInputShape = {
+  domain: z
+    .string()
+    .describe(
+      'Decision domain (e.g., "architecture", "implementation", "testing")',
+    ),
+  scope: z
+    .string()
+    .describe("What part of the codebase this affects"),
+  summary: z.string().describe("One-line decision statement"),
+  context: z.string().describe("Situation that prompted this decision"),
+  rationale: z.string().describe("Reasoning for the choice"),
+  constraints: z
+    .array(z.string())
+    .optional()
+    .describe("What limited the options"),
+  alternatives: z
+    .array(
+      z.object({
+        option: z.string().describe("Alternative option considered"),
+        pros: z
+          .array(z.string())
+          .optional()
+          .describe("Advantages of this alternative"),
+        cons: z
+          .array(z.string())
+          .optional()
+          .describe("Disadvantages of this alternative"),
+        reason_rejected: z
+          .string()
+          .describe("Why this alternative was rejected"),
+      }),
+    )
+    .optional()
+    .describe("Alternatives that were considered"),
+  depends_on: z
+    .array(z.string())
+    .optional()
+    .describe("IDs of prerequisite decisions"),
+  supersedes: z
+    .string()
+    .optional()
+    .describe("ID of decision this replaces"),
+  confidence: z
+    .enum(["high", "medium", "low"])
+    .optional()
+    .describe('Confidence level (default: "medium")'),
+  reversible: z
+    .boolean()
+    .optional()
+    .describe("Whether this decision is easily reversible (default: true)"),
+  affected_files: z
+    .array(z.string())
+    .optional()
+    .describe("File paths affected by this decision"),
+  affected_symbols: z
+    .array(z.string())
+    .optional()
+    .describe("Function/class names affected"),
+  agent_id: z
+    .string()
+    .optional()
+    .describe('Identifier for the deciding agent (default: "main")'),
+  commit_hash: z
+    .string()
+    .optional()
+    .describe("Git commit hash to associate with this decision"),
+};
+
 export function registerDecisionTools(
   server: McpServer,
   engine: DecisionEngine,
@@ -17,74 +87,7 @@ export function registerDecisionTools(
     {
       description:
         "Record a decision with full rationale, alternatives considered, and traceability. Creates a decision record and cross-posts to the blackboard.",
-      inputSchema: {
-        domain: z
-          .string()
-          .describe(
-            'Decision domain (e.g., "architecture", "implementation", "testing")',
-          ),
-        scope: z
-          .string()
-          .describe("What part of the codebase this affects"),
-        summary: z.string().describe("One-line decision statement"),
-        context: z.string().describe("Situation that prompted this decision"),
-        rationale: z.string().describe("Reasoning for the choice"),
-        constraints: z
-          .array(z.string())
-          .optional()
-          .describe("What limited the options"),
-        alternatives: z
-          .array(
-            z.object({
-              option: z.string().describe("Alternative option considered"),
-              pros: z
-                .array(z.string())
-                .optional()
-                .describe("Advantages of this alternative"),
-              cons: z
-                .array(z.string())
-                .optional()
-                .describe("Disadvantages of this alternative"),
-              reason_rejected: z
-                .string()
-                .describe("Why this alternative was rejected"),
-            }),
-          )
-          .optional()
-          .describe("Alternatives that were considered"),
-        depends_on: z
-          .array(z.string())
-          .optional()
-          .describe("IDs of prerequisite decisions"),
-        supersedes: z
-          .string()
-          .optional()
-          .describe("ID of decision this replaces"),
-        confidence: z
-          .enum(["high", "medium", "low"])
-          .optional()
-          .describe('Confidence level (default: "medium")'),
-        reversible: z
-          .boolean()
-          .optional()
-          .describe("Whether this decision is easily reversible (default: true)"),
-        affected_files: z
-          .array(z.string())
-          .optional()
-          .describe("File paths affected by this decision"),
-        affected_symbols: z
-          .array(z.string())
-          .optional()
-          .describe("Function/class names affected"),
-        agent_id: z
-          .string()
-          .optional()
-          .describe('Identifier for the deciding agent (default: "main")'),
-        commit_hash: z
-          .string()
-          .optional()
-          .describe("Git commit hash to associate with this decision"),
-      },
+      inputSchema: decisionInputShape,
     },
     async (args) => {
       try {
@@ -102,6 +105,37 @@ export function registerDecisionTools(
     },
   );
 
+  // twining_decide_batch — Record several decisions in one call
+  server.registerTool(
+    "twining_decide_batch",
+    {
+      description:
+        "Record several decisions in one call. Each item takes the same fields as twining_decide. Conflicts are checked against existing decisions and earlier items in the batch. Returns one result per item, in order: the decision's id and any conflicts, or an error for that item alone.",
+      inputSchema: {
+        decisions: z
+          .array(z.object(decisionInputShape))
+          .min(1)
+          .max(100)
+          .describe("Decisions to record (max 100)"),
+      },
+    },
+    async (args) => {
+      try {
+        const results = await engine.decideBatch(args.decisions);
+        const failed = results.filter((r) => "error" in r).length;
+        return toolResult({ results, recorded: results.length - failed, failed });
+      } catch (e) {
+        if (e instanceof TwiningError) {
+          return toolError(e.message, e.code);
+        }
+        return toolError(
+          e instanceof Error ? e.message : "Unknown error",
+          "INTERNAL_ERROR",
+        );
+      }
+    },
+  );
+
   // twining_why — Retrieve decision chain for a scope or file
   server.registerTool(
     "twining_why",
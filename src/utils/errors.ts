@@ -32,3 +32,18 @@ export class TwiningError extends Error {
     this.code = code;
   }
 }
+
+/** A batch item that failed; the rest of its batch still went through. */
+export interface BatchItemError {
+  error: string;
+  code: string;
+}
+
+/** Turn a batch item's failure into its slot in the results. */
+export function batchItemError(e: unknown): BatchItemError {
+  if (e instanceof TwiningError) return { error: e.message, code: e.code };
+  return {
+    error: e instanceof Error ? e.message : "Unknown error",
+    code: "INTERNAL_ERROR",
+  };
+}
@@ -0,0 +1,153 @@
+/**
+ * Scope-prefix index.
+ * A radix trie over scope strings answering the bidirectional prefix match
+ * used for scope filters throughout ("a.startsWith(b) || b.startsWith(a)")
+ * in O(depth + results): ancestors are the keys on the path to the query,
+ * descendants are the subtree below it. Matching is by string prefix, not
+ * path segment, so "src/auth" matches "src/authz" exactly as before.
+ */
+
+interface TrieNode<V> {
+  /** Edge label from the parent to this node. */
+  label: string;
+  /** Children keyed by the first character of their label. */
+  children: Map<string, TrieNode<V>>;
+  /** Values stored under the key ending at this node. */
+  values: Set<V> | null;
+}
+
+/** Bidirectional prefix match, as used for scope filters throughout. */
+export function scopeOverlaps(a: string, b: string): boolean {
+  return a.startsWith(b) || b.startsWith(a);
+}
+
+export class ScopeIndex<V> {
+  private readonly root: TrieNode<V> = newNode("");
+
+  /** Index a value under a scope key. */
+  add(key: string, value: V): void {
+    let node = this.root;
+    let rest = key;
+
+    while (rest.length > 0) {
+      const first = rest[0]!;
+      const child = node.children.get(first);
+      if (!child) {
+        const leaf = newNode<V>(rest);
+        node.children.set(first, leaf);
+        node = leaf;
+        rest = "";
+        break;
+      }
+
+      const common = commonPrefixLength(child.label, rest);
+      if (common < child.label.length) {
+        // Split the edge at the divergence point
+        const mid = newNode<V>(child.label.slice(0, common));
+        child.label = child.label.slice(common);
+        mid.children.set(child.label[0]!, child);
+        node.children.set(first, mid);
+        node = mid;
+      } else {
+        node = child;
+      }
+      rest = rest.slice(common);
+    }
+
+    (node.values ??= new Set()).add(value);
+  }
+
+  /** Remove a value from a scope key. Unknown pairs are ignored. */
+  remove(key: string, value: V): void {
+    const path: TrieNode<V>[] = [this.root];
+    let node = this.root;
+    let rest = key;
+    while (rest.length > 0) {
+      const child = node.children.get(rest[0]!);
+      if (!child || !rest.startsWith(child.label)) return;
+      rest = rest.slice(child.label.length);
+      node = child;
+      path.push(node);
+    }
+
+    if (!node.values?.delete(value)) return;
+    if (node.values.size === 0) node.values = null;
+
+    // Prune empty leaves and re-merge single-child chains
+    for (let i = path.length - 1; i > 0; i--) {
+      const current = path[i]!;
+      const parent = path[i - 1]!;
+      if (current.values) break;
+      if (current.children.size === 0) {
+        parent.children.delete(current.label[0]!);
+      } else if (current.children.size === 1) {
+        const only = current.children.values().next().value!;
+        only.label = current.label + only.label;
+        parent.children.set(only.label[0]!, only);
+        break;
+      } else {
+        break;
+      }
+    }
+  }
+
+  /**
+   * Values whose key overlaps `scope` in either direction: keys that are a
+   * prefix of the scope (ancestors) and keys the scope is a prefix of
+   * (descendants).
+   */
+  match(scope: string, into: Set<V> = new Set()): Set<V> {
+    let node = this.root;
+    let rest = scope;
+
+    for (;;) {
+      // Every key on the path so far is a prefix of the scope
+      if (node.values) for (const v of node.values) into.add(v);
+      if (rest.length === 0) {
+        collectSubtree(node, into, false);
+        return into;
+      }
+
+      const child = node.children.get(rest[0]!);
+      if (!child) return into;
+      if (child.label.length >= rest.length) {
+        // The scope ends inside this edge: the subtree is all descendants
+        if (child.label.startsWith(rest)) collectSubtree(child, into, true);
+        return into;
+      }
+      if (!rest.startsWith(child.label)) return into;
+      rest = rest.slice(child.label.length);
+      node = child;
+    }
+  }
+
+  /** Remove everything. */
+  clear(): void {
+    this.root.children.clear();
+    this.root.values = null;
+  }
+}
+
+function newNode<V>(label: string): TrieNode<V> {
+  return { label, children: new Map(), values: null };
+}
+
+function commonPrefixLength(a: string, b: string): number {
+  const max = Math.min(a.length, b.length);
+  let i = 0;
+  while (i < max && a[i] === b[i]) i++;
+  return i;
+}
+
+function collectSubtree<V>(
+  node: TrieNode<V>,
+  into: Set<V>,
+  includeSelf: boolean,
+): void {
+  const stack: TrieNode<V>[] = includeSelf ? [node] : [...node.children.values()];
+  while (stack.length > 0) {
+    const current = stack.pop()!;
+    if (current.values) for (const v of current.values) into.add(v);
+    for (const child of current.children.values()) stack.push(child);
+  }
+}
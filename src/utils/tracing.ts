@@ -0,0 +1,135 @@
+/**
+ * Lightweight span tracing for tool calls.
+ * A Trace is started around a sampled tool call; code anywhere beneath it
+ * wraps work in span() to record a nested, timed span with attributes.
+ * Outside a traced call span() just runs the function, so stores and
+ * engines are instrumented unconditionally at near-zero cost.
+ */
+import { AsyncLocalStorage } from "node:async_hooks";
+import { randomBytes } from "node:crypto";
+import { performance } from "node:perf_hooks";
+
+export type SpanAttributes = Record<string, string | number | boolean>;
+
+/** One finished span. Offsets are relative to the trace start. */
+export interface SpanRecord {
+  id: number;
+  /** Enclosing span; null for the root span */
+  parent_id: number | null;
+  name: string;
+  start_ms: number;
+  duration_ms: number;
+  attributes?: SpanAttributes;
+  error?: string;
+}
+
+/** A finished trace: the root span (spans[0]) and everything beneath it. */
+export interface TraceRecord {
+  trace_id: string;
+  name: string;
+  timestamp: string;
+  duration_ms: number;
+  spans: SpanRecord[];
+}
+
+interface ActiveSpan {
+  trace: Trace;
+  span: SpanRecord;
+}
+
+const activeSpan = new AsyncLocalStorage<ActiveSpan>();
+
+/** Round to microseconds; keeps trace files small without losing detail. */
+function round(ms: number): number {
+  return Math.round(ms * 1000) / 1000;
+}
+
+export class Trace {
+  readonly id = randomBytes(16).toString("hex");
+  private readonly startedAt = Date.now();
+  private readonly t0 = performance.now();
+  private readonly spans: SpanRecord[] = [];
+  private readonly root: SpanRecord;
+  private finished = false;
+
+  constructor(name: string, attributes?: SpanAttributes) {
+    this.root = this.open(name, null, attributes);
+  }
+
+  /** Run fn with the root span active, so span() calls inside nest under it. */
+  run<T>(fn: () => T): T {
+    return activeSpan.run({ trace: this, span: this.root }, fn);
+  }
+
+  /** Close the root span and return the finished trace. */
+  finish(error?: string): TraceRecord {
+    if (error) this.root.error = error;
+    this.close(this.root);
+    this.finished = true;
+    return {
+      trace_id: this.id,
+      name: this.root.name,
+      timestamp: new Date(this.startedAt).toISOString(),
+      duration_ms: this.root.duration_ms,
+      spans: this.spans,
+    };
+  }
+
+  /** Whether finish() has run; work still in flight after it goes unrecorded. */
+  get isFinished(): boolean {
+    return this.finished;
+  }
+
+  /** @internal */
+  open(
+    name: string,
+    parentId: number | null,
+    attributes?: SpanAttributes,
+  ): SpanRecord {
+    const record: SpanRecord = {
+      id: this.spans.length + 1,
+      parent_id: parentId,
+      name,
+      start_ms: round(performance.now() - this.t0),
+      duration_ms: 0,
+    };
+    if (attributes) record.attributes = { ...attributes };
+    this.spans.push(record);
+    return record;
+  }
+
+  /** @internal */
+  close(record: SpanRecord): void {
+    record.duration_ms = round(performance.now() - this.t0 - record.start_ms);
+  }
+}
+
+/**
+ * Run fn inside a child span of the active span. Without an active trace
+ * this is just `await fn()`.
+ */
+export async function span<T>(
+  name: string,
+  fn: () => Promise<T> | T,
+  attributes?: SpanAttributes,
+): Promise<T> {
+  const parent = activeSpan.getStore();
+  if (!parent || parent.trace.isFinished) return fn();
+  const record = parent.trace.open(name, parent.span.id, attributes);
+  try {
+    return await activeSpan.run({ trace: parent.trace, span: record }, fn);
+  } catch (err) {
+    record.error = err instanceof Error ? err.message : String(err);
+    throw err;
+  } finally {
+    parent.trace.close(record);
+  }
+}
+
+/** Add attributes to the active span; no-op outside a trace. */
+export function setSpanAttributes(attributes: SpanAttributes): void {
+  const active = activeSpan.getStore();
+  if (active) {
+    active.span.attributes = { ...active.span.attributes, ...attributes };
+  }
+}
@@ -184,6 +184,14 @@ export interface TwiningConfig {
       graph_connectivity?: number;
       graph_reachability?: number;
     };
+    cache?: {
+      /** Memoized (task, scope) results kept in the LRU; 0 disables (default: 64) */
+      max_entries: number;
+      /** Serve a memoized result for at most this long (default: 30000) */
+      ttl_ms: number;
+    };
+    /** Deadline per optional assemble stage, e.g. semantic search; 0 disables (default: 2000) */
+    stage_timeout_ms?: number;
   };
   conflict_resolution: string;
   agents?: {
@@ -207,6 +215,48 @@ export interface TwiningConfig {
   tools?: {
     mode: "full" | "lite";
   };
+  embeddings?: {
+    /** Most texts per background inference call (default: 32) */
+    batch_size: number;
+    /** Wait for more texts before running a partial batch (default: 5) */
+    batch_delay_ms: number;
+    /** worker_threads running inference; 0 = in-process (default: 0) */
+    workers: number;
+    /** Query embeddings kept in the LRU cache (default: 256) */
+    query_cache_size: number;
+  };
+  search?: {
+    ann: {
+      /** Use the IVF ANN index for large embedding indexes (default: true) */
+      enabled: boolean;
+      /** Live vectors below which search is an exact scan (default: 2000) */
+      min_vectors: number;
+      /** IVF cluster count; 0 = sqrt(vectors) (default: 0) */
+      nlist: number;
+      /** Clusters probed per query — the recall/latency knob (default: 8) */
+      nprobe: number;
+    };
+  };
+  storage?: {
+    /** Coalesce JSONL appends arriving within this window into one write (default: 0) */
+    append_window_ms: number;
+    /** "batch" fsyncs after each group write; "none" leaves it to the OS (default: "none") */
+    fsync: "none" | "batch";
+  };
+  daemon?: {
+    /** Relay tool calls to a shared per-project state daemon (default: false) */
+    enabled: boolean;
+    /** Daemon exits after this long with no connected clients (default: 600000) */
+    idle_timeout_ms: number;
+    /** How long a client waits for a daemon it spawned before running standalone (default: 5000) */
+    spawn_timeout_ms: number;
+  };
+  startup?: {
+    /** Load the embedding model in the background once a client connects (default: true) */
+    warm_embedder: boolean;
+    /** Save parsed stores on exit and preload them on the next start (default: false) */
+    snapshot: boolean;
+  };
 }
 
 /** Summarize result — spec section 4.3 twining_summarize return */
@@ -252,6 +302,17 @@ export interface DecisionIndexEntry {
   commit_hashes: string[];
 }
 
+/**
+ * What a search may return, as the store holding it sees it. Search only
+ * asks `has` about ids its indexes turn up, and loads just the ranked hits.
+ */
+export interface SearchCandidates<T> {
+  /** Whether the id is live and passes the query's filters */
+  has(id: string): boolean;
+  /** The items for these ids, in order; ids no longer present are skipped */
+  load(ids: string[]): Promise<T[]>;
+}
+
 // Agent coordination types — v1.3
 
 /** Agent liveness state derived from last_active timestamp */
@@ -468,6 +529,12 @@ export interface TestCoverageResult {
 
 // Analytics types — usage analytics and telemetry
 
+/**
+ * tool_name of the per-process startup timing entry in metrics.jsonl.
+ * It is not a tool call, so rollups and usage queries leave it out.
+ */
+export const STARTUP_METRIC = "(startup)";
+
 /** Single tool call metric entry (appended to metrics.jsonl) */
 export interface MetricEntry {
   tool_name: string;
@@ -476,6 +543,10 @@ export interface MetricEntry {
   success: boolean;
   error_code?: string;
   agent_id: string;
+  /** Milliseconds per internal stage, for tools that report them (e.g. assemble) */
+  stages?: Record<string, number>;
+  /** Trace of this call in traces.jsonl, when it was sampled and kept */
+  trace_id?: string;
 }
 
 /** Aggregated tool usage summary */
@@ -543,6 +614,16 @@ export interface ValueStats {
 export interface AnalyticsConfig {
   metrics: {
     enabled: boolean;
+    /** Rotate metrics.jsonl into archive/metrics/ past this size (default: 5 MiB) */
+    rotate_bytes?: number;
+    /** Rotate metrics.jsonl once its oldest entry is this many days old (default: 7) */
+    rotate_age_days?: number;
+  };
+  tracing?: {
+    /** Share of tool calls traced, 0–1; 0 disables tracing (default: 1) */
+    sample_rate: number;
+    /** Keep traces only for calls at least this slow (default: 250) */
+    min_duration_ms: number;
   };
   telemetry: {
     enabled: boolean;
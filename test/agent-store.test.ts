@@ -220,3 +220,21 @@ describe("AgentStore concurrent operations", () => {
     expect(a2!.capabilities).toEqual(["b"]);
   });
 });
+
+describe("AgentStore.generation", () => {
+  it("moves on writes from this store and from other processes", async () => {
+    const gen0 = await store.generation();
+    expect(await store.generation()).toBe(gen0);
+
+    await store.upsert({ agent_id: "agent-1" });
+    const gen1 = await store.generation();
+    expect(gen1).toBeGreaterThan(gen0);
+
+    // Another process rewrites the registry
+    fs.writeFileSync(
+      path.join(tmpDir, "agents", "registry.json"),
+      JSON.stringify([{ agent_id: "x", capabilities: [], registered_at: "", last_active: "" }]),
+    );
+    expect(await store.generation()).toBeGreaterThan(gen1);
+  });
+});
@@ -5,6 +5,7 @@ import path from "node:path";
 import os from "node:os";
 import { handleRequest } from "../../src/dashboard/http-server.js";
 import { appendJSONL, writeJSON } from "../../src/storage/file-store.js";
+import { MetricsCollector } from "../../src/analytics/metrics-collector.js";
 
 function httpGet(
   port: number,
@@ -89,7 +90,22 @@ describe("Analytics API routes", () => {
       agent_id: "test",
     });
 
-    server = http.createServer(handleRequest(publicDir, projectRoot));
+    // Seed a kept trace
+    await appendJSONL(path.join(twiningDir, "traces.jsonl"), {
+      trace_id: "ab".repeat(16), name: "twining_decide",
+      timestamp: "2024-01-01T00:00:00Z", duration_ms: 800,
+      spans: [
+        { id: 1, parent_id: null, name: "twining_decide", start_ms: 0, duration_ms: 800 },
+        { id: 2, parent_id: 1, name: "lock", start_ms: 5, duration_ms: 600, attributes: { retries: 4 } },
+      ],
+    });
+
+    const metricsCollector = new MetricsCollector(twiningDir);
+    metricsCollector.increment("assemble.cache.hit", 3);
+    metricsCollector.increment("assemble.cache.miss");
+    server = http.createServer(
+      handleRequest(publicDir, projectRoot, { metricsCollector }),
+    );
     await new Promise<void>((resolve) => {
       server.listen(0, "127.0.0.1", () => resolve());
     });
@@ -140,4 +156,48 @@ describe("Analytics API routes", () => {
     expect(data.errors[0].tool_name).toBe("twining_decide");
     expect(data.errors[0].error_code).toBe("CONFLICT");
   });
+
+  it("GET /api/analytics/counters returns in-process counters", async () => {
+    const res = await httpGet(port, "/api/analytics/counters");
+    expect(res.status).toBe(200);
+    const data = JSON.parse(res.body);
+    expect(data.counters).toEqual({
+      "assemble.cache.hit": 3,
+      "assemble.cache.miss": 1,
+    });
+  });
+
+  it("GET /api/traces lists kept traces", async () => {
+    const res = await httpGet(port, "/api/traces");
+    expect(res.status).toBe(200);
+    const data = JSON.parse(res.body);
+    expect(data.traces).toEqual([
+      {
+        trace_id: "ab".repeat(16), name: "twining_decide",
+        timestamp: "2024-01-01T00:00:00Z", duration_ms: 800, span_count: 2,
+      },
+    ]);
+  });
+
+  it("GET /api/traces/:id returns the spans, 404 when unknown", async () => {
+    const res = await httpGet(port, `/api/traces/${"ab".repeat(16)}`);
+    expect(res.status).toBe(200);
+    expect(JSON.parse(res.body).trace.spans).toHaveLength(2);
+    expect((await httpGet(port, "/api/traces/nope")).status).toBe(404);
+  });
+
+  it("GET /api/traces/export serves Chrome and OTLP formats", async () => {
+    const chrome = await httpGet(port, "/api/traces/export?format=chrome");
+    expect(chrome.status).toBe(200);
+    const events = JSON.parse(chrome.body).traceEvents;
+    expect(events.filter((e: { ph: string }) => e.ph === "X")).toHaveLength(2);
+
+    const otlp = await httpGet(port, "/api/traces/export?format=otlp");
+    expect(otlp.status).toBe(200);
+    const lines = otlp.body.trim().split("\n");
+    expect(lines).toHaveLength(1);
+    expect(JSON.parse(lines[0]!).resourceSpans[0].scopeSpans[0].spans).toHaveLength(2);
+
+    expect((await httpGet(port, "/api/traces/export?format=xml")).status).toBe(400);
+  });
 });
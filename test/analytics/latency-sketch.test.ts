@@ -0,0 +1,32 @@
+import { describe, it, expect } from "vitest";
+import { LatencySketch } from "../../src/analytics/latency-sketch.js";
+
+describe("LatencySketch", () => {
+  it("returns exact nearest-rank quantiles below 256ms", () => {
+    const sketch = new LatencySketch();
+    for (let i = 1; i <= 20; i++) sketch.add(i * 10);
+    expect(sketch.count).toBe(20);
+    expect(sketch.quantile(0.95)).toBe(190);
+    expect(sketch.quantile(0.5)).toBe(100);
+    expect(sketch.quantile(1)).toBe(200);
+  });
+
+  it("stays within 1% for large durations", () => {
+    const sketch = new LatencySketch();
+    const values = Array.from({ length: 1000 }, (_, i) => 300 + i * 97);
+    for (const v of values) sketch.add(v);
+    const exact = values[Math.ceil(values.length * 0.95) - 1]!;
+    expect(Math.abs(sketch.quantile(0.95) - exact) / exact).toBeLessThan(0.01);
+  });
+
+  it("merges and round-trips through JSON", () => {
+    const a = new LatencySketch();
+    const b = new LatencySketch();
+    for (let i = 0; i < 50; i++) a.add(i);
+    for (let i = 50; i < 100; i++) b.add(i * 1000);
+    a.merge(LatencySketch.fromJSON(JSON.parse(JSON.stringify(b.toJSON()))));
+    expect(a.count).toBe(100);
+    expect(a.quantile(0.5)).toBe(49);
+    expect(a.quantile(0.0)).toBe(0);
+  });
+});
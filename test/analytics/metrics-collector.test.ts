@@ -3,8 +3,9 @@ import fs from "node:fs";
 import path from "node:path";
 import os from "node:os";
 import { MetricsCollector } from "../../src/analytics/metrics-collector.js";
+import { MetricsStore } from "../../src/analytics/metrics-store.js";
 import { readJSONL } from "../../src/storage/file-store.js";
-import type { MetricEntry } from "../../src/utils/types.js";
+import { STARTUP_METRIC, type MetricEntry } from "../../src/utils/types.js";
 
 let tmpDir: string;
 let twiningDir: string;
@@ -133,4 +134,97 @@ describe("MetricsCollector", () => {
       agent_id: "agent-1",
     });
   });
+
+  it("keeps in-process counters", () => {
+    collector.increment("assemble.cache.hit");
+    collector.increment("assemble.cache.hit", 2);
+    expect(collector.getCounters()).toEqual({ "assemble.cache.hit": 3 });
+  });
+
+  it("attaches stage timings to the tool call in progress", async () => {
+    const call: { stages?: Record<string, number> } = {};
+    await collector.runInCall(call, async () => {
+      await new Promise((resolve) => setTimeout(resolve, 1));
+      collector.recordStages({ scope_decisions: 1.5 });
+      collector.recordStages({ scoring: 0.25 });
+    });
+    expect(call.stages).toEqual({ scope_decisions: 1.5, scoring: 0.25 });
+
+    // Outside a call, timings are dropped
+    collector.recordStages({ ignored: 1 });
+    expect(call.stages).not.toHaveProperty("ignored");
+  });
+
+  it("samples traces and keeps only slow ones", async () => {
+    expect(collector.startTrace("twining_post")).toBeNull();
+
+    collector.setTracing({ sample_rate: 1, min_duration_ms: 20 });
+    const fast = collector.startTrace("twining_post")!;
+    expect(collector.keepTrace(fast.finish())).toBeUndefined();
+
+    const slow = collector.startTrace("twining_decide")!;
+    await new Promise((resolve) => setTimeout(resolve, 25));
+    const traceId = collector.keepTrace(slow.finish());
+    expect(traceId).toBe(slow.id);
+
+    await new Promise((resolve) => setTimeout(resolve, 20));
+    const traces = await readJSONL<{ trace_id: string }>(
+      path.join(twiningDir, "traces.jsonl"),
+    );
+    expect(traces.map((t) => t.trace_id)).toEqual([traceId]);
+  });
+
+  it("reports startup once the first call responded and warm-up settled", async () => {
+    const metricsPath = path.join(twiningDir, "metrics.jsonl");
+    collector.markStartup("services");
+    collector.markStartup("tools_registered");
+    await collector.record({
+      tool_name: "twining_post",
+      timestamp: "2024-01-01T00:00:00Z",
+      duration_ms: 5,
+      success: true,
+      agent_id: "agent-1",
+    });
+    expect(Object.keys(collector.getStartupMarks())).toEqual([
+      "services",
+      "tools_registered",
+      "first_tool_response",
+    ]);
+    expect(await readJSONL<MetricEntry>(metricsPath)).toHaveLength(1);
+
+    collector.markStartup("embedder_ready");
+    collector.settleStartup();
+    collector.settleStartup();
+    await new Promise((resolve) => setTimeout(resolve, 20));
+
+    const startup = (await readJSONL<MetricEntry>(metricsPath)).filter(
+      (e) => e.tool_name === STARTUP_METRIC,
+    );
+    expect(startup).toHaveLength(1);
+    expect(startup[0]!.duration_ms).toBe(startup[0]!.stages!.first_tool_response);
+    expect(startup[0]!.stages).toHaveProperty("embedder_ready");
+    expect(startup[0]!.stages!.services).toBeLessThanOrEqual(startup[0]!.duration_ms);
+  });
+
+  it("leaves the startup entry out of tool usage", async () => {
+    collector.markStartup("services");
+    await collector.record({
+      tool_name: "twining_post",
+      timestamp: "2024-01-01T00:00:00Z",
+      duration_ms: 5,
+      success: true,
+      agent_id: "agent-1",
+    });
+    collector.settleStartup();
+    await new Promise((resolve) => setTimeout(resolve, 20));
+    const entries = await readJSONL<MetricEntry>(path.join(twiningDir, "metrics.jsonl"));
+    expect(entries.map((e) => e.tool_name)).toContain(STARTUP_METRIC);
+
+    const store = new MetricsStore(twiningDir);
+    const summary = await store.getToolUsageSummary();
+    expect(summary.map((s) => [s.tool_name, s.call_count])).toEqual([["twining_post", 1]]);
+    expect(await store.getToolUsageSummary("2024-01-01T00:00:00Z")).toEqual(summary);
+    const usage = await store.getUsageOverTime();
+    expect(usage.reduce((sum, b) => sum + b.call_count, 0)).toBe(1);
+  });
 });
@@ -0,0 +1,150 @@
+import { describe, it, expect, beforeEach, afterEach } from "vitest";
+import fs from "node:fs";
+import path from "node:path";
+import os from "node:os";
+import zlib from "node:zlib";
+import { MetricsRollup } from "../../src/analytics/metrics-rollup.js";
+import { MetricsStore } from "../../src/analytics/metrics-store.js";
+
+let twiningDir: string;
+
+function metric(tool: string, timestamp: string, extra: Record<string, unknown> = {}): string {
+  return JSON.stringify({
+    tool_name: tool,
+    timestamp,
+    duration_ms: 10,
+    success: true,
+    agent_id: "test",
+    ...extra,
+  }) + "\n";
+}
+
+function logPath(): string {
+  return path.join(twiningDir, "metrics.jsonl");
+}
+
+beforeEach(() => {
+  twiningDir = fs.mkdtempSync(path.join(os.tmpdir(), "twining-metrics-rollup-test-"));
+});
+
+afterEach(() => {
+  fs.rmSync(twiningDir, { recursive: true, force: true });
+});
+
+describe("MetricsRollup", () => {
+  it("folds only complete lines appended since the last refresh", () => {
+    const rollup = new MetricsRollup(twiningDir);
+    fs.writeFileSync(logPath(), metric("a", "2024-01-01T00:00:10Z"));
+    expect(rollup.refresh().tools.get("a")!.count).toBe(1);
+
+    const line = metric("a", "2024-01-01T00:01:10Z", { success: false, error_code: "E" });
+    fs.appendFileSync(logPath(), line.slice(0, 12));
+    expect(rollup.refresh().tools.get("a")!.count).toBe(1);
+
+    fs.appendFileSync(logPath(), line.slice(12));
+    const state = rollup.refresh();
+    expect(state.tools.get("a")!.count).toBe(2);
+    expect(state.minutes.size).toBe(2);
+    expect([...state.errors.values()]).toEqual([
+      { tool_name: "a", error_code: "E", count: 1 },
+    ]);
+  });
+
+  it("persists a checkpoint that a new reader resumes from", async () => {
+    const lines = Array.from({ length: 800 }, (_, i) =>
+      metric("t", "2024-01-01T00:00:00Z", { duration_ms: i, agent_id: "x".repeat(60) }),
+    ).join("");
+    fs.writeFileSync(logPath(), lines);
+    await new MetricsRollup(twiningDir).maintain();
+    expect(fs.existsSync(path.join(twiningDir, "metrics.rollup.json"))).toBe(true);
+
+    fs.appendFileSync(logPath(), metric("t", "2024-01-01T00:05:00Z"));
+    const state = new MetricsRollup(twiningDir).refresh();
+    expect(state.tools.get("t")!.count).toBe(801);
+  });
+
+  it("rotates and compresses the log past its size limit, keeping totals", async () => {
+    fs.writeFileSync(
+      logPath(),
+      metric("a", "2024-01-01T00:00:00Z") + metric("b", "2024-01-01T00:00:00Z"),
+    );
+    const rollup = new MetricsRollup(twiningDir, { rotate_bytes: 100 });
+    await rollup.maintain();
+
+    expect(fs.readFileSync(logPath(), "utf-8")).toBe("");
+    const archived = fs.readdirSync(path.join(twiningDir, "archive", "metrics"));
+    expect(archived).toHaveLength(1);
+    expect(archived[0]).toMatch(/\.jsonl\.gz$/);
+    const raw = zlib.gunzipSync(
+      fs.readFileSync(path.join(twiningDir, "archive", "metrics", archived[0]!)),
+    ).toString("utf-8");
+    expect(raw.trim().split("\n")).toHaveLength(2);
+
+    fs.appendFileSync(logPath(), metric("a", "2024-01-01T00:02:00Z"));
+    const summary = await new MetricsStore(twiningDir).getToolUsageSummary();
+    expect(summary.map((s) => [s.tool_name, s.call_count])).toEqual([
+      ["a", 2],
+      ["b", 1],
+    ]);
+  });
+
+  it("rotates by age", async () => {
+    fs.writeFileSync(logPath(), metric("a", "2024-01-01T00:00:00Z"));
+    const rollup = new MetricsRollup(twiningDir, { rotate_age_ms: 60_000 });
+    await rollup.maintain(new Date("2024-01-01T00:00:30Z").getTime());
+    expect(fs.readFileSync(logPath(), "utf-8")).not.toBe("");
+
+    await rollup.maintain(new Date("2024-01-01T00:01:00Z").getTime());
+    expect(fs.readFileSync(logPath(), "utf-8")).toBe("");
+    expect(rollup.refresh().tools.get("a")!.count).toBe(1);
+  });
+
+  it("downsamples old minutes into hours and days when checkpointing", async () => {
+    fs.writeFileSync(
+      logPath(),
+      metric("a", "2024-01-01T00:00:10Z") +
+        metric("a", "2024-01-01T00:30:10Z", { success: false, error_code: "E" }) +
+        metric("b", "2024-01-01T05:00:10Z") +
+        metric("a", "2024-02-10T11:00:10Z") +
+        metric("b", "2024-02-11T11:59:10Z"),
+    );
+    const rollup = new MetricsRollup(twiningDir, { rotate_bytes: 1 });
+    await rollup.maintain(new Date("2024-02-11T12:00:00Z").getTime());
+
+    // Reload from the checkpoint rather than the in-memory state
+    const state = new MetricsRollup(twiningDir).refresh();
+    expect([...state.minutes.keys()].map((k) => new Date(k).toISOString())).toEqual([
+      "2024-02-11T11:59:00.000Z",
+    ]);
+    expect([...state.hours.keys()].map((k) => new Date(k).toISOString())).toEqual([
+      "2024-02-10T11:00:00.000Z",
+    ]);
+    expect([...state.days.keys()].map((k) => new Date(k).toISOString())).toEqual([
+      "2024-01-01T00:00:00.000Z",
+    ]);
+    const day = state.days.values().next().value!;
+    expect(day.count).toBe(3);
+    expect(day.errors).toBe(1);
+    expect(day.tools.get("a")!.count).toBe(2);
+    expect(state.tools.get("a")!.count).toBe(3);
+
+    const store = new MetricsStore(twiningDir);
+    const usage = await store.getUsageOverTime(24 * 60);
+    expect(usage.reduce((sum, b) => sum + b.call_count, 0)).toBe(5);
+    const since = await store.getToolUsageSummary("2024-02-10T00:00:00Z");
+    expect(since.map((s) => [s.tool_name, s.call_count])).toEqual([
+      ["a", 1],
+      ["b", 1],
+    ]);
+  });
+
+  it("drops days past a year but keeps them in the totals", async () => {
+    fs.writeFileSync(logPath(), metric("a", "2023-01-01T00:00:00Z"));
+    const rollup = new MetricsRollup(twiningDir, { rotate_bytes: 1 });
+    await rollup.maintain(new Date("2024-06-01T00:00:00Z").getTime());
+
+    const state = new MetricsRollup(twiningDir).refresh();
+    expect(state.minutes.size + state.hours.size + state.days.size).toBe(0);
+    expect(state.tools.get("a")!.count).toBe(1);
+  });
+});
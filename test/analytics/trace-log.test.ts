@@ -0,0 +1,89 @@
+import { describe, it, expect, beforeEach, afterEach } from "vitest";
+import fs from "node:fs";
+import path from "node:path";
+import os from "node:os";
+import { TraceLog, toChromeTrace, toOtlp } from "../../src/analytics/trace-log.js";
+import type { TraceRecord } from "../../src/utils/tracing.js";
+
+let twiningDir: string;
+
+function makeTrace(id: string, durationMs: number): TraceRecord {
+  return {
+    trace_id: id.padEnd(32, "0"),
+    name: "twining_decide",
+    timestamp: "2024-01-01T00:00:00.000Z",
+    duration_ms: durationMs,
+    spans: [
+      { id: 1, parent_id: null, name: "twining_decide", start_ms: 0, duration_ms: durationMs },
+      {
+        id: 2,
+        parent_id: 1,
+        name: "lock",
+        start_ms: 1.5,
+        duration_ms: 2.25,
+        attributes: { file: "index.json", retries: 3, contended: true, wait_ms: 2.25 },
+      },
+    ],
+  };
+}
+
+beforeEach(() => {
+  twiningDir = fs.mkdtempSync(path.join(os.tmpdir(), "twining-trace-log-test-"));
+});
+
+afterEach(() => {
+  fs.rmSync(twiningDir, { recursive: true, force: true });
+});
+
+describe("TraceLog", () => {
+  it("lists newest traces first and looks them up by id", async () => {
+    const log = new TraceLog(twiningDir);
+    await log.append(makeTrace("aa", 100));
+    await log.append(makeTrace("bb", 900));
+    await log.append(makeTrace("cc", 300));
+
+    const list = await log.list(10, { min_duration_ms: 200 });
+    expect(list.map((t) => t.trace_id.slice(0, 2))).toEqual(["cc", "bb"]);
+    expect(list[0]!.span_count).toBe(2);
+    expect((await log.get("bb".padEnd(32, "0")))!.duration_ms).toBe(900);
+    expect(await log.get("missing")).toBeNull();
+  });
+
+  it("trims to the newest half past its size cap", async () => {
+    const log = new TraceLog(twiningDir, 1000);
+    for (let i = 0; i < 10; i++) await log.append(makeTrace(`t${i}`, i));
+    await log.trim();
+    const kept = await log.recent(100);
+    expect(kept.map((t) => t.duration_ms)).toEqual([9, 8, 7, 6, 5]);
+  });
+});
+
+describe("trace export", () => {
+  it("produces Chrome complete events in microseconds", () => {
+    const { traceEvents } = toChromeTrace([makeTrace("aa", 10)]);
+    const lock = traceEvents.find((e) => e.name === "lock")!;
+    expect(lock.ph).toBe("X");
+    expect(lock.ts).toBe(Date.parse("2024-01-01T00:00:00.000Z") * 1000 + 1500);
+    expect(lock.dur).toBe(2250);
+    expect(lock.args).toMatchObject({ retries: 3 });
+  });
+
+  it("produces OTLP spans with parent links and typed attributes", () => {
+    const request = toOtlp([makeTrace("aa", 10)]) as {
+      resourceSpans: { scopeSpans: { spans: Record<string, unknown>[] }[] }[];
+    };
+    const spans = request.resourceSpans[0]!.scopeSpans[0]!.spans;
+    expect(spans).toHaveLength(2);
+    const [root, lock] = spans as [Record<string, unknown>, Record<string, unknown>];
+    expect(root.parentSpanId).toBeUndefined();
+    expect(lock.parentSpanId).toBe(root.spanId);
+    expect(lock.spanId).toMatch(/^[0-9a-f]{16}$/);
+    expect(BigInt(lock.endTimeUnixNano as string) - BigInt(lock.startTimeUnixNano as string)).toBe(2_250_000n);
+    expect(lock.attributes).toEqual([
+      { key: "file", value: { stringValue: "index.json" } },
+      { key: "retries", value: { intValue: "3" } },
+      { key: "contended", value: { boolValue: true } },
+      { key: "wait_ms", value: { doubleValue: 2.25 } },
+    ]);
+  });
+});
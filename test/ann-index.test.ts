@@ -0,0 +1,186 @@
+/**
+ * Tests for the IVF ANN index.
+ */
+import { describe, it, expect, beforeEach, afterEach } from "vitest";
+import fs from "node:fs";
+import path from "node:path";
+import os from "node:os";
+import { AnnIndex } from "../src/embeddings/ann-index.js";
+import type { VectorView } from "../src/embeddings/index-manager.js";
+
+const DIM = 16;
+const CLUSTERS = 16;
+const PER_CLUSTER = 50;
+
+/** Deterministic pseudo-random numbers in [-0.5, 0.5). */
+function lcg(seed: number): () => number {
+  let state = seed;
+  return () => {
+    state = (state * 1664525 + 1013904223) >>> 0;
+    return state / 2 ** 32 - 0.5;
+  };
+}
+
+/** Unit vector near basis axis `axis`. */
+function nearAxis(axis: number, rand: () => number): number[] {
+  const v = Array.from({ length: DIM }, () => rand() * 0.2);
+  v[axis] = 1;
+  const norm = Math.sqrt(v.reduce((s, x) => s + x * x, 0));
+  return v.map((x) => x / norm);
+}
+
+function makeView(vectors: number[][], ids: string[]): VectorView {
+  const data = new Float32Array(vectors.length * DIM);
+  vectors.forEach((v, i) => data.set(v, i * DIM));
+  return {
+    dimension: DIM,
+    data,
+    slots: new Map(ids.map((id, i) => [id, i])),
+    slotIds: ids,
+    generation: 1,
+  };
+}
+
+function bruteForce(
+  query: number[],
+  view: VectorView,
+  k: number,
+  allow?: (id: string) => boolean,
+): string[] {
+  const scored: { id: string; score: number }[] = [];
+  for (const [id, slot] of view.slots) {
+    if (allow && !allow(id)) continue;
+    let score = 0;
+    for (let j = 0; j < DIM; j++) score += query[j]! * view.data[slot * DIM + j]!;
+    scored.push({ id, score });
+  }
+  scored.sort((a, b) => b.score - a.score);
+  return scored.slice(0, k).map((s) => s.id);
+}
+
+let tmpDir: string;
+let view: VectorView;
+
+beforeEach(() => {
+  tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), "twining-ann-test-"));
+  const rand = lcg(42);
+  const vectors: number[][] = [];
+  const ids: string[] = [];
+  for (let c = 0; c < CLUSTERS; c++) {
+    for (let i = 0; i < PER_CLUSTER; i++) {
+      vectors.push(nearAxis(c, rand));
+      ids.push(`c${c}-${i}`);
+    }
+  }
+  view = makeView(vectors, ids);
+});
+
+afterEach(() => {
+  fs.rmSync(tmpDir, { recursive: true, force: true });
+});
+
+describe("AnnIndex", () => {
+  it("returns null below min_vectors so callers scan exactly", () => {
+    const ann = new AnnIndex(path.join(tmpDir, "blackboard.ivf.json"), {
+      min_vectors: 10000,
+    });
+    expect(ann.search(nearAxis(0, lcg(1)), view, 5)).toBeNull();
+  });
+
+  it("returns null when disabled", () => {
+    const ann = new AnnIndex(path.join(tmpDir, "blackboard.ivf.json"), {
+      enabled: false,
+      min_vectors: 1,
+    });
+    expect(ann.search(nearAxis(0, lcg(1)), view, 5)).toBeNull();
+  });
+
+  it("matches exact search after training", async () => {
+    const ann = new AnnIndex(path.join(tmpDir, "blackboard.ivf.json"), {
+      min_vectors: 100,
+      nlist: CLUSTERS,
+      nprobe: 2,
+    });
+    await ann.train(view);
+
+    const query = nearAxis(3, lcg(7));
+    const hits = ann.search(query, view, 10)!;
+    expect(hits).toHaveLength(10);
+    expect(hits.map((h) => h.id)).toEqual(bruteForce(query, view, 10));
+    // Scores are exact and sorted
+    for (let i = 1; i < hits.length; i++) {
+      expect(hits[i - 1]!.score).toBeGreaterThanOrEqual(hits[i]!.score);
+    }
+  });
+
+  it("applies filters while probing and widens to fill k", async () => {
+    const ann = new AnnIndex(path.join(tmpDir, "blackboard.ivf.json"), {
+      min_vectors: 100,
+      nlist: CLUSTERS,
+      nprobe: 1,
+    });
+    await ann.train(view);
+
+    // Only members of a cluster far from the query are allowed
+    const allow = (id: string) => id.startsWith("c9-");
+    const query = nearAxis(0, lcg(7));
+    const hits = ann.search(query, view, 5, allow)!;
+    expect(hits).toHaveLength(5);
+    expect(hits.every((h) => allow(h.id))).toBe(true);
+    expect(hits.map((h) => h.id)).toEqual(bruteForce(query, view, 5, allow));
+  });
+
+  it("picks up appended vectors and skips removed ones", async () => {
+    const ann = new AnnIndex(path.join(tmpDir, "blackboard.ivf.json"), {
+      min_vectors: 100,
+    });
+    await ann.train(view);
+
+    // Append one vector exactly on axis 5 and remove c5-0
+    const exact = Array.from({ length: DIM }, (_, j) => (j === 5 ? 1 : 0));
+    const data = new Float32Array(view.data.length + DIM);
+    data.set(view.data);
+    data.set(exact, view.data.length);
+    const slots = new Map(view.slots);
+    slots.set("new", view.slotIds.length);
+    slots.delete("c5-0");
+    const grown: VectorView = {
+      ...view,
+      data,
+      slots,
+      slotIds: [...view.slotIds, "new"],
+    };
+
+    const hits = ann.search(exact, grown, 3)!;
+    expect(hits[0]!.id).toBe("new");
+    expect(hits[0]!.score).toBeCloseTo(1, 5);
+    const all = ann.search(exact, grown, 1000)!;
+    expect(all.some((h) => h.id === "c5-0")).toBe(false);
+  });
+
+  it("persists the trained index", async () => {
+    const filePath = path.join(tmpDir, "blackboard.ivf.json");
+    const first = new AnnIndex(filePath, {
+      min_vectors: 100,
+      nlist: CLUSTERS,
+    });
+    await first.train(view);
+    expect(fs.existsSync(filePath)).toBe(true);
+
+    const second = new AnnIndex(filePath, {
+      min_vectors: 100,
+      nlist: CLUSTERS,
+    });
+    const query = nearAxis(11, lcg(3));
+    const hits = second.search(query, view, 5);
+    expect(hits).not.toBeNull();
+    expect(hits!.map((h) => h.id)).toEqual(bruteForce(query, view, 5));
+  });
+
+  it("ignores an unreadable index file", () => {
+    const filePath = path.join(tmpDir, "blackboard.ivf.json");
+    fs.writeFileSync(filePath, "not json");
+    const ann = new AnnIndex(filePath, { min_vectors: 100 });
+    expect(ann.search(nearAxis(0, lcg(1)), view, 5)).toBeNull();
+  });
+});
@@ -0,0 +1,53 @@
+import { describe, it, expect } from "vitest";
+import { flattenReport, judge } from "./bench-baseline.js";
+
+function result(mean: number) {
+  return { mean_ms: mean, p75_ms: mean, p99_ms: mean, hz: 1000 / mean, rme_percent: 1, samples: 10 };
+}
+
+describe("flattenReport", () => {
+  it("keys benchmarks by suite and name, without the file path", () => {
+    const flat = flattenReport({
+      files: [
+        {
+          filepath: "/repo/test/bench/engines.bench.ts",
+          groups: [
+            {
+              fullName: "test/bench/engines.bench.ts > SearchEngine (1k)",
+              benchmarks: [
+                { name: "searchDecisions", mean: 1.23456789, p75: 1.3, p99: 2, hz: 810, rme: 1.5, sampleCount: 400 },
+              ],
+            },
+          ],
+        },
+      ],
+    });
+    expect(flat).toEqual({
+      "SearchEngine (1k) > searchDecisions": {
+        mean_ms: 1.2346,
+        p75_ms: 1.3,
+        p99_ms: 2,
+        hz: 810,
+        rme_percent: 1.5,
+        samples: 400,
+      },
+    });
+  });
+});
+
+describe("judge", () => {
+  it("flags a mean slower than the threshold allows", () => {
+    expect(judge(result(10), result(12), 0.25)).toBe("ok");
+    expect(judge(result(10), result(13), 0.25)).toBe("regressed");
+    expect(judge(result(10), result(7), 0.25)).toBe("improved");
+  });
+
+  it("ignores differences below the noise floor", () => {
+    expect(judge(result(0.01), result(0.04), 0.25)).toBe("ok");
+  });
+
+  it("reports benchmarks on only one side", () => {
+    expect(judge(undefined, result(1), 0.25)).toBe("new");
+    expect(judge(result(1), undefined, 0.25)).toBe("missing");
+  });
+});
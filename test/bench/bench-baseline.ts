@@ -0,0 +1,256 @@
+/**
+ * Benchmark Baseline and Regression Gate
+ *
+ * Reads the JSON that `vitest bench --outputJson` writes and either saves
+ * it as the baseline or compares it against that baseline, failing when a
+ * benchmark got slower than the threshold allows. The committed baseline
+ * (results/baseline.json) records the machine it was measured on; timings
+ * only compare on that hardware, so re-save it wherever the gate runs.
+ *
+ * Usage:
+ *   npx tsx test/bench/bench-baseline.ts save
+ *   npx tsx test/bench/bench-baseline.ts compare [--threshold 0.25] [--results path]
+ */
+import fs from "node:fs";
+import os from "node:os";
+import path from "node:path";
+
+// ---------------------------------------------------------------------------
+// Types
+// ---------------------------------------------------------------------------
+
+/** The parts of vitest's benchmark JSON report used here. */
+interface VitestBenchReport {
+  files: Array<{
+    filepath: string;
+    groups: Array<{
+      fullName: string;
+      benchmarks: Array<{
+        name: string;
+        mean: number;
+        p75: number;
+        p99: number;
+        hz: number;
+        rme: number;
+        sampleCount: number;
+      }>;
+    }>;
+  }>;
+}
+
+interface BaselineBenchmark {
+  mean_ms: number;
+  p75_ms: number;
+  p99_ms: number;
+  hz: number;
+  rme_percent: number;
+  samples: number;
+}
+
+interface BenchBaseline {
+  version: "1.0";
+  timestamp: string;
+  /** Allowed slowdown of a benchmark's mean, as a fraction (0.25 = 25%) */
+  threshold: number;
+  environment: Environment;
+  /** Keyed by "<group> > <benchmark>" */
+  benchmarks: Record<string, BaselineBenchmark>;
+}
+
+interface Environment {
+  node: string;
+  platform: string;
+  arch: string;
+  cpus: number;
+  cpu_model: string;
+  scales: string;
+}
+
+type Verdict = "ok" | "improved" | "regressed" | "new" | "missing";
+
+// ---------------------------------------------------------------------------
+// Constants
+// ---------------------------------------------------------------------------
+
+const ROOT = path.resolve(import.meta.dirname, "../..");
+const RESULTS_DIR = path.join(ROOT, "test/bench/results");
+const LATEST_PATH = path.join(RESULTS_DIR, "latest.json");
+const BASELINE_PATH = path.join(RESULTS_DIR, "baseline.json");
+
+const DEFAULT_THRESHOLD = 0.25;
+
+/** Differences smaller than this are timer noise, whatever the ratio. */
+const NOISE_FLOOR_MS = 0.05;
+
+// ---------------------------------------------------------------------------
+// Helpers
+// ---------------------------------------------------------------------------
+
+function readJson<T>(filePath: string): T {
+  const raw = fs.readFileSync(filePath, "utf8");
+  return JSON.parse(raw) as T;
+}
+
+function currentEnvironment(): Environment {
+  return {
+    node: process.version,
+    platform: process.platform,
+    arch: process.arch,
+    cpus: os.cpus().length,
+    cpu_model: os.cpus()[0]?.model ?? "unknown",
+    scales: process.env.TWINING_BENCH_SCALES ?? "1k",
+  };
+}
+
+/** Flatten a vitest report into baseline entries keyed by group and name. */
+export function flattenReport(report: VitestBenchReport): Record<string, BaselineBenchmark> {
+  const benchmarks: Record<string, BaselineBenchmark> = {};
+  for (const file of report.files) {
+    for (const group of file.groups) {
+      // Group names start with the file path; keep only the suite part
+      const suite = group.fullName.split(" > ").slice(1).join(" > ") || group.fullName;
+      for (const b of group.benchmarks) {
+        benchmarks[`${suite} > ${b.name}`] = {
+          mean_ms: round(b.mean),
+          p75_ms: round(b.p75),
+          p99_ms: round(b.p99),
+          hz: round(b.hz),
+          rme_percent: round(b.rme),
+          samples: b.sampleCount,
+        };
+      }
+    }
+  }
+  return benchmarks;
+}
+
+function round(value: number): number {
+  return Math.round(value * 10000) / 10000;
+}
+
+/** Judge one benchmark's mean against its baseline. */
+export function judge(
+  baseline: BaselineBenchmark | undefined,
+  latest: BaselineBenchmark | undefined,
+  threshold: number,
+): Verdict {
+  if (!baseline) return "new";
+  if (!latest) return "missing";
+  const delta = latest.mean_ms - baseline.mean_ms;
+  if (Math.abs(delta) < NOISE_FLOOR_MS) return "ok";
+  if (delta > baseline.mean_ms * threshold) return "regressed";
+  if (-delta > baseline.mean_ms * threshold) return "improved";
+  return "ok";
+}
+
+function describeEnvironment(env: Environment): string {
+  return `node ${env.node}, ${env.platform}/${env.arch}, ${env.cpus}x ${env.cpu_model}, scales ${env.scales}`;
+}
+
+function parseArgs(argv: string[]): { command: string; threshold?: number; results: string } {
+  const [command = "compare", ...rest] = argv;
+  let threshold: number | undefined;
+  let results = LATEST_PATH;
+  for (let i = 0; i < rest.length; i++) {
+    if (rest[i] === "--threshold") threshold = Number(rest[++i]);
+    else if (rest[i] === "--results") results = path.resolve(rest[++i] ?? "");
+  }
+  if (threshold !== undefined && !(threshold > 0)) {
+    console.error("--threshold must be a positive fraction, e.g. 0.25");
+    process.exit(2);
+  }
+  return { command, threshold, results };
+}
+
+// ---------------------------------------------------------------------------
+// Commands
+// ---------------------------------------------------------------------------
+
+function save(resultsPath: string, threshold: number | undefined): void {
+  const previous = fs.existsSync(BASELINE_PATH) ? readJson<BenchBaseline>(BASELINE_PATH) : null;
+  const baseline: BenchBaseline = {
+    version: "1.0",
+    timestamp: new Date().toISOString(),
+    threshold: threshold ?? previous?.threshold ?? DEFAULT_THRESHOLD,
+    environment: currentEnvironment(),
+    benchmarks: flattenReport(readJson<VitestBenchReport>(resultsPath)),
+  };
+  fs.mkdirSync(RESULTS_DIR, { recursive: true });
+  fs.writeFileSync(BASELINE_PATH, JSON.stringify(baseline, null, 2) + "\n");
+
+  console.log("Benchmark Baseline Saved");
+  console.log("========================");
+  console.log(`Benchmarks:  ${Object.keys(baseline.benchmarks).length}`);
+  console.log(`Threshold:   ${(baseline.threshold * 100).toFixed(0)}% slower than baseline mean`);
+  console.log(`Environment: ${describeEnvironment(baseline.environment)}`);
+  console.log(`Written to:  ${BASELINE_PATH}`);
+}
+
+function compare(resultsPath: string, thresholdOverride: number | undefined): number {
+  const baseline = readJson<BenchBaseline>(BASELINE_PATH);
+  const latest = flattenReport(readJson<VitestBenchReport>(resultsPath));
+  const threshold = thresholdOverride ?? baseline.threshold;
+  const env = currentEnvironment();
+
+  console.log("Benchmark Comparison");
+  console.log("====================");
+  console.log(`Baseline: ${baseline.timestamp} (${describeEnvironment(baseline.environment)})`);
+  console.log(`Current:  ${describeEnvironment(env)}`);
+  if (
+    env.node.split(".")[0] !== baseline.environment.node.split(".")[0] ||
+    env.cpu_model !== baseline.environment.cpu_model ||
+    env.platform !== baseline.environment.platform
+  ) {
+    console.log("Warning: different machine or Node major than the baseline; re-save it here for a fair gate.");
+  }
+  console.log(`Threshold: ${(threshold * 100).toFixed(0)}% on mean time`);
+  console.log("");
+
+  const names = [...new Set([...Object.keys(baseline.benchmarks), ...Object.keys(latest)])].sort();
+  const counts: Record<Verdict, number> = { ok: 0, improved: 0, regressed: 0, new: 0, missing: 0 };
+  const width = Math.max(...names.map((n) => n.length), 10);
+  console.log(`${"benchmark".padEnd(width)}  ${"baseline".padStart(10)}  ${"current".padStart(10)}  ${"change".padStart(8)}  verdict`);
+  for (const name of names) {
+    const before = baseline.benchmarks[name];
+    const after = latest[name];
+    const verdict = judge(before, after, threshold);
+    counts[verdict]++;
+    const change =
+      before && after ? `${((after.mean_ms / before.mean_ms - 1) * 100).toFixed(1)}%` : "";
+    console.log(
+      `${name.padEnd(width)}  ${(before ? before.mean_ms.toFixed(3) : "-").padStart(10)}  ` +
+        `${(after ? after.mean_ms.toFixed(3) : "-").padStart(10)}  ${change.padStart(8)}  ${verdict}`,
+    );
+  }
+
+  console.log("");
+  console.log(
+    `${counts.regressed} regressed, ${counts.improved} improved, ${counts.ok} unchanged, ` +
+      `${counts.new} new, ${counts.missing} not run`,
+  );
+  return counts.regressed > 0 ? 1 : 0;
+}
+
+// ---------------------------------------------------------------------------
+// CLI entry point
+// ---------------------------------------------------------------------------
+
+if (process.argv[1] && path.resolve(process.argv[1]) === path.resolve(import.meta.filename)) {
+  const { command, threshold, results } = parseArgs(process.argv.slice(2));
+  if (!fs.existsSync(results)) {
+    console.error(`No benchmark results at ${results}; run \`npm run bench\` first.`);
+    process.exit(2);
+  }
+  if (command === "save") {
+    save(results, threshold);
+  } else if (command === "compare") {
+    if (!fs.existsSync(BASELINE_PATH)) {
+      console.error(`No baseline at ${BASELINE_PATH}; run \`npm run bench:baseline\` first.`);
+      process.exit(2);
+    }
+    process.exit(compare(results, threshold));
+  } else {
+    console.error("Usage: npx tsx test/bench/bench-baseline.ts save|compare [--threshold 0.25] [--results path]");
+    process.exit(2);
+  }
+}
@@ -0,0 +1,65 @@
+/**
+ * Child process for the lock contention benchmarks.
+ *
+ * Runs under plain Node, so it imports the built stores from dist/; the
+ * benchmarks skip themselves when dist/ is missing (run `npm run build`).
+ * Each {op, count} message performs `count` writes against the shared
+ * project and replies {ok} once they are done.
+ *
+ * Usage (forked by contention.bench.ts): contention-worker.mjs <twining-dir> <agent-id>
+ */
+import { BlackboardStore } from "../../dist/storage/blackboard-store.js";
+import { DecisionStore } from "../../dist/storage/decision-store.js";
+
+const [twiningDir, agentId] = process.argv.slice(2);
+const blackboardStore = new BlackboardStore(twiningDir);
+const decisionStore = new DecisionStore(twiningDir);
+let n = 0;
+
+async function post() {
+  await blackboardStore.append({
+    agent_id: agentId,
+    entry_type: "status",
+    tags: ["contention"],
+    scope: "src/contention/",
+    summary: `${agentId} status ${n++}`,
+    detail: "Written by the lock contention benchmark",
+  });
+}
+
+async function decide() {
+  await decisionStore.create({
+    agent_id: agentId,
+    domain: "implementation",
+    scope: "src/contention/",
+    summary: `${agentId} decision ${n++}`,
+    context: "Written by the lock contention benchmark",
+    rationale: "Measures decision index lock contention",
+    constraints: [],
+    alternatives: [],
+    depends_on: [],
+    confidence: "medium",
+    reversible: true,
+    affected_files: [],
+    affected_symbols: [],
+    commit_hashes: [],
+  });
+}
+
+const OPS = {
+  post,
+  decide,
+  mixed: async () => (n % 4 === 0 ? decide() : post()),
+};
+
+process.on("message", async ({ op, count }) => {
+  try {
+    for (let i = 0; i < count; i++) await OPS[op]();
+    process.send({ ok: true });
+  } catch (err) {
+    process.send({ ok: false, error: String(err?.stack ?? err) });
+  }
+});
+
+// Exit with the benchmark, even if it never says goodbye
+process.on("disconnect", () => process.exit(0));
@@ -0,0 +1,100 @@
+/**
+ * Multi-process lock contention benchmarks.
+ *
+ * Several Node processes write to one project at once, as separate MCP
+ * server processes do when agents share a repo. Workers are forked once
+ * per bench and kept alive, so an iteration times the writes and the
+ * lock waits between them, not process startup.
+ *
+ * Workers run the built stores from dist/; these benches are skipped
+ * until `npm run build` has been run.
+ */
+import { fork, type ChildProcess } from "node:child_process";
+import fs from "node:fs";
+import path from "node:path";
+import { bench, describe } from "vitest";
+import { cachedState, copyState, selectedScales } from "./synthetic-state.js";
+
+const WORKER = path.join(import.meta.dirname, "contention-worker.mjs");
+const BUILT = fs.existsSync(
+  path.join(import.meta.dirname, "../../dist/storage/blackboard-store.js"),
+);
+
+const PROCESS_COUNTS = [1, 4, 8];
+
+/** Writes per process per iteration. */
+const WRITES = 20;
+
+type Op = "post" | "decide" | "mixed";
+
+/** A pool of forked writers sharing one project copy. */
+class WriterPool {
+  private readonly cachedRoot: string;
+  private readonly size: number;
+  private workers: ChildProcess[] = [];
+  private projectRoot = "";
+
+  constructor(cachedRoot: string, size: number) {
+    this.cachedRoot = cachedRoot;
+    this.size = size;
+  }
+
+  start(): void {
+    if (this.workers.length > 0) return;
+    this.projectRoot = copyState(this.cachedRoot);
+    const twiningDir = path.join(this.projectRoot, ".twining");
+    for (let i = 0; i < this.size; i++) {
+      this.workers.push(fork(WORKER, [twiningDir, `writer-${i}`], { stdio: "ignore" }));
+    }
+  }
+
+  /** Have every worker do `count` writes at once; resolves when all are done. */
+  async run(op: Op, count: number): Promise<void> {
+    await Promise.all(
+      this.workers.map(
+        (worker) =>
+          new Promise<void>((resolve, reject) => {
+            worker.once("message", (reply: { ok: boolean; error?: string }) =>
+              reply.ok ? resolve() : reject(new Error(reply.error)),
+            );
+            worker.send({ op, count });
+          }),
+      ),
+    );
+  }
+
+  stop(): void {
+    for (const worker of this.workers.splice(0)) worker.kill();
+    if (this.projectRoot) {
+      fs.rmSync(path.dirname(this.projectRoot), { recursive: true, force: true });
+    }
+  }
+}
+
+for (const scale of selectedScales()) {
+  const { projectRoot } = BUILT ? await cachedState(scale) : { projectRoot: "" };
+
+  for (const op of ["post", "decide", "mixed"] as const) {
+    describe(`Lock contention, ${op} (${scale})`, () => {
+      for (const processes of PROCESS_COUNTS) {
+        const pool = new WriterPool(projectRoot, processes);
+        bench.skipIf(!BUILT)(
+          `${processes} process${processes === 1 ? "" : "es"} x ${WRITES} writes`,
+          async () => {
+            await pool.run(op, WRITES);
+          },
+          {
+            time: 0,
+            iterations: 10,
+            warmupTime: 0,
+            warmupIterations: 1,
+            setup: () => pool.start(),
+            teardown: (_task, mode) => {
+              if (mode === "run") pool.stop();
+            },
+          },
+        );
+      }
+    });
+  }
+}
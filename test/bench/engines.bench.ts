@@ -0,0 +1,83 @@
+/**
+ * Engine hot-path benchmarks: context assembly, search and graph
+ * traversal over generated projects. Nothing here writes, so every bench
+ * shares one cached fixture per scale.
+ *
+ * Scales come from TWINING_BENCH_SCALES (default "1k").
+ */
+import { bench, describe } from "vitest";
+import { cachedState, selectedScales } from "./synthetic-state.js";
+import { openServices } from "./services.js";
+
+for (const scale of selectedScales()) {
+  const { projectRoot, state } = await cachedState(scale);
+  const services = openServices(projectRoot, state.twiningDir);
+  const words = state.words;
+  const query = `${words[16]} ${words[17]} ${words[6]}`;
+
+  // Keyword postings are built on write and at startup; build them once
+  // here so no measured call pays for it
+  await services.searchEngine.indexMissingBlackboardEntries(
+    (await services.blackboardStore.read()).entries,
+  );
+  await services.searchEngine.indexMissingDecisions(
+    (await services.decisionStore.getIndex()).map((d) => d.id),
+    (ids) => services.decisionStore.getMany(ids),
+  );
+
+  describe(`ContextAssembler.assemble (${scale})`, () => {
+    let n = 0;
+    bench("new task, hot scope", async () => {
+      n++;
+      await services.contextAssembler.assemble(`Fix ${words[n % words.length]} handling ${n}`, state.hot_scope);
+    });
+
+    bench("new task, file scope", async () => {
+      n++;
+      await services.contextAssembler.assemble(`Fix ${words[n % words.length]} handling ${n}`, state.hot_file);
+    });
+
+    bench("new task, project scope", async () => {
+      n++;
+      await services.contextAssembler.assemble(`Fix ${words[n % words.length]} handling ${n}`, "project");
+    });
+
+    bench("repeated task, hot scope (memoized)", async () => {
+      await services.contextAssembler.assemble("Review retry handling", state.hot_scope);
+    });
+  });
+
+  describe(`SearchEngine (${scale})`, () => {
+    // Candidates as the engines and the assembler pass them
+    bench("searchBlackboard", async () => {
+      const candidates = await services.blackboardStore.searchCandidates();
+      await services.searchEngine.searchBlackboard(query, candidates);
+    });
+
+    bench("searchBlackboard, hot scope", async () => {
+      const candidates = await services.blackboardStore.searchCandidates({ scope: state.hot_scope });
+      await services.searchEngine.searchBlackboard(query, candidates);
+    });
+
+    bench("searchDecisions", async () => {
+      const candidates = await services.decisionStore.searchCandidates(
+        (d) => d.status === "active" || d.status === "provisional",
+      );
+      await services.searchEngine.searchDecisions(query, candidates);
+    });
+  });
+
+  describe(`GraphEngine.neighbors (${scale})`, () => {
+    bench("hub entity, depth 1", async () => {
+      await services.graphEngine.neighbors(state.hub_entity, 1);
+    });
+
+    bench("hub entity, depth 2", async () => {
+      await services.graphEngine.neighbors(state.hub_entity, 2);
+    });
+
+    bench("leaf entity, depth 3", async () => {
+      await services.graphEngine.neighbors(state.leaf_entity, 3);
+    });
+  });
+}
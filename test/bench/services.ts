@@ -0,0 +1,67 @@
+/**
+ * Engine wiring for benchmarks.
+ * The subset of createServices() that the benchmarked paths use, built
+ * without the MCP server so a bench measures the engines alone.
+ */
+import { loadConfig } from "../../src/config.js";
+import { BlackboardStore } from "../../src/storage/blackboard-store.js";
+import { DecisionStore } from "../../src/storage/decision-store.js";
+import { GraphStore } from "../../src/storage/graph-store.js";
+import { AgentStore } from "../../src/storage/agent-store.js";
+import { HandoffStore } from "../../src/storage/handoff-store.js";
+import { BlackboardEngine } from "../../src/engine/blackboard.js";
+import { GraphEngine } from "../../src/engine/graph.js";
+import { Archiver } from "../../src/engine/archiver.js";
+import { ContextAssembler } from "../../src/engine/context-assembler.js";
+import { PlanningBridge } from "../../src/engine/planning-bridge.js";
+import { Embedder } from "../../src/embeddings/embedder.js";
+import { IndexManager } from "../../src/embeddings/index-manager.js";
+import { SearchEngine } from "../../src/embeddings/search.js";
+
+export interface BenchServices {
+  blackboardStore: BlackboardStore;
+  decisionStore: DecisionStore;
+  graphStore: GraphStore;
+  blackboardEngine: BlackboardEngine;
+  graphEngine: GraphEngine;
+  searchEngine: SearchEngine;
+  archiver: Archiver;
+  contextAssembler: ContextAssembler;
+}
+
+/**
+ * Open a project's stores and engines. Under vitest the embedder stays in
+ * keyword fallback mode, so search timings don't depend on a model download.
+ */
+export function openServices(projectRoot: string, twiningDir: string): BenchServices {
+  const config = loadConfig(twiningDir);
+  const blackboardStore = new BlackboardStore(twiningDir);
+  const decisionStore = new DecisionStore(twiningDir);
+  const graphStore = new GraphStore(twiningDir);
+  const embedder = Embedder.getInstance(twiningDir, config.embeddings);
+  const indexManager = new IndexManager(twiningDir);
+  const searchEngine = new SearchEngine(embedder, indexManager, config.search?.ann);
+  const blackboardEngine = new BlackboardEngine(blackboardStore, embedder, indexManager, searchEngine);
+  const graphEngine = new GraphEngine(graphStore);
+  const archiver = new Archiver(twiningDir, blackboardStore, blackboardEngine, indexManager);
+  const contextAssembler = new ContextAssembler(
+    blackboardStore,
+    decisionStore,
+    searchEngine,
+    config,
+    graphEngine,
+    new PlanningBridge(projectRoot),
+    new HandoffStore(twiningDir),
+    new AgentStore(twiningDir),
+  );
+  return {
+    blackboardStore,
+    decisionStore,
+    graphStore,
+    blackboardEngine,
+    graphEngine,
+    searchEngine,
+    archiver,
+    contextAssembler,
+  };
+}
@@ -0,0 +1,113 @@
+/**
+ * Store write-path and load benchmarks over generated projects. Each
+ * scale works on its own copy of the cached fixture, since these grow or
+ * archive it.
+ *
+ * Scales come from TWINING_BENCH_SCALES (default "1k").
+ */
+import fs from "node:fs";
+import path from "node:path";
+import { bench, describe } from "vitest";
+import { BlackboardStore } from "../../src/storage/blackboard-store.js";
+import { DecisionStore } from "../../src/storage/decision-store.js";
+import { GraphStore } from "../../src/storage/graph-store.js";
+import type { Decision } from "../../src/utils/types.js";
+import { cachedState, copyState, selectedScales } from "./synthetic-state.js";
+import { openServices } from "./services.js";
+
+/** Archive runs per bench; the cutoff advances through the timeline. */
+const ARCHIVE_RUNS = 20;
+
+function decisionInput(n: number, scope: string): Omit<Decision, "id" | "timestamp" | "status"> {
+  return {
+    agent_id: "bench",
+    domain: "implementation",
+    scope,
+    summary: `Benchmark decision ${n}`,
+    context: "Recorded by the store benchmarks",
+    rationale: "Measures the decision write path",
+    constraints: [],
+    alternatives: [],
+    depends_on: [],
+    confidence: "medium",
+    reversible: true,
+    affected_files: [`${scope}bench-${n}.ts`],
+    affected_symbols: [],
+    commit_hashes: [],
+  };
+}
+
+for (const scale of selectedScales()) {
+  const { projectRoot: cachedRoot, state } = await cachedState(scale);
+  const projectRoot = copyState(cachedRoot);
+  const twiningDir = path.join(projectRoot, ".twining");
+  const services = openServices(projectRoot, twiningDir);
+  let n = 0;
+
+  describe(`DecisionStore.create (${scale})`, () => {
+    bench("create", async () => {
+      await services.decisionStore.create(decisionInput(n++, state.hot_scope));
+    });
+
+    bench("createBatch of 20", async () => {
+      await services.decisionStore.createBatch(
+        Array.from({ length: 20 }, () => decisionInput(n++, state.hot_scope)),
+      );
+    });
+  });
+
+  describe(`BlackboardStore (${scale})`, () => {
+    bench("append", async () => {
+      await services.blackboardStore.append({
+        agent_id: "bench",
+        entry_type: "finding",
+        tags: ["bench"],
+        scope: state.hot_scope,
+        summary: `Benchmark finding ${n++}`,
+        detail: "Measures the post write path",
+      });
+    });
+
+    bench("read, hot scope", async () => {
+      await services.blackboardStore.read({ scope: state.hot_scope });
+    });
+  });
+
+  // What a fresh process pays on its first call to each store
+  describe(`Cold load (${scale})`, () => {
+    bench("BlackboardStore.count", async () => {
+      await new BlackboardStore(twiningDir).count();
+    });
+
+    bench("DecisionStore.getIndex", async () => {
+      await new DecisionStore(twiningDir).getIndex();
+    });
+
+    bench("GraphStore.getAdjacency", async () => {
+      await new GraphStore(twiningDir).getAdjacency();
+    });
+  });
+
+  describe(`Archiver.archive (${scale})`, () => {
+    const first = Date.parse(state.first_timestamp);
+    const step = (Date.parse(state.last_timestamp) - first) / (ARCHIVE_RUNS + 5);
+    let run = 0;
+    bench(
+      "next slice of the timeline",
+      async () => {
+        run++;
+        await services.archiver.archive({ before: new Date(first + run * step).toISOString() });
+      },
+      {
+        // Each run consumes entries, so run a fixed count with no warmup
+        time: 0,
+        iterations: ARCHIVE_RUNS,
+        warmupTime: 0,
+        warmupIterations: 0,
+        teardown: (_task, mode) => {
+          if (mode === "run") fs.rmSync(path.dirname(projectRoot), { recursive: true, force: true });
+        },
+      },
+    );
+  });
+}
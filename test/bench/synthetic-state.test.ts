@@ -0,0 +1,77 @@
+import { describe, it, expect, beforeEach, afterEach } from "vitest";
+import fs from "node:fs";
+import path from "node:path";
+import os from "node:os";
+import { generateState } from "./synthetic-state.js";
+import { BlackboardStore } from "../../src/storage/blackboard-store.js";
+import { DecisionStore } from "../../src/storage/decision-store.js";
+import { GraphStore } from "../../src/storage/graph-store.js";
+import { GraphEngine } from "../../src/engine/graph.js";
+
+let tmpDir: string;
+
+beforeEach(() => {
+  tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), "twining-synthetic-test-"));
+});
+
+afterEach(() => {
+  fs.rmSync(tmpDir, { recursive: true, force: true });
+});
+
+const SMALL = { entries: 3000, decisions: 200, entities: 300 };
+
+/** Every file under a directory, relative path -> contents. */
+function readTree(dir: string): Map<string, string> {
+  const files = new Map<string, string>();
+  for (const entry of fs.readdirSync(dir, { recursive: true, withFileTypes: true })) {
+    if (!entry.isFile()) continue;
+    const full = path.join(entry.parentPath, entry.name);
+    files.set(path.relative(dir, full), fs.readFileSync(full, "utf-8"));
+  }
+  return files;
+}
+
+describe("generateState", () => {
+  it("produces identical files for the same seed", async () => {
+    await generateState(path.join(tmpDir, "a", "project"), { ...SMALL, seed: 7 });
+    await generateState(path.join(tmpDir, "b", "project"), { ...SMALL, seed: 7 });
+    await generateState(path.join(tmpDir, "c", "project"), { ...SMALL, seed: 8 });
+
+    const a = readTree(path.join(tmpDir, "a", "project"));
+    expect(readTree(path.join(tmpDir, "b", "project"))).toEqual(a);
+    expect(readTree(path.join(tmpDir, "c", "project"))).not.toEqual(a);
+  });
+
+  it("writes a project the stores load", async () => {
+    const state = await generateState(path.join(tmpDir, "project"), SMALL);
+
+    const blackboard = new BlackboardStore(state.twiningDir);
+    expect(await blackboard.count()).toBe(SMALL.entries);
+    const manifest = JSON.parse(
+      fs.readFileSync(path.join(state.twiningDir, "blackboard", "manifest.json"), "utf-8"),
+    ) as { segments: unknown[] };
+    expect(manifest.segments.length).toBeGreaterThan(0);
+    const entries = (await blackboard.read()).entries;
+    expect(entries[0]!.timestamp).toBe(state.first_timestamp);
+    expect(entries.at(-1)!.timestamp).toBe(state.last_timestamp);
+    expect(new Set(entries.map((e) => e.id)).size).toBe(SMALL.entries);
+
+    const decisions = new DecisionStore(state.twiningDir);
+    const index = await decisions.getIndex();
+    expect(index).toHaveLength(SMALL.decisions);
+    expect(await decisions.get(index[0]!.id)).toMatchObject({ id: index[0]!.id });
+    expect((await decisions.getByScope(state.hot_scope)).length).toBeGreaterThan(0);
+    expect(index.some((d) => d.status === "superseded")).toBe(true);
+
+    const graph = new GraphEngine(new GraphStore(state.twiningDir));
+    const hub = await graph.neighbors(state.hub_entity, 1);
+    expect(hub.neighbors.length).toBeGreaterThan(10);
+  });
+
+  it("refuses to overwrite an existing project", async () => {
+    await generateState(path.join(tmpDir, "project"), { entries: 1, decisions: 1, entities: 1 });
+    await expect(
+      generateState(path.join(tmpDir, "project"), { entries: 1, decisions: 1, entities: 1 }),
+    ).rejects.toThrow(/already has a .twining directory/);
+  });
+});
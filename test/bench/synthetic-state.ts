@@ -0,0 +1,564 @@
+/**
+ * Synthetic .twining/ Generator
+ *
+ * Builds a realistic project state from a seed, for benchmarks that need
+ * more data than a unit test fixture: blackboard entries spread over a
+ * timeline and rolled into sealed segments, decisions with supersession
+ * chains and dependencies, and a knowledge graph with hub entities.
+ * Activity is skewed towards a few hot modules, as in real projects.
+ *
+ * Everything is derived from the seed (IDs included), so the same options
+ * produce byte-identical files. Sealing goes through BlackboardStore.roll()
+ * and the other files are written in the stores' snapshot formats, which
+ * the stores load like any other project.
+ *
+ * Usage: npx tsx test/bench/synthetic-state.ts <project-dir> [1k|10k|100k] [seed]
+ */
+import fs from "node:fs";
+import os from "node:os";
+import path from "node:path";
+import { ensureInitialized } from "../../src/storage/init.js";
+import { BlackboardStore } from "../../src/storage/blackboard-store.js";
+import type {
+  BlackboardEntry,
+  Decision,
+  DecisionIndexEntry,
+  Entity,
+  EntryType,
+  Relation,
+} from "../../src/utils/types.js";
+
+// ---------------------------------------------------------------------------
+// Types
+// ---------------------------------------------------------------------------
+
+export type ScaleName = "1k" | "10k" | "100k";
+
+export interface SyntheticStateOptions {
+  entries: number;
+  decisions: number;
+  entities: number;
+  seed?: number;
+  /** Outgoing relations per entity (default 2) */
+  relations_per_entity?: number;
+}
+
+/** What was generated, plus handles the benchmarks query by. */
+export interface SyntheticState {
+  twiningDir: string;
+  entries: number;
+  decisions: number;
+  entities: number;
+  relations: number;
+  /** Timestamps of the first and last blackboard entries */
+  first_timestamp: string;
+  last_timestamp: string;
+  /** The busiest module directory and one of its files */
+  hot_scope: string;
+  hot_file: string;
+  /** The most connected entity, and one of the last added */
+  hub_entity: string;
+  leaf_entity: string;
+  /** Vocabulary words, for building search queries */
+  words: readonly string[];
+}
+
+// ---------------------------------------------------------------------------
+// Constants
+// ---------------------------------------------------------------------------
+
+export const SCALES: Record<ScaleName, SyntheticStateOptions> = {
+  "1k": { entries: 1_000, decisions: 1_000, entities: 1_000 },
+  "10k": { entries: 10_000, decisions: 10_000, entities: 10_000 },
+  "100k": { entries: 100_000, decisions: 100_000, entities: 100_000 },
+};
+
+export const DEFAULT_SEED = 42;
+
+/** Bump when the generated content changes, so cached fixtures are rebuilt. */
+const GENERATOR_VERSION = 1;
+
+const START_MS = Date.parse("2025-01-01T00:00:00.000Z");
+
+/** One blackboard entry per minute of simulated activity. */
+const ENTRY_INTERVAL_MS = 60_000;
+
+/** Entries per write, matching a busy agent's post rate. */
+const APPEND_BATCH = 100;
+
+/** BlackboardStore's default head segment cap. */
+const SEGMENT_MAX_BYTES = 1024 * 1024;
+
+const FILES_PER_MODULE = 8;
+
+const AGENTS = ["main", "planner", "reviewer", "tester", "migrator", "docs", "security", "perf"];
+
+const WORDS = [
+  "auth", "billing", "storage", "search", "graph", "cache", "queue", "session",
+  "token", "schema", "migration", "index", "lock", "batch", "stream", "quota",
+  "retry", "timeout", "backoff", "snapshot", "replica", "shard", "checksum", "latency",
+  "webhook", "rollback", "cursor", "pagination", "validation", "parser", "router", "config",
+  "metrics", "tracing", "export", "import", "scheduler", "worker", "payload", "encoder",
+];
+
+const ENTRY_TYPE_WEIGHTS: Array<[EntryType, number]> = [
+  ["finding", 35],
+  ["status", 20],
+  ["warning", 10],
+  ["need", 8],
+  ["artifact", 7],
+  ["decision", 5],
+  ["question", 5],
+  ["answer", 5],
+  ["offer", 3],
+  ["constraint", 2],
+];
+
+const DOMAINS = ["architecture", "implementation", "testing", "security", "performance", "data"];
+
+const ENTITY_TYPES: Array<Entity["type"]> = ["function", "class", "concept", "pattern", "dependency"];
+
+const RELATION_TYPES: Array<Relation["type"]> = [
+  "depends_on", "calls", "imports", "related_to", "implements", "tested_by",
+];
+
+const ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ";
+
+// ---------------------------------------------------------------------------
+// Helpers
+// ---------------------------------------------------------------------------
+
+/** mulberry32: small, fast and good enough for fixture data. */
+function createRng(seed: number): () => number {
+  let a = seed >>> 0;
+  return () => {
+    a = (a + 0x6d2b79f5) >>> 0;
+    let t = a;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+class Generator {
+  private readonly rng: () => number;
+
+  constructor(seed: number) {
+    this.rng = createRng(seed);
+  }
+
+  next(): number {
+    return this.rng();
+  }
+
+  int(max: number): number {
+    return Math.floor(this.rng() * max);
+  }
+
+  /** Index in [0, max), skewed towards 0: a few hot items, a long tail. */
+  skewed(max: number): number {
+    const r = this.rng();
+    return Math.floor(r * r * max);
+  }
+
+  pick<T>(items: readonly T[]): T {
+    return items[this.int(items.length)]!;
+  }
+
+  weighted<T>(items: ReadonlyArray<readonly [T, number]>): T {
+    const total = items.reduce((sum, [, w]) => sum + w, 0);
+    let r = this.rng() * total;
+    for (const [item, weight] of items) {
+      r -= weight;
+      if (r < 0) return item;
+    }
+    return items[items.length - 1]![0];
+  }
+
+  words(count: number): string {
+    return Array.from({ length: count }, () => this.pick(WORDS)).join(" ");
+  }
+
+  /** A ULID for the given time, with seeded randomness. */
+  ulid(timeMs: number): string {
+    let time = "";
+    let t = timeMs;
+    for (let i = 0; i < 10; i++) {
+      time = ULID_ALPHABET[t % 32] + time;
+      t = Math.floor(t / 32);
+    }
+    let random = "";
+    for (let i = 0; i < 16; i++) random += ULID_ALPHABET[this.int(32)];
+    return time + random;
+  }
+
+  hex(length: number): string {
+    let out = "";
+    for (let i = 0; i < length; i++) out += this.int(16).toString(16);
+    return out;
+  }
+}
+
+function moduleNames(count: number): string[] {
+  return Array.from({ length: count }, (_, i) => {
+    const round = Math.floor(i / WORDS.length);
+    return WORDS[i % WORDS.length]! + (round > 0 ? String(round + 1) : "");
+  });
+}
+
+function capitalize(word: string): string {
+  return word.charAt(0).toUpperCase() + word.slice(1);
+}
+
+/** The scope layout: hot modules first, each with a fixed set of files. */
+class Layout {
+  readonly modules: string[];
+
+  constructor(scale: number) {
+    this.modules = moduleNames(Math.min(200, Math.max(8, Math.round(Math.sqrt(scale) / 2))));
+  }
+
+  moduleScope(m: number): string {
+    return `src/${this.modules[m]}/`;
+  }
+
+  fileScope(m: number, f: number): string {
+    return `src/${this.modules[m]}/${WORDS[(m + f * 7) % WORDS.length]}-${f}.ts`;
+  }
+
+  /** "project" 15% of the time, else a module (35%) or one of its files. */
+  scope(gen: Generator): string {
+    const r = gen.next();
+    if (r < 0.15) return "project";
+    const m = gen.skewed(this.modules.length);
+    if (r < 0.5) return this.moduleScope(m);
+    return this.fileScope(m, gen.int(FILES_PER_MODULE));
+  }
+}
+
+// ---------------------------------------------------------------------------
+// Content
+// ---------------------------------------------------------------------------
+
+function makeEntry(gen: Generator, layout: Layout, i: number, earlier: string[]): BlackboardEntry {
+  const timeMs = START_MS + i * ENTRY_INTERVAL_MS;
+  const entryType = gen.weighted(ENTRY_TYPE_WEIGHTS);
+  const entry: BlackboardEntry = {
+    id: gen.ulid(timeMs),
+    timestamp: new Date(timeMs).toISOString(),
+    agent_id: gen.pick(AGENTS),
+    entry_type: entryType,
+    tags: Array.from({ length: 1 + gen.int(3) }, () => gen.pick(WORDS)),
+    scope: layout.scope(gen),
+    summary: `${capitalize(gen.words(3))} ${entryType} in ${gen.pick(layout.modules)}`,
+    detail: `${capitalize(gen.words(12))}. ${capitalize(gen.words(18))}.`,
+  };
+  if (earlier.length > 0 && gen.next() < 0.1) {
+    entry.relates_to = [earlier[gen.int(earlier.length)]!];
+  }
+  return entry;
+}
+
+function makeDecision(
+  gen: Generator,
+  layout: Layout,
+  timeMs: number,
+  earlier: Decision[],
+): Decision {
+  const m = gen.skewed(layout.modules.length);
+  const file = layout.fileScope(m, gen.int(FILES_PER_MODULE));
+  const scope = gen.next() < 0.4 ? layout.moduleScope(m) : file;
+  const decision: Decision = {
+    id: gen.ulid(timeMs),
+    timestamp: new Date(timeMs).toISOString(),
+    agent_id: gen.pick(AGENTS),
+    domain: gen.pick(DOMAINS),
+    scope,
+    summary: `Use ${gen.words(2)} for ${gen.words(2)} in ${layout.modules[m]}`,
+    context: `${capitalize(gen.words(15))}.`,
+    rationale: `${capitalize(gen.words(20))}.`,
+    constraints: Array.from({ length: gen.int(3) }, () => capitalize(gen.words(6))),
+    alternatives: Array.from({ length: 1 + gen.int(2) }, () => ({
+      option: capitalize(gen.words(3)),
+      pros: [gen.words(4)],
+      cons: [gen.words(4)],
+      reason_rejected: capitalize(gen.words(8)),
+    })),
+    depends_on: [],
+    confidence: gen.weighted([["high", 50], ["medium", 35], ["low", 15]] as const),
+    status: "active",
+    reversible: gen.next() < 0.7,
+    affected_files: gen.next() < 0.3 ? [file, layout.fileScope(m, gen.int(FILES_PER_MODULE))] : [file],
+    affected_symbols: [`${capitalize(gen.pick(WORDS))}${capitalize(gen.pick(WORDS))}`],
+    commit_hashes: gen.next() < 0.3 ? [gen.hex(40)] : [],
+  };
+
+  if (earlier.length > 0) {
+    if (gen.next() < 0.1) {
+      decision.depends_on = [earlier[gen.int(earlier.length)]!.id];
+    }
+    // Supersede an active decision on the same scope, if there is one nearby
+    if (gen.next() < 0.08) {
+      const previous = earlier
+        .slice(-50)
+        .find((d) => d.scope === scope && d.status === "active");
+      if (previous) {
+        previous.status = "superseded";
+        decision.supersedes = previous.id;
+      }
+    }
+  }
+  return decision;
+}
+
+function toIndexEntry(decision: Decision): DecisionIndexEntry {
+  return {
+    id: decision.id,
+    timestamp: decision.timestamp,
+    domain: decision.domain,
+    scope: decision.scope,
+    summary: decision.summary,
+    confidence: decision.confidence,
+    status: decision.status,
+    affected_files: decision.affected_files,
+    affected_symbols: decision.affected_symbols,
+    commit_hashes: decision.commit_hashes,
+  };
+}
+
+// ---------------------------------------------------------------------------
+// Writers
+// ---------------------------------------------------------------------------
+
+async function writeBlackboard(
+  twiningDir: string,
+  gen: Generator,
+  layout: Layout,
+  count: number,
+): Promise<void> {
+  const store = new BlackboardStore(twiningDir, { segment_max_bytes: SEGMENT_MAX_BYTES });
+  const headPath = path.join(twiningDir, "blackboard.jsonl");
+  const ids: string[] = [];
+  for (let start = 0; start < count; start += APPEND_BATCH) {
+    const batch: BlackboardEntry[] = [];
+    for (let i = start; i < Math.min(count, start + APPEND_BATCH); i++) {
+      batch.push(makeEntry(gen, layout, i, ids));
+    }
+    ids.push(...batch.map((e) => e.id));
+    fs.appendFileSync(headPath, batch.map((e) => JSON.stringify(e) + "\n").join(""));
+    // Seal as appendBatch() would
+    if (fs.statSync(headPath).size >= SEGMENT_MAX_BYTES) await store.roll();
+  }
+}
+
+function writeDecisions(
+  twiningDir: string,
+  gen: Generator,
+  layout: Layout,
+  count: number,
+  spanMs: number,
+): void {
+  const decisions: Decision[] = [];
+  const step = count > 0 ? Math.max(1, Math.floor(spanMs / count)) : 1;
+  for (let i = 0; i < count; i++) {
+    decisions.push(makeDecision(gen, layout, START_MS + i * step + 1, decisions));
+  }
+  const decisionsDir = path.join(twiningDir, "decisions");
+  for (const decision of decisions) {
+    fs.writeFileSync(
+      path.join(decisionsDir, `${decision.id}.json`),
+      JSON.stringify(decision, null, 2),
+    );
+  }
+  fs.writeFileSync(
+    path.join(decisionsDir, "index.json"),
+    JSON.stringify(decisions.map(toIndexEntry), null, 2),
+  );
+}
+
+function writeGraph(
+  twiningDir: string,
+  gen: Generator,
+  layout: Layout,
+  count: number,
+  relationsPerEntity: number,
+  spanMs: number,
+): { relations: number; hub: string; leaf: string } {
+  const entities: Entity[] = [];
+  const step = count > 0 ? Math.max(1, Math.floor(spanMs / count)) : 1;
+  const modules = layout.modules.length;
+
+  for (let i = 0; i < count; i++) {
+    const createdAt = new Date(START_MS + i * step).toISOString();
+    let name: string;
+    let type: Entity["type"];
+    const properties: Record<string, string> = {};
+    // Modules, then their files, then symbols and concepts
+    if (i < modules) {
+      name = layout.moduleScope(i);
+      type = "module";
+    } else if (i < modules * (FILES_PER_MODULE + 1)) {
+      const k = i - modules;
+      name = layout.fileScope(k % modules, Math.floor(k / modules));
+      type = "file";
+    } else {
+      const m = gen.skewed(modules);
+      type = gen.pick(ENTITY_TYPES);
+      name = `${layout.modules[m]}.${capitalize(gen.pick(WORDS))}${capitalize(gen.pick(WORDS))}${i}`;
+      properties.file = layout.fileScope(m, gen.int(FILES_PER_MODULE));
+    }
+    entities.push({
+      id: gen.ulid(START_MS + i * step),
+      name,
+      type,
+      properties,
+      created_at: createdAt,
+      updated_at: createdAt,
+    });
+  }
+
+  // Preferential towards early entities, which become hubs
+  const relations: Relation[] = [];
+  for (let i = 1; i < entities.length; i++) {
+    const source = entities[i]!;
+    for (let r = 0; r < relationsPerEntity; r++) {
+      const target = entities[gen.skewed(i)]!;
+      relations.push({
+        id: gen.ulid(Date.parse(source.created_at)),
+        source: source.id,
+        target: target.id,
+        type: gen.pick(RELATION_TYPES),
+        properties: {},
+        created_at: source.created_at,
+      });
+    }
+  }
+
+  const graphDir = path.join(twiningDir, "graph");
+  fs.writeFileSync(path.join(graphDir, "entities.json"), JSON.stringify(entities, null, 2));
+  fs.writeFileSync(path.join(graphDir, "relations.json"), JSON.stringify(relations, null, 2));
+  return {
+    relations: relations.length,
+    hub: entities[0]?.name ?? "",
+    leaf: entities.at(-1)?.name ?? "",
+  };
+}
+
+// ---------------------------------------------------------------------------
+// Main
+// ---------------------------------------------------------------------------
+
+/**
+ * Generate a .twining/ directory under `projectRoot`, which must not
+ * already have one.
+ */
+export async function generateState(
+  projectRoot: string,
+  options: SyntheticStateOptions,
+): Promise<SyntheticState> {
+  if (fs.existsSync(path.join(projectRoot, ".twining"))) {
+    throw new Error(`${projectRoot} already has a .twining directory`);
+  }
+  const twiningDir = ensureInitialized(projectRoot);
+  const seed = options.seed ?? DEFAULT_SEED;
+  const layout = new Layout(Math.max(options.entries, options.decisions, options.entities));
+  const spanMs = Math.max(1, options.entries) * ENTRY_INTERVAL_MS;
+
+  // Separate streams, so changing one count leaves the other files alone
+  await writeBlackboard(twiningDir, new Generator(seed), layout, options.entries);
+  writeDecisions(twiningDir, new Generator(seed + 1), layout, options.decisions, spanMs);
+  const graph = writeGraph(
+    twiningDir,
+    new Generator(seed + 2),
+    layout,
+    options.entities,
+    options.relations_per_entity ?? 2,
+    spanMs,
+  );
+
+  return {
+    twiningDir,
+    entries: options.entries,
+    decisions: options.decisions,
+    entities: options.entities,
+    relations: graph.relations,
+    first_timestamp: new Date(START_MS).toISOString(),
+    last_timestamp: new Date(START_MS + Math.max(0, options.entries - 1) * ENTRY_INTERVAL_MS).toISOString(),
+    hot_scope: layout.moduleScope(0),
+    hot_file: layout.fileScope(0, 0),
+    hub_entity: graph.hub,
+    leaf_entity: graph.leaf,
+    words: WORDS,
+  };
+}
+
+/**
+ * A generated project for a scale, built once and cached in the temp dir.
+ * Benchmarks that write must work on a copy (see copyState).
+ */
+export async function cachedState(
+  scale: ScaleName,
+  seed = DEFAULT_SEED,
+): Promise<{ projectRoot: string; state: SyntheticState }> {
+  const cacheRoot = path.join(os.tmpdir(), `twining-bench-v${GENERATOR_VERSION}-${scale}-${seed}`);
+  const projectRoot = path.join(cacheRoot, "project");
+  const marker = path.join(cacheRoot, "state.json");
+  if (fs.existsSync(marker)) {
+    return { projectRoot, state: JSON.parse(fs.readFileSync(marker, "utf-8")) as SyntheticState };
+  }
+
+  // Generate beside the cache and rename, so an interrupted run never
+  // leaves a half-built fixture behind
+  const staging = fs.mkdtempSync(`${cacheRoot}.tmp-`);
+  const state = await generateState(path.join(staging, "project"), { ...SCALES[scale], seed });
+  fs.rmSync(cacheRoot, { recursive: true, force: true });
+  fs.renameSync(staging, cacheRoot);
+  state.twiningDir = path.join(projectRoot, ".twining");
+  fs.writeFileSync(marker, JSON.stringify(state, null, 2));
+  return { projectRoot, state };
+}
+
+/** Copy a cached project into a fresh temp dir. Returns the new project root. */
+export function copyState(projectRoot: string): string {
+  const target = path.join(fs.mkdtempSync(path.join(os.tmpdir(), "twining-bench-run-")), "project");
+  fs.cpSync(projectRoot, target, { recursive: true });
+  return target;
+}
+
+/**
+ * Scales to benchmark, from TWINING_BENCH_SCALES (comma-separated).
+ * Defaults to 1k; 100k takes minutes to generate and run.
+ */
+export function selectedScales(): ScaleName[] {
+  const raw = process.env.TWINING_BENCH_SCALES ?? "1k";
+  const scales = raw.split(",").map((s) => s.trim()).filter(Boolean);
+  for (const scale of scales) {
+    if (!(scale in SCALES)) {
+      throw new Error(`Unknown bench scale "${scale}" (expected ${Object.keys(SCALES).join(", ")})`);
+    }
+  }
+  return scales as ScaleName[];
+}
+
+// ---------------------------------------------------------------------------
+// CLI entry point
+// ---------------------------------------------------------------------------
+
+if (process.argv[1] && path.resolve(process.argv[1]) === path.resolve(import.meta.filename)) {
+  const [projectRoot, scale = "1k", seed = String(DEFAULT_SEED)] = process.argv.slice(2);
+  if (!projectRoot || !(scale in SCALES)) {
+    console.error("Usage: npx tsx test/bench/synthetic-state.ts <project-dir> [1k|10k|100k] [seed]");
+    process.exit(1);
+  }
+  const started = performance.now();
+  const state = await generateState(path.resolve(projectRoot), {
+    ...SCALES[scale as ScaleName],
+    seed: Number(seed),
+  });
+  console.log(
+    `Generated ${state.entries} entries, ${state.decisions} decisions, ` +
+      `${state.entities} entities and ${state.relations} relations in ` +
+      `${((performance.now() - started) / 1000).toFixed(1)}s`,
+  );
+  console.log(`  ${state.twiningDir}`);
+}
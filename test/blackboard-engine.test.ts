@@ -4,6 +4,10 @@ import path from "node:path";
 import os from "node:os";
 import { BlackboardStore } from "../src/storage/blackboard-store.js";
 import { BlackboardEngine } from "../src/engine/blackboard.js";
+import { Archiver } from "../src/engine/archiver.js";
+import { Embedder } from "../src/embeddings/embedder.js";
+import { IndexManager } from "../src/embeddings/index-manager.js";
+import { SearchEngine } from "../src/embeddings/search.js";
 import { TwiningError } from "../src/utils/errors.js";
 import type { TwiningConfig } from "../src/utils/types.js";
 import { DEFAULT_CONFIG } from "../src/config.js";
@@ -97,6 +101,45 @@ describe("BlackboardEngine.post", () => {
   });
 });
 
+describe("BlackboardEngine.postBatch", () => {
+  it("posts valid entries in order and reports invalid ones in place", async () => {
+    const results = await engine.postBatch([
+      { entry_type: "finding", summary: "First" },
+      { entry_type: "decision", summary: "Not allowed here" },
+      { entry_type: "warning", summary: "Second", scope: "src/auth/" },
+      { entry_type: "bogus", summary: "Bad type" },
+    ]);
+
+    expect(results).toHaveLength(4);
+    expect(results[0]).toHaveProperty("id");
+    expect(results[1]).toMatchObject({ code: "INVALID_INPUT" });
+    expect(results[2]).toHaveProperty("id");
+    expect(results[3]).toMatchObject({ code: "INVALID_INPUT" });
+
+    const { entries } = await engine.read();
+    expect(entries.map((e) => e.summary)).toEqual(["First", "Second"]);
+    expect(entries[1]!.scope).toBe("src/auth/");
+  });
+
+  it("writes the whole batch in one append", async () => {
+    const store = new BlackboardStore(tmpDir);
+    const appendBatch = vi.spyOn(store, "appendBatch");
+    const batchEngine = new BlackboardEngine(store);
+
+    await batchEngine.postBatch(
+      Array.from({ length: 5 }, (_, i) => ({ entry_type: "finding", summary: `F${i}` })),
+    );
+    expect(appendBatch).toHaveBeenCalledTimes(1);
+    expect((await batchEngine.read()).entries).toHaveLength(5);
+  });
+
+  it("returns only errors when nothing is valid", async () => {
+    const results = await engine.postBatch([{ entry_type: "finding", summary: "" }]);
+    expect(results).toEqual([{ error: "summary is required", code: "INVALID_INPUT" }]);
+    expect((await engine.read()).entries).toHaveLength(0);
+  });
+});
+
 describe("BlackboardEngine.read", () => {
   it("reads back posted entries", async () => {
     await engine.post({ entry_type: "finding", summary: "F1" });
@@ -121,6 +164,89 @@ describe("BlackboardEngine.read", () => {
   });
 });
 
+describe("BlackboardEngine.query include_archived", () => {
+  function searchingEngine(): { engine: BlackboardEngine; search: SearchEngine } {
+    const embedder = new Embedder(tmpDir);
+    (embedder as any).fallbackMode = true;
+    const search = new SearchEngine(embedder, new IndexManager(tmpDir));
+    return { engine: new BlackboardEngine(new BlackboardStore(tmpDir), null, null, search), search };
+  }
+
+  it("matches archived entries through the archive keyword index only when asked", async () => {
+    fs.mkdirSync(path.join(tmpDir, "archive"));
+    const archived = [
+      {
+        id: "ARCH1",
+        timestamp: "2024-06-01T00:00:00.000Z",
+        agent_id: "main",
+        entry_type: "warning",
+        tags: [],
+        scope: "src/db/",
+        summary: "Connection pool exhaustion under load",
+        detail: "",
+      },
+      {
+        id: "ARCH2",
+        timestamp: "2024-06-02T00:00:00.000Z",
+        agent_id: "main",
+        entry_type: "finding",
+        tags: [],
+        scope: "src/db/",
+        summary: "Product catalog pool sizing",
+        detail: "",
+      },
+    ];
+    fs.writeFileSync(
+      path.join(tmpDir, "archive", "2025-01-01-blackboard.jsonl"),
+      archived.map((e) => JSON.stringify(e)).join("\n") + "\n",
+    );
+    const { engine, search } = searchingEngine();
+    // Archives written before the index existed are caught up at startup
+    await search.indexMissingArchivedEntries(
+      await new BlackboardStore(tmpDir).readArchived(),
+    );
+
+    expect((await engine.query("connection pool")).results).toEqual([]);
+
+    const { results } = await engine.query("connection pool", { include_archived: true });
+    expect(results.map((r) => r.entry.id)).toEqual(["ARCH1", "ARCH2"]);
+    expect(results[0]!.archived).toBe(true);
+    expect(results[0]!.relevance).toBeGreaterThan(0);
+    expect(results[0]!.relevance).toBeLessThan(1);
+
+    // Whole words (or prefixes) only: "log" does not match "catalog"
+    expect((await engine.query("log", { include_archived: true })).results).toEqual([]);
+
+    const typed = await engine.query("pool", { include_archived: true, entry_types: ["finding"] });
+    expect(typed.results.map((r) => r.entry.id)).toEqual(["ARCH2"]);
+
+    const other = await engine.query("connection pool", {
+      include_archived: true,
+      scope: "src/api/",
+    });
+    expect(other.results).toEqual([]);
+  });
+
+  it("ranks archived and live keyword hits on the same scale", async () => {
+    const { engine } = searchingEngine();
+    const { id } = await engine.post({
+      entry_type: "finding",
+      summary: "Retry budget for webhooks",
+    });
+    const archiver = new Archiver(tmpDir, new BlackboardStore(tmpDir), engine, null);
+    await archiver.archive({ before: new Date(Date.now() + 60_000).toISOString(), summarize: false });
+    await engine.post({ entry_type: "finding", summary: "Retry budget for webhooks" });
+
+    const { results } = await engine.query("retry budget", { include_archived: true });
+    expect(results).toHaveLength(2);
+    const live = results.find((r) => !r.archived)!;
+    const archived = results.find((r) => r.archived)!;
+    expect(archived.entry.id).toBe(id);
+    // Same text in same-sized corpora scores alike in either index
+    expect(archived.relevance).toBeCloseTo(live.relevance, 6);
+  });
+});
+
 describe("BlackboardEngine.recent", () => {
   it("returns last N entries", async () => {
     for (let i = 0; i < 5; i++) {
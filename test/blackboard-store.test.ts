@@ -309,6 +309,248 @@ describe("BlackboardStore.dismiss", () => {
   });
 });
 
+describe("BlackboardStore incremental reads", () => {
+  const bbPath = () => path.join(tmpDir, "blackboard.jsonl");
+  const line = (id: string, extra: Record<string, unknown> = {}) =>
+    JSON.stringify({
+      id,
+      timestamp: "2026-01-01T00:00:00.000Z",
+      agent_id: "other",
+      entry_type: "finding",
+      tags: [],
+      scope: "project",
+      summary: id,
+      detail: "",
+      ...extra,
+    }) + "\n";
+
+  it("picks up lines appended by other writers", async () => {
+    await store.append({
+      entry_type: "finding",
+      summary: "Mine",
+      detail: "",
+      tags: [],
+      scope: "project",
+      agent_id: "main",
+    });
+    expect((await store.read()).total_count).toBe(1);
+
+    fs.appendFileSync(bbPath(), line("external", { tags: ["ext"] }));
+    const { entries } = await store.read({ tags: ["ext"] });
+    expect(entries.map((e) => e.id)).toEqual(["external"]);
+    expect(await store.count()).toBe(2);
+  });
+
+  it("ignores a partial trailing line until it is completed", async () => {
+    fs.writeFileSync(bbPath(), line("a"));
+    const full = line("b");
+    fs.appendFileSync(bbPath(), full.slice(0, 10));
+    expect(await store.count()).toBe(1);
+
+    fs.appendFileSync(bbPath(), full.slice(10));
+    expect((await store.recent(1))[0]!.id).toBe("b");
+  });
+
+  it("reloads when the file is rewritten in place", async () => {
+    fs.writeFileSync(bbPath(), line("a") + line("b"));
+    expect(await store.count()).toBe(2);
+
+    // Same inode, larger file, different content
+    fs.writeFileSync(bbPath(), line("c") + line("d") + line("e"));
+    const { entries } = await store.read();
+    expect(entries.map((e) => e.id)).toEqual(["c", "d", "e"]);
+  });
+
+  it("returns snapshots unaffected by later appends", async () => {
+    fs.writeFileSync(bbPath(), line("a"));
+    const { entries } = await store.read();
+    fs.appendFileSync(bbPath(), line("b"));
+    await store.read();
+    expect(entries).toHaveLength(1);
+  });
+
+  it("combines indexed type, tag and scope filters", async () => {
+    fs.writeFileSync(
+      bbPath(),
+      line("1", { entry_type: "warning", tags: ["db"], scope: "src/db/" }) +
+        line("2", { entry_type: "warning", tags: ["ui"], scope: "src/db/" }) +
+        line("3", { entry_type: "finding", tags: ["db"], scope: "src/db/pool.ts" }) +
+        line("4", { entry_type: "warning", tags: ["db"], scope: "src/api/" }),
+    );
+
+    const { entries } = await store.read({
+      entry_types: ["warning"],
+      tags: ["db"],
+      scope: "src/db/",
+    });
+    expect(entries.map((e) => e.id)).toEqual(["1"]);
+
+    const byScope = await store.read({ scope: "src/db/pool.ts" });
+    expect(byScope.entries.map((e) => e.id)).toEqual(["1", "2", "3"]);
+  });
+
+  it("checks search candidates per id against type and scope", async () => {
+    fs.writeFileSync(
+      bbPath(),
+      line("1", { entry_type: "warning", scope: "src/db/" }) +
+        line("2", { entry_type: "finding", scope: "src/db/" }) +
+        line("3", { entry_type: "warning", scope: "src/api/" }) +
+        line("4", { entry_type: "warning", scope: "src/db/" }),
+    );
+    await store.dismiss(["4"]);
+
+    const candidates = await store.searchCandidates({
+      entry_types: ["warning"],
+      scope: "src/db/pool.ts",
+    });
+    expect(["1", "2", "3", "4"].map((id) => candidates.has(id))).toEqual([
+      true,
+      false,
+      false,
+      false,
+    ]);
+    const loaded = await candidates.load(["3", "1", "missing"]);
+    expect(loaded.map((e) => e.id)).toEqual(["1"]);
+
+    const all = await store.searchCandidates();
+    expect((await all.load(["3", "1"])).map((e) => e.id)).toEqual(["3", "1"]);
+  });
+
+  it("bumps the generation on own and external writes only", async () => {
+    const g0 = await store.generation();
+    expect(await store.generation()).toBe(g0);
+
+    await store.append({
+      entry_type: "finding",
+      summary: "Mine",
+      detail: "",
+      tags: [],
+      scope: "project",
+      agent_id: "main",
+    });
+    const g1 = await store.generation();
+    expect(g1).toBeGreaterThan(g0);
+
+    fs.appendFileSync(bbPath(), line("external"));
+    const g2 = await store.generation();
+    expect(g2).toBeGreaterThan(g1);
+    expect(await store.generation()).toBe(g2);
+  });
+});
+
+describe("BlackboardStore segments", () => {
+  const segmentsDir = () => path.join(tmpDir, "blackboard");
+  const manifest = () =>
+    JSON.parse(fs.readFileSync(path.join(segmentsDir(), "manifest.json"), "utf-8")) as {
+      segments: Array<{ file: string; count: number; decisions: number }>;
+    };
+  const line = (id: string, timestamp: string, entry_type = "finding") =>
+    JSON.stringify({
+      id,
+      timestamp,
+      agent_id: "other",
+      entry_type,
+      tags: [],
+      scope: "project",
+      summary: `Summary ${id}`,
+      detail: "",
+    }) + "\n";
+  const post = (summary: string) =>
+    store.append({
+      entry_type: "finding",
+      summary,
+      detail: "x".repeat(100),
+      tags: [],
+      scope: "project",
+      agent_id: "main",
+    });
+
+  it("seals the head into a segment once it passes the size cap", async () => {
+    store = new BlackboardStore(tmpDir, { segment_max_bytes: 1000 });
+    for (let i = 0; i < 12; i++) await post(`Entry ${i}`);
+
+    const sealed = manifest().segments;
+    expect(sealed.length).toBeGreaterThanOrEqual(2);
+    expect(fs.statSync(path.join(tmpDir, "blackboard.jsonl")).size).toBeLessThan(1000);
+    const { entries } = await store.read();
+    expect(entries.map((e) => e.summary)).toEqual(
+      Array.from({ length: 12 }, (_, i) => `Entry ${i}`),
+    );
+    // A fresh reader (another process) sees the same board
+    expect((await new BlackboardStore(tmpDir).read()).total_count).toBe(12);
+  });
+
+  it("keeps appends made while the head is rolled", async () => {
+    const posts = Array.from({ length: 20 }, (_, i) => post(`Concurrent ${i}`));
+    await Promise.all([...posts, store.roll(), store.roll()]);
+    await store.roll();
+    expect(await store.count()).toBe(20);
+    expect(await new BlackboardStore(tmpDir).count()).toBe(20);
+  });
+
+  it("dismisses with tombstones and compacts them out of sealed segments", async () => {
+    const a = await post("A");
+    const b = await post("B");
+    await store.roll();
+    const c = await post("C");
+    const segmentBefore = manifest().segments[0]!.file;
+
+    const result = await store.dismiss([a.id, c.id]);
+    expect(result.dismissed).toEqual([a.id, c.id]);
+    // Nothing is rewritten at dismissal time
+    expect(manifest().segments[0]!.file).toBe(segmentBefore);
+    expect((await store.read()).entries.map((e) => e.id)).toEqual([b.id]);
+    expect((await new BlackboardStore(tmpDir).read()).entries.map((e) => e.id)).toEqual([b.id]);
+
+    await store.compactTombstones();
+    const after = manifest().segments;
+    expect(after).toHaveLength(1);
+    expect(after[0]!.file).not.toBe(segmentBefore);
+    expect(after[0]!.count).toBe(1);
+    expect(fs.existsSync(path.join(segmentsDir(), segmentBefore))).toBe(false);
+    // C is still in the head, so its tombstone stays
+    const tombstones = fs.readFileSync(path.join(segmentsDir(), "tombstones.jsonl"), "utf-8");
+    expect(tombstones).toContain(c.id);
+    expect(tombstones).not.toContain(a.id);
+    expect((await store.read()).entries.map((e) => e.id)).toEqual([b.id]);
+  });
+
+  it("archives whole segments and carries decisions forward", async () => {
+    const bbPath = path.join(tmpDir, "blackboard.jsonl");
+    fs.appendFileSync(bbPath, line("old-1", "2024-01-01T00:00:00.000Z"));
+    fs.appendFileSync(bbPath, line("old-2", "2024-01-02T00:00:00.000Z"));
+    await store.roll();
+    fs.appendFileSync(bbPath, line("old-dec", "2024-02-01T00:00:00.000Z", "decision"));
+    fs.appendFileSync(bbPath, line("old-3", "2024-02-02T00:00:00.000Z"));
+    fs.appendFileSync(bbPath, line("new-1", "2025-06-01T00:00:00.000Z"));
+
+    const archiveFile = path.join(tmpDir, "archive", "2025-01-01-blackboard.jsonl");
+    const archived = await store.archive("2025-01-01T00:00:00.000Z", archiveFile);
+    expect(archived.map((e) => e.id)).toEqual(["old-1", "old-2", "old-3"]);
+
+    const { entries } = await store.read();
+    expect(entries.map((e) => e.id)).toEqual(["old-dec", "new-1"]);
+    expect(manifest().segments).toHaveLength(1);
+    expect(manifest().segments[0]!.decisions).toBe(1);
+    expect(fs.readdirSync(segmentsDir()).filter((f) => f.startsWith("segment-"))).toHaveLength(1);
+
+    const withArchive = await store.read({ include_archived: true });
+    expect(withArchive.entries.map((e) => e.id)).toEqual([
+      "old-1",
+      "old-2",
+      "old-3",
+      "old-dec",
+      "new-1",
+    ]);
+    const archivedFindings = await store.read({
+      include_archived: true,
+      since: "2024-01-02T00:00:00.000Z",
+      entry_types: ["finding"],
+    });
+    expect(archivedFindings.entries.map((e) => e.id)).toEqual(["old-2", "old-3", "new-1"]);
+  });
+});
+
 describe("ENTRY_TYPES validation", () => {
   it("all 10 entry types are valid", () => {
     expect(ENTRY_TYPES).toHaveLength(10);
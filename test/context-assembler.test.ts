@@ -498,6 +498,212 @@ describe("ContextAssembler", () => {
     });
   });
 
+  describe("memoization", () => {
+    function counting() {
+      const counts: Record<string, number> = {};
+      const stages: Record<string, number>[] = [];
+      return {
+        counts,
+        stages,
+        increment(name: string) {
+          counts[name] = (counts[name] ?? 0) + 1;
+        },
+        recordStages(s: Record<string, number>) {
+          stages.push(s);
+        },
+      };
+    }
+
+    function makeAssembler(): ContextAssembler {
+      const graphEngine = new GraphEngine(new GraphStore(twiningDir));
+      return new ContextAssembler(
+        blackboardStore,
+        decisionStore,
+        null,
+        config,
+        graphEngine,
+        null,
+        new HandoffStore(twiningDir),
+        null,
+      );
+    }
+
+    const finding = (summary: string) => ({
+      agent_id: "test",
+      entry_type: "finding" as const,
+      tags: [],
+      scope: "src/auth/",
+      summary,
+      detail: "",
+    });
+
+    it("serves repeat calls from the cache until a store changes", async () => {
+      await blackboardStore.append(finding("First"));
+      const assembler = makeAssembler();
+      const sink = counting();
+      assembler.setMetrics(sink);
+
+      const first = await assembler.assemble("auth work", "src/auth/");
+      const second = await assembler.assemble("auth work", "src/auth/");
+      expect(sink.counts).toEqual({
+        "assemble.cache.miss": 1,
+        "assemble.cache.hit": 1,
+      });
+      expect(second.recent_findings).toEqual(first.recent_findings);
+      expect(second.recent_findings).not.toBe(first.recent_findings);
+
+      // A write by another store instance invalidates the blackboard part only
+      await new BlackboardStore(twiningDir).append(finding("Second"));
+      const third = await assembler.assemble("auth work", "src/auth/");
+      expect(third.recent_findings.map((f) => f.summary).sort()).toEqual([
+        "First",
+        "Second",
+      ]);
+      expect(sink.counts["assemble.cache.partial"]).toBe(1);
+    });
+
+    it("picks up new decisions and handoffs", async () => {
+      const assembler = makeAssembler();
+      await assembler.assemble("auth work", "src/auth/");
+
+      await new DecisionStore(twiningDir).create({
+        agent_id: "test",
+        domain: "implementation",
+        scope: "src/auth/",
+        summary: "Use JWT for auth",
+        context: "",
+        rationale: "Stateless",
+        constraints: [],
+        alternatives: [],
+        depends_on: [],
+        confidence: "high",
+        reversible: true,
+        affected_files: [],
+        affected_symbols: [],
+      });
+      await new HandoffStore(twiningDir).create({
+        source_agent: "agent-a",
+        scope: "src/auth/",
+        summary: "Auth handoff",
+        results: [],
+        context_snapshot: { decision_ids: [], warning_ids: [], finding_ids: [], summaries: [] },
+      });
+
+      const result = await assembler.assemble("auth work", "src/auth/");
+      expect(result.active_decisions.map((d) => d.summary)).toEqual(["Use JWT for auth"]);
+      expect(result.recent_handoffs?.map((h) => h.summary)).toEqual(["Auth handoff"]);
+    });
+
+    it("caches per token budget and can be disabled", async () => {
+      const assembler = makeAssembler();
+      const sink = counting();
+      assembler.setMetrics(sink);
+      await assembler.assemble("auth work", "src/auth/", 1000);
+      await assembler.assemble("auth work", "src/auth/", 2000);
+      expect(sink.counts["assemble.cache.partial"]).toBe(1);
+
+      const disabled = new ContextAssembler(
+        blackboardStore,
+        decisionStore,
+        null,
+        makeConfig({
+          context_assembly: {
+            ...DEFAULT_CONFIG.context_assembly,
+            cache: { max_entries: 0, ttl_ms: 30000 },
+          },
+        }),
+      );
+      const disabledSink = counting();
+      disabled.setMetrics(disabledSink);
+      await disabled.assemble("auth work", "src/auth/");
+      await disabled.assemble("auth work", "src/auth/");
+      expect(disabledSink.counts).toEqual({ "assemble.cache.miss": 2 });
+    });
+  });
+
+  describe("stages", () => {
+    it("reports a timing per stage", async () => {
+      const assembler = new ContextAssembler(
+        blackboardStore,
+        decisionStore,
+        null,
+        config,
+        new GraphEngine(new GraphStore(twiningDir)),
+        null,
+        new HandoffStore(twiningDir),
+        new AgentStore(twiningDir),
+      );
+      const stages: Record<string, number>[] = [];
+      assembler.setMetrics({ increment: () => {}, recordStages: (s) => stages.push(s) });
+
+      await assembler.assemble("auth work", "src/auth/");
+      expect(Object.keys(stages[0]!).sort()).toEqual([
+        "agents",
+        "generations",
+        "graph_reachability",
+        "handoffs",
+        "planning",
+        "related_entities",
+        "scope_decisions",
+        "scope_entries",
+        "scoring",
+      ]);
+      for (const ms of Object.values(stages[0]!)) {
+        expect(ms).toBeGreaterThanOrEqual(0);
+      }
+    });
+
+    it("leaves out a stage that misses its deadline and does not memoize it", async () => {
+      await decisionStore.create({
+        agent_id: "test",
+        domain: "implementation",
+        scope: "src/auth/",
+        summary: "Use JWT for auth",
+        context: "",
+        rationale: "Stateless",
+        constraints: [],
+        alternatives: [],
+        depends_on: [],
+        confidence: "high",
+        reversible: true,
+        affected_files: [],
+        affected_symbols: [],
+      });
+
+      // Semantic decision search that never finishes, as during a slow warmup
+      const stalled = {
+        searchDecisions: () => new Promise(() => {}),
+        searchBlackboard: async () => ({ results: [], fallback_mode: true }),
+        indexVersion: async () => "v1",
+      } as unknown as SearchEngine;
+      const assembler = new ContextAssembler(
+        blackboardStore,
+        decisionStore,
+        stalled,
+        makeConfig({
+          context_assembly: {
+            ...DEFAULT_CONFIG.context_assembly,
+            stage_timeout_ms: 20,
+          },
+        }),
+      );
+      const counts: Record<string, number> = {};
+      assembler.setMetrics({
+        increment: (name) => {
+          counts[name] = (counts[name] ?? 0) + 1;
+        },
+        recordStages: () => {},
+      });
+
+      const first = await assembler.assemble("auth work", "src/auth/");
+      expect(first.active_decisions.map((d) => d.summary)).toEqual(["Use JWT for auth"]);
+
+      await assembler.assemble("auth work", "src/auth/");
+      expect(counts["assemble.stage_timeout.semantic_decisions"]).toBe(2);
+      expect(counts["assemble.cache.hit"]).toBeUndefined();
+    });
+  });
+
   describe("summarize", () => {
     it("should return correct counts for a populated store", async () => {
       // Add decisions
@@ -0,0 +1,256 @@
+import { describe, it, expect, beforeEach, afterEach } from "vitest";
+import fs from "node:fs";
+import net from "node:net";
+import path from "node:path";
+import os from "node:os";
+import { PassThrough } from "node:stream";
+import type { Transport } from "@modelcontextprotocol/sdk/shared/transport.js";
+import {
+  daemonSocketPath,
+  listenExclusive,
+  connectSocket,
+} from "../src/daemon/daemon-socket.js";
+import { connectOrSpawnDaemon, DaemonRelay } from "../src/daemon/daemon-client.js";
+
+let tmpDir: string;
+const servers: net.Server[] = [];
+
+beforeEach(() => {
+  tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), "twining-daemon-test-"));
+});
+
+afterEach(async () => {
+  for (const server of servers.splice(0)) {
+    await new Promise<void>((resolve) => server.close(() => resolve()));
+  }
+  fs.rmSync(tmpDir, { recursive: true, force: true });
+});
+
+function lines(stream: PassThrough): () => Array<Record<string, unknown>> {
+  let text = "";
+  stream.setEncoding("utf-8");
+  stream.on("data", (chunk: string) => {
+    text += chunk;
+  });
+  return () =>
+    text
+      .split("\n")
+      .filter((line) => line.length > 0)
+      .map((line) => JSON.parse(line) as Record<string, unknown>);
+}
+
+async function waitFor(check: () => boolean, timeoutMs = 2000): Promise<void> {
+  const deadline = Date.now() + timeoutMs;
+  while (!check()) {
+    if (Date.now() > deadline) throw new Error("Timed out waiting for condition");
+    await new Promise((resolve) => setTimeout(resolve, 5));
+  }
+}
+
+/** A daemon stand-in that answers every request with its method name. */
+async function fakeDaemon(socketPath: string, options?: { silent?: Set<string> }) {
+  const sockets: net.Socket[] = [];
+  const received: Array<Record<string, unknown>> = [];
+  const server = net.createServer((socket) => {
+    sockets.push(socket);
+    let buffered = "";
+    socket.setEncoding("utf-8");
+    socket.on("data", (chunk: string) => {
+      buffered += chunk;
+      let newline: number;
+      while ((newline = buffered.indexOf("\n")) !== -1) {
+        const message = JSON.parse(buffered.slice(0, newline)) as Record<string, unknown>;
+        buffered = buffered.slice(newline + 1);
+        received.push(message);
+        const method = message.method as string;
+        if (message.id !== undefined && !options?.silent?.has(method)) {
+          socket.write(
+            JSON.stringify({ jsonrpc: "2.0", id: message.id, result: { from: "daemon", method } }) + "\n",
+          );
+        }
+      }
+    });
+  });
+  servers.push(server);
+  expect(await listenExclusive(server, socketPath)).toBe(true);
+  return { server, sockets, received };
+}
+
+/** A fallback server stand-in that records and answers what it is sent. */
+function fakeLocal() {
+  const sent: Array<Record<string, unknown>> = [];
+  const transport = {
+    onmessage: undefined as ((message: unknown) => void) | undefined,
+    async start() {},
+    async close() {},
+    async send(message: unknown) {
+      const rpc = message as Record<string, unknown>;
+      sent.push(rpc);
+      if (rpc.id !== undefined && rpc.method !== undefined) {
+        transport.onmessage?.({
+          jsonrpc: "2.0",
+          id: rpc.id,
+          result: { from: "local", method: rpc.method },
+        });
+      }
+    },
+  };
+  return { transport: transport as unknown as Transport, sent };
+}
+
+describe("daemonSocketPath", () => {
+  it("places the socket inside .twining for ordinary paths", () => {
+    const twiningDir = path.join(tmpDir, ".twining");
+    const socketPath = daemonSocketPath(twiningDir);
+    if (process.platform !== "win32") {
+      expect(socketPath).toBe(path.join(twiningDir, "daemon.sock"));
+    }
+    expect(daemonSocketPath(twiningDir)).toBe(socketPath);
+  });
+
+  it("moves to a hashed temp-dir socket when the path is too long", () => {
+    if (process.platform === "win32") return;
+    const deep = path.join(tmpDir, "x".repeat(120), ".twining");
+    const socketPath = daemonSocketPath(deep);
+    expect(path.dirname(socketPath)).toBe(os.tmpdir());
+    expect(path.basename(socketPath)).toMatch(/^twining-[0-9a-f]{16}\.sock$/);
+    expect(daemonSocketPath(deep)).toBe(socketPath);
+    expect(daemonSocketPath(deep + "2")).not.toBe(socketPath);
+  });
+});
+
+describe("listenExclusive", () => {
+  it("lets only one live daemon own the socket", async () => {
+    const socketPath = daemonSocketPath(tmpDir);
+    const first = net.createServer();
+    servers.push(first);
+    expect(await listenExclusive(first, socketPath)).toBe(true);
+
+    const second = net.createServer();
+    expect(await listenExclusive(second, socketPath)).toBe(false);
+    expect(second.listening).toBe(false);
+
+    const socket = await connectSocket(socketPath);
+    socket.destroy();
+  });
+
+  it("takes over a socket file left by a crashed daemon", async () => {
+    if (process.platform === "win32") return;
+    const socketPath = daemonSocketPath(tmpDir);
+    fs.writeFileSync(socketPath, "");
+
+    const server = net.createServer();
+    servers.push(server);
+    expect(await listenExclusive(server, socketPath)).toBe(true);
+    const socket = await connectSocket(socketPath);
+    socket.destroy();
+  });
+});
+
+describe("connectOrSpawnDaemon", () => {
+  it("connects to a daemon that is already running", async () => {
+    const daemon = await fakeDaemon(daemonSocketPath(tmpDir));
+    const socket = await connectOrSpawnDaemon(tmpDir, tmpDir, {
+      spawn_timeout_ms: 100,
+      entry: path.join(tmpDir, "missing-entry.js"),
+    });
+    expect(socket).not.toBeNull();
+    await waitFor(() => daemon.sockets.length === 1);
+    socket!.destroy();
+  });
+});
+
+describe("DaemonRelay", () => {
+  it("relays requests and responses between stdio and the daemon", async () => {
+    const socketPath = daemonSocketPath(tmpDir);
+    const daemon = await fakeDaemon(socketPath);
+    const input = new PassThrough();
+    const output = new PassThrough();
+    const written = lines(output);
+
+    const relay = new DaemonRelay(input, output, await connectSocket(socketPath), async () => {
+      throw new Error("fallback should not be used");
+    });
+    relay.start();
+
+    input.write(JSON.stringify({ jsonrpc: "2.0", id: 1, method: "initialize", params: {} }) + "\n");
+    input.write(JSON.stringify({ jsonrpc: "2.0", method: "notifications/initialized" }) + "\n");
+    input.write(JSON.stringify({ jsonrpc: "2.0", id: 2, method: "tools/list" }) + "\n");
+    await waitFor(() => written().length === 2);
+
+    expect(written().map((m) => m.id)).toEqual([1, 2]);
+    expect(daemon.received.map((m) => m.method)).toEqual([
+      "initialize",
+      "notifications/initialized",
+      "tools/list",
+    ]);
+    expect(relay.target).toBe("daemon");
+
+    input.end();
+    await relay.done;
+  });
+
+  it("fails over to a local server when the daemon goes away", async () => {
+    const socketPath = daemonSocketPath(tmpDir);
+    const daemon = await fakeDaemon(socketPath, { silent: new Set(["tools/call"]) });
+    const local = fakeLocal();
+    const input = new PassThrough();
+    const output = new PassThrough();
+    const written = lines(output);
+
+    const relay = new DaemonRelay(input, output, await connectSocket(socketPath), async () =>
+      local.transport,
+    );
+    relay.start();
+
+    input.write(JSON.stringify({ jsonrpc: "2.0", id: 1, method: "initialize", params: { v: 1 } }) + "\n");
+    input.write(JSON.stringify({ jsonrpc: "2.0", method: "notifications/initialized" }) + "\n");
+    input.write(JSON.stringify({ jsonrpc: "2.0", id: 2, method: "tools/call" }) + "\n");
+    await waitFor(() => daemon.received.length === 3 && written().length === 1);
+
+    // The daemon dies with tools/call unanswered
+    daemon.sockets[0]!.destroy();
+    await waitFor(() => relay.target === "local");
+
+    // The in-flight call is failed, not silently replayed
+    const failed = written().find((m) => m.id === 2)!;
+    expect((failed.error as { code: number }).code).toBe(-32603);
+
+    // The session handshake is replayed, and its reply kept from the client
+    expect(local.sent.map((m) => m.method)).toEqual(["initialize", "notifications/initialized"]);
+    expect(local.sent[0]!.params).toEqual({ v: 1 });
+    expect(local.sent[0]!.id).not.toBe(1);
+    expect(written()).toHaveLength(2);
+
+    input.write(JSON.stringify({ jsonrpc: "2.0", id: 3, method: "tools/list" }) + "\n");
+    await waitFor(() => written().length === 3);
+    expect(written()[2]).toMatchObject({ id: 3, result: { from: "local", method: "tools/list" } });
+
+    input.end();
+    await relay.done;
+  });
+
+  it("hands an unanswered initialize to the local server", async () => {
+    const socketPath = daemonSocketPath(tmpDir);
+    const daemon = await fakeDaemon(socketPath, { silent: new Set(["initialize"]) });
+    const local = fakeLocal();
+    const input = new PassThrough();
+    const output = new PassThrough();
+    const written = lines(output);
+
+    const relay = new DaemonRelay(input, output, await connectSocket(socketPath), async () =>
+      local.transport,
+    );
+    relay.start();
+
+    input.write(JSON.stringify({ jsonrpc: "2.0", id: 1, method: "initialize", params: {} }) + "\n");
+    await waitFor(() => daemon.received.length === 1);
+    daemon.sockets[0]!.destroy();
+
+    await waitFor(() => written().length === 1);
+    expect(written()[0]).toMatchObject({ id: 1, result: { from: "local", method: "initialize" } });
+
+    input.end();
+    await relay.done;
+  });
+});
@@ -3,6 +3,7 @@ import http from "node:http";
 import fs from "node:fs";
 import path from "node:path";
 import os from "node:os";
+import zlib from "node:zlib";
 import { handleRequest } from "../../src/dashboard/http-server.js";
 
 /* ------------------------------------------------------------------ */
@@ -561,6 +562,274 @@ describe("API routes - initialized project", () => {
   });
 });
 
+/* ------------------------------------------------------------------ */
+/* Test suite: ETags and the change feed                               */
+/* ------------------------------------------------------------------ */
+
+/** GET with extra request headers. */
+function httpGetWithHeaders(
+  port: number,
+  urlPath: string,
+  headers: http.OutgoingHttpHeaders,
+): Promise<{ status: number; headers: http.IncomingHttpHeaders; body: string }> {
+  return new Promise((resolve, reject) => {
+    const req = http.request(
+      { hostname: "127.0.0.1", port, path: urlPath, method: "GET", headers },
+      (res) => {
+        const chunks: Buffer[] = [];
+        res.on("data", (chunk: Buffer) => chunks.push(chunk));
+        res.on("end", () => {
+          resolve({
+            status: res.statusCode ?? 0,
+            headers: res.headers,
+            body: Buffer.concat(chunks).toString("utf-8"),
+          });
+        });
+      },
+    );
+    req.on("error", reject);
+    req.end();
+  });
+}
+
+describe("API routes - ETags and change feed", () => {
+  let server: http.Server;
+  let port: number;
+  let projectRoot: string;
+
+  beforeAll(async () => {
+    const project = createTestProject();
+    projectRoot = project.projectRoot;
+    server = http.createServer(
+      handleRequest(project.publicDir, project.projectRoot, { feedPollMs: 20 }),
+    );
+    await new Promise<void>((resolve) => {
+      server.listen(0, "127.0.0.1", () => resolve());
+    });
+    const addr = server.address();
+    port = typeof addr === "object" && addr !== null ? addr.port : 0;
+  });
+
+  afterAll(async () => {
+    server.closeAllConnections();
+    await new Promise<void>((resolve) => {
+      server.close(() => resolve());
+    });
+    fs.rmSync(projectRoot, { recursive: true, force: true });
+  });
+
+  function appendEntry(id: string, entryType = "finding"): void {
+    fs.appendFileSync(
+      path.join(projectRoot, ".twining", "blackboard.jsonl"),
+      JSON.stringify({
+        id,
+        timestamp: "2026-02-18T09:00:00.000Z",
+        agent_id: "test-agent",
+        entry_type: entryType,
+        tags: [],
+        scope: "src/",
+        summary: `Entry ${id}`,
+        detail: "",
+      }) + "\n",
+    );
+  }
+
+  it("answers 304 for an unchanged store and 200 once it changes", async () => {
+    for (const route of ["/api/blackboard", "/api/decisions", "/api/graph", "/api/handoffs", "/api/agents", "/api/delegations", "/api/status"]) {
+      const first = await httpGet(port, route);
+      expect(first.status).toBe(200);
+      const etag = first.headers.etag as string;
+      expect(etag).toMatch(/^W\/"/);
+
+      const again = await httpGetWithHeaders(port, route, { "If-None-Match": etag });
+      expect(again.status).toBe(304);
+      expect(again.body).toBe("");
+    }
+
+    const before = await httpGet(port, "/api/blackboard");
+    appendEntry("BB-ETAG");
+    const after = await httpGetWithHeaders(port, "/api/blackboard", {
+      "If-None-Match": before.headers.etag as string,
+    });
+    expect(after.status).toBe(200);
+    expect(after.headers.etag).not.toBe(before.headers.etag);
+    expect(JSON.parse(after.body).entries.map((e: { id: string }) => e.id)).toContain("BB-ETAG");
+  });
+
+  it("streams typed deltas over server-sent events", async () => {
+    const events: Array<{ type: string; id?: string; data?: Record<string, unknown> }> = [];
+    const req = http.request({ hostname: "127.0.0.1", port, path: "/api/events", method: "GET" });
+    const response = new Promise<http.IncomingMessage>((resolve) => req.on("response", resolve));
+    req.end();
+    const res = await response;
+    expect(res.headers["content-type"]).toContain("text/event-stream");
+
+    let buffer = "";
+    res.on("data", (chunk: Buffer) => {
+      buffer += chunk.toString("utf-8");
+      let end: number;
+      while ((end = buffer.indexOf("\n\n")) >= 0) {
+        const message = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        const data = message.split("\n").find((line) => line.startsWith("data: "));
+        if (message.includes("event: changes") && data) {
+          events.push(...JSON.parse(data.slice("data: ".length)));
+        }
+      }
+    });
+
+    // Let the feed take its baseline, then write
+    await new Promise((resolve) => setTimeout(resolve, 60));
+    appendEntry("BB-LIVE", "need");
+
+    const deadline = Date.now() + 2000;
+    while (!events.some((e) => e.type === "status") && Date.now() < deadline) {
+      await new Promise((resolve) => setTimeout(resolve, 20));
+    }
+    req.destroy();
+
+    expect(events.map((e) => e.type)).toEqual(["entry.added", "status"]);
+    expect(events[0]!.id).toBe("BB-LIVE");
+    expect(events[0]!.data!.entry_type).toBe("need");
+    expect(typeof events[1]!.data!.blackboard_entries).toBe("number");
+  });
+});
+
+/* ------------------------------------------------------------------ */
+/* Test suite: pagination, projection and compression                  */
+/* ------------------------------------------------------------------ */
+
+describe("API routes - pagination, projection and compression", () => {
+  let server: http.Server;
+  let port: number;
+  let projectRoot: string;
+
+  beforeAll(async () => {
+    const project = createTestProject();
+    projectRoot = project.projectRoot;
+    server = http.createServer(handleRequest(project.publicDir, project.projectRoot));
+    await new Promise<void>((resolve) => {
+      server.listen(0, "127.0.0.1", () => resolve());
+    });
+    const addr = server.address();
+    port = typeof addr === "object" && addr !== null ? addr.port : 0;
+  });
+
+  afterAll(async () => {
+    await new Promise<void>((resolve) => {
+      server.close(() => resolve());
+    });
+    fs.rmSync(projectRoot, { recursive: true, force: true });
+  });
+
+  it("pages the blackboard newest first with a cursor", async () => {
+    const first = JSON.parse((await httpGet(port, "/api/blackboard?limit=2")).body);
+    expect(first.entries.map((e: { id: string }) => e.id)).toEqual(["BB004", "BB003"]);
+    expect(first.total_count).toBe(4);
+    expect(typeof first.next_cursor).toBe("string");
+
+    const second = JSON.parse(
+      (await httpGet(port, `/api/blackboard?limit=2&cursor=${first.next_cursor}`)).body,
+    );
+    expect(second.entries.map((e: { id: string }) => e.id)).toEqual(["BB002", "BB001"]);
+    expect(second.next_cursor).toBeNull();
+
+    // The unparameterized route keeps its original shape
+    const all = JSON.parse((await httpGet(port, "/api/blackboard")).body);
+    expect(all.entries).toHaveLength(4);
+    expect(all.next_cursor).toBeUndefined();
+  });
+
+  it("filters and projects list routes", async () => {
+    const needs = JSON.parse(
+      (await httpGet(port, "/api/blackboard?entry_type=need&fields=summary")).body,
+    );
+    expect(needs.entries.map((e: { id: string }) => e.id)).toEqual(["BB004", "BB002"]);
+    expect(Object.keys(needs.entries[0]).sort()).toEqual(["id", "summary"]);
+
+    const decisions = JSON.parse(
+      (await httpGet(port, "/api/decisions?sort=timestamp&order=asc&fields=status")).body,
+    );
+    expect(decisions.decisions.map((d: { id: string }) => d.id)).toEqual(["DEC001", "DEC002"]);
+
+    const handoffs = JSON.parse(
+      (await httpGet(port, "/api/handoffs?source_agent=nobody")).body,
+    );
+    expect(handoffs.handoffs).toEqual([]);
+    expect(handoffs.total).toBe(0);
+  });
+
+  it("rejects invalid list parameters with 400", async () => {
+    const badSort = await httpGet(port, "/api/decisions?sort=detail");
+    expect(badSort.status).toBe(400);
+    expect(JSON.parse(badSort.body).error).toMatch(/sort must be one of/);
+    expect((await httpGet(port, "/api/graph?cursor=%%%")).status).toBe(400);
+  });
+
+  it("pages graph entities with their relations and loads neighborhoods", async () => {
+    const page = JSON.parse((await httpGet(port, "/api/graph?limit=1")).body);
+    expect(page.entities.map((e: { id: string }) => e.id)).toEqual(["ENT001"]);
+    expect(page.relations.map((r: { id: string }) => r.id)).toEqual(["REL001"]);
+    expect(page.entity_count).toBe(2);
+    expect(page.next_cursor).not.toBeNull();
+
+    const neighbors = await httpGet(port, "/api/graph/neighbors/ENT001");
+    expect(neighbors.status).toBe(200);
+    const body = JSON.parse(neighbors.body);
+    expect(body.center.id).toBe("ENT001");
+    expect(body.entities.map((e: { id: string }) => e.id)).toEqual(["ENT002"]);
+    expect(body.relations.map((r: { id: string }) => r.id)).toEqual(["REL001"]);
+
+    expect((await httpGet(port, "/api/graph/neighbors/NOPE")).status).toBe(404);
+  });
+
+  it("compresses large JSON responses when the client accepts it", async () => {
+    for (let i = 0; i < 40; i++) {
+      fs.appendFileSync(
+        path.join(projectRoot, ".twining", "blackboard.jsonl"),
+        JSON.stringify({
+          id: `BBZ${String(i).padStart(3, "0")}`,
+          timestamp: "2026-02-18T09:00:00.000Z",
+          agent_id: "test-agent",
+          entry_type: "finding",
+          tags: [],
+          scope: "src/",
+          summary: `Bulk entry ${i}`,
+          detail: "Padding so the response is worth compressing",
+        }) + "\n",
+      );
+    }
+
+    const plain = await httpGet(port, "/api/blackboard");
+    expect(plain.headers["content-encoding"]).toBeUndefined();
+
+    const compressed = await new Promise<{ headers: http.IncomingHttpHeaders; body: Buffer }>(
+      (resolve, reject) => {
+        const req = http.request(
+          {
+            hostname: "127.0.0.1",
+            port,
+            path: "/api/blackboard",
+            method: "GET",
+            headers: { "Accept-Encoding": "br" },
+          },
+          (res) => {
+            const chunks: Buffer[] = [];
+            res.on("data", (chunk: Buffer) => chunks.push(chunk));
+            res.on("end", () => resolve({ headers: res.headers, body: Buffer.concat(chunks) }));
+          },
+        );
+        req.on("error", reject);
+        req.end();
+      },
+    );
+    expect(compressed.headers["content-encoding"]).toBe("br");
+    expect(compressed.headers.vary).toBe("Accept-Encoding");
+    expect(compressed.body.length).toBeLessThan(plain.body.length);
+    expect(zlib.brotliDecompressSync(compressed.body).toString("utf-8")).toBe(plain.body);
+  });
+});
+
 /* ------------------------------------------------------------------ */
 /* Test suite: uninitialized project (no .twining/ directory)         */
 /* ------------------------------------------------------------------ */
@@ -0,0 +1,87 @@
+import { describe, it, expect } from "vitest";
+import { ChangeFeed, type Change } from "../../src/dashboard/change-feed.js";
+
+/** An in-memory collection whose generation bumps on every write. */
+function collection(kind: string, appendOnly = false) {
+  const items = new Map<string, unknown>();
+  let gen = 0;
+  let loads = 0;
+  return {
+    items,
+    set(id: string, value: unknown) {
+      items.set(id, value);
+      gen++;
+    },
+    remove(id: string) {
+      items.delete(id);
+      gen++;
+    },
+    get loads() {
+      return loads;
+    },
+    source: {
+      kind,
+      appendOnly,
+      generation: async () => gen,
+      load: async () => {
+        loads++;
+        return [...items].map(([id, value]) => ({ id, value }));
+      },
+    },
+  };
+}
+
+describe("ChangeFeed", () => {
+  it("takes a silent baseline, then reports typed deltas and status", async () => {
+    const decisions = collection("decision");
+    decisions.set("d1", { status: "active" });
+    const feed = new ChangeFeed([decisions.source], async () => ({ total: decisions.items.size }));
+
+    expect(await feed.poll()).toEqual([]);
+
+    decisions.set("d1", { status: "superseded" });
+    decisions.set("d2", { status: "active" });
+    expect(await feed.poll()).toEqual([
+      { type: "decision.updated", id: "d1", data: { status: "superseded" } },
+      { type: "decision.added", id: "d2", data: { status: "active" } },
+      { type: "status", data: { total: 2 } },
+    ]);
+
+    decisions.remove("d1");
+    expect((await feed.poll()).map((c) => c.type)).toEqual(["decision.removed", "status"]);
+  });
+
+  it("skips collections whose generation has not moved", async () => {
+    const entries = collection("entry", true);
+    entries.set("e1", { summary: "a" });
+    const feed = new ChangeFeed([entries.source], async () => ({}));
+    await feed.poll();
+    await feed.poll();
+    await feed.poll();
+    expect(entries.loads).toBe(1);
+
+    // Append-only collections diff by id alone
+    entries.items.set("e1", { summary: "edited" });
+    entries.set("e2", { summary: "b" });
+    expect((await feed.poll()).map((c) => c.type)).toEqual(["entry.added", "status"]);
+  });
+
+  it("pushes to subscribers while subscribed and stops afterwards", async () => {
+    const agents = collection("agent");
+    const feed = new ChangeFeed([agents.source], async () => ({}), 10);
+    const received: Change[][] = [];
+    const unsubscribe = feed.subscribe((changes) => received.push(changes));
+
+    await new Promise((resolve) => setTimeout(resolve, 20));
+    agents.set("a1", { agent_id: "a1" });
+    await new Promise((resolve) => setTimeout(resolve, 40));
+    expect(received.flat().map((c) => c.type)).toEqual(["agent.added", "status"]);
+
+    unsubscribe();
+    const loads = agents.loads;
+    agents.set("a2", { agent_id: "a2" });
+    await new Promise((resolve) => setTimeout(resolve, 40));
+    expect(agents.loads).toBe(loads);
+    expect(received).toHaveLength(1);
+  });
+});
@@ -3,8 +3,12 @@ import http from "node:http";
 import fs from "node:fs";
 import path from "node:path";
 import os from "node:os";
+import zlib from "node:zlib";
 import { getDashboardConfig } from "../../src/dashboard/dashboard-config.js";
-import { startDashboard } from "../../src/dashboard/http-server.js";
+import {
+  handleRequest,
+  startDashboard,
+} from "../../src/dashboard/http-server.js";
 
 /* ------------------------------------------------------------------ */
 /* Helpers                                                             */
@@ -413,3 +417,125 @@ describe("port retry", () => {
     expect(dashboardResult!.port).toBeGreaterThanOrEqual(blockerPort + 1);
   });
 });
+
+/* ------------------------------------------------------------------ */
+/* Tests: Static asset caching and compression                        */
+/* ------------------------------------------------------------------ */
+
+describe("static asset caching and compression", () => {
+  let server: http.Server;
+  let port: number;
+  let tmpDir: string;
+  const vendorJs = "var lib = {};\n".repeat(500);
+
+  /** GET returning the raw (possibly compressed) body. */
+  function rawGet(
+    urlPath: string,
+    headers: http.OutgoingHttpHeaders = {},
+  ): Promise<{ status: number; headers: http.IncomingHttpHeaders; body: Buffer }> {
+    return new Promise((resolve, reject) => {
+      const req = http.request(
+        { hostname: "127.0.0.1", port, path: urlPath, method: "GET", headers },
+        (res) => {
+          const chunks: Buffer[] = [];
+          res.on("data", (chunk: Buffer) => chunks.push(chunk));
+          res.on("end", () =>
+            resolve({
+              status: res.statusCode ?? 0,
+              headers: res.headers,
+              body: Buffer.concat(chunks),
+            }),
+          );
+        },
+      );
+      req.on("error", reject);
+      req.end();
+    });
+  }
+
+  beforeEach(async () => {
+    tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), "twining-static-"));
+    fs.mkdirSync(path.join(tmpDir, "vendor"));
+    fs.writeFileSync(path.join(tmpDir, "vendor", "lib.min.js"), vendorJs);
+    fs.writeFileSync(
+      path.join(tmpDir, "index.html"),
+      '<html><head><script src="vendor/lib.min.js" defer></script></head></html>',
+    );
+    server = http.createServer(handleRequest(tmpDir, tmpDir));
+    await new Promise<void>((resolve) => {
+      server.listen(0, "127.0.0.1", () => resolve());
+    });
+    const addr = server.address();
+    port = typeof addr === "object" && addr !== null ? addr.port : 0;
+  });
+
+  afterEach(async () => {
+    await new Promise<void>((resolve) => {
+      server.close(() => resolve());
+    });
+    fs.rmSync(tmpDir, { recursive: true, force: true });
+  });
+
+  it("links vendor assets by content hash and caches those URLs as immutable", async () => {
+    const index = await rawGet("/");
+    const match = index.body.toString("utf-8").match(/vendor\/lib\.min\.js\?v=([0-9a-f]{16})/);
+    expect(match).not.toBeNull();
+    expect(index.headers["cache-control"]).toBe("no-cache");
+
+    const versioned = await rawGet(`/vendor/lib.min.js?v=${match![1]}`);
+    expect(versioned.status).toBe(200);
+    expect(versioned.headers["cache-control"]).toContain("immutable");
+
+    // A stale or missing version must still revalidate
+    const stale = await rawGet("/vendor/lib.min.js?v=0000000000000000");
+    expect(stale.headers["cache-control"]).toBe("no-cache");
+    const revalidated = await rawGet("/vendor/lib.min.js", {
+      "If-None-Match": stale.headers.etag as string,
+    });
+    expect(revalidated.status).toBe(304);
+  });
+
+  it("serves brotli or gzip according to Accept-Encoding", async () => {
+    const br = await rawGet("/vendor/lib.min.js", { "Accept-Encoding": "gzip, deflate, br" });
+    expect(br.headers["content-encoding"]).toBe("br");
+    expect(br.headers.vary).toBe("Accept-Encoding");
+    expect(br.body.length).toBeLessThan(vendorJs.length);
+    expect(zlib.brotliDecompressSync(br.body).toString("utf-8")).toBe(vendorJs);
+
+    const gzip = await rawGet("/vendor/lib.min.js", { "Accept-Encoding": "gzip, br;q=0" });
+    expect(gzip.headers["content-encoding"]).toBe("gzip");
+    expect(zlib.gunzipSync(gzip.body).toString("utf-8")).toBe(vendorJs);
+
+    const plain = await rawGet("/vendor/lib.min.js");
+    expect(plain.headers["content-encoding"]).toBeUndefined();
+    expect(plain.body.toString("utf-8")).toBe(vendorJs);
+  });
+
+  it("serves a current precompressed sibling instead of compressing", async () => {
+    const jsPath = path.join(tmpDir, "vendor", "lib.min.js");
+    const siblingPath = `${jsPath}.br`;
+    const built = zlib.brotliCompressSync(Buffer.from("var built = true;\n"));
+    fs.writeFileSync(siblingPath, built);
+
+    const br = await rawGet("/vendor/lib.min.js", { "Accept-Encoding": "br" });
+    expect(br.headers["content-encoding"]).toBe("br");
+    expect(br.body.equals(built)).toBe(true);
+
+    // A sibling older than its source is stale and ignored
+    const past = new Date(Date.now() - 60_000);
+    fs.utimesSync(siblingPath, past, past);
+    fs.appendFileSync(jsPath, "// touched\n");
+    const fresh = await rawGet("/vendor/lib.min.js", { "Accept-Encoding": "br" });
+    expect(zlib.brotliDecompressSync(fresh.body).toString("utf-8")).toBe(
+      vendorJs + "// touched\n",
+    );
+  });
+
+  it("picks up a changed file on the next request", async () => {
+    const before = await rawGet("/vendor/lib.min.js");
+    fs.writeFileSync(path.join(tmpDir, "vendor", "lib.min.js"), "var changed = true;\n");
+    const after = await rawGet("/vendor/lib.min.js");
+    expect(after.body.toString("utf-8")).toBe("var changed = true;\n");
+    expect(after.headers.etag).not.toBe(before.headers.etag);
+  });
+});
@@ -0,0 +1,87 @@
+import { describe, it, expect } from "vitest";
+import {
+  applyListQuery,
+  parseListQuery,
+  projectFields,
+  type ListSpec,
+} from "../../src/dashboard/list-query.js";
+
+const SPEC: ListSpec = {
+  sortable: ["id", "timestamp", "priority"],
+  filterable: ["kind", "tags"],
+  timeField: "timestamp",
+  defaultOrder: "asc",
+};
+
+interface Row {
+  id: string;
+  timestamp: string;
+  kind: string;
+  tags: string[];
+  scope: string;
+  priority?: number;
+}
+
+const ROWS: Row[] = Array.from({ length: 10 }, (_, i) => ({
+  id: `01HX${String(i).padStart(4, "0")}`,
+  timestamp: `2026-03-01T00:0${i}:00.000Z`,
+  kind: i % 2 === 0 ? "even" : "odd",
+  tags: i % 3 === 0 ? ["three"] : [],
+  scope: i < 5 ? "src/a/" : "src/b/",
+  ...(i % 4 === 0 ? {} : { priority: i % 3 }),
+}));
+
+function query(qs: string) {
+  return parseListQuery(new URLSearchParams(qs), SPEC);
+}
+
+describe("list query", () => {
+  it("walks every record exactly once across cursor pages", () => {
+    for (const qs of ["limit=3", "limit=3&order=desc", "limit=4&sort=priority", "limit=2&sort=priority&order=desc"]) {
+      const seen: string[] = [];
+      let page = applyListQuery(ROWS, query(qs), SPEC);
+      seen.push(...page.items.map((r) => r.id));
+      while (page.next_cursor) {
+        page = applyListQuery(ROWS, query(`${qs}&cursor=${page.next_cursor}`), SPEC);
+        seen.push(...page.items.map((r) => r.id));
+      }
+      expect(seen.sort()).toEqual(ROWS.map((r) => r.id));
+      expect(page.total).toBe(ROWS.length);
+    }
+  });
+
+  it("keeps pages stable when newer records arrive between requests", () => {
+    const first = applyListQuery(ROWS, query("limit=4"), SPEC);
+    const grown = [...ROWS, { ...ROWS[0]!, id: "01HY0000" }];
+    const second = applyListQuery(grown, query(`limit=4&cursor=${first.next_cursor}`), SPEC);
+    expect(second.items.map((r) => r.id)).toEqual(ROWS.slice(4, 8).map((r) => r.id));
+  });
+
+  it("filters by field, array membership, scope prefix and time range", () => {
+    expect(applyListQuery(ROWS, query("kind=odd"), SPEC).total).toBe(5);
+    expect(applyListQuery(ROWS, query("tags=three"), SPEC).items.map((r) => r.id)).toEqual(
+      ["01HX0000", "01HX0003", "01HX0006", "01HX0009"],
+    );
+    expect(applyListQuery(ROWS, query("scope=src/b/&kind=even"), SPEC).total).toBe(2);
+    const ranged = applyListQuery(
+      ROWS,
+      query("since=2026-03-01T00:02:00.000Z&until=2026-03-01T00:04:00.000Z"),
+      SPEC,
+    );
+    expect(ranged.items.map((r) => r.id)).toEqual(["01HX0002", "01HX0003", "01HX0004"]);
+  });
+
+  it("projects fields and always keeps id", () => {
+    expect(projectFields(ROWS.slice(0, 1), ["kind"])).toEqual([{ id: "01HX0000", kind: "even" }]);
+    expect(projectFields(ROWS, null)).toBe(ROWS);
+  });
+
+  it("is inactive without parameters and rejects bad ones", () => {
+    expect(query("").active).toBe(false);
+    expect(query("kind=odd").active).toBe(true);
+    expect(() => query("sort=summary")).toThrow(/sort must be one of/);
+    expect(() => query("limit=0")).toThrow(/positive integer/);
+    expect(() => query("order=sideways")).toThrow(/asc or desc/);
+    expect(() => query("cursor=not-a-cursor")).toThrow(/Invalid cursor/);
+  });
+});
@@ -1,4 +1,4 @@
-import { describe, it, expect, beforeEach, afterEach } from "vitest";
+import { describe, it, expect, beforeEach, afterEach, vi } from "vitest";
 import fs from "node:fs";
 import path from "node:path";
 import os from "node:os";
@@ -133,6 +133,91 @@ describe("DecisionEngine.decide", () => {
   });
 });
 
+describe("DecisionEngine.decideBatch", () => {
+  it("records decisions in order with errors in place", async () => {
+    const results = await decisionEngine.decideBatch([
+      validDecisionInput({ summary: "Use JWT for auth" }),
+      validDecisionInput({ rationale: "" }),
+      validDecisionInput({ domain: "testing", scope: "test/", summary: "Use vitest" }),
+    ]);
+
+    expect(results).toHaveLength(3);
+    expect(results[0]).toHaveProperty("id");
+    expect(results[1]).toEqual({ error: "rationale is required", code: "INVALID_INPUT" });
+    expect(results[2]).toHaveProperty("id");
+
+    const index = await decisionStore.getIndex();
+    expect(index.map((d) => d.summary)).toEqual(["Use JWT for auth", "Use vitest"]);
+    const { entries } = await blackboardEngine.read({ entry_types: ["decision"] });
+    expect(entries.map((e) => e.summary)).toEqual(["Use JWT for auth", "Use vitest"]);
+  });
+
+  it("detects conflicts within the batch and against existing decisions", async () => {
+    const existing = await decisionEngine.decide(validDecisionInput({ summary: "Use sessions" }));
+    const results = await decisionEngine.decideBatch([
+      validDecisionInput({ domain: "testing", scope: "test/", summary: "Use vitest" }),
+      validDecisionInput({ domain: "testing", scope: "test/unit/", summary: "Use jest" }),
+      validDecisionInput({ summary: "Use JWT" }),
+    ]);
+
+    const [vitest, jest, jwt] = results as Array<{
+      id: string;
+      conflicts?: { id: string; summary: string }[];
+    }>;
+    expect(vitest!.conflicts).toBeUndefined();
+    expect(jest!.conflicts).toEqual([{ id: vitest!.id, summary: "Use vitest" }]);
+    expect(jwt!.conflicts).toEqual([{ id: existing.id, summary: "Use sessions" }]);
+
+    expect((await decisionStore.get(vitest!.id))!.status).toBe("active");
+    expect((await decisionStore.get(jest!.id))!.status).toBe("provisional");
+    expect((await decisionStore.get(jwt!.id))!.status).toBe("provisional");
+
+    const { entries } = await blackboardEngine.read({ entry_types: ["warning"] });
+    expect(entries).toHaveLength(2);
+  });
+
+  it("writes all decisions under one index lock", async () => {
+    const createBatch = vi.spyOn(decisionStore, "createBatch");
+    await decisionEngine.decideBatch([
+      validDecisionInput({ domain: "a", summary: "A" }),
+      validDecisionInput({ domain: "b", summary: "B" }),
+    ]);
+    expect(createBatch).toHaveBeenCalledTimes(1);
+    expect(await decisionStore.getIndex()).toHaveLength(2);
+  });
+
+  it("supersedes in the same write as the new decisions", async () => {
+    const old = await decisionEngine.decide(validDecisionInput({ summary: "Use sessions" }));
+    const updateStatus = vi.spyOn(decisionStore, "updateStatus");
+    const createBatch = vi.spyOn(decisionStore, "createBatch");
+
+    const [jwt] = (await decisionEngine.decideBatch([
+      validDecisionInput({ summary: "Use JWT", supersedes: old.id }),
+      validDecisionInput({ domain: "testing", scope: "test/", summary: "Use vitest" }),
+    ])) as Array<{ id: string; conflicts?: unknown[] }>;
+
+    expect(updateStatus).not.toHaveBeenCalled();
+    expect(createBatch).toHaveBeenCalledTimes(1);
+    expect((await decisionStore.get(old.id))!.status).toBe("superseded");
+    // The superseded decision is no longer a conflict
+    expect(jwt!.conflicts).toBeUndefined();
+    expect((await decisionStore.get(jwt!.id))!.status).toBe("active");
+  });
+
+  it("checks the whole batch against one read of the index", async () => {
+    const byScopes = vi.spyOn(decisionStore, "getIndexByScopes");
+    const byScope = vi.spyOn(decisionStore, "getIndexByScope");
+    await decisionEngine.decideBatch([
+      validDecisionInput({ summary: "A" }),
+      validDecisionInput({ scope: "src/auth/jwt/", summary: "B" }),
+      validDecisionInput({ scope: "src/db/", summary: "C" }),
+    ]);
+    expect(byScopes).toHaveBeenCalledTimes(1);
+    expect(byScopes.mock.calls[0]![0]).toEqual(["src/auth/", "src/auth/jwt/", "src/db/"]);
+    expect(byScope).not.toHaveBeenCalled();
+  });
+});
+
 describe("DecisionEngine.decide with commit_hash", () => {
   it("creates decision with commit_hashes when commit_hash provided", async () => {
     const result = await decisionEngine.decide(
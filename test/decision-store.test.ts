@@ -166,6 +166,158 @@ describe("DecisionStore.getByScope", () => {
   });
 });
 
+describe("DecisionStore.getMany", () => {
+  it("returns decisions in the requested order, skipping missing IDs", async () => {
+    const d1 = await store.create(makeDecisionInput({ summary: "D1" }));
+    const d2 = await store.create(makeDecisionInput({ summary: "D2" }));
+    const results = await store.getMany([d2.id, "missing", d1.id]);
+    expect(results.map((d) => d.summary)).toEqual(["D2", "D1"]);
+  });
+
+  it("reflects status changes made through the store", async () => {
+    const d1 = await store.create(makeDecisionInput());
+    await store.getMany([d1.id]);
+    await store.updateStatus(d1.id, "overridden", { override_reason: "Changed" });
+    const [reloaded] = await store.getMany([d1.id]);
+    expect(reloaded!.status).toBe("overridden");
+    expect(reloaded!.override_reason).toBe("Changed");
+  });
+
+  it("reloads files changed by another process", async () => {
+    const d1 = await store.create(makeDecisionInput({ summary: "Original" }));
+    expect((await store.get(d1.id))!.summary).toBe("Original");
+
+    // Another store instance writes the file and touches the index
+    const other = new DecisionStore(tmpDir);
+    await other.updateStatus(d1.id, "superseded");
+    expect((await store.get(d1.id))!.status).toBe("superseded");
+
+    fs.unlinkSync(path.join(tmpDir, "decisions", `${d1.id}.json`));
+    fs.utimesSync(
+      path.join(tmpDir, "decisions", "index.json"),
+      new Date(),
+      new Date(Date.now() + 5000),
+    );
+    expect(await store.get(d1.id)).toBeNull();
+  });
+
+  it("works with the cache disabled or smaller than the working set", async () => {
+    for (const cache_size of [0, 1]) {
+      const small = new DecisionStore(tmpDir, { cache_size });
+      const created = [
+        await small.create(makeDecisionInput({ summary: `A${cache_size}` })),
+        await small.create(makeDecisionInput({ summary: `B${cache_size}` })),
+      ];
+      const results = await small.getMany(created.map((d) => d.id));
+      expect(results.map((d) => d.summary)).toEqual([
+        `A${cache_size}`,
+        `B${cache_size}`,
+      ]);
+    }
+  });
+});
+
+describe("DecisionStore.getIndexByScope", () => {
+  it("matches scope, affected files and symbols unless disabled", async () => {
+    const scoped = await store.create(
+      makeDecisionInput({ scope: "src/db/", affected_files: [], affected_symbols: [] }),
+    );
+    const byFile = await store.create(
+      makeDecisionInput({ scope: "project", affected_files: ["src/db/pool.ts"], affected_symbols: [] }),
+    );
+    const bySymbol = await store.create(
+      makeDecisionInput({ scope: "project", affected_files: [], affected_symbols: ["src/db/"] }),
+    );
+
+    const all = await store.getIndexByScope("src/db/");
+    expect(all.map((e) => e.id)).toEqual([scoped.id, byFile.id, bySymbol.id]);
+
+    const scopeOnly = await store.getIndexByScope("src/db/", {
+      affected_files: false,
+      affected_symbols: false,
+    });
+    expect(scopeOnly.map((e) => e.id)).toEqual([scoped.id]);
+  });
+
+  it("stays current across creates, status changes and external writes", async () => {
+    const d1 = await store.create(makeDecisionInput({ summary: "D1" }));
+    expect(await store.getIndexByScope("src/auth/")).toHaveLength(1);
+
+    await store.create(makeDecisionInput({ summary: "D2" }));
+    await store.updateStatus(d1.id, "superseded");
+    const afterWrites = await store.getIndexByScope("src/auth/");
+    expect(afterWrites.map((e) => e.summary)).toEqual(["D1", "D2"]);
+    expect(afterWrites[0]!.status).toBe("superseded");
+
+    // Another process compacts, then rewrites the snapshot with a different scope
+    await store.compact();
+    const indexPath = path.join(tmpDir, "decisions", "index.json");
+    const raw = JSON.parse(fs.readFileSync(indexPath, "utf-8"));
+    raw[1].scope = "src/billing/";
+    fs.writeFileSync(indexPath, JSON.stringify(raw));
+    fs.utimesSync(indexPath, new Date(), new Date(Date.now() + 5000));
+
+    const billing = await store.getIndexByScope("src/billing/", {
+      affected_files: false,
+    });
+    expect(billing.map((e) => e.summary)).toEqual(["D2"]);
+  });
+});
+
+describe("DecisionStore.getIndexByScopes", () => {
+  it("answers each scope as getIndexByScope would, in order", async () => {
+    const auth = await store.create(makeDecisionInput({ scope: "src/auth/" }));
+    const db = await store.create(makeDecisionInput({ scope: "src/db/" }));
+
+    const results = await store.getIndexByScopes(["src/db/", "src/", "docs/"]);
+    expect(results.map((r) => r.map((e) => e.id))).toEqual([
+      [db.id],
+      [auth.id, db.id],
+      [],
+    ]);
+  });
+});
+
+describe("DecisionStore.createBatch", () => {
+  it("supersedes listed decisions in the same log append", async () => {
+    const old = await store.create(makeDecisionInput());
+    const logPath = path.join(tmpDir, "decisions", "index.log.jsonl");
+    const before = fs.readFileSync(logPath, "utf-8");
+
+    const [created] = await store.createBatch([makeDecisionInput()], {
+      supersede: [old.id, "missing"],
+    });
+
+    const appended = fs.readFileSync(logPath, "utf-8").slice(before.length);
+    expect(appended.trim().split("\n").map((l) => JSON.parse(l).op)).toEqual([
+      "status",
+      "create",
+    ]);
+    expect((await store.get(old.id))!.status).toBe("superseded");
+    const index = await store.getIndex();
+    expect(index.map((e) => [e.id, e.status])).toEqual([
+      [old.id, "superseded"],
+      [created!.id, "active"],
+    ]);
+  });
+});
+
+describe("DecisionStore.searchCandidates", () => {
+  it("checks ids against the index and loads only the ones asked for", async () => {
+    const active = await store.create(makeDecisionInput({ scope: "src/auth/" }));
+    const old = await store.create(makeDecisionInput({ scope: "src/db/" }));
+    await store.updateStatus(old.id, "superseded");
+
+    const candidates = await store.searchCandidates((e) => e.status === "active");
+    expect(candidates.has(active.id)).toBe(true);
+    expect(candidates.has(old.id)).toBe(false);
+    expect(candidates.has("missing")).toBe(false);
+
+    const loaded = await candidates.load([active.id, "missing"]);
+    expect(loaded.map((d) => d.id)).toEqual([active.id]);
+  });
+});
+
 describe("DecisionStore.updateStatus", () => {
   it("changes status in both file and index", async () => {
     const decision = await store.create(makeDecisionInput());
@@ -287,3 +439,104 @@ describe("DecisionStore.getIndex", () => {
     expect(index).toHaveLength(5);
   });
 });
+
+describe("DecisionStore index log", () => {
+  const logPath = () => path.join(tmpDir, "decisions", "index.log.jsonl");
+  const snapshot = () =>
+    JSON.parse(
+      fs.readFileSync(path.join(tmpDir, "decisions", "index.json"), "utf-8"),
+    ) as unknown[];
+
+  it("appends mutations to the log and replays them in a new instance", async () => {
+    const d1 = await store.create(makeDecisionInput({ summary: "D1" }));
+    await store.updateStatus(d1.id, "superseded");
+    await store.linkCommit(d1.id, "abc123");
+    await store.linkCommit(d1.id, "abc123");
+
+    expect(snapshot()).toEqual([]);
+    const lines = fs.readFileSync(logPath(), "utf-8").trim().split("\n");
+    expect(lines.map((l) => JSON.parse(l).op)).toEqual([
+      "create",
+      "status",
+      "commit",
+      "commit",
+    ]);
+
+    const index = await new DecisionStore(tmpDir).getIndex();
+    expect(index).toHaveLength(1);
+    expect(index[0]!.status).toBe("superseded");
+    expect(index[0]!.commit_hashes).toEqual(["abc123"]);
+  });
+
+  it("bumps the generation when another instance writes", async () => {
+    const other = new DecisionStore(tmpDir);
+    const g0 = await store.generation();
+    expect(await store.generation()).toBe(g0);
+
+    const d1 = await other.create(makeDecisionInput({ summary: "Theirs" }));
+    const g1 = await store.generation();
+    expect(g1).toBeGreaterThan(g0);
+
+    await other.updateStatus(d1.id, "superseded");
+    expect(await store.generation()).toBeGreaterThan(g1);
+  });
+
+  it("picks up appends from another instance", async () => {
+    const other = new DecisionStore(tmpDir);
+    await store.create(makeDecisionInput({ summary: "Mine" }));
+    expect(await other.getIndex()).toHaveLength(1);
+
+    await other.create(makeDecisionInput({ summary: "Theirs" }));
+    const index = await store.getIndex();
+    expect(index.map((e) => e.summary)).toEqual(["Mine", "Theirs"]);
+  });
+
+  it("compacts the log into the snapshot", async () => {
+    const d1 = await store.create(makeDecisionInput({ summary: "D1" }));
+    await store.create(makeDecisionInput({ summary: "D2" }));
+    await store.updateStatus(d1.id, "provisional");
+    const before = await store.getIndex();
+
+    await store.compact();
+    expect(fs.statSync(logPath()).size).toBe(0);
+    expect(snapshot()).toEqual(before);
+    expect(await new DecisionStore(tmpDir).getIndex()).toEqual(before);
+    expect(await store.getIndex()).toEqual(before);
+  });
+
+  it("compacts in the background once the log reaches the threshold", async () => {
+    const small = new DecisionStore(tmpDir, { compact_threshold: 3 });
+    for (let i = 0; i < 3; i++) {
+      await small.create(makeDecisionInput({ summary: `D${i}` }));
+    }
+    await new Promise((resolve) => setTimeout(resolve, 200));
+
+    expect(snapshot()).toHaveLength(3);
+    expect(fs.statSync(logPath()).size).toBe(0);
+    expect(await small.getIndex()).toHaveLength(3);
+  });
+
+  it("replays a log left behind by an interrupted compaction idempotently", async () => {
+    const d1 = await store.create(makeDecisionInput({ summary: "D1" }));
+    await store.linkCommit(d1.id, "abc123");
+    const log = fs.readFileSync(logPath(), "utf-8");
+    await store.compact();
+    // Crash between snapshot rename and log truncation
+    fs.writeFileSync(logPath(), log);
+
+    const index = await new DecisionStore(tmpDir).getIndex();
+    expect(index).toHaveLength(1);
+    expect(index[0]!.commit_hashes).toEqual(["abc123"]);
+  });
+
+  it("ignores a trailing partial line and overwrites it on the next write", async () => {
+    await store.create(makeDecisionInput({ summary: "D1" }));
+    fs.appendFileSync(logPath(), '{"op":"create","entry":{"id":"tru');
+
+    expect(await new DecisionStore(tmpDir).getIndex()).toHaveLength(1);
+    await store.create(makeDecisionInput({ summary: "D2" }));
+
+    const index = await new DecisionStore(tmpDir).getIndex();
+    expect(index.map((e) => e.summary)).toEqual(["D1", "D2"]);
+  });
+});
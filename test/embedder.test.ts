@@ -7,12 +7,25 @@ import { Embedder } from "../src/embeddings/embedder.js";
 import os from "node:os";
 import path from "node:path";
 import fs from "node:fs";
+import { pathToFileURL } from "node:url";
 
 function makeTempDir(): string {
   const dir = fs.mkdtempSync(path.join(os.tmpdir(), "twining-embedder-test-"));
   return dir;
 }
 
+/** Speaks embedding-worker's protocol; "hang" never answers, "exit" kills it. */
+const FAKE_WORKER = `
+import { parentPort } from "node:worker_threads";
+parentPort.on("message", ({ id, texts }) => {
+  if (texts === "hang") return;
+  if (texts === "exit") process.exit(1);
+  const data = new Float32Array([String(texts).length]);
+  parentPort.postMessage({ type: "result", id, data, dims: [1, 1] });
+});
+parentPort.postMessage({ type: "ready" });
+`;
+
 describe("Embedder", () => {
   beforeEach(() => {
     Embedder.resetInstances();
@@ -105,4 +118,116 @@ describe("Embedder", () => {
     expect(results).toHaveLength(3);
     expect(results.every((r) => r === null)).toBe(true);
   });
+
+  it("embedBatch should run a single inference call for all texts", async () => {
+    const tmpDir = makeTempDir();
+    const embedder = new Embedder(tmpDir);
+    const pipeline = vi.fn(async (texts: string | string[]) => {
+      const n = Array.isArray(texts) ? texts.length : 1;
+      const data = new Float32Array(n * 2);
+      for (let i = 0; i < n; i++) data[i * 2] = i + 1;
+      return { data, dims: [n, 2] };
+    });
+    (embedder as any).pipeline = pipeline;
+
+    const results = await embedder.embedBatch(["a", "b", "c"]);
+
+    expect(pipeline).toHaveBeenCalledOnce();
+    expect(pipeline.mock.calls[0]![0]).toEqual(["a", "b", "c"]);
+    expect(results).toEqual([
+      [1, 0],
+      [2, 0],
+      [3, 0],
+    ]);
+  });
+
+  it("embedBatch should retry individually when the batch call fails", async () => {
+    const tmpDir = makeTempDir();
+    const embedder = new Embedder(tmpDir);
+    (embedder as any).pipeline = async (texts: string | string[]) => {
+      if (Array.isArray(texts)) throw new Error("batch failed");
+      if (texts === "bad") throw new Error("bad input");
+      return { data: new Float32Array([0.5]), dims: [1, 1] };
+    };
+
+    const results = await embedder.embedBatch(["good", "bad"]);
+    expect(results).toEqual([[0.5], null]);
+  });
+
+  it("embedQuery should serve repeated queries from the LRU cache", async () => {
+    const tmpDir = makeTempDir();
+    const embedder = new Embedder(tmpDir, { query_cache_size: 2 });
+    let calls = 0;
+    embedder.embed = async (text: string) => {
+      calls++;
+      return [text.length];
+    };
+
+    await embedder.embedQuery("one");
+    await embedder.embedQuery("one");
+    expect(calls).toBe(1);
+
+    await embedder.embedQuery("two");
+    await embedder.embedQuery("one"); // refresh "one"
+    await embedder.embedQuery("three"); // evicts "two"
+    expect(calls).toBe(3);
+
+    await embedder.embedQuery("one");
+    expect(calls).toBe(3);
+    await embedder.embedQuery("two");
+    expect(calls).toBe(4);
+  });
+
+  it("embedQuery should not cache failed embeddings", async () => {
+    const tmpDir = makeTempDir();
+    const embedder = new Embedder(tmpDir);
+    let calls = 0;
+    embedder.embed = async () => {
+      calls++;
+      return null;
+    };
+
+    expect(await embedder.embedQuery("q")).toBeNull();
+    expect(await embedder.embedQuery("q")).toBeNull();
+    expect(calls).toBe(2);
+  });
+
+  it("warmUp should initialize ahead of the first embed", async () => {
+    const tmpDir = makeTempDir();
+    const embedder = new Embedder(tmpDir);
+    expect(embedder.isInitialized()).toBe(false);
+
+    // Tests run without ONNX, so warm-up lands in fallback mode
+    expect(await embedder.warmUp()).toBe(false);
+    expect(embedder.isInitialized()).toBe(true);
+    expect(await embedder.warmUp()).toBe(false);
+  });
+
+  it("drops a worker that dies mid-call and goes in-process once none are left", async () => {
+    const tmpDir = makeTempDir();
+    const workerPath = path.join(tmpDir, "fake-worker.mjs");
+    fs.writeFileSync(workerPath, FAKE_WORKER);
+    const embedder = new Embedder(tmpDir, { workers: 2 });
+    const pipeline = await (embedder as any).startWorkers(pathToFileURL(workerPath));
+    (embedder as any).pipeline = pipeline;
+    const [first] = [...(embedder as any).workers];
+
+    // The first call goes to the first worker, which is killed before answering
+    const stranded = pipeline("hang");
+    await first.terminate();
+    await expect(stranded).rejects.toThrow(/exited/);
+
+    // The survivor takes every call from now on
+    expect(await embedder.embed("ok")).toEqual([2]);
+    expect(await embedder.embed("ok")).toEqual([2]);
+
+    // A worker that exits without an error event fails its call too
+    expect(await embedder.embed("exit")).toBeNull();
+    expect((embedder as any).workers).toHaveLength(0);
+    expect(embedder.isInitialized()).toBe(false);
+
+    // Tests run without ONNX, so going in-process lands in fallback mode
+    expect(await embedder.embed("ok")).toBeNull();
+    expect(embedder.isFallbackMode()).toBe(true);
+  });
 });
@@ -0,0 +1,170 @@
+/**
+ * Tests for the background EmbeddingQueue.
+ */
+import { describe, it, expect, beforeEach, afterEach, vi } from "vitest";
+import fs from "node:fs";
+import os from "node:os";
+import path from "node:path";
+import { EmbeddingQueue } from "../src/embeddings/embedding-queue.js";
+import { Embedder } from "../src/embeddings/embedder.js";
+import { IndexManager } from "../src/embeddings/index-manager.js";
+import { SearchEngine } from "../src/embeddings/search.js";
+import { BlackboardStore } from "../src/storage/blackboard-store.js";
+import { BlackboardEngine } from "../src/engine/blackboard.js";
+
+let tmpDir: string;
+let embedder: Embedder;
+let indexManager: IndexManager;
+let embedBatch: ReturnType<typeof vi.fn>;
+
+beforeEach(() => {
+  tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), "twining-queue-test-"));
+  fs.mkdirSync(path.join(tmpDir, "archive"), { recursive: true });
+  fs.writeFileSync(path.join(tmpDir, "blackboard.jsonl"), "");
+  embedder = new Embedder(tmpDir);
+  (embedder as any).fallbackMode = false;
+  embedBatch = vi.fn(async (texts: string[]) =>
+    texts.map((t) => [t.length, 1, 0]),
+  );
+  embedder.embedBatch = embedBatch as unknown as Embedder["embedBatch"];
+  indexManager = new IndexManager(tmpDir);
+});
+
+afterEach(() => {
+  fs.rmSync(tmpDir, { recursive: true, force: true });
+});
+
+describe("EmbeddingQueue", () => {
+  it("coalesces queued texts into one batched call", async () => {
+    const queue = new EmbeddingQueue(embedder, indexManager);
+    queue.enqueue("blackboard", "a", "one");
+    queue.enqueue("blackboard", "b", "three");
+    queue.enqueue("blackboard", "c", "seven");
+
+    expect(queue.isPending("blackboard", "a")).toBe(true);
+    expect(queue.pendingCount()).toBe(3);
+    expect(await indexManager.getVector("blackboard", "a")).toBeNull();
+
+    await queue.flush();
+
+    expect(embedBatch).toHaveBeenCalledOnce();
+    expect(embedBatch.mock.calls[0]![0]).toEqual(["one", "three", "seven"]);
+    expect(queue.pendingCount()).toBe(0);
+    expect(await indexManager.getVector("blackboard", "b")).toEqual([5, 1, 0]);
+  });
+
+  it("splits work into batches of batch_size", async () => {
+    const queue = new EmbeddingQueue(embedder, indexManager, {
+      batch_size: 2,
+    });
+    for (const id of ["a", "b", "c", "d", "e"]) {
+      queue.enqueue("decisions", id, id);
+    }
+    await queue.flush();
+
+    expect(embedBatch.mock.calls.map((c) => c[0].length)).toEqual([2, 2, 1]);
+    const { entries } = await indexManager.load("decisions");
+    expect(entries).toHaveLength(5);
+  });
+
+  it("processes work on its own without an explicit flush", async () => {
+    const queue = new EmbeddingQueue(embedder, indexManager, {
+      batch_delay_ms: 1,
+    });
+    queue.enqueue("blackboard", "a", "text");
+
+    await vi.waitFor(async () => {
+      expect(await indexManager.getVector("blackboard", "a")).not.toBeNull();
+    });
+    expect(queue.isPending("blackboard", "a")).toBe(false);
+  });
+
+  it("never writes vectors for cancelled ids", async () => {
+    const queue = new EmbeddingQueue(embedder, indexManager);
+    queue.enqueue("blackboard", "keep", "keep");
+    queue.enqueue("blackboard", "drop", "drop");
+    queue.cancel("blackboard", ["drop"]);
+    await queue.flush();
+
+    expect(await indexManager.getVector("blackboard", "keep")).not.toBeNull();
+    expect(await indexManager.getVector("blackboard", "drop")).toBeNull();
+  });
+
+  it("never writes vectors for ids cancelled while in flight", async () => {
+    let release!: () => void;
+    const gate = new Promise<void>((resolve) => {
+      release = resolve;
+    });
+    embedBatch.mockImplementation(async (texts: string[]) => {
+      await gate;
+      return texts.map(() => [1, 0, 0]);
+    });
+
+    const queue = new EmbeddingQueue(embedder, indexManager);
+    queue.enqueue("blackboard", "a", "a");
+    queue.enqueue("blackboard", "b", "b");
+    const flushed = queue.flush();
+    await vi.waitFor(() => expect(embedBatch).toHaveBeenCalled());
+
+    queue.cancel("blackboard", ["a"]);
+    release();
+    await flushed;
+
+    expect(await indexManager.getVector("blackboard", "a")).toBeNull();
+    expect(await indexManager.getVector("blackboard", "b")).not.toBeNull();
+  });
+
+  it("skips texts that failed to embed", async () => {
+    embedBatch.mockImplementation(async (texts: string[]) =>
+      texts.map((t) => (t === "bad" ? null : [1, 0, 0])),
+    );
+    const queue = new EmbeddingQueue(embedder, indexManager);
+    queue.enqueue("blackboard", "good", "good");
+    queue.enqueue("blackboard", "bad", "bad");
+    await queue.flush();
+
+    expect(await indexManager.getVector("blackboard", "good")).not.toBeNull();
+    expect(await indexManager.getVector("blackboard", "bad")).toBeNull();
+    expect(queue.pendingCount()).toBe(0);
+  });
+
+  it("ignores work in fallback mode", async () => {
+    (embedder as any).fallbackMode = true;
+    const queue = new EmbeddingQueue(embedder, indexManager);
+    queue.enqueue("blackboard", "a", "text");
+    expect(queue.pendingCount()).toBe(0);
+    await queue.flush();
+    expect(embedBatch).not.toHaveBeenCalled();
+  });
+});
+
+describe("BlackboardEngine with an embedding queue", () => {
+  it("posts without waiting for inference and searches pending entries by keyword", async () => {
+    const embed = vi.fn(async () => [1, 0, 0]);
+    embedder.embed = embed;
+    const queue = new EmbeddingQueue(embedder, indexManager);
+    const searchEngine = new SearchEngine(embedder, indexManager);
+    const engine = new BlackboardEngine(
+      new BlackboardStore(tmpDir),
+      embedder,
+      indexManager,
+      searchEngine,
+    );
+    engine.setEmbeddingQueue(queue);
+
+    const { id } = await engine.post({
+      entry_type: "finding",
+      summary: "Connection pool exhausted under load",
+    });
+
+    expect(embed).not.toHaveBeenCalled();
+    expect(queue.isPending("blackboard", id)).toBe(true);
+
+    // Pending entry is still found, via keyword fallback
+    const pending = await engine.query("connection pool");
+    expect(pending.results.map((r) => r.entry.id)).toEqual([id]);
+
+    await queue.flush();
+    expect(await indexManager.getVector("blackboard", id)).not.toBeNull();
+  });
+});
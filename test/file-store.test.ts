@@ -7,8 +7,14 @@ import {
   writeJSON,
   appendJSONL,
   readJSONL,
+  configureAppends,
+  flushAppends,
+  acquireLock,
+  readTail,
+  tailInvalidated,
 } from "../src/storage/file-store.js";
 import { initTwiningDir, ensureInitialized } from "../src/storage/init.js";
+import { Trace } from "../src/utils/tracing.js";
 
 let tmpDir: string;
 
@@ -89,6 +95,135 @@ describe("appendJSONL + readJSONL", () => {
   });
 });
 
+describe("appendJSONL group commit", () => {
+  afterEach(() => {
+    configureAppends();
+  });
+
+  it("writes a burst of appends in call order with one write", async () => {
+    const filePath = path.join(tmpDir, "burst.jsonl");
+    const writes: string[] = [];
+    const original = fs.appendFileSync;
+    fs.appendFileSync = ((file: fs.PathOrFileDescriptor, data: string | Uint8Array) => {
+      writes.push(String(data));
+      return original(file, data);
+    }) as typeof fs.appendFileSync;
+    try {
+      await Promise.all(
+        Array.from({ length: 20 }, (_, i) => appendJSONL(filePath, { index: i })),
+      );
+    } finally {
+      fs.appendFileSync = original;
+    }
+
+    expect(writes).toHaveLength(1);
+    const results = await readJSONL<{ index: number }>(filePath);
+    expect(results.map((r) => r.index)).toEqual(
+      Array.from({ length: 20 }, (_, i) => i),
+    );
+  });
+
+  it("holds appends for the window and flushes them on demand", async () => {
+    configureAppends({ window_ms: 60_000, fsync: "batch" });
+    const filePath = path.join(tmpDir, "windowed.jsonl");
+
+    const pending = appendJSONL(filePath, { a: 1 });
+    const pending2 = appendJSONL(filePath, { a: 2 });
+    expect(fs.existsSync(filePath)).toBe(false);
+
+    await flushAppends();
+    await Promise.all([pending, pending2]);
+    expect(await readJSONL(filePath)).toEqual([{ a: 1 }, { a: 2 }]);
+  });
+
+  it("rejects every append in a failed batch", async () => {
+    // A directory where the file should be makes the write fail
+    const filePath = path.join(tmpDir, "is-a-dir");
+    fs.mkdirSync(filePath);
+    const results = await Promise.allSettled([
+      appendJSONL(filePath, { a: 1 }),
+      appendJSONL(filePath, { a: 2 }),
+    ]);
+    expect(results.map((r) => r.status)).toEqual(["rejected", "rejected"]);
+  });
+});
+
+describe("acquireLock", () => {
+  const options = {
+    retries: { retries: 10, factor: 1, minTimeout: 10, maxTimeout: 10 },
+    stale: 10000,
+  };
+
+  it("waits for a held lock and records the retries as a span", async () => {
+    const filePath = path.join(tmpDir, "locked.json");
+    fs.writeFileSync(filePath, "");
+    const holder = await acquireLock(filePath, options);
+    setTimeout(() => void holder(), 35);
+
+    const trace = new Trace("tool");
+    const release = await trace.run(() => acquireLock(filePath, options));
+    await release();
+    const lockSpan = trace.finish().spans.find((s) => s.name === "lock")!;
+
+    expect(lockSpan.attributes!.file).toBe("locked.json");
+    expect(lockSpan.attributes!.retries).toBeGreaterThanOrEqual(2);
+    expect(lockSpan.attributes!.wait_ms).toBeGreaterThanOrEqual(20);
+  });
+
+  it("gives up with ELOCKED once retries run out", async () => {
+    const filePath = path.join(tmpDir, "held.json");
+    fs.writeFileSync(filePath, "");
+    const holder = await acquireLock(filePath, options);
+    try {
+      await expect(
+        acquireLock(filePath, { ...options, retries: { ...options.retries, retries: 2 } }),
+      ).rejects.toMatchObject({ code: "ELOCKED" });
+    } finally {
+      await holder();
+    }
+  });
+});
+
+describe("readTail", () => {
+  it("reads complete lines and leaves a partial one for later", () => {
+    const filePath = path.join(tmpDir, "log.jsonl");
+    fs.writeFileSync(filePath, '{"a":1}\n{"b":2}\n{"c":');
+    const size = fs.statSync(filePath).size;
+
+    const first = readTail(filePath, 0, size);
+    expect(first.lines).toEqual(['{"a":1}', '{"b":2}']);
+    expect(first.bytes).toBe(16);
+
+    expect(readTail(filePath, first.bytes, size)).toEqual({ lines: [], bytes: 0 });
+
+    fs.appendFileSync(filePath, "3}\n");
+    const second = readTail(filePath, first.bytes, fs.statSync(filePath).size);
+    expect(second.lines).toEqual(['{"c":3}']);
+    expect(first.bytes + second.bytes).toBe(fs.statSync(filePath).size);
+  });
+
+  it("returns nothing when there is nothing new", () => {
+    const filePath = path.join(tmpDir, "log.jsonl");
+    fs.writeFileSync(filePath, "x\n");
+    expect(readTail(filePath, 2, 2)).toEqual({ lines: [], bytes: 0 });
+  });
+});
+
+describe("tailInvalidated", () => {
+  it("detects a replaced, truncated or deleted file", () => {
+    const filePath = path.join(tmpDir, "log.jsonl");
+    fs.writeFileSync(filePath, "one\ntwo\n");
+    const stat = fs.statSync(filePath);
+
+    expect(tailInvalidated(stat, stat.ino, 4)).toBe(false);
+    expect(tailInvalidated(stat, stat.ino, stat.size)).toBe(false);
+    expect(tailInvalidated(stat, stat.ino, stat.size + 1)).toBe(true);
+    expect(tailInvalidated(stat, stat.ino + 1, 4)).toBe(true);
+    expect(tailInvalidated(null, stat.ino, 4)).toBe(true);
+    expect(tailInvalidated(null, 0, 0)).toBe(false);
+  });
+});
+
 describe("initTwiningDir", () => {
   it("creates correct directory structure", () => {
     initTwiningDir(tmpDir);
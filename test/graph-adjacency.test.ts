@@ -0,0 +1,74 @@
+/**
+ * Tests for the CSR graph adjacency.
+ */
+import { describe, it, expect } from "vitest";
+import { GraphAdjacency } from "../src/storage/graph-adjacency.js";
+import type { Relation } from "../src/utils/types.js";
+
+let nextId = 0;
+function rel(source: string, target: string, type: Relation["type"]): Relation {
+  return {
+    id: `R${nextId++}`,
+    source,
+    target,
+    type,
+    properties: {},
+    created_at: "2026-01-01T00:00:00.000Z",
+  };
+}
+
+/** Edges of a node as "neighbor:type:direction" strings. */
+function edges(
+  adjacency: GraphAdjacency,
+  id: string,
+  types?: Relation["type"][],
+): string[] {
+  const out: string[] = [];
+  const node = adjacency.indexOf(id);
+  if (node === undefined) return out;
+  adjacency.forEachEdge(node, adjacency.typeMask(types), (n, r, incoming) => {
+    out.push(`${adjacency.idOf(n)}:${r.type}:${incoming ? "in" : "out"}`);
+  });
+  return out;
+}
+
+describe("GraphAdjacency", () => {
+  it("lists edges per node in relation order, in both directions", () => {
+    const adjacency = GraphAdjacency.build([
+      rel("A", "B", "calls"),
+      rel("C", "A", "depends_on"),
+      rel("A", "A", "related_to"),
+    ]);
+
+    expect(edges(adjacency, "A")).toEqual([
+      "B:calls:out",
+      "C:depends_on:in",
+      "A:related_to:out",
+      "A:related_to:in",
+    ]);
+    expect(edges(adjacency, "B")).toEqual(["A:calls:in"]);
+    expect(adjacency.indexOf("Z")).toBeUndefined();
+  });
+
+  it("filters edges by relation type mask", () => {
+    const adjacency = GraphAdjacency.build([
+      rel("A", "B", "calls"),
+      rel("A", "C", "tested_by"),
+    ]);
+
+    expect(edges(adjacency, "A", ["tested_by"])).toEqual(["C:tested_by:out"]);
+    expect(edges(adjacency, "A", ["imports"])).toEqual([]);
+    expect(adjacency.hasOutgoing(adjacency.indexOf("A")!, adjacency.typeMask(["tested_by"]))).toBe(true);
+    expect(adjacency.hasOutgoing(adjacency.indexOf("C")!, adjacency.typeMask(["tested_by"]))).toBe(false);
+  });
+
+  it("adds relations incrementally after the CSR arrays are built", () => {
+    const adjacency = GraphAdjacency.build([rel("A", "B", "calls")]);
+    adjacency.addRelation(rel("A", "D", "implements"));
+    adjacency.addRelation(rel("D", "E", "calls"));
+
+    expect(edges(adjacency, "A")).toEqual(["B:calls:out", "D:implements:out"]);
+    expect(edges(adjacency, "D", ["calls"])).toEqual(["E:calls:out"]);
+    expect(adjacency.needsRebuild()).toBe(false);
+  });
+});
@@ -152,6 +152,26 @@ describe("GraphEngine.neighbors", () => {
     expect(result.neighbors).toHaveLength(1);
     expect(result.neighbors[0]!.entity.name).toBe("B");
   });
+
+  it("sees relations added after the first traversal, by this or another store", async () => {
+    const a = await engine.addEntity({ name: "A", type: "class" });
+    const b = await engine.addEntity({ name: "B", type: "class" });
+    await engine.addRelation({ source: a.id, target: b.id, type: "calls" });
+    expect((await engine.neighbors(a.id, 3)).neighbors).toHaveLength(1);
+
+    await engine.addEntity({ name: "C", type: "class" });
+    await engine.addRelation({ source: "B", target: "C", type: "calls" });
+    const other = new GraphEngine(new GraphStore(tmpDir));
+    await other.addEntity({ name: "D", type: "class" });
+    await other.addRelation({ source: "D", target: "A", type: "tested_by" });
+
+    const result = await engine.neighbors(a.id, 3);
+    expect(result.neighbors.map((n) => n.entity.name)).toEqual(["B", "D", "C"]);
+    expect(result.neighbors[1]!.direction).toBe("incoming");
+
+    await store.removeEntities(new Set([b.id]));
+    expect((await engine.neighbors(a.id, 3)).neighbors.map((n) => n.entity.name)).toEqual(["D"]);
+  });
 });
 
 describe("GraphEngine.query", () => {
@@ -284,3 +284,94 @@ describe("GraphStore.removeEntities", () => {
     expect(result.removedRelations).toBe(0);
   });
 });
+
+describe("GraphStore.applyBatch", () => {
+  const logPath = () => path.join(tmpDir, "graph", "graph.log.jsonl");
+
+  it("resolves relations against entities created earlier in the batch", async () => {
+    const result = await store.applyBatch([
+      { kind: "entity", name: "src/a.ts", type: "file" },
+      { kind: "entity", name: "D1", type: "concept" },
+      { kind: "relation", source: "src/a.ts", target: "D1", type: "decided_by" },
+      { kind: "entity", name: "src/a.ts", type: "file", properties: { x: "1" } },
+    ]);
+
+    expect(result.entities).toHaveLength(3);
+    expect(result.entities[2]!.id).toBe(result.entities[0]!.id);
+    expect(result.relations[0]!.source).toBe(result.entities[0]!.id);
+    expect(await store.getEntities()).toHaveLength(2);
+    expect((await store.getEntityByName("src/a.ts"))[0]!.properties).toEqual({ x: "1" });
+    // One record per entity plus the relation, in a single append
+    expect(fs.readFileSync(logPath(), "utf-8").trim().split("\n")).toHaveLength(3);
+  });
+
+  it("writes nothing when a relation endpoint doesn't resolve", async () => {
+    await expect(
+      store.applyBatch([
+        { kind: "entity", name: "A", type: "class" },
+        { kind: "relation", source: "A", target: "missing", type: "calls" },
+      ]),
+    ).rejects.toThrow(TwiningError);
+    expect(await store.getEntities()).toHaveLength(0);
+  });
+
+  it("drops unresolved relations with skip_unresolved", async () => {
+    const result = await store.applyBatch(
+      [
+        { kind: "entity", name: "A", type: "class" },
+        { kind: "relation", source: "A", target: "missing", type: "calls" },
+        { kind: "relation", source: "A", target: "A", type: "calls" },
+      ],
+      { skip_unresolved: true },
+    );
+    expect(result.skipped).toHaveLength(1);
+    expect(result.skipped[0]!.code).toBe("NOT_FOUND");
+    expect(await store.getRelations()).toHaveLength(1);
+  });
+});
+
+describe("GraphStore write-ahead log", () => {
+  it("replays the log in a new instance and picks up other writers", async () => {
+    const other = new GraphStore(tmpDir);
+    const a = await store.addEntity({ name: "A", type: "class" });
+    await store.addRelation({ source: "A", target: "A", type: "calls" });
+    expect(await other.getEntities()).toHaveLength(1);
+
+    await other.addEntity({ name: "B", type: "class" });
+    await other.removeEntities(new Set([a.id]));
+    expect((await store.getEntities()).map((e) => e.name)).toEqual(["B"]);
+    expect(await store.getRelations()).toHaveLength(0);
+
+    // Snapshots are untouched until compaction
+    const snapshot = JSON.parse(
+      fs.readFileSync(path.join(tmpDir, "graph", "entities.json"), "utf-8"),
+    );
+    expect(snapshot).toEqual([]);
+  });
+
+  it("compacts the log into the snapshots", async () => {
+    await store.addEntity({ name: "A", type: "class" });
+    await store.addEntity({ name: "B", type: "class" });
+    await store.addRelation({ source: "A", target: "B", type: "calls" });
+    const entities = await store.getEntities();
+
+    await store.compact();
+    expect(fs.statSync(path.join(tmpDir, "graph", "graph.log.jsonl")).size).toBe(0);
+    const fresh = new GraphStore(tmpDir);
+    expect(await fresh.getEntities()).toEqual(entities);
+    expect(await fresh.getRelations()).toHaveLength(1);
+  });
+
+  it("compacts in the background once the log reaches the threshold", async () => {
+    const small = new GraphStore(tmpDir, { compact_threshold: 2 });
+    await small.addEntity({ name: "A", type: "class" });
+    await small.addEntity({ name: "B", type: "class" });
+    await new Promise((resolve) => setTimeout(resolve, 200));
+
+    const snapshot = JSON.parse(
+      fs.readFileSync(path.join(tmpDir, "graph", "entities.json"), "utf-8"),
+    );
+    expect(snapshot).toHaveLength(2);
+    expect(await small.getEntities()).toHaveLength(2);
+  });
+});
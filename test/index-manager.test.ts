@@ -39,11 +39,11 @@ describe("IndexManager", () => {
       expect(index.entries).toHaveLength(0);
     });
 
-    it("should load existing index", async () => {
+    it("should migrate an existing JSON index", async () => {
       const testIndex = {
         model: "all-MiniLM-L6-v2",
         dimension: 384,
-        entries: [{ id: "test-1", vector: [0.1, 0.2, 0.3] }],
+        entries: [{ id: "test-1", vector: [0.25, 0.5, 0.75] }],
       };
       const filePath = path.join(tmpDir, "embeddings", "blackboard.index");
       fs.writeFileSync(filePath, JSON.stringify(testIndex));
@@ -51,36 +51,67 @@ describe("IndexManager", () => {
       const index = await manager.load("blackboard");
       expect(index.entries).toHaveLength(1);
       expect(index.entries[0]!.id).toBe("test-1");
-      expect(index.entries[0]!.vector).toEqual([0.1, 0.2, 0.3]);
+      expect(index.entries[0]!.vector).toEqual([0.25, 0.5, 0.75]);
+      expect(index.dimension).toBe(3);
+
+      // Legacy file is replaced by the packed format
+      expect(fs.existsSync(filePath)).toBe(false);
+      expect(
+        fs.existsSync(path.join(tmpDir, "embeddings", "blackboard.meta.json")),
+      ).toBe(true);
+    });
+
+    it("should migrate an empty JSON index to an empty index", async () => {
+      const filePath = path.join(tmpDir, "embeddings", "blackboard.index");
+      fs.writeFileSync(filePath, "");
+
+      await manager.addEntry("blackboard", "entry-1", [0.5]);
+      const index = await manager.load("blackboard");
+      expect(index.entries).toHaveLength(1);
+      expect(fs.existsSync(filePath)).toBe(false);
     });
   });
 
   describe("save", () => {
-    it("should write index to file", async () => {
+    it("should write index to packed files", async () => {
       const testIndex = {
         model: "all-MiniLM-L6-v2",
         dimension: 384,
-        entries: [{ id: "test-1", vector: [0.5, 0.6, 0.7] }],
+        entries: [{ id: "test-1", vector: [0.5, 0.625, 0.75] }],
       };
 
       await manager.save("blackboard", testIndex);
 
-      const filePath = path.join(tmpDir, "embeddings", "blackboard.index");
-      const content = fs.readFileSync(filePath, "utf-8");
-      const loaded = JSON.parse(content);
+      const vecPath = path.join(tmpDir, "embeddings", "blackboard.1.vec");
+      expect(fs.statSync(vecPath).size).toBe(3 * 4);
+
+      const loaded = await new IndexManager(tmpDir).load("blackboard");
       expect(loaded.entries).toHaveLength(1);
-      expect(loaded.entries[0].id).toBe("test-1");
+      expect(loaded.entries[0]!.id).toBe("test-1");
+      expect(loaded.entries[0]!.vector).toEqual([0.5, 0.625, 0.75]);
+    });
+
+    it("should replace previous contents", async () => {
+      await manager.addEntry("blackboard", "old", [0.5]);
+      await manager.save("blackboard", {
+        model: "all-MiniLM-L6-v2",
+        dimension: 1,
+        entries: [{ id: "new", vector: [0.25] }],
+      });
+
+      const index = await manager.load("blackboard");
+      expect(index.entries.map((e) => e.id)).toEqual(["new"]);
     });
   });
 
   describe("addEntry", () => {
     it("should add entry to empty index", async () => {
-      await manager.addEntry("blackboard", "entry-1", [0.1, 0.2, 0.3]);
+      await manager.addEntry("blackboard", "entry-1", [0.25, 0.5, 0.75]);
 
       const index = await manager.load("blackboard");
       expect(index.entries).toHaveLength(1);
       expect(index.entries[0]!.id).toBe("entry-1");
-      expect(index.entries[0]!.vector).toEqual([0.1, 0.2, 0.3]);
+      expect(index.entries[0]!.vector).toEqual([0.25, 0.5, 0.75]);
     });
 
     it("should add multiple entries", async () => {
@@ -92,12 +123,12 @@ describe("IndexManager", () => {
     });
 
     it("should replace existing entry with same ID", async () => {
-      await manager.addEntry("blackboard", "entry-1", [0.1, 0.2, 0.3]);
-      await manager.addEntry("blackboard", "entry-1", [0.9, 0.8, 0.7]);
+      await manager.addEntry("blackboard", "entry-1", [0.25, 0.5, 0.75]);
+      await manager.addEntry("blackboard", "entry-1", [0.875, 0.625, 0.375]);
 
       const index = await manager.load("blackboard");
       expect(index.entries).toHaveLength(1);
-      expect(index.entries[0]!.vector).toEqual([0.9, 0.8, 0.7]);
+      expect(index.entries[0]!.vector).toEqual([0.875, 0.625, 0.375]);
     });
 
     it("should handle concurrent addEntry calls without corruption", async () => {
@@ -113,6 +144,37 @@ describe("IndexManager", () => {
       expect(index.entries).toHaveLength(10);
     });
 
+    it("should append without rewriting existing vectors", async () => {
+      await manager.addEntry("blackboard", "entry-1", [0.5, 0.25]);
+      const vecPath = path.join(tmpDir, "embeddings", "blackboard.1.vec");
+      const before = fs.readFileSync(vecPath);
+
+      await manager.addEntry("blackboard", "entry-2", [0.75, 0.125]);
+      const after = fs.readFileSync(vecPath);
+
+      expect(after.length).toBe(before.length + 2 * 4);
+      expect(after.subarray(0, before.length).equals(before)).toBe(true);
+    });
+
+    it("should skip vectors with a mismatched dimension", async () => {
+      await manager.addEntry("blackboard", "entry-1", [0.5, 0.25]);
+      await manager.addEntry("blackboard", "entry-2", [0.5, 0.25, 0.125]);
+
+      const index = await manager.load("blackboard");
+      expect(index.entries.map((e) => e.id)).toEqual(["entry-1"]);
+    });
+
+    it("should see entries appended by another manager", async () => {
+      const other = new IndexManager(tmpDir);
+      await manager.addEntry("blackboard", "entry-1", [0.5]);
+      expect((await other.load("blackboard")).entries).toHaveLength(1);
+
+      await manager.addEntry("blackboard", "entry-2", [0.25]);
+      const index = await other.load("blackboard");
+      expect(index.entries.map((e) => e.id)).toEqual(["entry-1", "entry-2"]);
+      expect(index.entries[1]!.vector).toEqual([0.25]);
+    });
+
     it("should work with decisions index", async () => {
       await manager.addEntry("decisions", "dec-1", [0.1, 0.2]);
       const index = await manager.load("decisions");
@@ -139,6 +201,28 @@ describe("IndexManager", () => {
       await manager.removeEntries("blackboard", ["nonexistent"]);
     });
 
+    it("should persist removals as tombstones", async () => {
+      await manager.addEntry("blackboard", "entry-1", [0.5]);
+      await manager.addEntry("blackboard", "entry-2", [0.25]);
+      await manager.removeEntries("blackboard", ["entry-1"]);
+
+      const idsPath = path.join(tmpDir, "embeddings", "blackboard.1.ids");
+      expect(fs.readFileSync(idsPath, "utf-8")).toBe(
+        "+entry-1\n+entry-2\n-entry-1\n",
+      );
+
+      const index = await new IndexManager(tmpDir).load("blackboard");
+      expect(index.entries.map((e) => e.id)).toEqual(["entry-2"]);
+    });
+
+    it("should allow re-adding a removed entry", async () => {
+      await manager.addEntry("blackboard", "entry-1", [0.5]);
+      await manager.removeEntries("blackboard", ["entry-1"]);
+      await manager.addEntry("blackboard", "entry-1", [0.75]);
+
+      expect(await manager.getVector("blackboard", "entry-1")).toEqual([0.75]);
+    });
+
     it("should be a no-op when IDs do not match", async () => {
       await manager.addEntry("blackboard", "entry-1", [0.1]);
       await manager.removeEntries("blackboard", ["nonexistent"]);
@@ -150,9 +234,9 @@ describe("IndexManager", () => {
 
   describe("getVector", () => {
     it("should return vector for existing entry", async () => {
-      await manager.addEntry("blackboard", "entry-1", [0.1, 0.2, 0.3]);
+      await manager.addEntry("blackboard", "entry-1", [0.25, 0.5, 0.75]);
       const vector = await manager.getVector("blackboard", "entry-1");
-      expect(vector).toEqual([0.1, 0.2, 0.3]);
+      expect(vector).toEqual([0.25, 0.5, 0.75]);
     });
 
     it("should return null for non-existing entry", async () => {
@@ -160,4 +244,61 @@ describe("IndexManager", () => {
       expect(vector).toBeNull();
     });
   });
+
+  describe("getVectors", () => {
+    it("should expose live vectors by slot", async () => {
+      await manager.addEntry("blackboard", "entry-1", [0.5, 0.25]);
+      await manager.addEntry("blackboard", "entry-2", [0.75, 0.125]);
+      await manager.removeEntries("blackboard", ["entry-1"]);
+
+      const view = await manager.getVectors("blackboard");
+      expect(view.dimension).toBe(2);
+      expect(view.slots.has("entry-1")).toBe(false);
+      const slot = view.slots.get("entry-2")!;
+      expect(Array.from(view.data.subarray(slot * 2, slot * 2 + 2))).toEqual([
+        0.75, 0.125,
+      ]);
+    });
+
+    it("should return an empty view when no index exists", async () => {
+      const view = await manager.getVectors("decisions");
+      expect(view.slots.size).toBe(0);
+      expect(view.data.length).toBe(0);
+    });
+  });
+
+  describe("compact", () => {
+    it("should drop dead slots and switch generation", async () => {
+      await manager.addEntry("blackboard", "entry-1", [0.5]);
+      await manager.addEntry("blackboard", "entry-2", [0.25]);
+      await manager.addEntry("blackboard", "entry-1", [0.75]);
+      await manager.removeEntries("blackboard", ["entry-2"]);
+
+      await manager.compact("blackboard");
+
+      const dir = path.join(tmpDir, "embeddings");
+      expect(fs.existsSync(path.join(dir, "blackboard.1.vec"))).toBe(false);
+      expect(fs.statSync(path.join(dir, "blackboard.2.vec")).size).toBe(4);
+      expect(fs.readFileSync(path.join(dir, "blackboard.2.ids"), "utf-8")).toBe(
+        "+entry-1\n",
+      );
+
+      const index = await manager.load("blackboard");
+      expect(index.entries).toEqual([{ id: "entry-1", vector: [0.75] }]);
+    });
+
+    it("should let other managers follow the new generation", async () => {
+      const other = new IndexManager(tmpDir);
+      await manager.addEntry("blackboard", "entry-1", [0.5]);
+      await manager.addEntry("blackboard", "entry-2", [0.25]);
+      await other.load("blackboard");
+
+      await manager.removeEntries("blackboard", ["entry-1"]);
+      await manager.compact("blackboard");
+      await manager.addEntry("blackboard", "entry-3", [0.125]);
+
+      const index = await other.load("blackboard");
+      expect(index.entries.map((e) => e.id)).toEqual(["entry-2", "entry-3"]);
+    });
+  });
 });
@@ -0,0 +1,161 @@
+/**
+ * Tests for the persistent BM25 keyword index.
+ */
+import { describe, it, expect, beforeEach, afterEach } from "vitest";
+import fs from "node:fs";
+import path from "node:path";
+import os from "node:os";
+import { KeywordIndex, tokenize } from "../src/embeddings/keyword-index.js";
+
+let tmpDir: string;
+
+beforeEach(() => {
+  tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), "twining-keyword-test-"));
+});
+
+afterEach(() => {
+  fs.rmSync(tmpDir, { recursive: true, force: true });
+});
+
+describe("tokenize", () => {
+  it("lowercases and splits on punctuation", () => {
+    expect(tokenize("Use JWT-based auth, not sessions!")).toEqual([
+      "use",
+      "jwt",
+      "based",
+      "auth",
+      "not",
+      "sessions",
+    ]);
+  });
+});
+
+describe("KeywordIndex", () => {
+  it("ranks documents by BM25", async () => {
+    const index = new KeywordIndex(tmpDir);
+    await index.add("blackboard", [
+      { id: "a", text: "database migration plan" },
+      { id: "b", text: "database database schema database" },
+      { id: "c", text: "frontend styling" },
+    ]);
+
+    const hits = index.search("blackboard", "database");
+    expect(hits.map((h) => h.id)).toEqual(["b", "a"]);
+    expect(hits[0]!.score).toBeGreaterThan(hits[1]!.score);
+  });
+
+  it("rewards documents matching more query terms", async () => {
+    const index = new KeywordIndex(tmpDir);
+    await index.add("blackboard", [
+      { id: "a", text: "auth token refresh" },
+      { id: "b", text: "auth middleware" },
+      { id: "c", text: "token bucket rate limiter" },
+    ]);
+
+    const hits = index.search("blackboard", "auth token");
+    expect(hits[0]!.id).toBe("a");
+  });
+
+  it("matches query terms as prefixes of indexed terms", async () => {
+    const index = new KeywordIndex(tmpDir);
+    await index.add("decisions", [
+      { id: "a", text: "authentication via JWT" },
+      { id: "b", text: "caching layer" },
+    ]);
+
+    expect(index.search("decisions", "auth").map((h) => h.id)).toEqual(["a"]);
+    // Short terms match exactly only
+    expect(index.search("decisions", "ca")).toEqual([]);
+    // Never inside a word, and an empty query matches nothing
+    expect(index.search("decisions", "thentication")).toEqual([]);
+    expect(index.search("decisions", "  ")).toEqual([]);
+  });
+
+  it("restricts results with allow and limit", async () => {
+    const index = new KeywordIndex(tmpDir);
+    await index.add("blackboard", [
+      { id: "a", text: "cache warmup" },
+      { id: "b", text: "cache eviction" },
+      { id: "c", text: "cache sizing" },
+    ]);
+
+    const allowed = index.search("blackboard", "cache", {
+      allow: (id) => id !== "b",
+    });
+    expect(allowed.map((h) => h.id).sort()).toEqual(["a", "c"]);
+    expect(index.search("blackboard", "cache", { limit: 1 })).toHaveLength(1);
+  });
+
+  it("replaces and removes documents", async () => {
+    const index = new KeywordIndex(tmpDir);
+    await index.add("blackboard", [{ id: "a", text: "old text" }]);
+    await index.add("blackboard", [{ id: "a", text: "new text" }]);
+    expect(index.search("blackboard", "old")).toEqual([]);
+    expect(index.search("blackboard", "new").map((h) => h.id)).toEqual(["a"]);
+
+    await index.remove("blackboard", ["a", "missing"]);
+    expect(index.size("blackboard")).toBe(0);
+    expect(index.search("blackboard", "new")).toEqual([]);
+  });
+
+  it("persists across instances and picks up appends from other writers", async () => {
+    const writer = new KeywordIndex(tmpDir);
+    const reader = new KeywordIndex(tmpDir);
+    await writer.add("blackboard", [{ id: "a", text: "shared state" }]);
+    expect(reader.search("blackboard", "shared").map((h) => h.id)).toEqual(["a"]);
+
+    await writer.add("blackboard", [{ id: "b", text: "shared again" }]);
+    expect(reader.size("blackboard")).toBe(2);
+
+    await writer.compact("blackboard");
+    expect(reader.size("blackboard")).toBe(2);
+  });
+
+  it("ensure() and missing() skip indexed items", async () => {
+    const index = new KeywordIndex(tmpDir);
+    await index.add("decisions", [{ id: "a", text: "first" }]);
+    await index.ensure(
+      "decisions",
+      [
+        { id: "a", body: "ignored" },
+        { id: "b", body: "second" },
+      ],
+      (item) => item.body,
+    );
+
+    expect(index.size("decisions")).toBe(2);
+    expect(index.search("decisions", "ignored")).toEqual([]);
+    expect(index.search("decisions", "second").map((h) => h.id)).toEqual(["b"]);
+    expect(index.missing("decisions", ["a", "b", "c"])).toEqual(["c"]);
+  });
+
+  it("compacts away replaced and removed lines", async () => {
+    const index = new KeywordIndex(tmpDir);
+    await index.add("blackboard", [
+      { id: "a", text: "alpha" },
+      { id: "b", text: "beta" },
+    ]);
+    await index.add("blackboard", [{ id: "a", text: "alpha two" }]);
+    await index.remove("blackboard", ["b"]);
+    await index.compact("blackboard");
+
+    const file = path.join(tmpDir, "blackboard.terms.jsonl");
+    const lines = fs.readFileSync(file, "utf-8").trim().split("\n");
+    expect(lines).toHaveLength(1);
+    expect(new KeywordIndex(tmpDir).search("blackboard", "two").map((h) => h.id)).toEqual(["a"]);
+  });
+
+  it("ignores a trailing partial line and overwrites it on the next append", async () => {
+    const index = new KeywordIndex(tmpDir);
+    await index.add("blackboard", [{ id: "a", text: "complete" }]);
+    const file = path.join(tmpDir, "blackboard.terms.jsonl");
+    fs.appendFileSync(file, '["+","b",1,{"trunc');
+
+    expect(index.size("blackboard")).toBe(1);
+    await index.add("blackboard", [{ id: "c", text: "after crash" }]);
+
+    const fresh = new KeywordIndex(tmpDir);
+    expect(fresh.size("blackboard")).toBe(2);
+    expect(fresh.search("blackboard", "crash").map((h) => h.id)).toEqual(["c"]);
+  });
+});
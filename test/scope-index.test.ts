@@ -0,0 +1,89 @@
+/**
+ * Tests for the scope-prefix index.
+ */
+import { describe, it, expect } from "vitest";
+import { ScopeIndex, scopeOverlaps } from "../src/utils/scope-index.js";
+
+function sorted(values: Set<string>): string[] {
+  return [...values].sort();
+}
+
+describe("ScopeIndex", () => {
+  it("matches ancestors, descendants and exact keys", () => {
+    const index = new ScopeIndex<string>();
+    index.add("project", "p");
+    index.add("src/", "src");
+    index.add("src/auth/", "auth");
+    index.add("src/auth/jwt.ts", "jwt");
+    index.add("src/db/", "db");
+
+    expect(sorted(index.match("src/auth/"))).toEqual(["auth", "jwt", "src"]);
+    expect(sorted(index.match("src/auth/jwt.ts"))).toEqual(["auth", "jwt", "src"]);
+    expect(sorted(index.match("src/"))).toEqual(["auth", "db", "jwt", "src"]);
+    expect(sorted(index.match("lib/"))).toEqual([]);
+  });
+
+  it("uses string-prefix semantics, like startsWith", () => {
+    const index = new ScopeIndex<string>();
+    index.add("src/auth", "auth");
+    index.add("src/authz/policy.ts", "authz");
+
+    expect(sorted(index.match("src/auth"))).toEqual(["auth", "authz"]);
+    expect(sorted(index.match("src/au"))).toEqual(["auth", "authz"]);
+    expect(sorted(index.match("src/authz"))).toEqual(["auth", "authz"]);
+  });
+
+  it("matches everything for an empty scope and treats an empty key as a root", () => {
+    const index = new ScopeIndex<string>();
+    index.add("", "root");
+    index.add("a/b", "ab");
+
+    expect(sorted(index.match(""))).toEqual(["ab", "root"]);
+    expect(sorted(index.match("zzz"))).toEqual(["root"]);
+  });
+
+  it("removes values and keeps other keys intact", () => {
+    const index = new ScopeIndex<string>();
+    index.add("src/a", "1");
+    index.add("src/ab", "2");
+    index.add("src/b", "3");
+    index.remove("src/a", "1");
+    index.remove("src/missing", "9");
+
+    expect(sorted(index.match("src/"))).toEqual(["2", "3"]);
+    expect(sorted(index.match("src/ab/x"))).toEqual(["2"]);
+
+    index.remove("src/ab", "2");
+    index.remove("src/b", "3");
+    expect(sorted(index.match(""))).toEqual([]);
+  });
+
+  it("agrees with scopeOverlaps on random keys", () => {
+    let seed = 11;
+    const rand = () => {
+      seed = (seed * 1664525 + 1013904223) >>> 0;
+      return seed / 2 ** 32;
+    };
+    const parts = ["a", "b", "/", "src/", "ab"];
+    const key = () => {
+      let s = "";
+      const n = Math.floor(rand() * 5);
+      for (let i = 0; i < n; i++) s += parts[Math.floor(rand() * parts.length)];
+      return s;
+    };
+
+    const index = new ScopeIndex<number>();
+    const keys: string[] = [];
+    for (let i = 0; i < 200; i++) {
+      keys.push(key());
+      index.add(keys[i]!, i);
+    }
+    for (let q = 0; q < 100; q++) {
+      const scope = key();
+      const expected = keys
+        .map((k, i) => (scopeOverlaps(k, scope) ? i : -1))
+        .filter((i) => i >= 0);
+      expect([...index.match(scope)].sort((a, b) => a - b)).toEqual(expected);
+    }
+  });
+});
@@ -1,15 +1,15 @@
 /**
- * Tests for SearchEngine, cosineSimilarity, and keywordSearch.
+ * Tests for SearchEngine and cosineSimilarity.
  */
 import { describe, it, expect, beforeEach } from "vitest";
-import {
-  SearchEngine,
-  cosineSimilarity,
-  keywordSearch,
-} from "../src/embeddings/search.js";
+import { SearchEngine, cosineSimilarity } from "../src/embeddings/search.js";
 import { Embedder } from "../src/embeddings/embedder.js";
 import { IndexManager } from "../src/embeddings/index-manager.js";
-import type { BlackboardEntry, Decision } from "../src/utils/types.js";
+import type {
+  BlackboardEntry,
+  Decision,
+  SearchCandidates,
+} from "../src/utils/types.js";
 import os from "node:os";
 import path from "node:path";
 import fs from "node:fs";
@@ -36,6 +36,25 @@ function makeEntry(
   };
 }
 
+/** Candidates over a list, accepting only what `accept` passes. */
+function candidatesOf<T extends { id: string }>(
+  items: T[],
+  accept: (item: T) => boolean,
+): SearchCandidates<T> & { checked: string[] } {
+  const byId = new Map(items.map((item) => [item.id, item]));
+  const checked: string[] = [];
+  const has = (id: string) => {
+    checked.push(id);
+    const item = byId.get(id);
+    return item !== undefined && accept(item);
+  };
+  return {
+    checked,
+    has,
+    load: async (ids) => ids.filter(has).map((id) => byId.get(id)!),
+  };
+}
+
 function makeDecision(
   id: string,
   summary: string,
@@ -96,72 +115,6 @@ describe("cosineSimilarity", () => {
   });
 });
 
-describe("keywordSearch", () => {
-  it("should find items matching query terms", () => {
-    const items = [
-      { id: "1", text: "The auth module handles JWT tokens" },
-      { id: "2", text: "The database stores user data" },
-      { id: "3", text: "JWT authentication is secure" },
-    ];
-
-    const results = keywordSearch("JWT auth", items, 10);
-    expect(results.length).toBeGreaterThan(0);
-
-    // Items 1 and 3 both match both terms ("jwt" and "auth")
-    // Item 2 should NOT be in results (no "jwt" or "auth")
-    const ids = results.map((r) => r.id);
-    expect(ids).toContain("1");
-    expect(ids).toContain("3");
-    expect(ids).not.toContain("2");
-  });
-
-  it("should return empty for no matches", () => {
-    const items = [
-      { id: "1", text: "hello world" },
-      { id: "2", text: "foo bar" },
-    ];
-
-    const results = keywordSearch("nonexistent term", items, 10);
-    expect(results).toHaveLength(0);
-  });
-
-  it("should respect limit parameter", () => {
-    const items = [
-      { id: "1", text: "test item one" },
-      { id: "2", text: "test item two" },
-      { id: "3", text: "test item three" },
-    ];
-
-    const results = keywordSearch("test", items, 2);
-    expect(results).toHaveLength(2);
-  });
-
-  it("should handle empty query", () => {
-    const items = [{ id: "1", text: "some text" }];
-    const results = keywordSearch("", items, 10);
-    expect(results).toHaveLength(0);
-  });
-
-  it("should be case-insensitive", () => {
-    const items = [{ id: "1", text: "Authentication Module" }];
-    const results = keywordSearch("authentication module", items, 10);
-    expect(results).toHaveLength(1);
-  });
-
-  it("should score items with more term occurrences higher", () => {
-    const items = [
-      { id: "1", text: "auth" },
-      { id: "2", text: "auth auth auth" },
-    ];
-
-    const results = keywordSearch("auth", items, 10);
-    expect(results).toHaveLength(2);
-    // Item 2 should score higher due to more occurrences
-    expect(results[0]!.id).toBe("2");
-    expect(results[0]!.score).toBeGreaterThan(results[1]!.score);
-  });
-});
-
 describe("SearchEngine", () => {
   describe("searchBlackboard (fallback mode)", () => {
     it("should use keyword search when embedder is in fallback mode", async () => {
@@ -177,6 +130,7 @@ describe("SearchEngine", () => {
         makeEntry("2", "Database schema design", "PostgreSQL with Prisma"),
         makeEntry("3", "Auth middleware", "JWT token validation"),
       ];
+      await engine.indexBlackboardEntries(entries);
 
       const { results, fallback_mode } = await engine.searchBlackboard(
         "JWT authentication",
@@ -190,7 +144,7 @@ describe("SearchEngine", () => {
       expect(ids).toContain("1");
     });
 
-    it("should filter by entry_types", async () => {
+    it("should only return candidates the store accepts", async () => {
       const tmpDir = makeTempDir();
       const embedder = new Embedder(tmpDir);
       (embedder as any).fallbackMode = true;
@@ -202,14 +156,17 @@ describe("SearchEngine", () => {
         makeEntry("1", "JWT finding", "", "finding"),
         makeEntry("2", "JWT warning", "", "warning"),
         makeEntry("3", "JWT status", "", "status"),
+        makeEntry("4", "Database schema", "", "finding"),
       ];
+      await engine.indexBlackboardEntries(entries);
 
-      const { results } = await engine.searchBlackboard("JWT", entries, {
-        entry_types: ["finding"],
-      });
+      const candidates = candidatesOf(entries, (e) => e.entry_type === "finding");
+      const { results } = await engine.searchBlackboard("JWT", candidates);
 
       expect(results).toHaveLength(1);
       expect(results[0]!.entry.id).toBe("1");
+      // Only ids the keyword index turned up were checked
+      expect([...new Set(candidates.checked)].sort()).toEqual(["1", "2", "3"]);
     });
 
     it("should respect limit", async () => {
@@ -223,6 +180,7 @@ describe("SearchEngine", () => {
       const entries = Array.from({ length: 20 }, (_, i) =>
         makeEntry(`entry-${i}`, `test item ${i}`),
       );
+      await engine.indexBlackboardEntries(entries);
 
       const { results } = await engine.searchBlackboard("test", entries, {
         limit: 5,
@@ -231,6 +189,35 @@ describe("SearchEngine", () => {
       expect(results.length).toBeLessThanOrEqual(5);
     });
 
+    it("should persist the keyword index and honor unindex", async () => {
+      const tmpDir = makeTempDir();
+      const embedder = new Embedder(tmpDir);
+      (embedder as any).fallbackMode = true;
+
+      const indexManager = new IndexManager(tmpDir);
+      const engine = new SearchEngine(embedder, indexManager);
+      await engine.indexBlackboardEntries([
+        makeEntry("1", "Retry budget for webhooks"),
+        makeEntry("2", "Webhook signature check"),
+      ]);
+      expect(
+        fs.existsSync(path.join(tmpDir, "embeddings", "blackboard.terms.jsonl")),
+      ).toBe(true);
+
+      await engine.unindex("blackboard", ["2"]);
+
+      // Fresh engine reads the persisted index; searching never indexes,
+      // so "2" stays out even when passed in as a candidate
+      const fresh = new SearchEngine(embedder, new IndexManager(tmpDir));
+      const { results } = await fresh.searchBlackboard("webhook", [
+        makeEntry("1", "Retry budget for webhooks"),
+        makeEntry("2", "Webhook signature check"),
+      ]);
+      expect(results.map((r) => r.entry.id)).toEqual(["1"]);
+      expect(results[0]!.relevance).toBeGreaterThan(0);
+      expect(results[0]!.relevance).toBeLessThan(1);
+    });
+
     it("should return empty results for empty entries", async () => {
       const tmpDir = makeTempDir();
       const embedder = new Embedder(tmpDir);
@@ -281,6 +268,67 @@ describe("SearchEngine", () => {
       // "far" should rank last
       expect(results[2]!.entry.id).toBe("far");
     });
+
+    it("should apply scope and type filters before ranking", async () => {
+      const tmpDir = makeTempDir();
+      const embedder = new Embedder(tmpDir);
+      (embedder as any).fallbackMode = false;
+      (embedder as any).pipeline = true;
+      embedder.embed = async () => [1, 0, 0];
+
+      const indexManager = new IndexManager(tmpDir);
+      await indexManager.addEntry("blackboard", "close", [1, 0, 0]);
+      await indexManager.addEntry("blackboard", "scoped", [0, 1, 0]);
+      await indexManager.addEntry("blackboard", "warning", [0, 0, 1]);
+
+      const engine = new SearchEngine(embedder, indexManager);
+      const entries = [
+        { ...makeEntry("close", "close"), scope: "src/other/" },
+        { ...makeEntry("scoped", "scoped"), scope: "src/auth/jwt.ts" },
+        {
+          ...makeEntry("warning", "warning", "", "warning"),
+          scope: "src/auth/",
+        },
+      ];
+
+      const candidates = candidatesOf(
+        entries,
+        (e) => e.entry_type === "finding" && e.scope.startsWith("src/auth/"),
+      );
+      const { results } = await engine.searchBlackboard("query", candidates, {
+        limit: 1,
+      });
+
+      expect(results.map((r) => r.entry.id)).toEqual(["scoped"]);
+    });
+
+    it("should score entries without a vector by keyword, discounted", async () => {
+      const tmpDir = makeTempDir();
+      const embedder = new Embedder(tmpDir);
+      (embedder as any).fallbackMode = false;
+      (embedder as any).pipeline = true;
+      embedder.embed = async () => [1, 0, 0];
+
+      const indexManager = new IndexManager(tmpDir);
+      await indexManager.addEntry("blackboard", "embedded", [1, 0, 0]);
+
+      const engine = new SearchEngine(embedder, indexManager);
+      const entries = [
+        makeEntry("embedded", "Cache warmup"),
+        makeEntry("pending", "Cache eviction policy"),
+        makeEntry("rejected", "Cache sizing"),
+      ];
+      await engine.indexBlackboardEntries(entries);
+
+      const { results } = await engine.searchBlackboard(
+        "cache",
+        candidatesOf(entries, (e) => e.id !== "rejected"),
+      );
+
+      expect(results.map((r) => r.entry.id)).toEqual(["embedded", "pending"]);
+      expect(results[1]!.relevance).toBeGreaterThan(0);
+      expect(results[1]!.relevance).toBeLessThan(0.5);
+    });
   });
 
   describe("searchDecisions (fallback mode)", () => {
@@ -296,6 +344,7 @@ describe("SearchEngine", () => {
         makeDecision("d1", "Use JWT for auth", "Stateless, scalable"),
         makeDecision("d2", "Use PostgreSQL", "Relational data model"),
       ];
+      await engine.indexDecisions(decisions);
 
       const { results, fallback_mode } = await engine.searchDecisions(
         "JWT authentication",
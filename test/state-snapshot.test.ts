@@ -0,0 +1,135 @@
+import { describe, it, expect, beforeEach, afterEach } from "vitest";
+import fs from "node:fs";
+import path from "node:path";
+import os from "node:os";
+import { ensureInitialized } from "../src/storage/init.js";
+import { BlackboardStore } from "../src/storage/blackboard-store.js";
+import { DecisionStore } from "../src/storage/decision-store.js";
+import { KeywordIndex } from "../src/embeddings/keyword-index.js";
+import {
+  restoreStateSnapshot,
+  saveStateSnapshot,
+  snapshotPath,
+  type SnapshotSources,
+} from "../src/storage/state-snapshot.js";
+
+let tmpDir: string;
+let twiningDir: string;
+
+beforeEach(() => {
+  tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), "twining-snapshot-test-"));
+  twiningDir = ensureInitialized(tmpDir);
+});
+
+afterEach(() => {
+  fs.rmSync(tmpDir, { recursive: true, force: true });
+});
+
+function sources(): SnapshotSources {
+  return {
+    blackboardStore: new BlackboardStore(twiningDir),
+    decisionStore: new DecisionStore(twiningDir),
+    keywordIndex: new KeywordIndex(path.join(twiningDir, "embeddings")),
+  };
+}
+
+function post(summary: string) {
+  return {
+    entry_type: "finding" as const,
+    summary,
+    detail: "",
+    tags: [],
+    scope: "project",
+    agent_id: "main",
+  };
+}
+
+/** Populate and parse every cached store, then snapshot it. */
+async function seed(): Promise<SnapshotSources> {
+  const first = sources();
+  await first.blackboardStore.append(post("alpha"));
+  await first.decisionStore.create({
+    agent_id: "main",
+    domain: "architecture",
+    scope: "src/",
+    summary: "Use JSONL",
+    context: "",
+    rationale: "Appends are cheap",
+    constraints: [],
+    alternatives: [],
+    depends_on: [],
+    confidence: "high",
+    reversible: true,
+    affected_files: [],
+    affected_symbols: [],
+  });
+  await first.keywordIndex.add("blackboard", [{ id: "doc-1", text: "alpha beta" }]);
+
+  await first.blackboardStore.read();
+  await first.decisionStore.getIndex();
+  first.keywordIndex.size("blackboard");
+  expect(saveStateSnapshot(twiningDir, first, "1.0.0")).toBe(true);
+  return first;
+}
+
+describe("state snapshot", () => {
+  it("serves parsed entries for files that have not changed", async () => {
+    const first = await seed();
+    const head = path.join(twiningDir, "blackboard.jsonl");
+    const mtime = new Date("2024-01-01T00:00:00Z");
+    fs.utimesSync(head, mtime, mtime);
+    await first.blackboardStore.read();
+    saveStateSnapshot(twiningDir, first, "1.0.0");
+
+    // Same size and mtime, different bytes: only the snapshot has "alpha"
+    fs.writeFileSync(head, fs.readFileSync(head, "utf-8").replace("alpha", "omega"));
+    fs.utimesSync(head, mtime, mtime);
+
+    const next = sources();
+    expect(restoreStateSnapshot(twiningDir, next, "1.0.0")).toBe(true);
+    expect((await next.blackboardStore.read()).entries.map((e) => e.summary)).toEqual(["alpha"]);
+    expect((await next.decisionStore.getIndex()).map((d) => d.summary)).toEqual(["Use JSONL"]);
+    expect(next.keywordIndex.search("blackboard", "beta").map((h) => h.id)).toEqual(["doc-1"]);
+  });
+
+  it("parses only what was appended since the snapshot", async () => {
+    const first = await seed();
+    await first.blackboardStore.append(post("bravo"));
+    await first.keywordIndex.add("blackboard", [{ id: "doc-2", text: "gamma" }]);
+
+    const next = sources();
+    expect(restoreStateSnapshot(twiningDir, next, "1.0.0")).toBe(true);
+    expect((await next.blackboardStore.read()).entries.map((e) => e.summary)).toEqual([
+      "alpha",
+      "bravo",
+    ]);
+    expect(next.keywordIndex.size("blackboard")).toBe(2);
+  });
+
+  it("re-reads files that were rewritten since the snapshot", async () => {
+    await seed();
+    const head = path.join(twiningDir, "blackboard.jsonl");
+    fs.writeFileSync(head, "");
+
+    const next = sources();
+    expect(restoreStateSnapshot(twiningDir, next, "1.0.0")).toBe(true);
+    expect((await next.blackboardStore.read()).entries).toEqual([]);
+  });
+
+  it("ignores a missing snapshot or one from another version", async () => {
+    expect(restoreStateSnapshot(twiningDir, sources(), "1.0.0")).toBe(false);
+    await seed();
+    expect(fs.existsSync(snapshotPath(twiningDir))).toBe(true);
+    expect(restoreStateSnapshot(twiningDir, sources(), "2.0.0")).toBe(false);
+  });
+
+  it("does not replace state a store has already read", async () => {
+    await seed();
+    const next = sources();
+    await next.blackboardStore.append(post("bravo"));
+    expect(await next.blackboardStore.count()).toBe(2);
+
+    restoreStateSnapshot(twiningDir, next, "1.0.0");
+    expect(await next.blackboardStore.count()).toBe(2);
+  });
+});
@@ -103,6 +103,28 @@ describe("twining_post tool", () => {
   });
 });
 
+describe("twining_post_batch tool", () => {
+  it("returns per-entry results in order with counts", async () => {
+    const response = await callTool("twining_post_batch", {
+      entries: [
+        { entry_type: "finding", summary: "F1" },
+        { entry_type: "decision", summary: "Rejected" },
+        { entry_type: "warning", summary: "W1" },
+      ],
+    });
+    const data = parseToolResponse(response) as {
+      results: Array<{ id?: string; code?: string }>;
+      posted: number;
+      failed: number;
+    };
+    expect(data.posted).toBe(2);
+    expect(data.failed).toBe(1);
+    expect(data.results[0]!.id).toHaveLength(26);
+    expect(data.results[1]!.code).toBe("INVALID_INPUT");
+    expect(data.results[2]!.id).toHaveLength(26);
+  });
+});
+
 describe("twining_read tool", () => {
   it("returns entries in toolResult format", async () => {
     await callTool("twining_post", {
@@ -189,6 +211,37 @@ describe("twining_decide tool", () => {
   });
 });
 
+describe("twining_decide_batch tool", () => {
+  it("records decisions and reports conflicts within the batch", async () => {
+    const response = await callTool("twining_decide_batch", {
+      decisions: [
+        {
+          domain: "architecture",
+          scope: "src/auth/",
+          summary: "Use JWT",
+          context: "Need auth",
+          rationale: "Stateless",
+        },
+        {
+          domain: "architecture",
+          scope: "src/auth/",
+          summary: "Use sessions",
+          context: "Need auth",
+          rationale: "Simple",
+        },
+      ],
+    });
+    const data = parseToolResponse(response) as {
+      results: Array<{ id: string; conflicts?: Array<{ id: string }> }>;
+      recorded: number;
+      failed: number;
+    };
+    expect(data.recorded).toBe(2);
+    expect(data.failed).toBe(0);
+    expect(data.results[1]!.conflicts![0]!.id).toBe(data.results[0]!.id);
+  });
+});
+
 describe("twining_why tool", () => {
   it("returns decisions matching scope", async () => {
     await callTool("twining_decide", {
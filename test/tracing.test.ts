@@ -0,0 +1,62 @@
+import { describe, it, expect } from "vitest";
+import { Trace, span, setSpanAttributes } from "../src/utils/tracing.js";
+
+describe("span tracing", () => {
+  it("runs fn untraced outside a trace", async () => {
+    expect(await span("work", async () => 42)).toBe(42);
+    setSpanAttributes({ ignored: true });
+  });
+
+  it("nests spans under the active span, including parallel ones", async () => {
+    const trace = new Trace("twining_decide", { agent: "a" });
+    await trace.run(async () => {
+      await span("outer", async () => {
+        setSpanAttributes({ items: 2 });
+        await Promise.all([
+          span("left", async () => {}),
+          span("right", async () => {}, { index: "decisions" }),
+        ]);
+      });
+    });
+    const record = trace.finish();
+
+    expect(record.name).toBe("twining_decide");
+    expect(record.trace_id).toMatch(/^[0-9a-f]{32}$/);
+    const byName = new Map(record.spans.map((s) => [s.name, s]));
+    expect(byName.get("twining_decide")!.parent_id).toBeNull();
+    expect(byName.get("twining_decide")!.attributes).toEqual({ agent: "a" });
+    const outer = byName.get("outer")!;
+    expect(outer.parent_id).toBe(byName.get("twining_decide")!.id);
+    expect(outer.attributes).toEqual({ items: 2 });
+    expect(byName.get("left")!.parent_id).toBe(outer.id);
+    expect(byName.get("right")!.attributes).toEqual({ index: "decisions" });
+    expect(record.duration_ms).toBeGreaterThanOrEqual(outer.duration_ms);
+  });
+
+  it("records errors on the span and rethrows", async () => {
+    const trace = new Trace("tool");
+    await expect(
+      trace.run(() =>
+        span("failing", async () => {
+          throw new Error("boom");
+        }),
+      ),
+    ).rejects.toThrow("boom");
+    const record = trace.finish("Error");
+    expect(record.spans.find((s) => s.name === "failing")!.error).toBe("boom");
+    expect(record.spans[0]!.error).toBe("Error");
+  });
+
+  it("drops spans that start after the trace finished", async () => {
+    const trace = new Trace("tool");
+    let late: Promise<void> = Promise.resolve();
+    await trace.run(async () => {
+      late = new Promise<void>((resolve) => setTimeout(resolve, 5)).then(() =>
+        span("late", async () => {}),
+      );
+    });
+    const record = trace.finish();
+    await late;
+    expect(record.spans.map((s) => s.name)).toEqual(["tool"]);
+  });
+});
@@ -0,0 +1,12 @@
+import { defineConfig } from "vitest/config";
+
+export default defineConfig({
+  test: {
+    benchmark: {
+      include: ["test/bench/**/*.bench.ts"],
+    },
+    // One file at a time, so benchmarks don't compete for CPU and disk
+    fileParallelism: false,
+    hookTimeout: 600000,
+  },
+});